@@ -5,10 +5,12 @@
 """
 This package is intentionally left lean. The application will create new
 Python files in this directory when developers provision new API endpoints
-via the web UI. Each generated module may expose one or more Flask blueprints
-or view functions, but this scaffolding is deliberately simple to avoid
-unintended execution of arbitrary code.
+via the web UI. Each generated module exposes a Flask blueprint named
+`blueprint`; app/api_loader.py imports it on the first request to its
+endpoint path under /api and re-imports it when the file changes, so no
+redeploy is needed. Only files named integration_<id>.py for an existing,
+non-disabled integration are ever executed.
 
 Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-Modified:  2025-11-23
+Modified:  2026-10-16
 """
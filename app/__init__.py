@@ -2,17 +2,40 @@
 # app/__init__.py - Package root (./app/__init__.py)
 # Application factory and high-level wiring for the Flask MCP API site.
 
-from flask import Flask, redirect, url_for
-from flask_scss import Scss
+from typing import TYPE_CHECKING
+
+from flask import Flask
 
 from config import get_config
 from .extensions import db, login_manager
-from .models import User, Role, seed_initial_data
-from .routes.auth import auth_bp
-from .routes.admin import admin_bp
-from .routes.api_admin import api_admin_bp
-from .routes.developer import developer_bp
-from .routes.operator import operator_bp
+
+if TYPE_CHECKING:
+    from .models import User
+
+
+# ------------------------------------------------------------------------------
+def register_blueprints(app: Flask) -> None:
+    """
+    Import and register the route blueprints.
+
+    Blueprint modules pull in forms, WTForms and the query helpers, so they
+    are imported here rather than at package import time. Tools that only
+    need the models (worker.py, benchmarks, the CLI) stay cheap to import.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    from .routes.auth import auth_bp
+    from .routes.admin import admin_bp
+    from .routes.api_admin import api_admin_bp
+    from .routes.developer import developer_bp
+    from .routes.operator import operator_bp
+
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(admin_bp, url_prefix="/admin")
+    app.register_blueprint(api_admin_bp, url_prefix="/api-admin")
+    app.register_blueprint(developer_bp, url_prefix="/developer")
+    app.register_blueprint(operator_bp, url_prefix="/operator")
 
 
 # ------------------------------------------------------------------------------
@@ -25,34 +48,92 @@ def create_app() -> Flask:
     app.py thin and makes the codebase easier to test or embed in WSGI
     servers.
 
+    Migrations and seeding only run here when AUTO_INIT_DB is set (the
+    development default). Production runs `flask init-db` once per deploy
+    so worker start-up skips DDL, seeding and the admin password hash
+    entirely, and only reads the schema version to warn if it is behind.
+
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-17
     """
+    from .assets import asset_manifest
+    from .audit_log import audit_log
+    from .commands import register_commands
+    from .database import init_engines
+    from .metrics import metrics
+    from .passwords import password_hasher
+    from .rate_limit import rate_limiter
+    from .scaffold_queue import scaffold_queue
+    from .settings_store import settings_store
+    from .sql_profiler import sql_profiler
+    from .user_cache import load_cached_user, user_cache
+
     app = Flask(__name__)
     app.config.from_object(get_config())
 
-    # Initialize Flask-Scss for runtime SCSS compilation for development.
-    # In production, prefer precompiled CSS assets.
-    Scss(app, asset_dir="app/static/scss", static_dir="app/static/css")
+    # Client address and scheme as seen by the trusted reverse proxies.
+    hops = app.config["TRUSTED_PROXY_HOPS"]
+    if hops > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+    # Runtime SCSS compilation is a development convenience only. Production
+    # serves the hashed bundles from `flask assets-build` and never imports
+    # Flask-Scss at all.
+    if app.config["ASSETS_RUNTIME_SCSS"]:
+        from flask_scss import Scss
+
+        Scss(app, asset_dir="app/static/scss", static_dir="app/static/css")
+    asset_manifest.init_app(app)
 
     # Initialize extensions
-    db.init_app(app)
+    # db.init_app with pool options, SQLite pragmas and the replica bind.
+    init_engines(app)
     login_manager.init_app(app)
+    password_hasher.init_app(app)
+    user_cache.init_app(app)
+    settings_store.init_app(app)
+    # Before any hook that can reject a request, so every request is timed.
+    metrics.init_app(app)
+    sql_profiler.init_app(app)
+    rate_limiter.init_app(app)
 
-    # Configure user loader for Flask-Login
+    # Configure user loader for Flask-Login. Users and their roles are served
+    # from a process-local TTL cache, invalidated on any User/Role change.
     @login_manager.user_loader
-    def load_user(user_id: str) -> User | None:
-        return User.query.get(int(user_id))
+    def load_user(user_id: str) -> "User | None":
+        return load_cached_user(int(user_id))
 
     # Simple unauthorized handler redirecting to login page.
     login_manager.login_view = "auth.login"
 
     # Register blueprints for separated concerns.
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(admin_bp, url_prefix="/admin")
-    app.register_blueprint(api_admin_bp, url_prefix="/api-admin")
-    app.register_blueprint(developer_bp, url_prefix="/developer")
-    app.register_blueprint(operator_bp, url_prefix="/operator")
+    register_blueprints(app)
+
+    # api/ module scaffolds, written in the background after commits.
+    scaffold_queue.init_app(app)
+    # Change events of integrations, user roles and settings, also batched.
+    audit_log.init_app(app)
+
+    # Generated integration modules, imported on first hit and hot-reloaded.
+    if app.config["GENERATED_API_ENABLED"]:
+        from .api_loader import api_registry
+
+        api_registry.init_app(app)
+
+    # One data-driven proxy serving every integration from its DB row.
+    if app.config["GATEWAY_ENABLED"]:
+        from .circuit_breaker import circuit_breakers
+        from .gateway import gateway
+        from .response_cache import response_cache
+
+        response_cache.init_app(app)
+        circuit_breakers.init_app(app)
+        gateway.init_app(app)
+
+    # Maintenance commands exposed through the flask CLI.
+    register_commands(app)
 
     # Moved to /app/routes/auth.py where current_user is defined.
     # Default route: redirect to login or dashboard
@@ -62,9 +143,25 @@ def create_app() -> Flask:
     #         return redirect(url_for("developer.dashboard"))
     #     return redirect(url_for("auth.login"))
 
-    # Ensure database and seed roles/users.
-    with app.app_context():
-        db.create_all()
-        seed_initial_data()
+    # Ensure database and seed roles/users (guarded so concurrent workers
+    # do the work once; a no-op after the first boot).
+    if app.config["AUTO_INIT_DB"]:
+        from .bootstrap import init_database
+
+        with app.app_context():
+            init_database(app.config["DB_INIT_LOCK_FILE"])
+    else:
+        from .migrations import check_schema_version
+
+        with app.app_context():
+            check_schema_version()
+
+    # Optional in-process health sweeps; worker.py is the standalone variant.
+    if app.config["HEALTH_SWEEP_IN_PROCESS"]:
+        from .scheduler import HealthSweepScheduler
+
+        scheduler = HealthSweepScheduler.from_app(app)
+        scheduler.start()
+        app.extensions["health_sweep"] = scheduler
 
     return app
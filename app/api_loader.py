@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# app/api_loader.py - (./app/api_loader.py)
+# Runtime dispatch to generated api/integration_<id>.py modules with hot reload.
+
+import hashlib
+import hmac
+import logging
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from flask import Flask, abort, request
+from flask_login import current_user
+from sqlalchemy import select
+from werkzeug.exceptions import NotFound
+from werkzeug.routing import Map, Rule
+
+from .api_utils import render_api_module
+from .extensions import db
+from .integration_index import (
+    MISS_RECHECK_SECONDS,
+    IntegrationIndex,
+    served_integrations,
+)
+from .metrics import metrics
+from .models import ApiIntegration
+from .rate_limit import rate_limited_response, rate_limiter
+
+log = logging.getLogger(__name__)
+
+# Methods the catch-all mount accepts; each module's own rules narrow this.
+DISPATCH_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD"]
+
+
+# ------------------------------------------------------------------------------
+class _RuleRecorder:
+    """
+    Stand-in for Flask's BlueprintSetupState that captures url rules.
+
+    Generated modules expose a Blueprint. Flask refuses new blueprints once
+    the app has served a request, so instead of registering it the loader
+    replays the blueprint's deferred setup calls against this recorder.
+    """
+
+    def __init__(self) -> None:
+        self.rules: list[Rule] = []
+        self.views: dict[str, Callable[..., Any]] = {}
+
+    def add_url_rule(
+        self,
+        rule: str,
+        endpoint: str | None = None,
+        view_func: Callable[..., Any] | None = None,
+        **options: Any,
+    ) -> None:
+        if view_func is None:
+            return
+        endpoint = endpoint or view_func.__name__
+        self.rules.append(
+            Rule(
+                rule,
+                endpoint=endpoint,
+                methods=options.get("methods") or ["GET"],
+                defaults=options.get("defaults"),
+                strict_slashes=options.get("strict_slashes"),
+            )
+        )
+        self.views[endpoint] = view_func
+
+
+# ------------------------------------------------------------------------------
+@dataclass
+class LoadedModule:
+    """One imported generated module and the routes it declared."""
+
+    integration_id: int
+    path: Path
+    mtime_ns: int
+    url_map: Map
+    views: dict[str, Callable[..., Any]] = field(default_factory=dict)
+
+
+# ------------------------------------------------------------------------------
+class ScaffoldRow(NamedTuple):
+    """The integration columns a module's trust is decided on."""
+
+    id: int
+    name: str
+    endpoint_path: str
+    http_method: str | None
+    scaffold_approved_sha256: str | None
+
+
+# ------------------------------------------------------------------------------
+class ApiModuleRegistry(IntegrationIndex):
+    """
+    Serve generated integration modules under GENERATED_API_PREFIX.
+
+    Routing uses the integrations table, not the module files: endpoint
+    paths without converters go into a dict keyed by path, so lookup is
+    O(1) however many modules exist. Paths with converters (e.g.
+    /items/<int:item_id>) fall back to one shared werkzeug Map.
+
+    A module is imported on its first request and re-imported whenever
+    its file's mtime changes. Only trusted files are executed: the exact
+    scaffold render_api_module() produces for the integration's current
+    row, or a file whose SHA-256 an admin approved (stored in
+    scaffold_approved_sha256). Any other file is refused with a 404 until
+    it is regenerated or approved. A deleted file or a deleted or disabled
+    integration stops being served, and callers must be logged in unless
+    GENERATED_API_REQUIRE_LOGIN is off. The index is rebuilt as described in
+    IntegrationIndex, checking every GENERATED_API_CHECK_INTERVAL seconds
+    and on a routing miss so integrations created by another worker are
+    picked up at once. Requests take a token from the integration's rate
+    limits (rate_limit.py) before the module runs.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(
+        self, check_interval: float = 2.0, require_login: bool = True
+    ) -> None:
+        super().__init__(check_interval)
+        self.require_login = require_login
+        self.api_root: Path | None = None
+        self._static: dict[str, int] = {}
+        self._dynamic = Map()
+        self._limits: dict[int, tuple[int, str | None]] = {}
+        self._scaffolds: dict[int, ScaffoldRow] = {}
+        self._modules: dict[int, LoadedModule] = {}
+        self._refused: dict[int, int] = {}
+        self.loads = 0
+        self.refusals = 0
+
+    def init_app(self, app: Flask) -> None:
+        self.check_interval = app.config["GENERATED_API_CHECK_INTERVAL"]
+        self.require_login = app.config["GENERATED_API_REQUIRE_LOGIN"]
+        self.api_root = Path(app.config["API_MODULES_DIR"])
+        prefix = app.config["GENERATED_API_PREFIX"].rstrip("/")
+        app.add_url_rule(
+            f"{prefix}/<path:subpath>",
+            endpoint="generated_api",
+            view_func=self.dispatch,
+            methods=DISPATCH_METHODS,
+        )
+        app.extensions["api_registry"] = self
+
+    # -- index ---------------------------------------------------------------
+
+    def rebuild(self) -> None:
+        rows = db.session.execute(
+            select(
+                ApiIntegration.id,
+                ApiIntegration.name,
+                ApiIntegration.endpoint_path,
+                ApiIntegration.http_method,
+                ApiIntegration.scaffold_approved_sha256,
+                ApiIntegration.owner_id,
+                ApiIntegration.rate_limit,
+            )
+            .where(served_integrations())
+            .order_by(ApiIntegration.id)
+        ).all()
+        static: dict[str, int] = {}
+        dynamic: list[Rule] = []
+        limits: dict[int, tuple[int, str | None]] = {}
+        scaffolds: dict[int, ScaffoldRow] = {}
+        for row in rows:
+            integration_id = row.id
+            limits[integration_id] = (row.owner_id, row.rate_limit)
+            scaffolds[integration_id] = ScaffoldRow._make(row[:5])
+            path = "/" + (row.endpoint_path or "").strip().lstrip("/")
+            if "<" in path:
+                dynamic.append(Rule(path, endpoint=str(integration_id)))
+            else:
+                # Lowest id wins when two integrations claim the same path.
+                static.setdefault(path, integration_id)
+
+        url_map = Map()
+        for rule in dynamic:
+            try:
+                url_map.add(rule)
+            except ValueError:
+                log.warning("Skipping invalid endpoint path %r", rule.rule)
+
+        live = set(static.values()) | {int(r.endpoint) for r in dynamic}
+        with self._lock:
+            previous = self._scaffolds
+            self._static = static
+            self._dynamic = url_map
+            self._limits = limits
+            self._scaffolds = scaffolds
+            # Trust was decided against the old row: re-check on next use.
+            self._refused.clear()
+            for loaded_id in list(self._modules):
+                if loaded_id not in live or (
+                    previous.get(loaded_id) != scaffolds.get(loaded_id)
+                ):
+                    self._modules.pop(loaded_id, None)
+
+    def lookup(self, path: str) -> int | None:
+        integration_id = self._static.get(path)
+        if integration_id is not None:
+            return integration_id
+        try:
+            endpoint, _ = self._dynamic.bind("").match(path)
+        except NotFound:
+            return None
+        return int(endpoint)
+
+    # -- modules -------------------------------------------------------------
+
+    def module_path(self, integration_id: int) -> Path:
+        return self.api_root / f"integration_{integration_id}.py"
+
+    def get_module(self, integration_id: int) -> LoadedModule | None:
+        """
+        Return the loaded module, importing or reloading it if needed, or
+        None if there is no file or the file is not trusted.
+        """
+        path = self.module_path(integration_id)
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._modules.pop(integration_id, None)
+            return None
+        loaded = self._modules.get(integration_id)
+        if loaded is not None and loaded.mtime_ns == mtime_ns:
+            return loaded
+        if self._refused.get(integration_id) == mtime_ns:
+            return None
+        with self._lock:
+            loaded = self._modules.get(integration_id)
+            if loaded is None or loaded.mtime_ns != mtime_ns:
+                loaded = self._load(integration_id, path, mtime_ns)
+                if loaded is None:
+                    self._modules.pop(integration_id, None)
+                    self._refused[integration_id] = mtime_ns
+                    return None
+                self._modules[integration_id] = loaded
+        return loaded
+
+    def trusted(self, integration_id: int, source: bytes) -> bool:
+        """
+        True if source may be executed for this integration: it is the
+        unedited scaffold of the current row, or an admin approved its
+        SHA-256.
+        """
+        row = self._scaffolds.get(integration_id)
+        if row is None:
+            return False
+        if source == render_api_module(row).encode("utf-8"):
+            return True
+        approved = row.scaffold_approved_sha256
+        return bool(approved) and hmac.compare_digest(
+            hashlib.sha256(source).hexdigest(), approved
+        )
+
+    def _load(
+        self, integration_id: int, path: Path, mtime_ns: int
+    ) -> LoadedModule | None:
+        # The bytes that were checked are the bytes that run: the file is
+        # read once and compiled from memory, never re-opened by an importer.
+        source = path.read_bytes()
+        if not self.trusted(integration_id, source):
+            self.refusals += 1
+            log.warning(
+                "Not serving %s: edited scaffold without admin approval",
+                path.name,
+            )
+            return None
+        module = types.ModuleType(f"api.integration_{integration_id}")
+        module.__file__ = str(path)
+        exec(compile(source, str(path), "exec"), module.__dict__)
+
+        recorder = _RuleRecorder()
+        blueprint = getattr(module, "blueprint", None)
+        for deferred in getattr(blueprint, "deferred_functions", ()):
+            deferred(recorder)
+        self.loads += 1
+        log.info("Loaded %s (%d routes)", path.name, len(recorder.rules))
+        return LoadedModule(
+            integration_id=integration_id,
+            path=path,
+            mtime_ns=mtime_ns,
+            url_map=Map(recorder.rules),
+            views=recorder.views,
+        )
+
+    def unload(self, integration_id: int) -> None:
+        with self._lock:
+            self._modules.pop(integration_id, None)
+
+    # -- request handling ----------------------------------------------------
+
+    def dispatch(self, subpath: str):
+        if self.require_login and not current_user.is_authenticated:
+            abort(401)
+        path = "/" + subpath
+        self.refresh()
+        integration_id = self.lookup(path)
+        if integration_id is None and self.refresh(MISS_RECHECK_SECONDS):
+            integration_id = self.lookup(path)
+        if integration_id is None:
+            abort(404)
+        metrics.note_integration(integration_id)
+        owner_id, rate_limit = self._limits.get(integration_id, (None, None))
+        decision = rate_limiter.check_integration(
+            integration_id, owner_id, rate_limit, request.remote_addr or ""
+        )
+        if not decision.allowed:
+            return rate_limited_response(decision)
+        loaded = self.get_module(integration_id)
+        if loaded is None:
+            abort(404)
+        # Raises NotFound / MethodNotAllowed, which Flask renders as usual.
+        endpoint, args = loaded.url_map.bind("").match(path, method=request.method)
+        return loaded.views[endpoint](**args)
+
+    def stats(self) -> dict:
+        return {
+            "routes": len(self._static) + len(list(self._dynamic.iter_rules())),
+            "loaded": len(self._modules),
+            "loads": self.loads,
+            "refusals": self.refusals,
+        }
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+api_registry = ApiModuleRegistry()
+
@@ -2,71 +2,272 @@
 # app/api_utils.py - (./app/api_utils.py)
 # Utilities for generating and managing API endpoint scaffolding on disk.
 
+import hashlib
+import os
+import threading
 from pathlib import Path
 from textwrap import dedent
+from typing import Iterable
 
 from flask import current_app
 
 from .models import ApiIntegration
 
+# Last line of every scaffold: a digest of the lines above it. A file whose
+# digest no longer matches has been edited by hand and is never overwritten.
+DIGEST_PREFIX = "# scaffold-sha256: "
+
+# Temp files kept open between the write and fsync passes at most.
+_FSYNC_GROUP = 64
+
+# Directories already created by get_api_root() in this process.
+_created_roots: set[Path] = set()
+
+# Scaffold source, formatted by render_api_module(). Every value taken from
+# the integration row is substituted as a Python literal (repr), never as
+# raw text, so names and paths cannot break out of the generated code.
+_TEMPLATE = dedent(
+    '''\
+    # api/{safe_name}.py - Auto-generated integration module
+    # Generated for integration: {name} (ID: {id})
+
+    from flask import Blueprint, jsonify, request
+
+    INTEGRATION_NAME = {name}
+
+    blueprint = Blueprint("{safe_name}", __name__)
+
+    @blueprint.route({endpoint_path}, methods=[{http_method}])
+    def handle_{safe_name}():
+        \"\"\"Example handler stub for the generated integration endpoint.
+
+        Replace this logic with real integration behavior. This stub is
+        intentionally simple: it reads the request body in 64 KiB pieces
+        and reports its size, so large payloads are never buffered.
+        Use the /gateway proxy to stream to the real upstream.
+
+        Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+        Modified:  2026-10-17
+        \"\"\"
+        received = 0
+        while chunk := request.stream.read(65536):
+            received += len(chunk)
+        return jsonify({{"message": f"Stub handler for {{INTEGRATION_NAME}}", "bytes_received": received}}), 200
+    '''
+)
+
 
 # ------------------------------------------------------------------------------
 def get_api_root() -> Path:
     """
-    Return the root path for generated API modules.
+    Return the root path for generated API modules (API_MODULES_DIR).
 
     This function centralizes path handling to make it easier to
-    adjust or secure in future iterations.
+    adjust or secure in future iterations. The directory is created on
+    the first call per path, not on every call.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-17
     """
-    root = Path(current_app.root_path).parent / "api"
-    root.mkdir(exist_ok=True)
+    root = Path(current_app.config["API_MODULES_DIR"])
+    if root not in _created_roots:
+        root.mkdir(parents=True, exist_ok=True)
+        _created_roots.add(root)
     return root
 
 
 # ------------------------------------------------------------------------------
-def generate_api_module(integration: ApiIntegration) -> Path:
+def module_name(integration_id: int) -> str:
+    return f"integration_{integration_id}"
+
+
+# ------------------------------------------------------------------------------
+def render_api_module(integration) -> str:
     """
-    Create a new Python module under the api/ folder for the given integration.
+    Return the scaffold source for an integration (or any row with id,
+    name, endpoint_path and http_method), ending in its digest line.
 
-    The generated code is intentionally simple and should be reviewed or
-    adapted by developers before exposure to external traffic. The endpoint
-    is not auto-registered; developers can wire it into blueprints as needed.
+    Row values are emitted as Python string literals, so whatever a user
+    typed into a name or path stays data and is never executed. The
+    generated code is intentionally simple and should be reviewed or
+    adapted by developers before exposure to external traffic.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-17
     """
-    api_root = get_api_root()
-    safe_name = f"integration_{integration.id}"
-    module_path = api_root / f"{safe_name}.py"
+    integration_id = int(integration.id)
+    body = _TEMPLATE.format(
+        safe_name=module_name(integration_id),
+        id=integration_id,
+        name=repr(str(integration.name or "")),
+        endpoint_path=repr(str(integration.endpoint_path or "")),
+        http_method=repr(str(integration.http_method or "GET")),
+    )
+    return f"{body}{DIGEST_PREFIX}{_digest(body)}\n"
 
-    if module_path.exists():
-        return module_path
 
-    content = dedent(
-        f'''\
-        # api/{safe_name}.py - Auto-generated integration module
-        # Generated for integration: {integration.name} (ID: {integration.id})
+# ------------------------------------------------------------------------------
+def _digest(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
 
-        from flask import Blueprint, jsonify, request
 
-        blueprint = Blueprint("{safe_name}", __name__)
+# ------------------------------------------------------------------------------
+def is_pristine(text: str) -> bool:
+    """
+    True if text is an unedited scaffold and may be regenerated or removed.
 
-        @blueprint.route("{integration.endpoint_path}", methods=["{integration.http_method}"])
-        def handle_{safe_name}():
-            \"\"\"Example handler stub for the generated integration endpoint.
+    Scaffolds written before digests were added have no digest line; they
+    only count as pristine in write_api_modules() when they equal the new
+    scaffold minus that line.
+    """
+    body, _, last = text.rstrip("\n").rpartition("\n")
+    return last.startswith(DIGEST_PREFIX) and last[len(DIGEST_PREFIX):] == _digest(
+        body + "\n"
+    )
 
-            Replace this logic with real integration behavior. This stub is
-            intentionally simple and echoes the request payload for testing.
 
-            Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-            Modified:  2025-11-23
-            \"\"\"
-            return jsonify({{"message": "Stub handler for {integration.name}", "payload": request.json}}), 200
-        '''
-    )
+# ------------------------------------------------------------------------------
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    except UnicodeDecodeError:
+        return ""
+
+
+# ------------------------------------------------------------------------------
+def _fsync_dir(path: Path) -> None:
+    # Makes the renames durable; directories cannot be opened on Windows.
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
 
-    module_path.write_text(content, encoding="utf-8")
-    return module_path
+# ------------------------------------------------------------------------------
+def write_api_modules(
+    api_root: Path,
+    integrations: Iterable,
+    fsync: bool = True,
+    force: bool = False,
+) -> dict[str, int]:
+    """
+    Write or refresh the scaffolds for a batch of integrations atomically.
+
+    Each module is written to a hidden temp file in api_root and renamed
+    over the old one, so the loader never imports a half-written file and
+    sees a new mtime on every change. Durability is paid once per batch
+    rather than per file: temp files are fsynced in groups after being
+    written, and the directory is fsynced once after all the renames.
+    Unchanged scaffolds are left untouched (no reload), and scaffolds a
+    developer has edited are kept unless force is set.
+
+    Returns counts: {"written": n, "unchanged": n, "kept": n}.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    counts = {"written": 0, "unchanged": 0, "kept": 0}
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    staged: list[tuple[Path, Path]] = []
+    unsynced = []
+    try:
+        for integration in integrations:
+            path = api_root / f"{module_name(integration.id)}.py"
+            content = render_api_module(integration)
+            existing = _read(path)
+            if existing == content:
+                counts["unchanged"] += 1
+                continue
+            if (
+                existing is not None
+                and not force
+                and not is_pristine(existing)
+                and existing != content.rpartition(DIGEST_PREFIX)[0]
+            ):
+                counts["kept"] += 1
+                continue
+            temp = api_root / f".{path.name}{suffix}"
+            staged.append((temp, path))
+            handle = open(temp, "w", encoding="utf-8")
+            unsynced.append(handle)
+            handle.write(content)
+            if len(unsynced) >= _FSYNC_GROUP:
+                _sync_and_close(unsynced, fsync)
+        _sync_and_close(unsynced, fsync)
+        for temp, path in staged:
+            os.replace(temp, path)
+            counts["written"] += 1
+    except BaseException:
+        _sync_and_close(unsynced, False)
+        for temp, _ in staged[counts["written"]:]:
+            temp.unlink(missing_ok=True)
+        raise
+    if fsync and staged:
+        _fsync_dir(api_root)
+    return counts
+
+
+# ------------------------------------------------------------------------------
+def _sync_and_close(handles: list, fsync: bool) -> None:
+    for handle in handles:
+        if fsync and not handle.closed:
+            handle.flush()
+            os.fsync(handle.fileno())
+        handle.close()
+    handles.clear()
+
+
+# ------------------------------------------------------------------------------
+def remove_api_modules(
+    api_root: Path, integration_ids: Iterable[int], fsync: bool = True
+) -> dict[str, int]:
+    """
+    Clean up the scaffolds of deleted integrations.
+
+    Pristine scaffolds are deleted. Edited ones are renamed to
+    integration_<id>.py.deleted so the work is not lost but the module is
+    no longer served, even if SQLite hands the id to a new integration.
+
+    Returns counts: {"removed": n, "renamed": n}.
+    """
+    counts = {"removed": 0, "renamed": 0}
+    for integration_id in integration_ids:
+        path = api_root / f"{module_name(integration_id)}.py"
+        existing = _read(path)
+        if existing is None:
+            continue
+        if is_pristine(existing):
+            path.unlink(missing_ok=True)
+            counts["removed"] += 1
+        else:
+            os.replace(path, path.with_name(f"{path.name}.deleted"))
+            counts["renamed"] += 1
+    if fsync and any(counts.values()):
+        _fsync_dir(api_root)
+    return counts
+
+
+# ------------------------------------------------------------------------------
+def generate_api_module(
+    integration: ApiIntegration, api_root: Path | None = None
+) -> Path:
+    """
+    Write the scaffold for one integration now, on the calling thread.
+
+    Views do not call this: scaffold_queue.py writes modules in the
+    background after commits. The runtime loader in api_loader.py serves
+    the module under GENERATED_API_PREFIX as soon as the file exists;
+    edits to the file are picked up without a restart.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    api_root = api_root or get_api_root()
+    write_api_modules(
+        api_root, [integration], fsync=current_app.config["SCAFFOLD_FSYNC"]
+    )
+    return api_root / f"{module_name(integration.id)}.py"
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# app/assets.py - (./app/assets.py)
+# Ahead-of-time asset build (SCSS/JS) and manifest-based URL resolution.
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from flask import Flask, Response, request, url_for
+
+log = logging.getLogger(__name__)
+
+# Build output lives under static/ so Flask's static route serves it.
+DIST_DIRNAME = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Logical asset name -> source file, relative to the static folder.
+SCSS_ENTRY_POINTS = {"css/main.css": "scss/main.scss"}
+JS_ENTRY_POINTS = {"js/main.js": "js/main.js"}
+
+# One year; hashed filenames change whenever content changes.
+IMMUTABLE_MAX_AGE = 31536000
+
+
+# ------------------------------------------------------------------------------
+def _compile_scss(source: Path, include_paths: list[Path]) -> str:
+    """
+    Compile one SCSS entry point to compressed CSS.
+
+    Uses libsass when installed (fast, current Sass semantics) and falls
+    back to the pure-Python pyScss compiler from requirements.txt.
+    """
+    try:
+        import sass
+    except ImportError:
+        sass = None
+    if sass is not None:
+        return sass.compile(
+            filename=str(source),
+            include_paths=[str(p) for p in include_paths],
+            output_style="compressed",
+        )
+
+    from scss import Compiler
+
+    compiler = Compiler(
+        search_path=[str(p) for p in include_paths], output_style="compressed"
+    )
+    return compiler.compile(str(source))
+
+
+# ------------------------------------------------------------------------------
+def _minify_js(source: str) -> str:
+    """
+    Conservatively shrink JavaScript without a JS parser.
+
+    Only drops full-line // comments, leading indentation and blank lines,
+    which is safe for the project's hand-written scripts (no multi-line
+    template literals). Swap in a real minifier if the scripts grow.
+    """
+    lines = []
+    for line in source.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("//"):
+            continue
+        lines.append(stripped)
+    return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------------------------
+def _write_hashed(dist_dir: Path, logical: str, content: str) -> str:
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    stem, ext = os.path.splitext(logical)
+    relative = f"{stem}.{digest}{ext}"
+    target = dist_dir / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.exists():
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+    return f"{DIST_DIRNAME}/{relative}"
+
+
+# ------------------------------------------------------------------------------
+def build_assets(static_folder: str | Path) -> dict[str, str]:
+    """
+    Compile SCSS and minify JS into content-hashed files plus a manifest.
+
+    Output goes to <static>/dist/ and the manifest maps logical names such
+    as "css/main.css" to their hashed paths relative to the static folder.
+    Stale hashed files from earlier builds are removed.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    static_dir = Path(static_folder)
+    dist_dir = static_dir / DIST_DIRNAME
+    dist_dir.mkdir(exist_ok=True)
+    include_paths = [static_dir / "scss", static_dir]
+
+    manifest: dict[str, str] = {}
+    for logical, source in SCSS_ENTRY_POINTS.items():
+        css = _compile_scss(static_dir / source, include_paths)
+        manifest[logical] = _write_hashed(dist_dir, logical, css)
+    for logical, source in JS_ENTRY_POINTS.items():
+        js = _minify_js((static_dir / source).read_text(encoding="utf-8"))
+        manifest[logical] = _write_hashed(dist_dir, logical, js)
+
+    keep = {static_dir / path for path in manifest.values()}
+    for stale in dist_dir.rglob("*.*"):
+        if stale.name != MANIFEST_NAME and stale not in keep:
+            stale.unlink()
+
+    tmp = dist_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, dist_dir / MANIFEST_NAME)
+    return manifest
+
+
+# ------------------------------------------------------------------------------
+class AssetManifest:
+    """
+    Resolve logical asset names to hashed, cacheable static URLs.
+
+    Exposes asset_url() to templates. The manifest is read once at startup
+    and only used when runtime SCSS compilation is off; in development,
+    logical names resolve to the unhashed paths Flask-Scss keeps current.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, str] = {}
+        self._path: Path | None = None
+
+    def init_app(self, app: Flask) -> None:
+        self._path = Path(app.static_folder) / DIST_DIRNAME / MANIFEST_NAME
+        if not app.config["ASSETS_RUNTIME_SCSS"]:
+            self._load()
+        if not self._entries and not app.config["ASSETS_RUNTIME_SCSS"]:
+            log.warning(
+                "No asset manifest at %s; run `flask assets-build` before "
+                "serving with runtime SCSS disabled.",
+                self._path,
+            )
+        app.extensions["asset_manifest"] = self
+        app.jinja_env.globals["asset_url"] = self.url
+        dist_prefix = f"{app.static_url_path}/{DIST_DIRNAME}/"
+
+        @app.after_request
+        def cache_hashed_assets(response: Response) -> Response:
+            # Hashed files never change in place, so they can be cached
+            # indefinitely by browsers and CDNs.
+            if request.path.startswith(dist_prefix) and response.status_code == 200:
+                response.cache_control.no_cache = None
+                response.cache_control.public = True
+                response.cache_control.max_age = IMMUTABLE_MAX_AGE
+                response.cache_control.immutable = True
+            return response
+
+    def _load(self) -> None:
+        try:
+            self._entries = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def resolve(self, logical: str) -> str:
+        return self._entries.get(logical, logical)
+
+    def url(self, logical: str) -> str:
+        return url_for("static", filename=self.resolve(logical))
+
+
+# ------------------------------------------------------------------------------
+# Shared instance, configured by init_app() in create_app.
+asset_manifest = AssetManifest()
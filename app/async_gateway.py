@@ -0,0 +1,762 @@
+#!/usr/bin/env python3
+# app/async_gateway.py - (./app/async_gateway.py)
+# ASGI integration gateway on an asyncio event loop, with the Flask UI mounted.
+
+import asyncio
+import itertools
+import json
+import logging
+import ssl
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from flask import Flask
+
+from .circuit_breaker import Permit, UpstreamUnavailable
+from .gateway import (
+    STRIPPED_REQUEST_HEADERS,
+    STRIPPED_RESPONSE_HEADERS,
+    GatewayRoute,
+    IntegrationGateway,
+    auth_headers,
+    choose_route,
+    may_forward,
+    parse_roles,
+)
+from .integration_index import MISS_RECHECK_SECONDS
+from .metrics import metrics
+from .rate_limit import RateLimit, rate_limiter
+from .response_cache import (
+    CONDITIONAL_HEADERS,
+    CachedResponse,
+    cache_key,
+    request_directive,
+    storable,
+)
+
+try:  # Optional dependency: pip install httpx
+    import httpx
+except ImportError:  # pragma: no cover - depends on environment
+    httpx = None
+
+log = logging.getLogger(__name__)
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+# Target connections per httpx client when ASYNC_GATEWAY_POOL_SHARDS is 0.
+POOL_SHARD_SIZE = 32
+
+# Request headers passed through as-is; Content-Length is kept because the
+# async client streams the body with the length the caller declared.
+_FORWARDED_LENGTH = b"content-length"
+
+
+# ------------------------------------------------------------------------------
+class AsyncIntegrationGateway:
+    """
+    Forward GATEWAY_PREFIX traffic with httpx on the event loop.
+
+    Routing reuses the synchronous gateway's RouteTrie and refresh logic,
+    so both modes serve the same integrations from the same config. Only
+    the occasional index refresh and cold user lookups touch the database,
+    and those run in a worker thread. Everything else runs on the loop:
+    one slow upstream costs a coroutine, not a thread.
+
+    Request bodies are streamed upstream from ASGI receive() messages.
+    Responses are relayed with aiter_raw() as bytes arrive, so SSE and
+    chunked responses keep their pacing and memory stays bounded.
+
+    The connection budget is split across several httpx clients used
+    round-robin. httpcore scans every pooled connection on each request,
+    so one pool of thousands of connections costs time quadratic in load.
+    Shards of about POOL_SHARD_SIZE connections keep that cost flat.
+
+    The response cache and the per-upstream circuit breakers are shared
+    with the synchronous gateway; only the cache's single-flight waits
+    differ, using asyncio events on this loop. Callers are authorized per
+    integration exactly as in IntegrationGateway.dispatch().
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(self, flask_app: Flask, index: IntegrationGateway) -> None:
+        config = flask_app.config
+        self.flask_app = flask_app
+        self.index = index
+        self.prefix = config["GATEWAY_PREFIX"].rstrip("/")
+        self.api_key_header = config["GATEWAY_API_KEY_HEADER"]
+        self.require_login = config["GATEWAY_REQUIRE_LOGIN"]
+        self.trusted_roles = parse_roles(config["GATEWAY_TRUSTED_ROLES"])
+        self.proxy_hops = config["TRUSTED_PROXY_HOPS"]
+        self.timeout = config["GATEWAY_TIMEOUT"]
+        self.max_connections = config["ASYNC_GATEWAY_MAX_CONNECTIONS"]
+        self.max_keepalive = config["ASYNC_GATEWAY_MAX_KEEPALIVE"]
+        self.shards = config["ASYNC_GATEWAY_POOL_SHARDS"] or max(
+            1, -(-self.max_connections // POOL_SHARD_SIZE)
+        )
+        self.clients: "list[httpx.AsyncClient]" = []
+        self._next_client = itertools.count()
+        self.cache = index.cache
+        self.breakers = index.breakers
+        self._flights: dict[str, asyncio.Event] = {}
+        self._refresh_lock = asyncio.Lock()
+        self._limits_lock = asyncio.Lock()
+        self._default_limits: dict[str, RateLimit | None] = {}
+        self._limits_loaded = float("-inf")
+        self.forwarded = 0
+        self.upstream_errors = 0
+        self.in_flight = 0
+
+    # -- lifecycle -----------------------------------------------------------
+
+    @property
+    def started(self) -> bool:
+        return bool(self.clients)
+
+    async def startup(self) -> None:
+        limits = httpx.Limits(
+            max_connections=max(1, -(-self.max_connections // self.shards)),
+            max_keepalive_connections=max(1, -(-self.max_keepalive // self.shards)),
+        )
+        # One CA bundle load for all shards; it costs tens of ms per context.
+        tls = ssl.create_default_context()
+        await asyncio.to_thread(self._load_limits_sync)
+        self.clients = [
+            httpx.AsyncClient(
+                verify=tls,
+                timeout=httpx.Timeout(self.timeout),
+                limits=limits,
+                follow_redirects=False,
+            )
+            for _ in range(self.shards)
+        ]
+
+    async def shutdown(self) -> None:
+        clients, self.clients = self.clients, []
+        for client in clients:
+            await client.aclose()
+
+    def client(self) -> "httpx.AsyncClient":
+        return self.clients[next(self._next_client) % len(self.clients)]
+
+    def handles(self, path: str) -> bool:
+        return path.startswith(self.prefix + "/")
+
+    # -- database-backed helpers (run in a worker thread) --------------------
+
+    def _refresh_sync(self, max_age: float | None) -> bool:
+        with self.flask_app.app_context():
+            return self.index.refresh(max_age)
+
+    def _load_limits_sync(self) -> None:
+        with self.flask_app.app_context():
+            self._default_limits = rate_limiter.default_limits()
+        self._limits_loaded = time.monotonic()
+
+    async def _limits(self) -> dict[str, RateLimit | None]:
+        """
+        Default rate limits, re-read every check_interval seconds.
+
+        They can change through SiteSettings, which needs an app context,
+        so the reload runs in a worker thread, independent of the index.
+        """
+        if self._limits_due():
+            async with self._limits_lock:
+                if self._limits_due():
+                    await asyncio.to_thread(self._load_limits_sync)
+        return self._default_limits
+
+    def _limits_due(self) -> bool:
+        return time.monotonic() - self._limits_loaded >= self.index.check_interval
+
+    async def _refresh(self, max_age: float | None = None) -> bool:
+        async with self._refresh_lock:
+            if not self.index.due(max_age):
+                return False
+            return await asyncio.to_thread(self._refresh_sync, max_age)
+
+    def _caller_sync(self, user_id: int) -> tuple[int, str | None] | None:
+        from .user_cache import load_cached_user
+
+        with self.flask_app.app_context():
+            return _caller(load_cached_user(user_id))
+
+    async def _authenticated(self, scope: Scope) -> tuple[int, str | None] | None:
+        """(user id, role name) from the Flask session cookie, if logged in."""
+        from .user_cache import user_cache
+
+        cookie_name = self.flask_app.config["SESSION_COOKIE_NAME"]
+        raw = None
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                for part in value.decode("latin-1").split(";"):
+                    key, _, morsel = part.strip().partition("=")
+                    if key == cookie_name:
+                        raw = morsel
+        if not raw:
+            return None
+        interface = self.flask_app.session_interface
+        serializer = interface.get_signing_serializer(self.flask_app)
+        try:
+            session = serializer.loads(
+                raw,
+                max_age=int(
+                    self.flask_app.permanent_session_lifetime.total_seconds()
+                ),
+            )
+            user_id = int(session["_user_id"])
+        except Exception:
+            return None
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            return _caller(cached)
+        return await asyncio.to_thread(self._caller_sync, user_id)
+
+    # -- request handling ----------------------------------------------------
+
+    async def _resolve(self, path: str) -> dict[str, GatewayRoute] | None:
+        if self.index.due():
+            await self._refresh()
+        routes = self.index.trie.match(path)
+        if routes is None and await self._refresh(MISS_RECHECK_SECONDS):
+            routes = self.index.trie.match(path)
+        return routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Latency is measured to the response headers, as the WSGI gateway's
+        # after_request hook sees it, so streamed bodies do not inflate it.
+        started = time.perf_counter()
+        status, elapsed = 500, None
+
+        async def tracked_send(message: dict) -> None:
+            nonlocal status, elapsed
+            if message["type"] == "http.response.start":
+                status, elapsed = message["status"], time.perf_counter() - started
+            await send(message)
+
+        integration_id = None
+        try:
+            integration_id = await self._handle(scope, receive, tracked_send)
+        finally:
+            if elapsed is None:
+                elapsed = time.perf_counter() - started
+            metrics.observe("gateway", status, elapsed, integration_id)
+
+    async def _handle(self, scope: Scope, receive: Receive, send: Send) -> int | None:
+        """Answer one gateway request; returns the integration it routed to."""
+        caller = None
+        if self.require_login:
+            caller = await self._authenticated(scope)
+            if caller is None:
+                return await _send_json(send, 401, {"error": "Login required"})
+        path = scope["path"][len(self.prefix):] or "/"
+        routes = await self._resolve(path)
+        if routes is None:
+            return await _send_json(send, 404, {"error": "No such integration"})
+        method = scope["method"]
+        route = choose_route(routes, method)
+        if route is None:
+            allow = [(b"allow", ", ".join(sorted(routes)).encode())]
+            if method == "OPTIONS":
+                return await _send_bytes(send, 204, b"", allow)
+            return await _send_json(
+                send, 405, {"error": "Method not allowed"}, allow
+            )
+        if caller is not None and not may_forward(
+            route, *caller, self.trusted_roles
+        ):
+            await _send_json(send, 403, _error("Forbidden", route))
+            return route.integration_id
+        decision = rate_limiter.check_integration(
+            route.integration_id,
+            route.owner_id,
+            route.rate_limit,
+            _client_ip(scope, self.proxy_hops),
+            await self._limits() if rate_limiter.enabled else {},
+        )
+        if not decision.allowed:
+            await _send_json(
+                send,
+                429,
+                {"error": "Rate limit exceeded", "limit": decision.scope},
+                [(b"retry-after", str(decision.retry_after_seconds).encode())],
+            )
+        else:
+            await self.forward(route, path, scope, receive, send)
+        return route.integration_id
+
+    def _upstream_headers(
+        self,
+        route: GatewayRoute,
+        scope: Scope,
+        validators: dict[str, str] | None = None,
+    ) -> list:
+        stripped = STRIPPED_REQUEST_HEADERS
+        if validators is not None:
+            stripped = stripped | CONDITIONAL_HEADERS
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name == _FORWARDED_LENGTH or name.decode("latin-1") not in stripped
+        ]
+        credentials = auth_headers(route, self.api_key_header)
+        if "Authorization" in credentials:
+            headers = [(n, v) for n, v in headers if n != b"authorization"]
+        credentials.update(validators or {})
+        headers.extend(
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in credentials.items()
+        )
+        host = dict(scope["headers"]).get(b"host", b"")
+        client = _client_ip(scope, self.proxy_hops)
+        headers.append((b"x-forwarded-for", client.encode("latin-1")))
+        headers.append((b"x-forwarded-host", host))
+        headers.append((b"x-forwarded-proto", scope.get("scheme", "http").encode()))
+        return headers
+
+    async def _open(
+        self,
+        route: GatewayRoute,
+        path: str,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        body: bytes | None = None,
+        validators: dict[str, str] | None = None,
+    ) -> "tuple[httpx.Response, Permit | None] | None":
+        """
+        Send upstream and return the streaming response with its breaker
+        permit, for _relay() to release; or reply 502/503/504 and return None.
+        """
+        url = route.base_url + path
+        if scope.get("query_string"):
+            url = f"{url}?{scope['query_string'].decode('latin-1')}"
+        headers = self._upstream_headers(route, scope, validators)
+        if body is None:
+            names = {name for name, _ in scope["headers"]}
+            length = dict(scope["headers"]).get(b"content-length", b"0")
+            if b"transfer-encoding" in names or length not in (b"", b"0"):
+                body = _receive_body(receive)
+
+        client = self.client()
+        request = client.build_request(
+            scope["method"], url, headers=headers, content=body
+        )
+        try:
+            permit = self.breakers.acquire(route.base_url)
+        except UpstreamUnavailable as exc:
+            await _send_json(
+                send,
+                503,
+                _error(str(exc), route),
+                [(b"retry-after", str(exc.retry_after_seconds).encode())],
+            )
+            return None
+        try:
+            upstream = await client.send(request, stream=True)
+        except httpx.TimeoutException:
+            failure = (504, "Upstream timed out")
+        except httpx.HTTPError as exc:
+            log.warning(
+                "Async gateway upstream error for %s: %s", route.integration_id, exc
+            )
+            failure = (502, "Upstream unreachable")
+        except BaseException:
+            if permit is not None:
+                permit.release(None)
+            raise
+        else:
+            if permit is not None:
+                permit.responded()
+            return upstream, permit
+        # Release before replying, so a slow client does not skew latency.
+        if permit is not None:
+            permit.release(None)
+        self.upstream_errors += 1
+        await _send_json(send, failure[0], _error(failure[1], route))
+        return None
+
+    @staticmethod
+    def _relayed_headers(upstream: "httpx.Response") -> list[tuple[bytes, bytes]]:
+        headers = [
+            (name.lower(), value)
+            for name, value in upstream.headers.raw
+            if name.lower().decode("latin-1") not in STRIPPED_RESPONSE_HEADERS
+        ]
+        if upstream.headers.get("content-type", "").startswith("text/event-stream"):
+            headers.append((b"x-accel-buffering", b"no"))
+        return headers
+
+    async def _relay(
+        self,
+        upstream: "httpx.Response",
+        send: Send,
+        headers: list[tuple[bytes, bytes]],
+        permit: Permit | None,
+        keep: int = 0,
+    ) -> bytes | None:
+        """
+        Stream the upstream response to the client, then release the permit
+        with its status (None if reading the body from upstream failed).
+
+        With keep > 0, also return a copy of the body if it was relayed in
+        full and fits in `keep` bytes (None otherwise).
+        """
+        kept: list[bytes] | None = [] if keep > 0 else None
+        size = 0
+        outcome = upstream.status_code
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": upstream.status_code,
+                    "headers": headers,
+                }
+            )
+            async for chunk in upstream.aiter_raw():
+                if kept is not None:
+                    size += len(chunk)
+                    if size <= keep:
+                        kept.append(chunk)
+                    else:
+                        kept = None
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+            self.forwarded += 1
+        except httpx.HTTPError:
+            outcome = None
+            raise
+        finally:
+            await upstream.aclose()
+            if permit is not None:
+                permit.release(outcome)
+        return b"".join(kept) if kept is not None else None
+
+    async def forward(
+        self,
+        route: GatewayRoute,
+        path: str,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        self.in_flight += 1
+        try:
+            if self.cache.enabled and route.cache_ttl > 0:
+                if await self.forward_cached(route, path, scope, receive, send):
+                    return
+            sent = await self._open(route, path, scope, receive, send)
+            if sent is not None:
+                upstream, permit = sent
+                await self._relay(
+                    upstream, send, self._relayed_headers(upstream), permit
+                )
+        finally:
+            self.in_flight -= 1
+
+    # -- response cache ------------------------------------------------------
+
+    async def forward_cached(
+        self,
+        route: GatewayRoute,
+        path: str,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> bool:
+        """Answer through the response cache; False if the request bypasses it."""
+        cache = self.cache
+        method = scope["method"]
+        headers = _request_headers(scope)
+        directive = request_directive(method, headers)
+        length = headers.get("content-length", "")
+        if directive is None or "transfer-encoding" in headers:
+            return False
+        if length.isdigit() and int(length) > cache.max_entry_bytes:
+            return False
+        body = None
+        if length.isdigit() and int(length) > 0:
+            body = b"".join([chunk async for chunk in _receive_body(receive)])
+        key = cache_key(
+            route,
+            method,
+            path,
+            scope.get("query_string", b"").decode("latin-1"),
+            headers,
+            body,
+        )
+
+        entry = cache.get(key)
+        if directive == "use" and entry is not None and entry.fresh(route.cache_ttl):
+            cache.record(route.integration_id, "hit")
+            await _send_cached(send, entry, "HIT", method, headers)
+            return True
+        if method == "HEAD":
+            return False
+        flight = self._flights.get(key)
+        if flight is not None:
+            cache.count_coalesced()
+            try:
+                await asyncio.wait_for(flight.wait(), self.timeout)
+            except asyncio.TimeoutError:
+                pass
+            entry = cache.get(key)
+            if entry is not None and entry.fresh(route.cache_ttl):
+                cache.record(route.integration_id, "hit")
+                await _send_cached(send, entry, "HIT", method, headers)
+                return True
+            cache.record(route.integration_id, "miss")
+            sent = await self._open(route, path, scope, receive, send, body, {})
+            if sent is not None:
+                upstream, permit = sent
+                await self._relay(
+                    upstream, send, self._relayed_headers(upstream), permit
+                )
+            return True
+
+        self._flights[key] = asyncio.Event()
+        try:
+            await self._fetch_into_cache(
+                route, path, key, entry, body, scope, receive, send
+            )
+        finally:
+            self._flights.pop(key).set()
+        return True
+
+    async def _fetch_into_cache(
+        self,
+        route: GatewayRoute,
+        path: str,
+        key: str,
+        stale: CachedResponse | None,
+        body: bytes | None,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        cache = self.cache
+        validators = stale.validators() if stale is not None else {}
+        sent = await self._open(route, path, scope, receive, send, body, validators)
+        if sent is None:
+            return
+        upstream, permit = sent
+        raw_headers = self._relayed_headers(upstream)
+        headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in raw_headers]
+
+        if upstream.status_code == 304 and stale is not None:
+            await upstream.aclose()
+            if permit is not None:
+                permit.release(304)
+            entry = stale.revalidated(headers)
+            cache.put(key, entry)
+            cache.record(route.integration_id, "revalidated")
+            await _send_cached(
+                send, entry, "REVALIDATED", scope["method"], _request_headers(scope)
+            )
+            return
+
+        cache.record(route.integration_id, "miss")
+        lowered = {name.lower(): value for name, value in headers}
+        if not storable(upstream.status_code, lowered, cache.max_entry_bytes):
+            await self._relay(upstream, send, raw_headers, permit)
+            return
+        status = upstream.status_code
+        content = await self._relay(
+            upstream,
+            send,
+            raw_headers + [(b"x-cache", b"MISS")],
+            permit,
+            keep=cache.max_entry_bytes,
+        )
+        if content is not None:
+            cache.put(key, CachedResponse(status, tuple(headers), content, time.time()))
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "forwarded": self.forwarded,
+            "upstream_errors": self.upstream_errors,
+            "cache": self.cache.stats(),
+            "breakers": self.breakers.stats(),
+        }
+
+
+# ------------------------------------------------------------------------------
+async def _receive_body(receive: Receive) -> AsyncIterator[bytes]:
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        chunk = message.get("body", b"")
+        if chunk:
+            yield chunk
+        if not message.get("more_body", False):
+            return
+
+
+# ------------------------------------------------------------------------------
+def _client_ip(scope: Scope, proxy_hops: int) -> str:
+    """Client address, trusting proxy_hops proxies as ProxyFix(x_for=...) does."""
+    if proxy_hops > 0:
+        forwarded = b",".join(
+            value for name, value in scope["headers"] if name == b"x-forwarded-for"
+        )
+        values = forwarded.decode("latin-1").split(",") if forwarded else []
+        if len(values) >= proxy_hops:
+            return values[-proxy_hops].strip()
+    client = scope.get("client") or ("", 0)
+    return client[0]
+
+
+# ------------------------------------------------------------------------------
+def _caller(user) -> tuple[int, str | None] | None:
+    """(id, role name) of an active user, else None."""
+    if user is None or not user.active:
+        return None
+    return user.id, user.role.name if user.role else None
+
+
+# ------------------------------------------------------------------------------
+def _error(message: str, route: GatewayRoute) -> dict:
+    return {"error": message, "integration_id": route.integration_id}
+
+
+# ------------------------------------------------------------------------------
+async def _send_bytes(
+    send: Send, status: int, body: bytes, headers: list | None = None
+) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-length", str(len(body)).encode())]
+            + (headers or []),
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+# ------------------------------------------------------------------------------
+async def _send_json(
+    send: Send, status: int, payload: dict, headers: list | None = None
+) -> None:
+    body = json.dumps(payload).encode()
+    await _send_bytes(
+        send, status, body, [(b"content-type", b"application/json")] + (headers or [])
+    )
+
+
+# ------------------------------------------------------------------------------
+def _request_headers(scope: Scope) -> dict[str, str]:
+    return {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in scope["headers"]
+    }
+
+
+# ------------------------------------------------------------------------------
+def _encode_headers(pairs) -> list[tuple[bytes, bytes]]:
+    return [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in pairs]
+
+
+# ------------------------------------------------------------------------------
+async def _send_cached(
+    send: Send,
+    entry: CachedResponse,
+    state: str,
+    method: str,
+    request_headers: dict[str, str],
+) -> None:
+    """Answer from a cache entry, with a 304 if the client's ETag matches."""
+    extra = [(b"age", str(int(entry.age())).encode()), (b"x-cache", state.encode())]
+    if method in ("GET", "HEAD") and entry.matches(
+        request_headers.get("if-none-match")
+    ):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 304,
+                "headers": _encode_headers(entry.not_modified_headers()) + extra,
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+        return
+    headers = [
+        pair
+        for pair in _encode_headers(entry.headers)
+        if pair[0] not in (b"content-length", b"transfer-encoding")
+    ]
+    headers.append((b"content-length", str(len(entry.body)).encode()))
+    await send(
+        {"type": "http.response.start", "status": entry.status, "headers": headers + extra}
+    )
+    await send(
+        {"type": "http.response.body", "body": b"" if method == "HEAD" else entry.body}
+    )
+
+
+# ------------------------------------------------------------------------------
+def _wsgi_bridge(flask_app: Flask):
+    """Wrap the Flask app for ASGI using whichever adapter is installed."""
+    workers = flask_app.config["ASGI_UI_THREADS"]
+    try:
+        from a2wsgi import WSGIMiddleware
+    except ImportError:
+        try:
+            from uvicorn.middleware.wsgi import WSGIMiddleware
+        except ImportError as exc:
+            raise RuntimeError(
+                "ASGI mode needs a WSGI adapter: pip install a2wsgi (or uvicorn)"
+            ) from exc
+    return WSGIMiddleware(flask_app, workers=workers)
+
+
+# ------------------------------------------------------------------------------
+def create_asgi_app(flask_app: Flask) -> Callable[[Scope, Receive, Send], Awaitable[None]]:
+    """
+    Build the ASGI application served by asgi.py.
+
+    Requests under GATEWAY_PREFIX go to AsyncIntegrationGateway on the event
+    loop. Everything else (the admin/developer/operator UI, static files,
+    /api modules) is handed to the unchanged Flask app through a WSGI
+    adapter running on a small thread pool. The lifespan protocol opens and
+    closes the shared httpx client.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    if httpx is None:
+        raise RuntimeError("ASGI mode needs the async HTTP client: pip install httpx")
+    ui = _wsgi_bridge(flask_app)
+    index = flask_app.extensions.get("gateway")
+    gateway = AsyncIntegrationGateway(flask_app, index) if index else None
+    if gateway is not None:
+        flask_app.extensions["async_gateway"] = gateway
+
+    async def application(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    if gateway is not None:
+                        await gateway.startup()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    if gateway is not None:
+                        await gateway.shutdown()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] == "http" and gateway is not None and gateway.handles(
+            scope["path"]
+        ):
+            if not gateway.started:  # servers without lifespan support
+                await gateway.startup()
+            return await gateway(scope, receive, send)
+        return await ui(scope, receive, send)
+
+    return application
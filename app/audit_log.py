@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+# app/audit_log.py - (./app/audit_log.py)
+# Append-only change log for integrations, user roles and site settings.
+
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+from itertools import takewhile
+from typing import Any, Iterable
+
+from flask import Flask, g, has_request_context
+from sqlalchemy import delete, event, insert, inspect, select, tuple_
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import ApiIntegration, AuditDailySummary, AuditEvent, SiteSetting, User
+from .queries import KeysetPage, keyset_paginate
+
+log = logging.getLogger(__name__)
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+# Audited models: entity type, the columns whose edits are logged, and the
+# column used as the label of create/delete events. Probe results,
+# timestamps and password hashes are deliberately not logged.
+AUDITED = {
+    ApiIntegration: (
+        "integration",
+        (
+            "name", "system_name", "base_url", "endpoint_path", "http_method",
+            "status", "auth_type", "api_key", "notes", "owner_id",
+            "docusaurus_doc_path", "cache_ttl", "rate_limit",
+            "scaffold_approved_sha256",
+        ),
+        "name",
+    ),
+    User: ("user", ("role_id",), "email"),
+    SiteSetting: ("setting", ("value",), "key"),
+}
+
+# Changes to these are logged without their values.
+SECRET_FIELDS = frozenset({"api_key"})
+REDACTED = "[redacted]"
+
+# session.info key holding captured events until the commit.
+_EVENTS_KEY = "audit_log_events"
+
+# Raw events rolled up per compaction transaction.
+_COMPACT_BATCH = 5000
+
+# Summary keys looked up per query while merging a compaction batch.
+_KEY_CHUNK = 500
+
+
+# ------------------------------------------------------------------------------
+class AuditLog:
+    """
+    Buffers change events and appends them to audit_events in batches.
+
+    Mapper events capture who changed what (see AUDITED) during each
+    flush; when the session commits, its events are handed to this
+    buffer and the request carries on without another INSERT. A
+    background thread writes the buffer every AUDIT_FLUSH_INTERVAL
+    seconds, or as soon as AUDIT_BATCH_SIZE events are waiting, as one
+    multi-row insert. Rolled-back changes are never logged. Events still
+    buffered are written at interpreter exit; a process that is killed
+    loses at most one interval. AUDIT_FLUSH_INTERVAL = 0 writes each
+    commit's events on the committing thread instead.
+
+    compact() rolls events older than AUDIT_RETENTION_DAYS up into
+    AuditDailySummary rows; the sweep scheduler calls it every
+    AUDIT_COMPACT_INTERVAL seconds.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.flush_interval = 1.0
+        self.batch_size = 500
+        self.retention_days = 90
+        self.app: Flask | None = None
+        self.written = 0
+        self._pending: list[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._atexit = False
+
+    def init_app(self, app: Flask) -> None:
+        self.app = app
+        self.enabled = app.config["AUDIT_LOG_ENABLED"]
+        self.flush_interval = app.config["AUDIT_FLUSH_INTERVAL"]
+        self.batch_size = app.config["AUDIT_BATCH_SIZE"]
+        self.retention_days = app.config["AUDIT_RETENTION_DAYS"]
+        if not self._atexit:
+            atexit.register(self.stop)
+            self._atexit = True
+        app.extensions["audit_log"] = self
+
+    # -- buffering -----------------------------------------------------------
+
+    def record(self, events: list[dict]) -> None:
+        """Queue events (AuditEvent column dicts) for the next batch."""
+        if self.app is None or not events:
+            return
+        with self._lock:
+            self._pending.extend(events)
+            full = len(self._pending) >= self.batch_size
+            if self._worker is None and self.flush_interval > 0:
+                self._stop.clear()
+                self._worker = threading.Thread(
+                    target=self._run, name="audit-log", daemon=True
+                )
+                self._worker.start()
+        if self.flush_interval <= 0:
+            try:
+                self.flush()
+            except Exception:  # The change is committed; retry next time.
+                log.exception("Audit log flush failed")
+        elif full:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            stopping = self._stop.is_set()
+            try:
+                self.flush()
+            except Exception:  # Keep the thread alive; events are re-queued.
+                log.exception("Audit log flush failed")
+            if stopping:
+                return
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of events."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            try:
+                # Its own connection: this may run inside the committing
+                # session's after_commit hook.
+                with self.app.app_context(), db.engine.begin() as connection:
+                    for start in range(0, len(pending), self.batch_size):
+                        connection.execute(
+                            insert(AuditEvent.__table__),
+                            pending[start : start + self.batch_size],
+                        )
+            except Exception:
+                with self._lock:
+                    self._pending = pending + self._pending
+                raise
+            self.written += len(pending)
+            return len(pending)
+
+    def stop(self) -> None:
+        """Write buffered events and stop the background thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=10)
+            self._worker = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "written": self.written,
+        }
+
+    # -- compaction ----------------------------------------------------------
+
+    def compact(self, now: datetime | None = None) -> dict[str, int]:
+        """
+        Roll events older than retention_days into daily summaries.
+
+        Works through the log in id order, _COMPACT_BATCH events per
+        transaction: each batch is merged into AuditDailySummary rows
+        (one per entity, day, action and field) and deleted in the same
+        commit, so a crash never loses or double-counts events. Ids are
+        assigned in time order, so the scan stops at the first event
+        inside the retention window and never reads the recent log.
+        Needs an app context. Returns {"events": n, "summaries": n}.
+
+        Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+        Modified:  2026-10-17
+        """
+        now = now or datetime.utcnow()
+        cutoff = datetime.combine(
+            now.date() - timedelta(days=self.retention_days), datetime.min.time()
+        )
+        table = AuditEvent.__table__
+        totals = {"events": 0, "summaries": 0}
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                select(table)
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(_COMPACT_BATCH)
+            ).all()
+            expired = list(takewhile(lambda row: row.occurred_at < cutoff, rows))
+            if not expired:
+                db.session.rollback()
+                break
+            totals["summaries"] += _merge_summaries(expired)
+            db.session.execute(
+                delete(table).where(table.c.id.between(expired[0].id, expired[-1].id))
+            )
+            db.session.commit()
+            totals["events"] += len(expired)
+            if len(expired) < len(rows) or len(rows) < _COMPACT_BATCH:
+                break
+            last_id = expired[-1].id
+        return totals
+
+
+# ------------------------------------------------------------------------------
+def _merge_summaries(rows: list) -> int:
+    """Add a batch of events to the daily summaries; returns rows touched."""
+    groups: dict[tuple, dict] = {}
+    for row in rows:
+        key = (row.entity_type, row.entity_id, row.occurred_at.date(), row.action,
+               row.field or "")
+        summary = groups.get(key)
+        if summary is None:
+            groups[key] = {
+                "entity_type": key[0],
+                "entity_id": key[1],
+                "day": key[2],
+                "action": key[3],
+                "field": key[4],
+                "event_count": 1,
+                "first_at": row.occurred_at,
+                "last_at": row.occurred_at,
+                "last_actor_id": row.actor_id,
+                "first_old_value": row.old_value,
+                "last_new_value": row.new_value,
+            }
+        else:
+            summary["event_count"] += 1
+            summary["last_at"] = row.occurred_at
+            summary["last_actor_id"] = row.actor_id
+            summary["last_new_value"] = row.new_value
+
+    key_columns = (
+        AuditDailySummary.entity_type,
+        AuditDailySummary.entity_id,
+        AuditDailySummary.day,
+        AuditDailySummary.action,
+        AuditDailySummary.field,
+    )
+    keys = list(groups)
+    for start in range(0, len(keys), _KEY_CHUNK):
+        existing = db.session.scalars(
+            select(AuditDailySummary).where(
+                tuple_(*key_columns).in_(keys[start : start + _KEY_CHUNK])
+            )
+        )
+        for summary in existing:
+            batch = groups.pop(
+                (summary.entity_type, summary.entity_id, summary.day,
+                 summary.action, summary.field)
+            )
+            summary.event_count += batch["event_count"]
+            summary.last_at = batch["last_at"]
+            summary.last_actor_id = batch["last_actor_id"]
+            summary.last_new_value = batch["last_new_value"]
+    if groups:
+        db.session.execute(insert(AuditDailySummary), list(groups.values()))
+    return len(keys)
+
+
+# ------------------------------------------------------------------------------
+def audit_events_page(
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    actor_id: int | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = 50,
+) -> KeysetPage:
+    """
+    One keyset page of audit events, newest first.
+
+    Filtering by entity or by actor seeks into ix_audit_events_entity_id
+    or ix_audit_events_actor_id, so every page costs the same however
+    long the log grows.
+    """
+    stmt = select(AuditEvent)
+    if entity_type:
+        stmt = stmt.where(AuditEvent.entity_type == entity_type)
+    if entity_id is not None:
+        stmt = stmt.where(AuditEvent.entity_id == entity_id)
+    if actor_id is not None:
+        stmt = stmt.where(AuditEvent.actor_id == actor_id)
+    return keyset_paginate(
+        stmt,
+        (AuditEvent.id,),
+        after=after,
+        before=before,
+        limit=max(limit, 1),
+        descending=True,
+    )
+
+
+# ------------------------------------------------------------------------------
+def audit_daily_summaries(
+    entity_type: str, entity_id: int, limit: int = 90
+) -> list[AuditDailySummary]:
+    """Most recent compacted days of history for one entity."""
+    return list(
+        db.session.scalars(
+            select(AuditDailySummary)
+            .where(
+                AuditDailySummary.entity_type == entity_type,
+                AuditDailySummary.entity_id == entity_id,
+            )
+            .order_by(AuditDailySummary.day.desc(), AuditDailySummary.id)
+            .limit(limit)
+        )
+    )
+
+
+# ------------------------------------------------------------------------------
+def stage_events(session: Session, events: Iterable[dict]) -> None:
+    """
+    Log changes made with Core or bulk statements, which bypass the mapper
+    events. Each dict needs entity_type, entity_id and action, and may give
+    field, old_value and new_value; the events are written if and when the
+    session commits.
+
+    Example:
+        stage_events(db.session, [{"entity_type": "integration",
+                                   "entity_id": 7, "action": CREATE}])
+    """
+    if not audit_log.enabled or audit_log.app is None:
+        return
+    base = {"occurred_at": datetime.utcnow(), "actor_id": _actor_id(),
+            "field": None, "old_value": None, "new_value": None}
+    session.info.setdefault(_EVENTS_KEY, []).extend(
+        {**base, **values} for values in events
+    )
+
+
+# ------------------------------------------------------------------------------
+def _actor_id() -> int | None:
+    # Only a user Flask-Login already loaded for this request; loading one
+    # here would query the database in the middle of a flush.
+    if not has_request_context():
+        return None
+    user = g.get("_login_user")
+    if user is None or not user.is_authenticated:
+        return None
+    return user.id
+
+
+# ------------------------------------------------------------------------------
+def _text(field: str, value: Any) -> str | None:
+    if value is None:
+        return None
+    if field in SECRET_FIELDS:
+        return REDACTED
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+# ------------------------------------------------------------------------------
+def _capture(target, action: str) -> None:
+    session = Session.object_session(target)
+    if session is None or not audit_log.enabled or audit_log.app is None:
+        return
+    entity_type, fields, label = AUDITED[type(target)]
+    state = inspect(target)
+    base = {
+        "occurred_at": datetime.utcnow(),
+        "actor_id": _actor_id(),
+        "entity_type": entity_type,
+        "entity_id": target.id,
+        "action": action,
+    }
+    if action == UPDATE:
+        events = []
+        for field in fields:
+            history = state.attrs[field].history
+            if not history.has_changes():
+                continue
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+            if old != new:
+                events.append(
+                    {**base, "field": field, "old_value": _text(field, old),
+                     "new_value": _text(field, new)}
+                )
+    else:
+        # From the instance dict: no lazy load for a row being deleted.
+        value = _text(label, state.dict.get(label))
+        events = [
+            {**base, "field": None,
+             "old_value": value if action == DELETE else None,
+             "new_value": value if action == CREATE else None}
+        ]
+    if events:
+        session.info.setdefault(_EVENTS_KEY, []).extend(events)
+
+
+# ------------------------------------------------------------------------------
+def _register(model) -> None:
+    @event.listens_for(model, "after_insert")
+    def _created(mapper, connection, target) -> None:
+        _capture(target, CREATE)
+
+    @event.listens_for(model, "after_update")
+    def _updated(mapper, connection, target) -> None:
+        _capture(target, UPDATE)
+
+    @event.listens_for(model, "after_delete")
+    def _deleted(mapper, connection, target) -> None:
+        _capture(target, DELETE)
+
+
+for _model in AUDITED:
+    _register(_model)
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_commit")
+def _record_after_commit(session: Session) -> None:
+    events = session.info.pop(_EVENTS_KEY, None)
+    if events:
+        audit_log.record(events)
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session: Session) -> None:
+    session.info.pop(_EVENTS_KEY, None)
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+audit_log = AuditLog()
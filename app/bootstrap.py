@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# app/bootstrap.py - (./app/bootstrap.py)
+# Database migration and seeding on first boot, guarded across workers.
+
+import contextlib
+import logging
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+
+from .extensions import db
+from .migrations import head_version, schema_version, upgrade
+from .models import SiteSettingsVersion, seed_initial_data
+
+try:  # POSIX only; elsewhere concurrent first boots rely on seed idempotency.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------------------------
+@contextlib.contextmanager
+def init_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive, blocking file lock for the duration of the block."""
+    if fcntl is None:
+        yield
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+# ------------------------------------------------------------------------------
+def database_ready() -> bool:
+    """
+    Cheaply check whether migrations and seeding already happened.
+
+    A single query reads the schema version and confirms the seed
+    sentinel row exists; a missing table (new database) means not ready.
+    """
+    seeded = select(SiteSettingsVersion.id).where(SiteSettingsVersion.id == 1)
+    try:
+        version = db.session.execute(
+            select(schema_version.c.version).where(
+                schema_version.c.id == 1, seeded.exists()
+            )
+        ).scalar()
+    except DBAPIError:
+        db.session.rollback()
+        return False
+    return version is not None and version >= head_version()
+
+
+# ------------------------------------------------------------------------------
+def init_database(lock_path: str, force: bool = False) -> bool:
+    """
+    Apply pending migrations, seed roles/admin and build the search index.
+
+    Workers that boot together serialize on a file lock and re-check
+    readiness after acquiring it, so only the first one does the work and
+    the rest skip the password hash and DDL. Returns True if this call
+    initialized or upgraded the database.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    from .search import ensure_search_index
+
+    if not force and database_ready():
+        return False
+    with init_lock(lock_path):
+        db.session.rollback()
+        if not force and database_ready():
+            return False
+        log.info("Migrating database schema and seeding data")
+        upgrade()
+        seed_initial_data()
+        ensure_search_index()
+    return True
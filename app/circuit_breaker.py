@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+# app/circuit_breaker.py - (./app/circuit_breaker.py)
+# Per-upstream circuit breakers and AIMD concurrency limits for the gateway.
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from flask import Flask
+from sqlalchemy import func, select, update
+
+from .audit_log import UPDATE, stage_events
+from .extensions import db
+from .models import ApiIntegration
+
+log = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# last_error written when a breaker moves an integration to "error".
+OPEN_ERROR = "Circuit breaker open: upstream failing or too slow"
+
+# SQLite limits bound parameters per statement; base_url lists are chunked.
+_URL_CHUNK = 500
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class BreakerPolicy:
+    """Thresholds shared by every upstream's breaker, from CIRCUIT_* config."""
+
+    window_seconds: float = 10.0
+    window_buckets: int = 10
+    min_requests: int = 20
+    error_rate: float = 0.5
+    slow_call_seconds: float = 5.0
+    slow_call_rate: float = 0.8
+    open_seconds: float = 30.0
+    half_open_probes: int = 3
+    max_concurrency: int = 64
+    min_concurrency: int = 1
+    backoff: float = 0.5
+
+    @classmethod
+    def from_config(cls, config) -> "BreakerPolicy":
+        return cls(
+            window_seconds=config["CIRCUIT_WINDOW_SECONDS"],
+            min_requests=config["CIRCUIT_MIN_REQUESTS"],
+            error_rate=config["CIRCUIT_ERROR_RATE"],
+            slow_call_seconds=config["CIRCUIT_SLOW_CALL_SECONDS"],
+            slow_call_rate=config["CIRCUIT_SLOW_CALL_RATE"],
+            open_seconds=config["CIRCUIT_OPEN_SECONDS"],
+            half_open_probes=config["CIRCUIT_HALF_OPEN_PROBES"],
+            max_concurrency=config["CIRCUIT_MAX_CONCURRENCY"],
+            min_concurrency=config["CIRCUIT_MIN_CONCURRENCY"],
+            backoff=config["CIRCUIT_BACKOFF"],
+        )
+
+
+# ------------------------------------------------------------------------------
+class UpstreamUnavailable(Exception):
+    """Raised by acquire() when a request must not be sent upstream."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after))
+
+
+# ------------------------------------------------------------------------------
+class Permit:
+    """One admitted upstream call; release() it with the outcome."""
+
+    __slots__ = ("breaker", "started", "probe", "latency", "released")
+
+    def __init__(self, breaker: "UpstreamBreaker", started: float, probe: bool) -> None:
+        self.breaker = breaker
+        self.started = started
+        self.probe = probe
+        self.latency: float | None = None
+        self.released = False
+
+    def responded(self) -> None:
+        """Note that response headers arrived; slowness is judged up to here."""
+        self.latency = time.monotonic() - self.started
+
+    def release(self, status: int | None) -> None:
+        """
+        Record the outcome once the body is done: the upstream status, or
+        None for a timeout or network error, including one mid-body.
+        Later calls are ignored.
+        """
+        if self.released:
+            return
+        self.released = True
+        self.breaker.release(self, status)
+
+
+# ------------------------------------------------------------------------------
+class UpstreamBreaker:
+    """
+    Circuit breaker and adaptive concurrency limit for one base_url.
+
+    Outcomes land in a rolling window of time buckets. Once the window
+    holds min_requests calls and the share of errors (network failures,
+    timeouts, 5xx) or of calls slower than slow_call_seconds crosses its
+    threshold, the breaker opens and calls fail fast. After open_seconds
+    it goes half-open and admits half_open_probes live requests: if they
+    all succeed it closes, and any failure re-opens it.
+
+    While closed, concurrent calls are capped by an AIMD limit. Every
+    healthy response adds 1/limit (about +1 per round of calls), and an
+    error, a 429 or a slow call multiplies it by `backoff`, at most once
+    per round: only calls started after the last cut can cut again. A
+    slowing upstream therefore gets fewer workers quickly, and regains
+    them gradually as it recovers. A slot is held until the response body
+    has been relayed, so open streams count against the limit and a body
+    that fails midway counts as an error. Slowness is judged on the time
+    to response headers, so a long, healthy stream is not a slow call.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(self, base_url: str, policy: BreakerPolicy, on_transition=None) -> None:
+        self.base_url = base_url
+        self.policy = policy
+        self.on_transition = on_transition
+        self.state = CLOSED
+        self.limit = float(policy.max_concurrency)
+        self.in_flight = 0
+        self.trips = 0
+        self.shed = 0
+        self._opened_at = 0.0
+        self._last_cut = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._bucket_seconds = policy.window_seconds / policy.window_buckets
+        size = policy.window_buckets
+        # Per bucket: [epoch, calls, errors, slow calls, latency sum].
+        self._window = [[-1, 0, 0, 0, 0.0] for _ in range(size)]
+        self._lock = threading.Lock()
+
+    # -- admission -----------------------------------------------------------
+
+    def acquire(self) -> Permit:
+        """Admit one call or raise UpstreamUnavailable."""
+        now = time.monotonic()
+        with self._lock:
+            probe = False
+            if self.state == OPEN:
+                wait = self._opened_at + self.policy.open_seconds - now
+                if wait > 0:
+                    self.shed += 1
+                    raise UpstreamUnavailable("Upstream circuit open", wait)
+                self._set_state(HALF_OPEN)
+                self._probes = self._probe_successes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.policy.half_open_probes:
+                    self.shed += 1
+                    raise UpstreamUnavailable("Upstream circuit half-open", 1.0)
+                self._probes += 1
+                probe = True
+            elif self.in_flight >= max(self.policy.min_concurrency, int(self.limit)):
+                self.shed += 1
+                raise UpstreamUnavailable("Upstream concurrency limit reached", 1.0)
+            self.in_flight += 1
+        return Permit(self, now, probe)
+
+    def release(self, permit: Permit, status: int | None) -> None:
+        now = time.monotonic()
+        latency = permit.latency if permit.latency is not None else now - permit.started
+        failed = status is None or status >= 500
+        slow = latency > self.policy.slow_call_seconds
+        overloaded = failed or slow or status == 429
+        with self._lock:
+            self.in_flight -= 1
+            self._record(now, failed, slow, latency)
+            if overloaded:
+                if permit.started >= self._last_cut:
+                    self.limit = max(
+                        float(self.policy.min_concurrency), self.limit * self.policy.backoff
+                    )
+                    self._last_cut = now
+            elif self.in_flight * 2 >= self.limit:
+                # Only grow while the limit is actually being used.
+                self.limit = min(
+                    float(self.policy.max_concurrency), self.limit + 1.0 / self.limit
+                )
+
+            if self.state == HALF_OPEN and permit.probe:
+                if failed or slow:
+                    self._trip(now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.policy.half_open_probes:
+                        self._reset_window()
+                        self.limit = max(self.limit, float(self.policy.half_open_probes))
+                        self._set_state(CLOSED)
+            elif self.state == CLOSED and (failed or slow) and self._should_trip(now):
+                self._trip(now)
+
+    # -- rolling window ------------------------------------------------------
+
+    def _bucket(self, now: float) -> list:
+        epoch = int(now / self._bucket_seconds)
+        bucket = self._window[epoch % len(self._window)]
+        if bucket[0] != epoch:
+            bucket[:] = [epoch, 0, 0, 0, 0.0]
+        return bucket
+
+    def _record(self, now: float, failed: bool, slow: bool, latency: float) -> None:
+        bucket = self._bucket(now)
+        bucket[1] += 1
+        bucket[2] += failed
+        bucket[3] += slow
+        bucket[4] += latency
+
+    def _totals(self, now: float) -> tuple[int, int, int, float]:
+        oldest = int(now / self._bucket_seconds) - len(self._window) + 1
+        calls = errors = slow = 0
+        latency = 0.0
+        for epoch, n, e, s, total in self._window:
+            if epoch >= oldest:
+                calls += n
+                errors += e
+                slow += s
+                latency += total
+        return calls, errors, slow, latency
+
+    def _reset_window(self) -> None:
+        for bucket in self._window:
+            bucket[:] = [-1, 0, 0, 0, 0.0]
+
+    def _should_trip(self, now: float) -> bool:
+        calls, errors, slow, _ = self._totals(now)
+        if calls < self.policy.min_requests:
+            return False
+        return (
+            errors / calls >= self.policy.error_rate
+            or slow / calls >= self.policy.slow_call_rate
+        )
+
+    # -- state changes -------------------------------------------------------
+
+    def _trip(self, now: float) -> None:
+        self._opened_at = now
+        if self.state != OPEN:
+            self.trips += 1
+            self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        previous, self.state = self.state, state
+        log.info("Circuit for %s: %s -> %s", self.base_url, previous, state)
+        if self.on_transition is not None:
+            self.on_transition(self.base_url, previous, state)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls, errors, slow, latency = self._totals(time.monotonic())
+            return {
+                "base_url": self.base_url,
+                "state": self.state,
+                "limit": round(self.limit, 1),
+                "in_flight": self.in_flight,
+                "calls": calls,
+                "error_rate": errors / calls if calls else 0.0,
+                "slow_rate": slow / calls if calls else 0.0,
+                "avg_latency_ms": round(latency * 1000 / calls, 1) if calls else None,
+                "trips": self.trips,
+                "shed": self.shed,
+            }
+
+
+# ------------------------------------------------------------------------------
+class CircuitBreakers:
+    """
+    Process-wide registry of UpstreamBreakers keyed by base_url.
+
+    Both gateways (WSGI and ASGI) call acquire() before each upstream
+    request and release the permit with the outcome. Breaker state is
+    per process, like the rate-limit memory backend.
+
+    When a breaker opens, integrations on that base_url move from
+    "enabled" to "error"; when it closes again they move back. The
+    transitions are queued and written by a background thread every
+    CIRCUIT_STATUS_FLUSH_INTERVAL seconds as one UPDATE per direction,
+    so a flapping upstream never writes on the request path. Disabled
+    integrations are left alone, as in apply_probe_results(), and each
+    flip is audit-logged with no actor.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(self, policy: BreakerPolicy | None = None) -> None:
+        self.enabled = True
+        self.policy = policy or BreakerPolicy()
+        self.flush_interval = 5.0
+        self.app: Flask | None = None
+        self._breakers: dict[str, UpstreamBreaker] = {}
+        self._pending: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def init_app(self, app: Flask) -> None:
+        self.app = app
+        self.enabled = app.config["CIRCUIT_BREAKER_ENABLED"]
+        self.policy = BreakerPolicy.from_config(app.config)
+        self.flush_interval = app.config["CIRCUIT_STATUS_FLUSH_INTERVAL"]
+        self._breakers = {}
+        app.extensions["circuit_breakers"] = self
+
+    def get(self, base_url: str) -> UpstreamBreaker:
+        breaker = self._breakers.get(base_url)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(base_url)
+                if breaker is None:
+                    breaker = UpstreamBreaker(base_url, self.policy, self._queue)
+                    self._breakers[base_url] = breaker
+        return breaker
+
+    def acquire(self, base_url: str) -> Permit | None:
+        """A permit for base_url, None when disabled; may raise UpstreamUnavailable."""
+        if not self.enabled:
+            return None
+        return self.get(base_url).acquire()
+
+    # -- status write-back ---------------------------------------------------
+
+    def _queue(self, base_url: str, previous: str, state: str) -> None:
+        if state == OPEN:
+            status = "error"
+        elif state == CLOSED and previous == HALF_OPEN:
+            status = "enabled"
+        else:
+            return
+        with self._lock:
+            self._pending[base_url] = status
+            if self._flusher is None and self.app is not None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="circuit-status", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:  # Keep the thread alive; transitions are re-queued.
+                log.exception("Circuit status flush failed")
+
+    def flush(self) -> int:
+        """Write queued status transitions; returns the number of rows changed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        changed = 0
+        now = datetime.utcnow()
+        try:
+            with self.app.app_context():
+                returning = db.engine.dialect.update_returning
+                for status, previous, last_error in (
+                    ("error", "enabled", OPEN_ERROR),
+                    ("enabled", "error", None),
+                ):
+                    urls = [url for url, target in pending.items() if target == status]
+                    for start in range(0, len(urls), _URL_CHUNK):
+                        values = {"status": status, "updated_at": now}
+                        if last_error is not None:
+                            values["last_error"] = last_error
+                        where = (
+                            func.rtrim(ApiIntegration.base_url, "/").in_(
+                                urls[start : start + _URL_CHUNK]
+                            ),
+                            ApiIntegration.status == previous,
+                        )
+                        stmt = (
+                            update(ApiIntegration)
+                            .where(*where)
+                            .values(**values)
+                            .execution_options(synchronize_session=False)
+                        )
+                        # The Core update bypasses the audit log's mapper
+                        # events, so the flipped ids are logged explicitly.
+                        if returning:
+                            ids = list(
+                                db.session.scalars(stmt.returning(ApiIntegration.id))
+                            )
+                        else:
+                            ids = list(
+                                db.session.scalars(select(ApiIntegration.id).where(*where))
+                            )
+                            db.session.execute(stmt)
+                        stage_events(
+                            db.session,
+                            [
+                                {"entity_type": "integration", "entity_id": i,
+                                 "action": UPDATE, "field": "status",
+                                 "old_value": previous, "new_value": status,
+                                 "actor_id": None}
+                                for i in ids
+                            ],
+                        )
+                        changed += len(ids)
+                db.session.commit()
+                db.session.remove()
+        except Exception:
+            with self._lock:
+                # Newer transitions queued meanwhile win over the failed batch.
+                self._pending = {**pending, **self._pending}
+            raise
+        return changed
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5)
+            self._flusher = None
+
+    def stats(self) -> dict:
+        snapshots = [breaker.snapshot() for breaker in list(self._breakers.values())]
+        return {
+            "enabled": self.enabled,
+            "upstreams": len(snapshots),
+            "open": [s for s in snapshots if s["state"] != CLOSED],
+            "trips": sum(s["trips"] for s in snapshots),
+            "shed": sum(s["shed"] for s in snapshots),
+            "pending_status_writes": len(self._pending),
+        }
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# app/commands.py - (./app/commands.py)
+# Flask CLI commands for maintenance and operational tasks.
+
+import click
+from flask import Flask
+
+
+# ------------------------------------------------------------------------------
+def register_commands(app: Flask) -> None:
+    """
+    Attach the project's maintenance commands to the Flask CLI.
+
+    Commands are run with `flask --app app.py <command>` and execute inside
+    an application context, so they share configuration and database
+    access with the web application.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    @app.cli.command("init-db")
+    @click.option("--force", is_flag=True, help="Re-run even if already initialized.")
+    def init_db_command(force: bool) -> None:
+        """Migrate the schema, seed roles/admin and build the search index."""
+        from .bootstrap import init_database
+
+        if init_database(app.config["DB_INIT_LOCK_FILE"], force=force):
+            click.echo("Database initialized.")
+        else:
+            click.echo("Database already initialized; nothing to do.")
+
+    @app.cli.command("db-upgrade")
+    @click.option("--to", "target", type=int, default=None,
+                  help="Stop at this version instead of the latest.")
+    def db_upgrade_command(target: int | None) -> None:
+        """Apply pending schema migrations only (no seeding)."""
+        from .bootstrap import init_lock
+        from .migrations import MIGRATIONS, upgrade
+
+        with init_lock(app.config["DB_INIT_LOCK_FILE"]):
+            applied = upgrade(target=target)
+        for version in applied:
+            click.echo(f"{version:>4}  {MIGRATIONS[version - 1].description}")
+        click.echo(f"Applied {len(applied)} migration(s).")
+
+    @app.cli.command("db-version")
+    def db_version_command() -> None:
+        """Show the schema version and any model tables/columns/indexes missing."""
+        from .migrations import current_version, head_version, missing_schema
+
+        click.echo(f"Schema version {current_version()} (head {head_version()}).")
+        for item in missing_schema():
+            click.echo(f"  missing {item}")
+
+    @app.cli.command("audit-compact")
+    def audit_compact_command() -> None:
+        """Roll audit events past AUDIT_RETENTION_DAYS into daily summaries."""
+        from .audit_log import audit_log
+
+        totals = audit_log.compact()
+        click.echo(
+            f"Compacted {totals['events']} audit events into "
+            f"{totals['summaries']} daily summaries."
+        )
+
+    @app.cli.command("check-integrations")
+    @click.option(
+        "--include-disabled",
+        is_flag=True,
+        help="Also probe integrations whose status is 'disabled'.",
+    )
+    def check_integrations_command(include_disabled: bool) -> None:
+        """Probe every integration concurrently and record the results."""
+        import time
+
+        from .health_checks import check_integrations
+
+        started = time.perf_counter()
+        results = check_integrations(include_disabled=include_disabled)
+        elapsed = time.perf_counter() - started
+        healthy = sum(1 for r in results if r.ok)
+        click.echo(
+            f"Checked {len(results)} integrations in {elapsed:.2f}s: "
+            f"{healthy} healthy, {len(results) - healthy} failing."
+        )
+
+    @app.cli.command("search-rebuild")
+    def search_rebuild_command() -> None:
+        """Rebuild the integration full-text search index from scratch."""
+        import time
+
+        from .search import get_search_backend, rebuild_search_index
+
+        started = time.perf_counter()
+        count = rebuild_search_index()
+        click.echo(
+            f"Rebuilt {get_search_backend().name} search index over {count} "
+            f"integrations in {time.perf_counter() - started:.2f}s."
+        )
+
+    @app.cli.command("assets-build")
+    def assets_build_command() -> None:
+        """Compile SCSS/JS into hashed bundles and write the manifest."""
+        from .assets import build_assets
+
+        manifest = build_assets(app.static_folder)
+        for logical, built in sorted(manifest.items()):
+            click.echo(f"{logical} -> {built}")
+
+    @app.cli.command("import-integrations")
+    @click.argument("source", type=click.File("rb"))
+    @click.option("--owner", required=True, help="Email of the owning user.")
+    @click.option("--format", "fmt", type=click.Choice(["jsonl", "csv"]),
+                  help="Defaults to the file extension.")
+    @click.option("--dry-run", is_flag=True, help="Validate without inserting.")
+    @click.option("--batch-size", type=int, default=None,
+                  help="Rows per INSERT batch (default BULK_BATCH_SIZE).")
+    def import_integrations_command(
+        source, owner: str, fmt: str | None, dry_run: bool, batch_size: int | None
+    ) -> None:
+        """Bulk-import integrations from a JSONL or CSV file ('-' for stdin)."""
+        from .bulk import detect_format, import_integrations, iter_records
+        from .models import User
+
+        user = User.query.filter_by(email=owner.lower()).first()
+        if user is None:
+            raise click.BadParameter(f"no user with email {owner}", param_hint="--owner")
+        try:
+            fmt = detect_format(fmt, source.name)
+        except ValueError as exc:
+            raise click.BadParameter(str(exc), param_hint="--format") from exc
+
+        report = import_integrations(
+            iter_records(source, fmt),
+            owner_id=user.id,
+            dry_run=dry_run,
+            batch_size=batch_size,
+        )
+        for error in report.errors:
+            details = "; ".join(
+                f"{name}: {' '.join(messages)}"
+                for name, messages in error["errors"].items()
+            )
+            click.echo(f"line {error['line']}: {details}", err=True)
+        verb = "Validated" if dry_run else "Imported"
+        count = report.valid if dry_run else report.inserted
+        click.echo(
+            f"{verb} {count} integrations in {report.elapsed:.2f}s "
+            f"({report.rows_per_second:.0f} rows/s); {report.invalid} invalid rows."
+        )
+        if app.config["GENERATE_API_MODULES"] and report.ids:
+            from .scaffold_queue import scaffold_queue
+
+            scaffold_queue.enqueue(report.ids)
+            click.echo(f"Generated {scaffold_queue.flush()} API modules.")
+
+    @app.cli.command("endpoint-path-report")
+    def endpoint_path_report_command() -> None:
+        """List integrations whose endpoint_path the edit forms would now reject."""
+        import re
+
+        from sqlalchemy import select
+
+        from .extensions import db
+        from .forms import ENDPOINT_PATH_PATTERN
+        from .models import ApiIntegration
+
+        pattern = re.compile(ENDPOINT_PATH_PATTERN)
+        rows = db.session.execute(
+            select(ApiIntegration.id, ApiIntegration.name, ApiIntegration.endpoint_path)
+            .order_by(ApiIntegration.id)
+            .execution_options(yield_per=1000)
+        )
+        count = 0
+        for row in rows:
+            if pattern.match(row.endpoint_path or "") is None:
+                count += 1
+                click.echo(f"{row.id:>8}  {row.endpoint_path!r}  ({row.name})")
+        click.echo(
+            f"{count} integrations have a legacy endpoint_path; they save "
+            f"unchanged, but a new path must match the current pattern."
+        )
+
+    @app.cli.command("export-integrations")
+    @click.argument("target", type=click.File("w"), default="-")
+    @click.option("--format", "fmt", type=click.Choice(["jsonl", "csv"]),
+                  help="Defaults to the file extension, else jsonl.")
+    @click.option("--owner", default=None, help="Only this user's integrations.")
+    def export_integrations_command(target, fmt: str | None, owner: str | None) -> None:
+        """Stream integrations to a JSONL or CSV file ('-' for stdout)."""
+        from .bulk import detect_format, export_integrations
+        from .models import User
+
+        owner_id = None
+        if owner:
+            user = User.query.filter_by(email=owner.lower()).first()
+            if user is None:
+                raise click.BadParameter(f"no user with email {owner}", param_hint="--owner")
+            owner_id = user.id
+        try:
+            fmt = detect_format(fmt, target.name)
+        except ValueError:
+            fmt = "jsonl"
+        for chunk in export_integrations(fmt, owner_id=owner_id):
+            target.write(chunk)
+
+    @app.cli.command("regenerate-all")
+    @click.option("--force", is_flag=True,
+                  help="Also overwrite scaffolds that were edited by hand.")
+    @click.option("--workers", type=int, default=None,
+                  help="Writer threads (default SCAFFOLD_WORKERS).")
+    def regenerate_all_command(force: bool, workers: int | None) -> None:
+        """Rewrite every api/ module scaffold and remove orphaned ones."""
+        import time
+
+        from .scaffold_queue import scaffold_queue
+
+        started = time.perf_counter()
+        totals = scaffold_queue.regenerate_all(force=force, workers=workers)
+        click.echo(
+            f"Regenerated API modules in {time.perf_counter() - started:.2f}s: "
+            f"{totals['written']} written, {totals['unchanged']} unchanged, "
+            f"{totals['kept']} edited kept, {totals['removed']} orphans removed, "
+            f"{totals['renamed']} edited orphans renamed to .deleted."
+        )
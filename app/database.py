@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# app/database.py - (./app/database.py)
+# Engine pool options, SQLite pragmas and read-replica routing for db.
+
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable
+
+from flask import Flask, current_app, has_request_context, session as flask_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Bind key of the optional read replica (DATABASE_REPLICA_URL).
+REPLICA_BIND = "replica"
+
+# Flask session key: reads stay on the primary until this timestamp.
+_PRIMARY_UNTIL_KEY = "_db_primary_until"
+
+# session.info flag set once a transaction has written something.
+_WROTE_KEY = "db_wrote"
+
+# True while a @replica_reads view runs.
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+# ------------------------------------------------------------------------------
+def normalize_database_url(url: str) -> str:
+    """Accept the postgres:// scheme some hosts put in DATABASE_URL."""
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+# ------------------------------------------------------------------------------
+def engine_options(url: str, config) -> dict[str, Any]:
+    """
+    SQLAlchemy create_engine() options for one database URL from DB_POOL_*.
+
+    Every file or server database gets a sized QueuePool (DB_POOL_SIZE
+    connections kept, DB_MAX_OVERFLOW more under bursts, DB_POOL_TIMEOUT
+    seconds to wait for one). Server databases such as PostgreSQL also
+    get pre-ping and DB_POOL_RECYCLE, so connections dropped by the
+    server or a proxy are replaced instead of failing a request. In-memory
+    SQLite keeps Flask-SQLAlchemy's single shared connection.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            return {}
+        return {
+            "pool_size": config["DB_POOL_SIZE"],
+            "max_overflow": config["DB_MAX_OVERFLOW"],
+            "pool_timeout": config["DB_POOL_TIMEOUT"],
+        }
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+
+# ------------------------------------------------------------------------------
+def init_engines(app: Flask) -> None:
+    """
+    Configure the database engines, then initialize the db extension.
+
+    Pool options from engine_options() are defaults; anything set in
+    SQLALCHEMY_ENGINE_OPTIONS wins. DATABASE_REPLICA_URL adds a
+    "replica" bind used by @replica_reads views. Every SQLite engine
+    gets the SQLITE_* pragmas on each new connection: WAL lets readers
+    run alongside the single writer, busy_timeout makes a writer wait
+    for the lock instead of failing with "database is locked", and
+    synchronous=NORMAL drops the per-commit fsync that WAL makes
+    unnecessary for consistency, and foreign_keys turns on the FK checks
+    and ON DELETE CASCADE that SQLite otherwise ignores.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    from .extensions import db
+
+    config = app.config
+    uri = normalize_database_url(config["SQLALCHEMY_DATABASE_URI"])
+    config["SQLALCHEMY_DATABASE_URI"] = uri
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(uri, config),
+        **config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
+    replica = config.get("DATABASE_REPLICA_URL")
+    if replica:
+        replica = normalize_database_url(replica)
+        binds = dict(config.get("SQLALCHEMY_BINDS") or {})
+        binds[REPLICA_BIND] = {"url": replica, **engine_options(replica, config)}
+        config["SQLALCHEMY_BINDS"] = binds
+
+    db.init_app(app)
+
+    pragmas = [
+        (name, config[key])
+        for name, key in (
+            ("journal_mode", "SQLITE_JOURNAL_MODE"),
+            ("synchronous", "SQLITE_SYNCHRONOUS"),
+            ("busy_timeout", "SQLITE_BUSY_TIMEOUT_MS"),
+            ("foreign_keys", "SQLITE_FOREIGN_KEYS"),
+        )
+        if str(config[key]) != ""
+    ]
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite" and pragmas:
+                event.listen(engine, "connect", _pragma_setter(pragmas))
+
+
+# ------------------------------------------------------------------------------
+def _pragma_setter(pragmas: list[tuple[str, Any]]) -> Callable:
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas]
+
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return set_pragmas
+
+
+# ------------------------------------------------------------------------------
+class RoutingSession(Session):
+    """
+    db.session class that can send reads to the read replica.
+
+    Inside a @replica_reads view, SELECTs for models on the default bind
+    go to the "replica" engine; flushes, writes and raw SQL stay on the
+    primary, as does everything when no replica is configured.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if (
+            bind is None
+            and _replica_reads.get()
+            and not self._flushing
+            and getattr(clause, "is_select", False)
+        ):
+            engines = self._db.engines
+            if engine is engines.get(None):
+                return engines.get(REPLICA_BIND, engine)
+        return engine
+
+
+# ------------------------------------------------------------------------------
+def replica_reads(view: Callable) -> Callable:
+    """
+    Serve a read-only view's queries from the read replica.
+
+    For DB_REPLICA_STICKY_SECONDS after a request commits a write, the
+    same browser session keeps reading from the primary, so users see
+    their own changes despite replication lag. Without a replica
+    configured the decorator changes nothing.
+
+    Example:
+        @operator_bp.route("/status")
+        @login_required
+        @replica_reads
+        def status_dashboard(): ...
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if flask_session.get(_PRIMARY_UNTIL_KEY, 0) > time.time():
+            return view(*args, **kwargs)
+        token = _replica_reads.set(True)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    return wrapped
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(RoutingSession, "after_flush")
+def _flushed(session, flush_context) -> None:
+    session.info[_WROTE_KEY] = True
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _bulk_statement(orm_execute_state) -> None:
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WROTE_KEY] = True
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(session) -> None:
+    if not session.info.pop(_WROTE_KEY, False) or not has_request_context():
+        return
+    if REPLICA_BIND in session._db.engines:
+        flask_session[_PRIMARY_UNTIL_KEY] = (
+            time.time() + current_app.config["DB_REPLICA_STICKY_SECONDS"]
+        )
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_write_flag(session) -> None:
+    session.info.pop(_WROTE_KEY, None)
@@ -5,9 +5,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 
+from .database import RoutingSession
+
 # ------------------------------------------------------------------------------
-# SQLAlchemy database instance shared across the app.
-db = SQLAlchemy()
+# SQLAlchemy database instance shared across the app. Engines are set up by
+# database.init_engines(); the session can route reads to a replica.
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 # ------------------------------------------------------------------------------
 # Flask-Login manager to handle user sessions and authentication.
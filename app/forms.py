@@ -2,15 +2,62 @@
 # app/forms.py - (./app/forms.py)
 # WTForms-based form definitions for authentication and CRUD operations.
 
+import re
+
 from flask_wtf import FlaskForm
 from wtforms import (
+    IntegerField,
     StringField,
     PasswordField,
     SubmitField,
     TextAreaField,
     SelectField,
 )
-from wtforms.validators import DataRequired, Email, Length, Optional, URL
+from wtforms.validators import (
+    URL,
+    DataRequired,
+    Email,
+    Length,
+    NumberRange,
+    Optional,
+    ValidationError,
+)
+
+from .rate_limit import parse_rate_limit
+
+# One path segment: unreserved URL characters and werkzeug converters such
+# as <item_id> or <int:item_id>. Endpoint paths are routed by the gateway
+# and rendered into api/ scaffolds, so nothing else is accepted.
+_PATH_SEGMENT = (
+    r"(?:[A-Za-z0-9._~-]"
+    r"|<(?:(?:int|float|string|path|uuid):)?[A-Za-z_][A-Za-z0-9_]*>)+"
+)
+ENDPOINT_PATH_PATTERN = rf"/(?:{_PATH_SEGMENT}(?:/{_PATH_SEGMENT})*/?)?\Z"
+ENDPOINT_PATH_MESSAGE = "Use a path like /items or /items/<int:item_id>."
+
+
+# ------------------------------------------------------------------------------
+def valid_rate_limit(form, field) -> None:
+    """WTForms validator for rate limit specs such as "120/m"."""
+    try:
+        parse_rate_limit(field.data)
+    except ValueError as exc:
+        raise ValidationError(str(exc)) from exc
+
+
+# ------------------------------------------------------------------------------
+def valid_endpoint_path(form, field) -> None:
+    """
+    WTForms validator applying ENDPOINT_PATH_PATTERN to new or changed paths.
+
+    Paths saved before the pattern existed (such as /items/{id}) pass while
+    unchanged, so the rest of such an integration can still be edited;
+    `flask endpoint-path-report` lists them.
+    """
+    if field.object_data is not None and field.data == field.object_data:
+        return
+    if re.match(ENDPOINT_PATH_PATTERN, field.data or "") is None:
+        raise ValidationError(ENDPOINT_PATH_MESSAGE)
 
 
 # ------------------------------------------------------------------------------
@@ -60,14 +107,15 @@ class ApiIntegrationForm(FlaskForm):
     Form for creating or updating API integration records.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-17
     """
 
     name = StringField("Name", validators=[DataRequired()])
     system_name = StringField("System Name", validators=[DataRequired()])
     base_url = StringField("Base URL", validators=[DataRequired(), URL()])
     endpoint_path = StringField(
-        "Endpoint Path", validators=[DataRequired(), Length(max=255)]
+        "Endpoint Path",
+        validators=[DataRequired(), Length(max=255), valid_endpoint_path],
     )
     http_method = SelectField(
         "HTTP Method",
@@ -89,6 +137,14 @@ class ApiIntegrationForm(FlaskForm):
     docusaurus_doc_path = StringField(
         "Docusaurus Doc Path", validators=[Optional(), Length(max=255)]
     )
+    cache_ttl = IntegerField(
+        "Gateway Cache TTL (seconds)",
+        validators=[Optional(), NumberRange(min=0, max=86400)],
+    )
+    rate_limit = StringField(
+        "Rate Limit (e.g. 120/m)",
+        validators=[Optional(), Length(max=50), valid_rate_limit],
+    )
     submit = SubmitField("Save")
 
 
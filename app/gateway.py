@@ -0,0 +1,750 @@
+#!/usr/bin/env python3
+# app/gateway.py - (./app/gateway.py)
+# Data-driven reverse proxy serving every integration from its database row.
+
+import base64
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import requests
+from flask import Flask, Response, abort, jsonify, request
+from flask_login import current_user
+from requests.adapters import HTTPAdapter
+from sqlalchemy import select
+
+from .circuit_breaker import (
+    CircuitBreakers,
+    Permit,
+    UpstreamUnavailable,
+    circuit_breakers,
+)
+from .extensions import db
+from .integration_index import (
+    MISS_RECHECK_SECONDS,
+    IntegrationIndex,
+    served_integrations,
+)
+from .metrics import metrics
+from .models import ApiIntegration
+from .rate_limit import rate_limited_response, rate_limiter
+from .response_cache import (
+    CONDITIONAL_HEADERS,
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+    request_directive,
+    response_cache,
+    storable,
+    tee,
+)
+
+log = logging.getLogger(__name__)
+
+GATEWAY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
+
+# RFC 7230 hop-by-hop headers never cross a proxy.
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "trailers",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+# The site's own session must not leak upstream, and requests recomputes
+# the framing headers for the forwarded body.
+STRIPPED_REQUEST_HEADERS = HOP_BY_HOP_HEADERS | {"host", "cookie", "content-length"}
+# Bodies are relayed undecoded, so Content-Encoding/Length stay valid.
+# Upstream cookies would otherwise be set on this site's domain.
+STRIPPED_RESPONSE_HEADERS = HOP_BY_HOP_HEADERS | {"set-cookie"}
+
+_PARAM_SEGMENT = re.compile(r"^<(?:(\w+)(?:\([^)]*\))?:)?(\w+)>$")
+
+# Segment predicates for werkzeug-style converters; unknown ones act as string.
+_CONVERTERS: dict[str, Callable[[str], bool]] = {
+    "string": lambda segment: True,
+    "int": str.isdigit,
+    "float": lambda segment: re.fullmatch(r"\d+\.\d+", segment) is not None,
+    "uuid": lambda segment: re.fullmatch(
+        r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}", segment
+    )
+    is not None,
+}
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class GatewayRoute:
+    """Everything needed to forward one request, copied from the DB row."""
+
+    integration_id: int
+    method: str
+    base_url: str
+    auth_type: str
+    api_key: str | None
+    cache_ttl: int = 0
+    owner_id: int | None = None
+    rate_limit: str | None = None
+
+
+# ------------------------------------------------------------------------------
+def auth_headers(route: GatewayRoute, api_key_header: str) -> dict[str, str]:
+    """Credentials to add upstream: a key header or HTTP basic, per auth_type."""
+    if not route.api_key:
+        return {}
+    if route.auth_type == "api_key":
+        return {api_key_header: route.api_key}
+    if route.auth_type == "basic":
+        token = base64.b64encode(route.api_key.encode("utf-8")).decode("ascii")
+        return {"Authorization": f"Basic {token}"}
+    return {}
+
+
+# ------------------------------------------------------------------------------
+def may_forward(
+    route: GatewayRoute,
+    user_id: int | None,
+    role: str | None,
+    trusted_roles: frozenset[str],
+) -> bool:
+    """True if the caller may use route: its owner, or a trusted role."""
+    if role is not None and role in trusted_roles:
+        return True
+    return user_id is not None and route.owner_id == user_id
+
+
+# ------------------------------------------------------------------------------
+def parse_roles(value: str) -> frozenset[str]:
+    return frozenset(role.strip() for role in value.split(",") if role.strip())
+
+
+# ------------------------------------------------------------------------------
+def choose_route(
+    routes: dict[str, GatewayRoute], method: str
+) -> GatewayRoute | None:
+    """Pick the route for method; HEAD falls back to the GET route."""
+    route = routes.get(method)
+    if route is None and method == "HEAD":
+        route = routes.get("GET")
+    return route
+
+
+# ------------------------------------------------------------------------------
+class _RequestBody:
+    """
+    File-like view of the incoming body that requests streams upstream.
+
+    Exposing __len__ makes requests send Content-Length instead of chunked
+    encoding when the client declared a length; read() pulls from the
+    WSGI input in bounded pieces, so the body is never held in memory.
+    """
+
+    def __init__(self, stream, length: int | None, chunk_size: int) -> None:
+        self._stream = stream
+        self._length = length
+        self._chunk_size = chunk_size
+
+    def __len__(self) -> int:
+        return self._length or 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self._chunk_size:
+            size = self._chunk_size
+        return self._stream.read(size)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self._chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+# ------------------------------------------------------------------------------
+def _relay(
+    upstream: requests.Response, chunk_size: int, permit: Permit | None = None
+) -> Iterator[bytes]:
+    """
+    Yield the upstream body as it arrives, at most chunk_size at a time.
+
+    Chunked responses (including Server-Sent Events) are relayed chunk by
+    chunk; other bodies use read1(), which returns whatever bytes are
+    already available instead of waiting for a full buffer. Bytes are not
+    decompressed, so the client sees exactly what upstream sent.
+
+    The breaker permit is released at the end with the upstream status,
+    or with None if reading the body failed (a read timeout or reset).
+    """
+    raw = upstream.raw
+    outcome = None
+    try:
+        if raw.chunked and raw.supports_chunked_reads():
+            yield from raw.read_chunked(chunk_size, decode_content=False)
+        else:
+            while True:
+                chunk = raw.read1(chunk_size, decode_content=False)
+                if not chunk:
+                    break
+                yield chunk
+        outcome = upstream.status_code
+    except GeneratorExit:
+        outcome = upstream.status_code  # the client left; upstream was fine
+        raise
+    finally:
+        upstream.close()
+        if permit is not None:
+            permit.release(outcome)
+
+
+# ------------------------------------------------------------------------------
+class _TrieNode:
+    __slots__ = ("children", "params", "rest", "routes")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.params: dict[str, _TrieNode] = {}
+        self.rest: _TrieNode | None = None
+        self.routes: dict[str, GatewayRoute] = {}
+
+
+# ------------------------------------------------------------------------------
+class RouteTrie:
+    """
+    Path-segment trie over endpoint_path patterns.
+
+    Literal segments are dict lookups; <param> segments are tried after the
+    literal child, and a trailing <path:...> matches the remainder. Match
+    cost depends on path depth, not on how many integrations exist. Each
+    leaf maps HTTP method to the route that serves it.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def __init__(self) -> None:
+        self.root = _TrieNode()
+        self.size = 0
+
+    @staticmethod
+    def split(path: str) -> list[str]:
+        return [segment for segment in path.split("/") if segment]
+
+    def insert(self, pattern: str, route: GatewayRoute) -> bool:
+        """Add a route; returns False for unsupported or duplicate patterns."""
+        node = self.root
+        segments = self.split(pattern)
+        for position, segment in enumerate(segments):
+            if "<" not in segment:
+                node = node.children.setdefault(segment, _TrieNode())
+                continue
+            match = _PARAM_SEGMENT.match(segment)
+            if match is None:
+                return False
+            converter = match.group(1) or "string"
+            if converter == "path":
+                if position != len(segments) - 1:
+                    return False
+                node.rest = node.rest or _TrieNode()
+                node = node.rest
+                break
+            if converter not in _CONVERTERS:
+                converter = "string"
+            node = node.params.setdefault(converter, _TrieNode())
+        if route.method in node.routes:
+            return False
+        node.routes[route.method] = route
+        self.size += 1
+        return True
+
+    def match(self, path: str) -> dict[str, GatewayRoute] | None:
+        """Return {method: route} for the path, or None if nothing matches."""
+        return self._match(self.root, self.split(path), 0)
+
+    def _match(
+        self, node: _TrieNode, segments: list[str], position: int
+    ) -> dict[str, GatewayRoute] | None:
+        if position == len(segments):
+            return node.routes or None
+        segment = segments[position]
+        child = node.children.get(segment)
+        if child is not None:
+            found = self._match(child, segments, position + 1)
+            if found:
+                return found
+        for converter, child in node.params.items():
+            if _CONVERTERS[converter](segment):
+                found = self._match(child, segments, position + 1)
+                if found:
+                    return found
+        if node.rest is not None:
+            return node.rest.routes or None
+        return None
+
+
+# ------------------------------------------------------------------------------
+class IntegrationGateway(IntegrationIndex):
+    """
+    Forward GATEWAY_PREFIX/<endpoint_path> to the owning integration.
+
+    One RouteTrie built from (endpoint_path, http_method) of every served
+    integration replaces per-integration modules: 10k integrations cost
+    one in-memory table, and nothing is imported or written to disk.
+    Requests go to base_url + path (query string preserved) over one
+    pooled keep-alive session. The integration's api_key is injected per
+    auth_type: a header for "api_key", HTTP basic for "basic"
+    ("user:password"), nothing for "none".
+
+    Both directions stream: request bodies are read from the WSGI input
+    as upstream consumes them, and the response is returned as soon as
+    upstream headers arrive, then relayed in chunks of at most
+    GATEWAY_STREAM_CHUNK_SIZE bytes. Memory per in-flight request stays
+    bounded by the chunk size and time-to-first-byte tracks upstream.
+
+    With GATEWAY_REQUIRE_LOGIN, a caller must also be the integration's
+    owner or hold one of GATEWAY_TRUSTED_ROLES; anyone else gets a 403
+    before the stored credentials are used.
+
+    Each forwarded request first takes a token from the integration's,
+    its owner's and the client IP's rate-limit buckets (see rate_limit.py).
+    Upstream calls then pass the base_url's circuit breaker and adaptive
+    concurrency limit (circuit_breaker.py); refused calls get a 503.
+
+    Integrations with a cache_ttl are answered from the ResponseCache
+    while fresh. Misses still stream to the client, with a bounded copy
+    teed into the cache; concurrent misses for one key wait for the first.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(
+        self,
+        check_interval: float = 2.0,
+        timeout: float = 30.0,
+        pool_size: int = 64,
+        api_key_header: str = "X-API-Key",
+        require_login: bool = True,
+        trusted_roles: frozenset[str] = frozenset({"admin", "api_admin"}),
+        chunk_size: int = 65536,
+        cache: ResponseCache = response_cache,
+        breakers: CircuitBreakers = circuit_breakers,
+    ) -> None:
+        super().__init__(check_interval)
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.api_key_header = api_key_header
+        self.require_login = require_login
+        self.trusted_roles = trusted_roles
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.breakers = breakers
+        self.trie = RouteTrie()
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        self.forwarded = 0
+        self.upstream_errors = 0
+
+    def init_app(self, app: Flask) -> None:
+        self.check_interval = app.config["GATEWAY_CHECK_INTERVAL"]
+        self.timeout = app.config["GATEWAY_TIMEOUT"]
+        self.pool_size = app.config["GATEWAY_POOL_SIZE"]
+        self.api_key_header = app.config["GATEWAY_API_KEY_HEADER"]
+        self.require_login = app.config["GATEWAY_REQUIRE_LOGIN"]
+        self.trusted_roles = parse_roles(app.config["GATEWAY_TRUSTED_ROLES"])
+        self.chunk_size = app.config["GATEWAY_STREAM_CHUNK_SIZE"]
+        prefix = app.config["GATEWAY_PREFIX"].rstrip("/")
+        app.add_url_rule(
+            f"{prefix}/<path:subpath>",
+            endpoint="gateway",
+            view_func=self.dispatch,
+            methods=GATEWAY_METHODS,
+            provide_automatic_options=False,
+        )
+        app.extensions["gateway"] = self
+
+    # -- routing table -------------------------------------------------------
+
+    def rebuild(self) -> None:
+        rows = db.session.execute(
+            select(
+                ApiIntegration.id,
+                ApiIntegration.endpoint_path,
+                ApiIntegration.http_method,
+                ApiIntegration.base_url,
+                ApiIntegration.auth_type,
+                ApiIntegration.api_key,
+                ApiIntegration.cache_ttl,
+                ApiIntegration.owner_id,
+                ApiIntegration.rate_limit,
+            )
+            .where(served_integrations())
+            .order_by(ApiIntegration.id)
+        )
+        trie = RouteTrie()
+        for row in rows:
+            route = GatewayRoute(
+                integration_id=row.id,
+                method=(row.http_method or "GET").upper(),
+                base_url=row.base_url.rstrip("/"),
+                auth_type=row.auth_type or "none",
+                api_key=row.api_key,
+                cache_ttl=row.cache_ttl or 0,
+                owner_id=row.owner_id,
+                rate_limit=row.rate_limit,
+            )
+            # Lowest id wins when two integrations claim the same route.
+            if not trie.insert(row.endpoint_path or "/", route):
+                log.debug("Gateway skipped route for integration %s", row.id)
+        self.trie = trie
+
+    def resolve(self, path: str) -> dict[str, GatewayRoute] | None:
+        self.refresh()
+        routes = self.trie.match(path)
+        if routes is None and self.refresh(MISS_RECHECK_SECONDS):
+            routes = self.trie.match(path)
+        return routes
+
+    # -- forwarding ----------------------------------------------------------
+
+    def client(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_size,
+                        pool_maxsize=self.pool_size,
+                        max_retries=0,
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def upstream_request(
+        self,
+        route: GatewayRoute,
+        path: str,
+        body: bytes | None = None,
+        validators: dict[str, str] | None = None,
+    ) -> dict:
+        """
+        Build requests.request() kwargs for forwarding the current request.
+
+        The cached path passes the already-read body, plus `validators`
+        replacing the client's own conditional headers.
+        """
+        stripped = STRIPPED_REQUEST_HEADERS
+        if validators is not None:
+            stripped = stripped | CONDITIONAL_HEADERS
+        headers = {
+            name: value
+            for name, value in request.headers.items()
+            if name.lower() not in stripped
+        }
+        headers.update(validators or {})
+        headers["X-Forwarded-For"] = request.remote_addr or ""
+        headers["X-Forwarded-Host"] = request.host
+        headers["X-Forwarded-Proto"] = request.scheme
+        credentials = auth_headers(route, self.api_key_header)
+        if "Authorization" in credentials:
+            headers.pop("Authorization", None)
+        headers.update(credentials)
+
+        url = route.base_url + path
+        if request.query_string:
+            url = f"{url}?{request.query_string.decode('latin-1')}"
+
+        # Stream the body only when there is one: a declared length, or a
+        # chunked upload (no length), which is forwarded chunked as well.
+        chunked = "chunked" in request.headers.get("Transfer-Encoding", "").lower()
+        if body is None and (request.content_length or chunked):
+            body = _RequestBody(
+                request.stream, request.content_length, self.chunk_size
+            )
+            if chunked:
+                body = iter(body)
+        return dict(
+            method=request.method,
+            url=url,
+            headers=headers,
+            data=body,
+            timeout=self.timeout,
+            allow_redirects=False,
+            stream=True,
+        )
+
+    def _send_upstream(
+        self, route: GatewayRoute, kwargs: dict
+    ) -> tuple[requests.Response, Permit | None] | Response:
+        """
+        Issue the upstream request; a 502/503/504 Response on failure.
+
+        On success the caller owns the breaker permit and must release it
+        once the body is done (_relay() and _streamed() do).
+        """
+        try:
+            permit = self.breakers.acquire(route.base_url)
+        except UpstreamUnavailable as exc:
+            return _gateway_error(503, str(exc), route, exc.retry_after_seconds)
+        try:
+            upstream = self.client().request(**kwargs)
+        except BaseException as exc:
+            if permit is not None:
+                permit.release(None)
+            if isinstance(exc, requests.Timeout):
+                self.upstream_errors += 1
+                return _gateway_error(504, "Upstream timed out", route)
+            if isinstance(exc, requests.RequestException):
+                self.upstream_errors += 1
+                log.warning(
+                    "Gateway upstream error for %s: %s", route.integration_id, exc
+                )
+                return _gateway_error(502, "Upstream unreachable", route)
+            raise
+        if permit is not None:
+            permit.responded()
+        self.forwarded += 1
+        return upstream, permit
+
+    @staticmethod
+    def _relayed_headers(upstream: requests.Response) -> list[tuple[str, str]]:
+        headers = [
+            (name, value)
+            for name, value in upstream.headers.items()
+            if name.lower() not in STRIPPED_RESPONSE_HEADERS
+        ]
+        if upstream.headers.get("Content-Type", "").startswith("text/event-stream"):
+            # Ask fronting proxies (nginx) not to buffer event streams.
+            headers.append(("X-Accel-Buffering", "no"))
+        return headers
+
+    def forward(self, route: GatewayRoute, path: str) -> Response:
+        if self.cache.enabled and route.cache_ttl > 0:
+            cached = self.forward_cached(route, path)
+            if cached is not None:
+                return cached
+        return self._proxy(route, self.upstream_request(route, path))
+
+    def _proxy(self, route: GatewayRoute, kwargs: dict) -> Response:
+        sent = self._send_upstream(route, kwargs)
+        if isinstance(sent, Response):
+            return sent
+        upstream, permit = sent
+        return self._streamed(upstream, self._relayed_headers(upstream), permit)
+
+    def _streamed(
+        self,
+        upstream: requests.Response,
+        headers: list[tuple[str, str]],
+        permit: Permit | None,
+    ) -> Response:
+        response = Response(
+            _relay(upstream, self.chunk_size, permit),
+            status=upstream.status_code,
+            headers=headers,
+            direct_passthrough=True,
+        )
+        _close_with(response, upstream, permit)
+        return response
+
+    # -- response cache ------------------------------------------------------
+
+    def forward_cached(self, route: GatewayRoute, path: str) -> Response | None:
+        """
+        Serve through the response cache, or None if the request bypasses it.
+
+        Only GET and HEAD qualify (see request_directive). A request body,
+        rare on a GET, is hashed into the key, so only requests with a
+        declared length within GATEWAY_CACHE_MAX_ENTRY_BYTES qualify.
+        """
+        cache = self.cache
+        headers = {name.lower(): value for name, value in request.headers.items()}
+        directive = request_directive(request.method, headers)
+        length = request.content_length
+        if directive is None or "transfer-encoding" in headers:
+            return None
+        if length and length > cache.max_entry_bytes:
+            return None
+        body = request.get_data(cache=False) if length else None
+        key = cache_key(
+            route,
+            request.method,
+            path,
+            request.query_string.decode("latin-1"),
+            headers,
+            body,
+        )
+
+        entry = cache.get(key)
+        if directive == "use" and entry is not None and entry.fresh(route.cache_ttl):
+            cache.record(route.integration_id, "hit")
+            return _cached_response(entry, "HIT")
+        if request.method == "HEAD":
+            return None  # only GET responses populate entries
+        flight = cache.claim(key)
+        if flight is not None:
+            flight.wait(self.timeout)
+            entry = cache.get(key)
+            if entry is not None and entry.fresh(route.cache_ttl):
+                cache.record(route.integration_id, "hit")
+                return _cached_response(entry, "HIT")
+            # The first request's answer was not storable; fetch our own.
+            cache.record(route.integration_id, "miss")
+            return self._proxy(route, self.upstream_request(route, path, body, {}))
+        try:
+            return self._fetch_into_cache(route, path, key, entry, body)
+        except BaseException:
+            cache.release(key)
+            raise
+
+    def _fetch_into_cache(
+        self,
+        route: GatewayRoute,
+        path: str,
+        key: str,
+        stale: CachedResponse | None,
+        body: bytes | None,
+    ) -> Response:
+        """Fetch as the single-flight owner of key, storing what is storable."""
+        cache = self.cache
+        validators = stale.validators() if stale is not None else {}
+        sent = self._send_upstream(
+            route, self.upstream_request(route, path, body, validators)
+        )
+        if isinstance(sent, Response):
+            cache.release(key)
+            return sent
+        upstream, permit = sent
+        headers = self._relayed_headers(upstream)
+
+        if upstream.status_code == 304 and stale is not None:
+            upstream.close()
+            if permit is not None:
+                permit.release(304)
+            entry = stale.revalidated(headers)
+            cache.put(key, entry)
+            cache.release(key)
+            cache.record(route.integration_id, "revalidated")
+            return _cached_response(entry, "REVALIDATED")
+
+        cache.record(route.integration_id, "miss")
+        lowered = {name.lower(): value for name, value in headers}
+        if not storable(upstream.status_code, lowered, cache.max_entry_bytes):
+            cache.release(key)
+            return self._streamed(upstream, headers, permit)
+
+        status = upstream.status_code
+
+        def store(content: bytes | None) -> None:
+            if content is not None:
+                cache.put(
+                    key,
+                    CachedResponse(status, tuple(headers), content, time.time()),
+                )
+            cache.release(key)
+
+        response = Response(
+            tee(
+                _relay(upstream, self.chunk_size, permit),
+                cache.max_entry_bytes,
+                store,
+            ),
+            status=status,
+            headers=headers + [("X-Cache", "MISS")],
+            direct_passthrough=True,
+        )
+        # Also wake waiters if the body is never iterated (store() ran first
+        # otherwise, since the iterable closes before these callbacks).
+        _close_with(response, upstream, permit)
+        response.call_on_close(lambda: cache.release(key))
+        return response
+
+    def dispatch(self, subpath: str) -> Response:
+        if self.require_login and not current_user.is_authenticated:
+            abort(401)
+        path = "/" + subpath
+        routes = self.resolve(path)
+        if routes is None:
+            abort(404)
+        route = choose_route(routes, request.method)
+        if route is None:
+            allowed = sorted(routes)
+            if request.method == "OPTIONS":
+                return Response(status=204, headers={"Allow": ", ".join(allowed)})
+            abort(405, valid_methods=allowed)
+        if self.require_login and not may_forward(
+            route,
+            current_user.id,
+            current_user.role.name if current_user.role else None,
+            self.trusted_roles,
+        ):
+            abort(403)
+        metrics.note_integration(route.integration_id)
+        decision = rate_limiter.check_integration(
+            route.integration_id,
+            route.owner_id,
+            route.rate_limit,
+            request.remote_addr or "",
+        )
+        if not decision.allowed:
+            return rate_limited_response(decision)
+        return self.forward(route, path)
+
+    def stats(self) -> dict:
+        return {
+            "routes": self.trie.size,
+            "forwarded": self.forwarded,
+            "upstream_errors": self.upstream_errors,
+            "cache": self.cache.stats(),
+            "breakers": self.breakers.stats(),
+        }
+
+
+# ------------------------------------------------------------------------------
+def _cached_response(entry: CachedResponse, state: str) -> Response:
+    """Answer from a cache entry, with a 304 if the client's ETag matches."""
+    extra = [("Age", str(int(entry.age()))), ("X-Cache", state)]
+    if request.method in ("GET", "HEAD") and entry.matches(
+        request.headers.get("If-None-Match")
+    ):
+        return Response(status=304, headers=entry.not_modified_headers() + extra)
+    return Response(
+        entry.body, status=entry.status, headers=list(entry.headers) + extra
+    )
+
+
+# ------------------------------------------------------------------------------
+def _close_with(
+    response: Response, upstream: requests.Response, permit: Permit | None
+) -> None:
+    """Close upstream and release the permit even if the body is never read."""
+    response.call_on_close(upstream.close)
+    if permit is not None:
+        status = upstream.status_code
+        response.call_on_close(lambda: permit.release(status))
+
+
+# ------------------------------------------------------------------------------
+def _gateway_error(
+    status: int, message: str, route: GatewayRoute, retry_after: int | None = None
+) -> Response:
+    response = jsonify(error=message, integration_id=route.integration_id)
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = str(retry_after)
+    return response
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+gateway = IntegrationGateway()
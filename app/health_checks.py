@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# app/health_checks.py - (./app/health_checks.py)
+# Outbound health-check engine for probing configured API integrations.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import zip_longest
+from urllib.parse import urlsplit
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from sqlalchemy import insert, select, update
+
+from .audit_log import UPDATE, stage_events
+from .extensions import db
+from .models import ApiIntegration, IntegrationCheck, hour_bucket
+
+# Methods that are never sent verbatim by a probe when safe mode is on; the
+# probe falls back to HEAD so a health check cannot mutate upstream state.
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# SQLite limits the number of bound parameters per statement, so id lists
+# are chunked when reading current statuses back.
+_ID_CHUNK = 500
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ProbeTarget:
+    """
+    Immutable snapshot of the integration fields needed to run a probe.
+
+    Probes run on worker threads outside the request's database session, so
+    targets are plain values rather than ORM instances.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    integration_id: int
+    url: str
+    method: str
+    auth_type: str
+    api_key: str | None
+
+    @classmethod
+    def from_integration(cls, integration: ApiIntegration) -> "ProbeTarget":
+        url = integration.base_url.rstrip("/") + "/" + integration.endpoint_path.lstrip("/")
+        return cls(
+            integration_id=integration.id,
+            url=url,
+            method=(integration.http_method or "GET").upper(),
+            auth_type=integration.auth_type or "none",
+            api_key=integration.api_key,
+        )
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ProbeResult:
+    """
+    Outcome of a single probe: reachability, HTTP code, latency and error.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    integration_id: int
+    ok: bool
+    http_status: int | None
+    latency_ms: float
+    error: str | None
+    checked_at: datetime
+
+
+# ------------------------------------------------------------------------------
+class HealthChecker:
+    """
+    Concurrent HTTP prober with a pooled keep-alive session.
+
+    A bounded thread pool runs probes in parallel while a semaphore per
+    upstream host caps how many requests hit the same server at once.
+    Targets are interleaved by host before submission so a large batch
+    against one upstream cannot starve the pool.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def __init__(
+        self,
+        timeout: float = 5.0,
+        max_workers: int = 32,
+        per_host_limit: int = 4,
+        api_key_header: str = "X-API-Key",
+        safe_methods_only: bool = True,
+    ) -> None:
+        self.timeout = timeout
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.api_key_header = api_key_header
+        self.safe_methods_only = safe_methods_only
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+            max_retries=0,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._host_limits.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_limits[host] = sem
+            return sem
+
+    def _request_kwargs(self, target: ProbeTarget) -> dict:
+        kwargs: dict = {"timeout": self.timeout, "allow_redirects": False}
+        if target.api_key:
+            if target.auth_type == "api_key":
+                kwargs["headers"] = {self.api_key_header: target.api_key}
+            elif target.auth_type == "basic":
+                user, _, password = target.api_key.partition(":")
+                kwargs["auth"] = (user, password)
+        return kwargs
+
+    def probe(self, target: ProbeTarget) -> ProbeResult:
+        """Run a single probe and never raise; failures become results."""
+        method = target.method
+        substituted = False
+        if self.safe_methods_only and method in UNSAFE_METHODS:
+            method, substituted = "HEAD", True
+
+        host = urlsplit(target.url).netloc
+        status: int | None = None
+        error: str | None = None
+        with self._host_semaphore(host):
+            started = time.perf_counter()
+            try:
+                response = self._session.request(
+                    method, target.url, **self._request_kwargs(target)
+                )
+                status = response.status_code
+                response.close()
+            except requests.RequestException as exc:
+                error = f"{type(exc).__name__}: {exc}"[:255]
+            latency_ms = (time.perf_counter() - started) * 1000.0
+
+        ok = status is not None and (status < 400 or (substituted and status == 405))
+        if status is not None and not ok:
+            error = f"HTTP {status}"
+        return ProbeResult(
+            integration_id=target.integration_id,
+            ok=ok,
+            http_status=status,
+            latency_ms=round(latency_ms, 2),
+            error=error,
+            checked_at=datetime.utcnow(),
+        )
+
+    def probe_many(self, targets: list[ProbeTarget]) -> list[ProbeResult]:
+        """Probe all targets concurrently and return results in input order."""
+        if not targets:
+            return []
+        ordered = _interleave_by_host(targets)
+        workers = min(self.max_workers, len(ordered))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="probe") as pool:
+            results = list(pool.map(self.probe, ordered))
+        by_id = {r.integration_id: r for r in results}
+        return [by_id[t.integration_id] for t in targets]
+
+    def close(self) -> None:
+        self._session.close()
+
+
+# ------------------------------------------------------------------------------
+def _interleave_by_host(targets: list[ProbeTarget]) -> list[ProbeTarget]:
+    """Round-robin targets across hosts so no single upstream is hit in a burst."""
+    groups: dict[str, list[ProbeTarget]] = {}
+    for target in targets:
+        groups.setdefault(urlsplit(target.url).netloc, []).append(target)
+    return [t for row in zip_longest(*groups.values()) for t in row if t is not None]
+
+
+# ------------------------------------------------------------------------------
+def get_health_checker() -> HealthChecker:
+    """
+    Return the application-wide HealthChecker, creating it on first use.
+
+    The checker is stored on app.extensions so its connection pool is
+    reused across requests and CLI invocations within the same process.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    checker = current_app.extensions.get("health_checker")
+    if checker is None:
+        config = current_app.config
+        checker = HealthChecker(
+            timeout=config["HEALTH_CHECK_TIMEOUT"],
+            max_workers=config["HEALTH_CHECK_MAX_WORKERS"],
+            per_host_limit=config["HEALTH_CHECK_PER_HOST_LIMIT"],
+            api_key_header=config["HEALTH_CHECK_API_KEY_HEADER"],
+            safe_methods_only=config["HEALTH_CHECK_SAFE_METHODS_ONLY"],
+        )
+        current_app.extensions["health_checker"] = checker
+    return checker
+
+
+# ------------------------------------------------------------------------------
+def load_probe_targets(include_disabled: bool = False) -> list[ProbeTarget]:
+    """
+    Load probe targets for all integrations using a column-only query.
+
+    Disabled integrations are skipped unless explicitly requested, since
+    operators switch them off precisely to stop traffic to the upstream.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    stmt = select(
+        ApiIntegration.id,
+        ApiIntegration.base_url,
+        ApiIntegration.endpoint_path,
+        ApiIntegration.http_method,
+        ApiIntegration.auth_type,
+        ApiIntegration.api_key,
+    ).order_by(ApiIntegration.id)
+    if not include_disabled:
+        stmt = stmt.where(ApiIntegration.status != "disabled")
+    return [
+        ProbeTarget.from_integration(row) for row in db.session.execute(stmt)
+    ]
+
+
+# ------------------------------------------------------------------------------
+def apply_probe_results(
+    results: list[ProbeResult], commit: bool = True, record_history: bool = True
+) -> int:
+    """
+    Write probe outcomes back to api_integrations in one bulk UPDATE.
+
+    Healthy probes move 'error' integrations back to 'enabled' and failed
+    probes move 'enabled' integrations to 'error'; 'disabled' is left alone.
+    updated_at is only bumped for rows whose status actually changes, so a
+    health sweep does not masquerade as a user edit. Each result is also
+    appended to integration_checks with a single executemany INSERT, and
+    status transitions are staged for the audit log. Returns the number of
+    status transitions.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    if not results:
+        return 0
+
+    current: dict[int, tuple[str, datetime]] = {}
+    ids = [r.integration_id for r in results]
+    for start in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[start : start + _ID_CHUNK]
+        rows = db.session.execute(
+            select(
+                ApiIntegration.id, ApiIntegration.status, ApiIntegration.updated_at
+            ).where(ApiIntegration.id.in_(chunk))
+        )
+        current.update({row.id: (row.status, row.updated_at) for row in rows})
+
+    now = datetime.utcnow()
+    transitions = 0
+    params = []
+    changes = []
+    for result in results:
+        if result.integration_id not in current:
+            continue  # Deleted while the probe was in flight.
+        status, updated_at = current[result.integration_id]
+        new_status = status
+        if result.ok and status == "error":
+            new_status = "enabled"
+        elif not result.ok and status == "enabled":
+            new_status = "error"
+        if new_status != status:
+            transitions += 1
+            updated_at = now
+            changes.append(
+                {"entity_type": "integration", "entity_id": result.integration_id,
+                 "action": UPDATE, "field": "status", "old_value": status,
+                 "new_value": new_status}
+            )
+        params.append(
+            {
+                "id": result.integration_id,
+                "status": new_status,
+                "updated_at": updated_at,
+                "last_checked_at": result.checked_at,
+                "last_latency_ms": result.latency_ms,
+                "last_http_status": result.http_status,
+                "last_error": result.error,
+            }
+        )
+
+    if params:
+        db.session.execute(update(ApiIntegration), params)
+        stage_events(db.session, changes)
+        if record_history:
+            db.session.execute(
+                insert(IntegrationCheck),
+                [
+                    {
+                        "integration_id": r.integration_id,
+                        "checked_at": r.checked_at,
+                        "hour_bucket": hour_bucket(r.checked_at),
+                        "ok": r.ok,
+                        "http_status": r.http_status,
+                        "latency_ms": r.latency_ms,
+                        "error": r.error,
+                    }
+                    for r in results
+                    if r.integration_id in current
+                ],
+            )
+    if commit:
+        db.session.commit()
+    return transitions
+
+
+# ------------------------------------------------------------------------------
+def check_integrations(include_disabled: bool = False) -> list[ProbeResult]:
+    """
+    Probe every integration concurrently and persist the outcomes.
+
+    This is the "test all" path used by the API admin UI and the
+    check-integrations CLI command.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    targets = load_probe_targets(include_disabled=include_disabled)
+    # Release the read transaction while the network calls are in flight.
+    db.session.rollback()
+    results = get_health_checker().probe_many(targets)
+    apply_probe_results(results)
+    return results
+
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# app/integration_index.py - (./app/integration_index.py)
+# Base class for per-process routing tables derived from api_integrations rows.
+
+import threading
+import time
+import weakref
+
+from sqlalchemy import Connection, event, func, select
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import ApiIntegration
+
+# Floor between index re-checks triggered by unknown paths, so 404 scans
+# cannot turn into one signature query per request.
+MISS_RECHECK_SECONDS = 0.5
+
+# session.info flag set when a transaction touched api_integrations.
+_CHANGED_KEY = "integration_index_changed"
+
+# Every live index, marked stale together after a local commit.
+_indexes: "weakref.WeakSet[IntegrationIndex]" = weakref.WeakSet()
+
+
+# ------------------------------------------------------------------------------
+def served_integrations():
+    """WHERE clause for integrations that routing tables should expose."""
+    return ApiIntegration.status != "disabled"
+
+
+# ------------------------------------------------------------------------------
+class IntegrationIndex:
+    """
+    Lazily rebuilt, process-local structure built from integration rows.
+
+    Subclasses implement rebuild(). refresh() compares a one-row signature
+    (count, max id, max updated_at over served integrations) with the one
+    seen at the last rebuild and only calls rebuild() when it changed. The
+    signature is checked at most every `check_interval` seconds, straight
+    after commits in this process, or sooner when a caller passes max_age
+    (e.g. on a routing miss).
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def __init__(self, check_interval: float = 2.0) -> None:
+        self.check_interval = check_interval
+        self._signature: tuple | None = None
+        self._checked_at = float("-inf")
+        self._lock = threading.RLock()
+        _indexes.add(self)
+
+    def mark_stale(self) -> None:
+        """Force the next request to re-check the integrations signature."""
+        self._checked_at = float("-inf")
+
+    def due(self, max_age: float | None = None) -> bool:
+        """True if the signature is older than max_age (default: interval)."""
+        max_age = self.check_interval if max_age is None else max_age
+        return time.monotonic() - self._checked_at >= max_age
+
+    def refresh(self, max_age: float | None = None) -> bool:
+        """Rebuild if integrations changed; True if a rebuild happened."""
+        if not self.due(max_age):
+            return False
+        with self._lock:
+            if not self.due(max_age):
+                return False
+            signature = tuple(
+                db.session.execute(
+                    select(
+                        func.count(ApiIntegration.id),
+                        func.max(ApiIntegration.id),
+                        func.max(ApiIntegration.updated_at),
+                    ).where(served_integrations())
+                ).one()
+            )
+            self._checked_at = time.monotonic()
+            if signature == self._signature:
+                return False
+            self.rebuild()
+            self._signature = signature
+            return True
+
+    def rebuild(self) -> None:
+        raise NotImplementedError
+
+
+# ------------------------------------------------------------------------------
+def mark_integrations_changed(session: Session) -> None:
+    """
+    Flag a Core-level write to api_integrations on the session.
+
+    Bulk insert/update statements bypass the mapper events below, so
+    callers using them mark the session themselves; indexes are then
+    marked stale when it commits.
+    """
+    session.info[_CHANGED_KEY] = True
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(ApiIntegration, "after_insert")
+@event.listens_for(ApiIntegration, "after_update")
+@event.listens_for(ApiIntegration, "after_delete")
+def _integration_changed(mapper, connection: Connection, target) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_CHANGED_KEY] = True
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_commit")
+def _refresh_after_commit(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        for index in list(_indexes):
+            index.mark_stale()
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_rollback")
+def _discard_change_flag(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# app/metrics.py - (./app/metrics.py)
+# Per-thread request telemetry with a Prometheus text endpoint at /metrics.
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from flask import Flask, Response, abort, current_app, request
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds (seconds) of the latency histogram buckets; one more bucket
+# catches everything slower, as Prometheus' +Inf.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Roles that may read /metrics with a browser session instead of the token.
+METRICS_ROLES = frozenset({"operator", "admin", "api_admin"})
+
+# Extensions whose stats() numbers are exported as mcpapp_<name>_<key> gauges.
+EXPORTED_STATS = (
+    "gateway",
+    "async_gateway",
+    "response_cache",
+    "circuit_breakers",
+    "rate_limiter",
+    "user_cache",
+    "password_hasher",
+    "api_registry",
+)
+
+# Series layout: count, latency sum, DB queries, DB seconds, then buckets.
+_COUNT, _SUM, _QUERIES, _DB_SECONDS, _BUCKETS = 0, 1, 2, 3, 4
+
+# Dead-thread shards are folded into the retired totals past this many.
+_MAX_SHARDS = 256
+
+
+# ------------------------------------------------------------------------------
+def _new_series() -> list:
+    return [0, 0.0, 0, 0.0] + [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+# ------------------------------------------------------------------------------
+def _merge_into(table: dict, key, series: list) -> None:
+    total = table.get(key)
+    if total is None:
+        table[key] = series[:]
+    else:
+        for position, value in enumerate(series):
+            total[position] += value
+
+
+# ------------------------------------------------------------------------------
+class _Shard:
+    """
+    One thread's accumulators. Only that thread writes to it, so updates
+    take no lock; readers copy the dicts, which is atomic under the GIL.
+    """
+
+    __slots__ = (
+        "thread",
+        "series",
+        "statuses",
+        "queries",
+        "db_seconds",
+        "query_started",
+        "request_started",
+        "request_queries",
+        "request_db_seconds",
+        "integration_id",
+    )
+
+    def __init__(self, thread: threading.Thread | None) -> None:
+        self.thread = thread
+        # ("blueprint", name) / ("integration", id) -> series list
+        self.series: dict[tuple, list] = {}
+        # (blueprint, status class) -> count
+        self.statuses: dict[tuple[str, str], int] = {}
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.query_started = 0.0
+        self.request_started = 0.0
+        self.request_queries = 0
+        self.request_db_seconds = 0.0
+        self.integration_id: int | None = None
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class SeriesSummary:
+    """Totals and estimated percentiles for one blueprint or integration."""
+
+    requests: int
+    avg_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: float
+    db_ms_per_request: float
+
+    @classmethod
+    def from_series(cls, series: list) -> "SeriesSummary":
+        count = series[_COUNT] or 1
+        buckets = series[_BUCKETS:]
+        return cls(
+            requests=series[_COUNT],
+            avg_ms=round(series[_SUM] * 1000 / count, 2),
+            p50_ms=round(quantile(buckets, 0.50) * 1000, 2),
+            p95_ms=round(quantile(buckets, 0.95) * 1000, 2),
+            p99_ms=round(quantile(buckets, 0.99) * 1000, 2),
+            queries_per_request=round(series[_QUERIES] / count, 2),
+            db_ms_per_request=round(series[_DB_SECONDS] * 1000 / count, 2),
+        )
+
+
+# ------------------------------------------------------------------------------
+def quantile(buckets: list[int], q: float) -> float:
+    """
+    Estimate a quantile from histogram bucket counts.
+
+    Interpolates linearly inside the bucket holding the q-th observation,
+    as Prometheus' histogram_quantile() does; the overflow bucket reports
+    the largest finite bound.
+    """
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    lower = 0.0
+    for position, count in enumerate(buckets):
+        if position == len(LATENCY_BUCKETS):
+            return LATENCY_BUCKETS[-1]
+        upper = LATENCY_BUCKETS[position]
+        if count and seen + count >= rank:
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+        lower = upper
+    return LATENCY_BUCKETS[-1]
+
+
+# ------------------------------------------------------------------------------
+class RequestMetrics:
+    """
+    Request, latency and database telemetry kept in per-thread shards.
+
+    A before_request/after_request pair times every request and counts it
+    per blueprint (the endpoint name for blueprint-less routes such as
+    "gateway") and per integration when the gateway or a generated API
+    served it. SQLAlchemy cursor events add query counts and time to the
+    current thread's running totals, so each request records how many
+    queries it ran and how long they took. Latency goes into a fixed
+    bucket histogram from which p50/p95/p99 are estimated.
+
+    Each thread writes only its own shard, so recording takes no lock and
+    costs a few dict operations. Readers sum the shards; shards of exited
+    threads are folded into retired totals. Values are per process, like
+    the other in-memory stats on the operator dashboard.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._retired = _Shard(None)
+        self._lock = threading.Lock()
+        self._hooked = False
+
+    def init_app(self, app: Flask) -> None:
+        self.enabled = app.config["METRICS_ENABLED"]
+        app.extensions["metrics"] = self
+        if not self.enabled:
+            return
+        app.before_request(self._request_started)
+        app.after_request(self._request_finished)
+        app.add_url_rule("/metrics", endpoint="metrics", view_func=metrics_view)
+        if not self._hooked:
+            event.listen(Engine, "before_cursor_execute", self._query_started)
+            event.listen(Engine, "after_cursor_execute", self._query_finished)
+            self._hooked = True
+
+    # -- recording -----------------------------------------------------------
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard(threading.current_thread())
+            with self._lock:
+                if len(self._shards) >= _MAX_SHARDS:
+                    self._retire_dead()
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _retire_dead(self) -> None:
+        live = []
+        for shard in self._shards:
+            if shard.thread.is_alive():
+                live.append(shard)
+                continue
+            for key, series in shard.series.items():
+                _merge_into(self._retired.series, key, series)
+            for key, count in shard.statuses.items():
+                self._retired.statuses[key] = self._retired.statuses.get(key, 0) + count
+        self._shards = live
+
+    def _query_started(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self._shard().query_started = time.perf_counter()
+
+    def _query_finished(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        shard = self._shard()
+        shard.queries += 1
+        shard.db_seconds += time.perf_counter() - shard.query_started
+
+    def note_integration(self, integration_id: int) -> None:
+        """Attribute the current request to an integration."""
+        self._shard().integration_id = integration_id
+
+    def _request_started(self) -> None:
+        shard = self._shard()
+        shard.integration_id = None
+        shard.request_queries = shard.queries
+        shard.request_db_seconds = shard.db_seconds
+        shard.request_started = time.perf_counter()
+
+    def _request_finished(self, response: Response) -> Response:
+        shard = self._shard()
+        self._observe(
+            shard,
+            request.blueprint or request.endpoint or "unmatched",
+            response.status_code,
+            time.perf_counter() - shard.request_started,
+            shard.integration_id,
+            shard.queries - shard.request_queries,
+            shard.db_seconds - shard.request_db_seconds,
+        )
+        return response
+
+    def observe(
+        self,
+        name: str,
+        status: int,
+        seconds: float,
+        integration_id: int | None = None,
+        queries: int = 0,
+        db_seconds: float = 0.0,
+    ) -> None:
+        """Record one request handled outside Flask (the ASGI gateway)."""
+        if self.enabled:
+            self._observe(
+                self._shard(), name, status, seconds, integration_id, queries, db_seconds
+            )
+
+    @staticmethod
+    def _observe(
+        shard: _Shard,
+        name: str,
+        status: int,
+        seconds: float,
+        integration_id: int | None,
+        queries: int,
+        db_seconds: float,
+    ) -> None:
+        bucket = _BUCKETS + bisect_left(LATENCY_BUCKETS, seconds)
+        keys = [("blueprint", name)]
+        if integration_id is not None:
+            keys.append(("integration", integration_id))
+        for key in keys:
+            series = shard.series.get(key)
+            if series is None:
+                series = shard.series[key] = _new_series()
+            series[_COUNT] += 1
+            series[_SUM] += seconds
+            series[_QUERIES] += queries
+            series[_DB_SECONDS] += db_seconds
+            series[bucket] += 1
+        status_key = (name, f"{status // 100}xx")
+        shard.statuses[status_key] = shard.statuses.get(status_key, 0) + 1
+
+    # -- reading -------------------------------------------------------------
+
+    def collect(self) -> tuple[dict[tuple, list], dict[tuple[str, str], int]]:
+        """Summed (series, statuses) across every thread's shard."""
+        series: dict[tuple, list] = {}
+        statuses: dict[tuple[str, str], int] = {}
+        with self._lock:
+            shards = [self._retired, *self._shards]
+        for shard in shards:
+            for key, values in list(shard.series.items()):
+                _merge_into(series, key, values[:])
+            for key, count in list(shard.statuses.items()):
+                statuses[key] = statuses.get(key, 0) + count
+        return series, statuses
+
+    def summary(self, integration_ids=()) -> dict:
+        """Per-blueprint summaries, plus the given integrations' ones."""
+        series, statuses = self.collect()
+        wanted = set(integration_ids)
+        blueprints = {
+            key[1]: SeriesSummary.from_series(values)
+            for key, values in sorted(series.items(), key=lambda item: str(item[0]))
+            if key[0] == "blueprint"
+        }
+        return {
+            "enabled": self.enabled,
+            "blueprints": blueprints,
+            "errors": {
+                name: statuses.get((name, "5xx"), 0) for name in blueprints
+            },
+            "integrations": {
+                key[1]: SeriesSummary.from_series(values)
+                for key, values in series.items()
+                if key[0] == "integration" and key[1] in wanted
+            },
+        }
+
+    def render(self, app: Flask) -> str:
+        """Prometheus text exposition (format 0.0.4) of everything collected."""
+        series, statuses = self.collect()
+        lines = [
+            "# HELP mcpapp_http_requests_total Requests by blueprint and status class.",
+            "# TYPE mcpapp_http_requests_total counter",
+        ]
+        for (name, code), count in sorted(statuses.items()):
+            lines.append(
+                f'mcpapp_http_requests_total{{blueprint="{_escape(name)}",code="{code}"}} {count}'
+            )
+        for kind, label, metric in (
+            ("blueprint", "blueprint", "mcpapp_http"),
+            ("integration", "integration_id", "mcpapp_integration"),
+        ):
+            rows = sorted(
+                ((key[1], values) for key, values in series.items() if key[0] == kind),
+                key=lambda row: str(row[0]),
+            )
+            lines += [
+                f"# HELP {metric}_request_duration_seconds Request latency.",
+                f"# TYPE {metric}_request_duration_seconds histogram",
+            ]
+            for name, values in rows:
+                tag = f'{label}="{_escape(str(name))}"'
+                cumulative = 0
+                for bound, count in zip(
+                    (*LATENCY_BUCKETS, "+Inf"), values[_BUCKETS:]
+                ):
+                    cumulative += count
+                    lines.append(
+                        f'{metric}_request_duration_seconds_bucket{{{tag},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"{metric}_request_duration_seconds_sum{{{tag}}} {values[_SUM]:.6f}")
+                lines.append(f"{metric}_request_duration_seconds_count{{{tag}}} {values[_COUNT]}")
+            lines += [
+                f"# HELP {metric}_db_queries_total SQL statements run by requests.",
+                f"# TYPE {metric}_db_queries_total counter",
+            ]
+            lines += [
+                f'{metric}_db_queries_total{{{label}="{_escape(str(name))}"}} {values[_QUERIES]}'
+                for name, values in rows
+            ]
+            lines += [
+                f"# HELP {metric}_db_seconds_total Time spent in SQL by requests.",
+                f"# TYPE {metric}_db_seconds_total counter",
+            ]
+            lines += [
+                f'{metric}_db_seconds_total{{{label}="{_escape(str(name))}"}} {values[_DB_SECONDS]:.6f}'
+                for name, values in rows
+            ]
+
+        cache = app.extensions.get("response_cache")
+        if cache is not None:
+            lines += [
+                "# HELP mcpapp_gateway_cache_lookups_total Response-cache lookups by outcome.",
+                "# TYPE mcpapp_gateway_cache_lookups_total counter",
+            ]
+            for integration_id, counts in sorted(cache.counts().items()):
+                for outcome, count in zip(("hit", "revalidated", "miss"), counts):
+                    lines.append(
+                        f'mcpapp_gateway_cache_lookups_total{{integration_id="{integration_id}",'
+                        f'outcome="{outcome}"}} {count}'
+                    )
+
+        for name in EXPORTED_STATS:
+            extension = app.extensions.get(name)
+            if extension is None:
+                continue
+            for key, value in extension.stats().items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if isinstance(value, (int, float)):
+                    metric = f"mcpapp_{name}_{key}"
+                    lines.append(f"# TYPE {metric} gauge")
+                    lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------------------------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ------------------------------------------------------------------------------
+def metrics_view() -> Response:
+    """
+    Serve the Prometheus text exposition.
+
+    Scrapers send "Authorization: Bearer <METRICS_TOKEN>"; without a token
+    configured, or from a browser, an operator, admin or API admin
+    session is required.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    token = current_app.config["METRICS_TOKEN"]
+    supplied = request.headers.get("Authorization", "")
+    # Compare bytes: compare_digest() rejects non-ASCII str. WSGI headers
+    # are latin-1, so the encode cannot fail.
+    if not (
+        token
+        and hmac.compare_digest(
+            supplied.encode("latin-1"), f"Bearer {token}".encode()
+        )
+    ):
+        if not current_user.is_authenticated:
+            abort(401)
+        if not current_user.role or current_user.role.name not in METRICS_ROLES:
+            abort(403)
+    return Response(
+        metrics.render(current_app._get_current_object()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+metrics = RequestMetrics()
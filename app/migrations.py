@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+# app/migrations.py - (./app/migrations.py)
+# Versioned schema migrations, applied in order and recorded in schema_version.
+
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterator
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+from .extensions import db
+
+log = logging.getLogger(__name__)
+
+# One row (id=1) holding the number of the last applied migration.
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Prefix of the shadow table and triggers used by Operations.rebuild_table().
+_REBUILD_PREFIX = "_rebuild_"
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Migration:
+    """One numbered schema change; see the @migration functions below."""
+
+    version: int
+    description: str
+    upgrade: Callable[["Operations"], None]
+    transactional: bool = True
+
+
+MIGRATIONS: list[Migration] = []
+
+
+# ------------------------------------------------------------------------------
+def migration(description: str, transactional: bool = True) -> Callable:
+    """
+    Register the decorated function as the next migration.
+
+    Migrations are numbered in definition order and must never be edited
+    or reordered once released; change the schema by appending a new one.
+    A transactional migration runs in one transaction together with its
+    version bump. Non-transactional ones (online table rebuilds) commit
+    as they go and must be safe to re-run after a crash.
+    """
+
+    def register(upgrade: Callable[["Operations"], None]) -> Callable:
+        MIGRATIONS.append(
+            Migration(len(MIGRATIONS) + 1, description, upgrade, transactional)
+        )
+        return upgrade
+
+    return register
+
+
+# ------------------------------------------------------------------------------
+@contextlib.contextmanager
+def _transaction(engine: Engine, foreign_keys: bool = True) -> Iterator[Connection]:
+    with engine.connect() as connection:
+        if connection.dialect.name != "sqlite":
+            with connection.begin():
+                yield connection
+            return
+        # pysqlite only opens a transaction before DML, so DDL would commit
+        # on its own. Begin explicitly so a migration's DDL and its version
+        # bump commit together; IMMEDIATE also serializes concurrent runs.
+        connection.execution_options(isolation_level="AUTOCOMMIT")
+        enforced = connection.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        if enforced and not foreign_keys:
+            # Only takes effect outside a transaction; stops DROP TABLE
+            # from cascading deletes into referencing tables.
+            connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.exec_driver_sql("ROLLBACK")
+            raise
+        else:
+            connection.exec_driver_sql("COMMIT")
+        finally:
+            if enforced and not foreign_keys:
+                connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+
+
+# ------------------------------------------------------------------------------
+class Operations:
+    """
+    Idempotent DDL helpers handed to each migration.
+
+    Every helper checks the live schema first and does nothing when the
+    change is already there, so databases created by db.create_all() at
+    any earlier point are brought up to date by the same migrations as
+    new ones.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(self, engine: Engine, connection: Connection) -> None:
+        self.engine = engine
+        self.connection = connection
+        self.metadata = MetaData()
+
+    def has_table(self, name: str) -> bool:
+        return inspect(self.connection).has_table(name)
+
+    def has_column(self, table_name: str, name: str) -> bool:
+        columns = inspect(self.connection).get_columns(table_name)
+        return any(column["name"] == name for column in columns)
+
+    def has_index(self, table_name: str, name: str) -> bool:
+        indexes = inspect(self.connection).get_indexes(table_name)
+        return any(index["name"] == name for index in indexes)
+
+    def create_table(self, name: str, *columns, **kwargs) -> Table:
+        self._reflect_references(columns)
+        table = Table(name, self.metadata, *columns, **kwargs)
+        if not self.has_table(name):
+            table.create(self.connection)
+        return table
+
+    def add_column(self, table_name: str, column: Column) -> None:
+        if self.has_column(table_name, column.name):
+            return
+        Table(table_name, MetaData(), column)
+        ddl = CreateColumn(column).compile(dialect=self.connection.dialect)
+        self.connection.execute(
+            text(f"ALTER TABLE {self._quote(table_name)} ADD COLUMN {ddl}")
+        )
+
+    def create_index(self, name: str, table_name: str, *columns: str, **kw) -> None:
+        if self.has_index(table_name, name):
+            return
+        table = Table(table_name, MetaData(), autoload_with=self.connection)
+        Index(name, *(table.c[column] for column in columns), **kw).create(
+            self.connection
+        )
+
+    def execute(self, statement: str, **params) -> None:
+        self.connection.execute(text(statement), params)
+
+    def rebuild_table(
+        self, table: Table, batch_size: int = 5000, pause: float = 0.0
+    ) -> int:
+        """
+        Rebuild a SQLite table to match `table` without a long write lock.
+
+        SQLite's ALTER TABLE cannot change types, constraints or NOT NULL,
+        so the table is recreated (the documented 12-step procedure), but
+        online: a shadow table is created with triggers mirroring every
+        insert, update and delete on the old one, rows are copied
+        batch_size at a time in separate short transactions (sleeping
+        `pause` seconds between them), each index is then moved to the
+        shadow in its own transaction, and a final one drops the old
+        table, renames the shadow into place and restores the table's
+        other triggers (e.g. search). Writers wait for at most one batch
+        or one index build, never the whole copy. Columns missing from
+        the old table take their server defaults.
+
+        Needs a non-transactional migration and an integer primary key
+        named id. Returns the number of rows copied.
+
+        Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+        Modified:  2026-10-17
+        """
+        if self.engine.dialect.name != "sqlite":
+            raise NotImplementedError("Use ALTER TABLE on this database.")
+        name = table.name
+        shadow = f"{_REBUILD_PREFIX}{name}"
+        old_columns = {c["name"] for c in inspect(self.engine).get_columns(name)}
+        columns = [c.name for c in table.columns if c.name in old_columns]
+        quoted = ", ".join(self._quote(c) for c in columns)
+        new_values = ", ".join(f"NEW.{self._quote(c)}" for c in columns)
+        triggers = {
+            "ai": f"AFTER INSERT ON {name} BEGIN INSERT OR REPLACE INTO {shadow} "
+            f"({quoted}) VALUES ({new_values}); END",
+            "au": f"AFTER UPDATE ON {name} BEGIN DELETE FROM {shadow} WHERE "
+            f"id = OLD.id; INSERT OR REPLACE INTO {shadow} ({quoted}) "
+            f"VALUES ({new_values}); END",
+            "ad": f"AFTER DELETE ON {name} BEGIN DELETE FROM {shadow} WHERE "
+            f"id = OLD.id; END",
+        }
+
+        with _transaction(self.engine) as connection:
+            # Leftovers of an interrupted run are discarded and redone.
+            for suffix in triggers:
+                connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {shadow}_{suffix}")
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {shadow}")
+            self._reflect_references(table.columns)
+            shadow_table = table.to_metadata(self.metadata, name=shadow)
+            connection.execute(CreateTable(shadow_table))
+            for suffix, body in triggers.items():
+                connection.exec_driver_sql(f"CREATE TRIGGER {shadow}_{suffix} {body}")
+
+        copied = 0
+        last_id = 0
+        while True:
+            with _transaction(self.engine) as connection:
+                upper = connection.exec_driver_sql(
+                    f"SELECT max(id) FROM (SELECT id FROM {name} WHERE id > ? "
+                    f"ORDER BY id LIMIT ?)",
+                    (last_id, batch_size),
+                ).scalar()
+                if upper is None:
+                    break
+                # Rows already written by a trigger are newer; keep them.
+                result = connection.exec_driver_sql(
+                    f"INSERT OR IGNORE INTO {shadow} ({quoted}) SELECT {quoted} "
+                    f"FROM {name} WHERE id > ? AND id <= ?",
+                    (last_id, upper),
+                )
+                copied += max(result.rowcount, 0)
+                last_id = upper
+            if pause:
+                time.sleep(pause)
+
+        # Index names are database-wide, so each old index is dropped just
+        # before its replacement is built on the shadow.
+        for index in shadow_table.indexes:
+            with _transaction(self.engine) as connection:
+                connection.exec_driver_sql(
+                    f"DROP INDEX IF EXISTS {self._quote(index.name)}"
+                )
+                index.create(connection)
+
+        with _transaction(self.engine, foreign_keys=False) as connection:
+            kept_triggers = connection.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = ? AND name NOT LIKE ?",
+                (name, f"{shadow}%"),
+            ).scalars().all()
+            connection.exec_driver_sql(f"DROP TABLE {name}")
+            connection.exec_driver_sql(f"ALTER TABLE {shadow} RENAME TO {name}")
+            for statement in kept_triggers:
+                connection.exec_driver_sql(statement)
+        return copied
+
+    def _reflect_references(self, columns) -> None:
+        # Foreign keys resolve against self.metadata: reflect the tables
+        # they point at, which earlier migrations created.
+        for column in columns:
+            for key in getattr(column, "foreign_keys", ()):
+                target = key.target_fullname.rpartition(".")[0]
+                if target not in self.metadata.tables:
+                    Table(target, self.metadata, autoload_with=self.connection)
+
+    def _quote(self, name: str) -> str:
+        return self.connection.dialect.identifier_preparer.quote(name)
+
+
+# ------------------------------------------------------------------------------
+def head_version() -> int:
+    return len(MIGRATIONS)
+
+
+# ------------------------------------------------------------------------------
+def current_version(connection: Connection | None = None) -> int | None:
+    """
+    Return the applied schema version with one primary-key lookup.
+
+    None means the schema_version table does not exist (a new database,
+    or one created by db.create_all() before migrations).
+    """
+    query = select(schema_version.c.version).where(schema_version.c.id == 1)
+    try:
+        if connection is not None:
+            return connection.execute(query).scalar() or 0
+        return db.session.execute(query).scalar() or 0
+    except DBAPIError:
+        if connection is None:
+            db.session.rollback()
+        return None
+
+
+# ------------------------------------------------------------------------------
+def upgrade(engine: Engine | None = None, target: int | None = None) -> list[int]:
+    """
+    Apply pending migrations up to target (default: the latest).
+
+    Each transactional migration and its version bump commit together;
+    concurrent callers serialize on the database (and on init_lock in
+    bootstrap) and re-check the version first, so a migration runs once.
+    Returns the versions applied by this call.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    engine = engine or db.engine
+    target = head_version() if target is None else target
+    with _transaction(engine) as connection:
+        schema_version.create(connection, checkfirst=True)
+
+    applied = []
+    for step in MIGRATIONS[:target]:
+        with _transaction(engine) as connection:
+            if current_version(connection) >= step.version:
+                continue
+            if step.transactional:
+                step.upgrade(Operations(engine, connection))
+                _set_version(connection, step.version)
+        if not step.transactional:
+            with engine.connect() as connection:
+                step.upgrade(Operations(engine, connection))
+                connection.commit()
+            with _transaction(engine) as connection:
+                _set_version(connection, step.version)
+        log.info("Applied migration %d: %s", step.version, step.description)
+        applied.append(step.version)
+    return applied
+
+
+# ------------------------------------------------------------------------------
+def _set_version(connection: Connection, version: int) -> None:
+    values = {"version": version, "applied_at": datetime.utcnow()}
+    updated = connection.execute(
+        schema_version.update().where(schema_version.c.id == 1).values(**values)
+    ).rowcount
+    if not updated:
+        connection.execute(schema_version.insert().values(id=1, **values))
+
+
+# ------------------------------------------------------------------------------
+def missing_schema(engine: Engine | None = None) -> list[str]:
+    """
+    List tables, columns and indexes of the models absent from the database.
+
+    Empty after upgrade() unless a model changed without a migration.
+    """
+    inspector = inspect(engine or db.engine)
+    missing = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            missing.append(f"table {table.name}")
+            continue
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        missing += [
+            f"column {table.name}.{c.name}" for c in table.columns if c.name not in columns
+        ]
+        indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        missing += [
+            f"index {i.name}" for i in table.indexes if i.name not in indexes
+        ]
+    return missing
+
+
+# ------------------------------------------------------------------------------
+def check_schema_version() -> bool:
+    """
+    Startup check for deployments that migrate out of band (AUTO_INIT_DB
+    off): one query, and an error in the log if the database is behind.
+    """
+    version = current_version()
+    if version == head_version():
+        return True
+    log.error(
+        "Database schema is at version %s but this code expects %d; "
+        "run `flask db-upgrade`.",
+        version,
+        head_version(),
+    )
+    return False
+
+
+# -- migrations -----------------------------------------------------------------
+# Table definitions are spelled out as of each migration rather than taken
+# from app/models.py, so old migrations keep meaning the same thing.
+
+
+# ------------------------------------------------------------------------------
+@migration("Baseline: roles, users, api_integrations, site_settings")
+def _baseline(op: Operations) -> None:
+    op.create_table(
+        "roles",
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), unique=True, nullable=False),
+        Column("description", String(255)),
+    )
+    op.create_table(
+        "users",
+        Column("id", Integer, primary_key=True),
+        Column("email", String(120), unique=True, nullable=False),
+        Column("full_name", String(120), nullable=False),
+        Column("password_hash", String(255), nullable=False),
+        Column("active", Boolean),
+        Column("role_id", Integer, ForeignKey("roles.id")),
+    )
+    op.create_table(
+        "api_integrations",
+        Column("id", Integer, primary_key=True),
+        Column("name", String(120), nullable=False),
+        Column("system_name", String(120), nullable=False),
+        Column("base_url", String(255), nullable=False),
+        Column("endpoint_path", String(255), nullable=False),
+        Column("http_method", String(10)),
+        Column("status", String(20)),
+        Column("auth_type", String(50)),
+        Column("api_key", String(255)),
+        Column("notes", Text),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime),
+        Column("owner_id", Integer, ForeignKey("users.id"), nullable=False),
+        Column("docusaurus_doc_path", String(255)),
+    )
+    op.create_table(
+        "site_settings",
+        Column("id", Integer, primary_key=True),
+        Column("key", String(100), unique=True, nullable=False),
+        Column("value", String(255), nullable=False),
+    )
+
+
+# ------------------------------------------------------------------------------
+@migration("Health probe results and integration_checks history")
+def _health_checks(op: Operations) -> None:
+    op.add_column("api_integrations", Column("last_checked_at", DateTime))
+    op.add_column("api_integrations", Column("last_latency_ms", Float))
+    op.add_column("api_integrations", Column("last_http_status", Integer))
+    op.add_column("api_integrations", Column("last_error", String(255)))
+    op.create_table(
+        "integration_checks",
+        Column("id", Integer, primary_key=True),
+        Column(
+            "integration_id",
+            Integer,
+            ForeignKey("api_integrations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        Column("checked_at", DateTime, nullable=False),
+        Column("hour_bucket", Integer, nullable=False),
+        Column("ok", Boolean, nullable=False),
+        Column("http_status", Integer),
+        Column("latency_ms", Float),
+        Column("error", String(255)),
+    )
+    op.create_index("ix_integration_checks_hour_bucket", "integration_checks",
+                    "hour_bucket")
+    op.create_index("ix_integration_checks_integration_bucket",
+                    "integration_checks", "integration_id", "hour_bucket")
+
+
+# ------------------------------------------------------------------------------
+@migration("Keyset indexes on api_integrations")
+def _integration_indexes(op: Operations) -> None:
+    # Each index leads with the filter column and ends with the keyset
+    # tie-breaker, so it also serves plain lookups on (owner_id, name),
+    # status, system_name and updated_at.
+    op.create_index("ix_api_integrations_name_id", "api_integrations", "name", "id")
+    op.create_index("ix_api_integrations_status_name_id", "api_integrations",
+                    "status", "name", "id")
+    op.create_index("ix_api_integrations_system_name_name_id", "api_integrations",
+                    "system_name", "name", "id")
+    op.create_index("ix_api_integrations_owner_name_id", "api_integrations",
+                    "owner_id", "name", "id")
+    op.create_index("ix_api_integrations_updated_at_id", "api_integrations",
+                    "updated_at", "id")
+
+
+# ------------------------------------------------------------------------------
+@migration("site_settings_version for cached settings")
+def _settings_version(op: Operations) -> None:
+    op.create_table(
+        "site_settings_version",
+        Column("id", Integer, primary_key=True),
+        Column("version", Integer, nullable=False),
+    )
+
+
+# ------------------------------------------------------------------------------
+@migration("Gateway cache_ttl and rate_limit per integration")
+def _gateway_columns(op: Operations) -> None:
+    op.add_column("api_integrations", Column("cache_ttl", Integer))
+    op.add_column("api_integrations", Column("rate_limit", String(50)))
+
+
+# ------------------------------------------------------------------------------
+@migration("Audit events and daily summaries")
+def _audit_log(op: Operations) -> None:
+    op.create_table(
+        "audit_events",
+        Column("id", Integer, primary_key=True),
+        Column("occurred_at", DateTime, nullable=False),
+        Column("actor_id", Integer),
+        Column("entity_type", String(20), nullable=False),
+        Column("entity_id", Integer, nullable=False),
+        Column("action", String(10), nullable=False),
+        Column("field", String(50)),
+        Column("old_value", Text),
+        Column("new_value", Text),
+    )
+    op.create_index("ix_audit_events_entity_id", "audit_events",
+                    "entity_type", "entity_id", "id")
+    op.create_index("ix_audit_events_actor_id", "audit_events", "actor_id", "id")
+    op.create_table(
+        "audit_daily_summaries",
+        Column("id", Integer, primary_key=True),
+        Column("day", Date, nullable=False),
+        Column("entity_type", String(20), nullable=False),
+        Column("entity_id", Integer, nullable=False),
+        Column("action", String(10), nullable=False),
+        Column("field", String(50), nullable=False),
+        Column("event_count", Integer, nullable=False),
+        Column("first_at", DateTime, nullable=False),
+        Column("last_at", DateTime, nullable=False),
+        Column("last_actor_id", Integer),
+        Column("first_old_value", Text),
+        Column("last_new_value", Text),
+        UniqueConstraint("entity_type", "entity_id", "day", "action", "field",
+                         name="uq_audit_daily_summaries_key"),
+    )
+
+
+# ------------------------------------------------------------------------------
+@migration("Admin-approved scaffold digests")
+def _scaffold_approval(op: Operations) -> None:
+    op.add_column(
+        "api_integrations", Column("scaffold_approved_sha256", String(64))
+    )
+
+
+# ------------------------------------------------------------------------------
+@migration("Drop check history orphaned before foreign keys were enforced")
+def _orphaned_checks(op: Operations) -> None:
+    op.execute(
+        "DELETE FROM integration_checks WHERE integration_id NOT IN "
+        "(SELECT id FROM api_integrations)"
+    )
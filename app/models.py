@@ -5,9 +5,9 @@
 from datetime import datetime
 
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 
 from .extensions import db
+from .passwords import password_hasher
 
 
 # ------------------------------------------------------------------------------
@@ -39,12 +39,13 @@ class User(UserMixin, db.Model):
     """
     User model for authentication and authorization.
 
-    Stores salted+hashed passwords using Werkzeug helpers. For serious
-    deployments, prefer a stronger password policy and separate audit
-    logging of authentication events.
+    Stores salted+hashed passwords using the configured hashing policy
+    (see app/passwords.py). Hashes made under an older policy still verify
+    and are upgraded on the next successful login. For serious
+    deployments, add separate audit logging of authentication events.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
 
     __tablename__ = "users"
@@ -63,10 +64,13 @@ class User(UserMixin, db.Model):
     )
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return password_hasher.needs_rehash(self.password_hash)
 
     @property
     def is_admin(self) -> bool:
@@ -98,6 +102,17 @@ class ApiIntegration(db.Model):
     """
 
     __tablename__ = "api_integrations"
+    __table_args__ = (
+        # Each index mirrors a keyset sort in queries.INTEGRATION_SORTS. The
+        # status/system_name/owner_id prefixes also serve equality filters.
+        db.Index("ix_api_integrations_name_id", "name", "id"),
+        db.Index("ix_api_integrations_status_name_id", "status", "name", "id"),
+        db.Index(
+            "ix_api_integrations_system_name_name_id", "system_name", "name", "id"
+        ),
+        db.Index("ix_api_integrations_owner_name_id", "owner_id", "name", "id"),
+        db.Index("ix_api_integrations_updated_at_id", "updated_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
@@ -124,6 +139,67 @@ class ApiIntegration(db.Model):
     # Simple Docusaurus doc path, e.g. /integrations/my-api
     docusaurus_doc_path = db.Column(db.String(255))
 
+    # Outcome of the most recent outbound health probe (see health_checks.py).
+    last_checked_at = db.Column(db.DateTime)
+    last_latency_ms = db.Column(db.Float)
+    last_http_status = db.Column(db.Integer)
+    last_error = db.Column(db.String(255))
+
+    # Seconds the gateway may serve a cached upstream response (see
+    # response_cache.py); empty or 0 forwards every request.
+    cache_ttl = db.Column(db.Integer)
+
+    # Token-bucket limit such as "120/m" (see rate_limit.py); empty uses
+    # the RATE_LIMIT_INTEGRATION default.
+    rate_limit = db.Column(db.String(50))
+
+    # SHA-256 of a hand-edited api/ scaffold an admin approved; the loader
+    # only runs edited modules whose digest matches (see api_loader.py).
+    scaffold_approved_sha256 = db.Column(db.String(64))
+
+
+# ------------------------------------------------------------------------------
+def hour_bucket(moment: datetime) -> int:
+    """Return the number of whole hours between the Unix epoch and moment."""
+    return int((moment - datetime(1970, 1, 1)).total_seconds() // 3600)
+
+
+# ------------------------------------------------------------------------------
+class IntegrationCheck(db.Model):
+    """
+    Append-only history of outbound health probes for each integration.
+
+    Rows are only ever inserted. hour_bucket stores whole hours since the
+    epoch so "last N hours" dashboard queries become an indexed integer
+    range scan instead of a datetime comparison across the whole table.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    __tablename__ = "integration_checks"
+    __table_args__ = (
+        db.Index("ix_integration_checks_hour_bucket", "hour_bucket"),
+        db.Index(
+            "ix_integration_checks_integration_bucket",
+            "integration_id",
+            "hour_bucket",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    integration_id = db.Column(
+        db.Integer,
+        db.ForeignKey("api_integrations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    checked_at = db.Column(db.DateTime, nullable=False)
+    hour_bucket = db.Column(db.Integer, nullable=False)
+    ok = db.Column(db.Boolean, nullable=False)
+    http_status = db.Column(db.Integer)
+    latency_ms = db.Column(db.Float)
+    error = db.Column(db.String(255))
+
 
 # ------------------------------------------------------------------------------
 class SiteSetting(db.Model):
@@ -143,6 +219,93 @@ class SiteSetting(db.Model):
     value = db.Column(db.String(255), nullable=False)
 
 
+# ------------------------------------------------------------------------------
+class SiteSettingsVersion(db.Model):
+    """
+    Single-row, monotonically increasing version of the site_settings table.
+
+    Bumped in the same transaction as any SiteSetting change so that every
+    worker can detect edits with one primary-key lookup (settings_store.py).
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    __tablename__ = "site_settings_version"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# ------------------------------------------------------------------------------
+class AuditEvent(db.Model):
+    """
+    One append-only change event: who changed which field of what, and how.
+
+    Written in batches by app/audit_log.py, never updated; events older
+    than AUDIT_RETENTION_DAYS are rolled up into AuditDailySummary rows.
+    A create or delete is a single event with field NULL and the entity's
+    label (name, email or key) as its new or old value. actor_id is NULL
+    for changes made outside a logged-in request (CLI, background jobs)
+    and has no foreign key, so the log survives user cleanups.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    __tablename__ = "audit_events"
+    # Keyset pages (newest first) per entity and per actor; id order is
+    # also time order, so no separate index on occurred_at is kept.
+    __table_args__ = (
+        db.Index("ix_audit_events_entity_id", "entity_type", "entity_id", "id"),
+        db.Index("ix_audit_events_actor_id", "actor_id", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    occurred_at = db.Column(db.DateTime, nullable=False)
+    actor_id = db.Column(db.Integer)
+    entity_type = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(10), nullable=False)
+    field = db.Column(db.String(50))
+    old_value = db.Column(db.Text)
+    new_value = db.Column(db.Text)
+
+
+# ------------------------------------------------------------------------------
+class AuditDailySummary(db.Model):
+    """
+    Roll-up of one day's audit events per entity, action and field.
+
+    Keeps the count, the value before the first change and after the last
+    one, and who made the last change; field is "" for creates/deletes.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    __tablename__ = "audit_daily_summaries"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "entity_type", "entity_id", "day", "action", "field",
+            name="uq_audit_daily_summaries_key",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    entity_type = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(10), nullable=False)
+    field = db.Column(db.String(50), nullable=False, default="")
+    event_count = db.Column(db.Integer, nullable=False)
+    first_at = db.Column(db.DateTime, nullable=False)
+    last_at = db.Column(db.DateTime, nullable=False)
+    last_actor_id = db.Column(db.Integer)
+    first_old_value = db.Column(db.Text)
+    last_new_value = db.Column(db.Text)
+
+
 # ------------------------------------------------------------------------------
 def seed_initial_data() -> None:
     """
@@ -184,3 +347,9 @@ def seed_initial_data() -> None:
         admin.set_password("admin123")
         db.session.add(admin)
         db.session.commit()
+
+    # Written last: bootstrap.database_ready() treats this row as the marker
+    # that seeding completed.
+    if db.session.get(SiteSettingsVersion, 1) is None:
+        db.session.add(SiteSettingsVersion(id=1, version=0))
+        db.session.commit()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# app/passwords.py - (./app/passwords.py)
+# Configurable password hashing policy run on a bounded KDF worker pool.
+
+import hmac
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from flask import Flask
+from werkzeug.security import check_password_hash, generate_password_hash
+
+try:  # Optional dependency: pip install argon2-cffi
+    import argon2
+except ImportError:  # pragma: no cover - depends on environment
+    argon2 = None
+
+T = TypeVar("T")
+
+HASH_ALGORITHMS = ("scrypt", "pbkdf2", "argon2")
+
+
+# ------------------------------------------------------------------------------
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the KDF queue is full or a hash timed out; answer 503."""
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class HashPolicy:
+    """
+    Password hashing algorithm plus its cost parameters.
+
+    scrypt and pbkdf2 use Werkzeug's hash format, so hashes created before
+    this policy existed keep verifying. argon2 requires argon2-cffi.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    algorithm: str = "scrypt"
+    scrypt_n: int = 32768
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    pbkdf2_iterations: int = 600000
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    argon2_parallelism: int = 4
+    salt_length: int = 16
+
+    def __post_init__(self) -> None:
+        if self.algorithm not in HASH_ALGORITHMS:
+            raise ValueError(
+                f"Unknown PASSWORD_HASH_ALGORITHM {self.algorithm!r}; "
+                f"expected one of {', '.join(HASH_ALGORITHMS)}"
+            )
+        if self.algorithm == "argon2" and argon2 is None:
+            raise ValueError("PASSWORD_HASH_ALGORITHM 'argon2' needs argon2-cffi")
+
+    @classmethod
+    def from_config(cls, config) -> "HashPolicy":
+        return cls(
+            algorithm=config["PASSWORD_HASH_ALGORITHM"],
+            scrypt_n=config["PASSWORD_SCRYPT_N"],
+            scrypt_r=config["PASSWORD_SCRYPT_R"],
+            scrypt_p=config["PASSWORD_SCRYPT_P"],
+            pbkdf2_iterations=config["PASSWORD_PBKDF2_ITERATIONS"],
+            argon2_time_cost=config["PASSWORD_ARGON2_TIME_COST"],
+            argon2_memory_cost=config["PASSWORD_ARGON2_MEMORY_COST"],
+            argon2_parallelism=config["PASSWORD_ARGON2_PARALLELISM"],
+        )
+
+    @property
+    def werkzeug_method(self) -> str | None:
+        """Method string as stored before the first '$' of a Werkzeug hash."""
+        if self.algorithm == "scrypt":
+            return f"scrypt:{self.scrypt_n}:{self.scrypt_r}:{self.scrypt_p}"
+        if self.algorithm == "pbkdf2":
+            return f"pbkdf2:sha256:{self.pbkdf2_iterations}"
+        return None
+
+    def argon2_hasher(self):
+        return argon2.PasswordHasher(
+            time_cost=self.argon2_time_cost,
+            memory_cost=self.argon2_memory_cost,
+            parallelism=self.argon2_parallelism,
+            salt_len=self.salt_length,
+        )
+
+    def hash(self, password: str) -> str:
+        if self.algorithm == "argon2":
+            return self.argon2_hasher().hash(password)
+        return generate_password_hash(
+            password, method=self.werkzeug_method, salt_length=self.salt_length
+        )
+
+    def verify(self, stored_hash: str, password: str) -> bool:
+        if stored_hash.startswith("$argon2"):
+            if argon2 is None:
+                return False
+            try:
+                return argon2.PasswordHasher().verify(stored_hash, password)
+            except (
+                argon2.exceptions.VerificationError,
+                argon2.exceptions.InvalidHashError,
+            ):
+                return False
+        return check_password_hash(stored_hash, password)
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """True if stored_hash was made with another algorithm or cost."""
+        if self.algorithm == "argon2":
+            if not stored_hash.startswith("$argon2"):
+                return True
+            return self.argon2_hasher().check_needs_rehash(stored_hash)
+        method = stored_hash.split("$", 1)[0]
+        return not hmac.compare_digest(method, self.werkzeug_method)
+
+
+# ------------------------------------------------------------------------------
+class PasswordHasher:
+    """
+    Run password KDFs on a small, bounded thread pool.
+
+    hashlib's scrypt/pbkdf2 and argon2-cffi release the GIL, so a pool
+    sized to the CPU count keeps a burst of logins from occupying every
+    request thread with KDF work. At most `max_workers + max_queue` calls
+    may be in flight, counting calls whose caller already gave up; beyond
+    that, or when a call waits longer than `timeout`, callers get
+    PasswordHasherBusy instead of piling up behind the pool.
+
+    Unknown-email logins skip the KDF: reject_unknown() queues a task on
+    the same pool that sleeps for a moving average of recent in-worker
+    verify times under the current policy. It waits in the same queue as
+    a real verify, so the response time does not reveal whether the
+    account exists, even under load. Until a verify under the current
+    policy has been timed, it instead runs one real verify against a dummy
+    hash that configure() starts computing on the pool, so it still costs
+    exactly one KDF, like a wrong password.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(
+        self,
+        policy: HashPolicy | None = None,
+        max_workers: int = 2,
+        max_queue: int = 32,
+        timeout: float = 10.0,
+    ) -> None:
+        self.policy = policy or HashPolicy()
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._verify_seconds: float | None = None
+        self._dummy: Future | None = None
+        self.rejected = 0
+
+    def init_app(self, app: Flask) -> None:
+        self.configure(
+            HashPolicy.from_config(app.config),
+            max_workers=app.config["PASSWORD_HASH_WORKERS"],
+            max_queue=app.config["PASSWORD_HASH_QUEUE"],
+            timeout=app.config["PASSWORD_HASH_TIMEOUT"],
+        )
+        app.extensions["password_hasher"] = self
+
+    def configure(
+        self,
+        policy: HashPolicy,
+        max_workers: int | None = None,
+        max_queue: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        with self._lock:
+            if policy != self.policy:
+                self._verify_seconds = None
+                self._dummy = None
+            self.policy = policy
+            if max_workers is not None and max_workers != self.max_workers:
+                self.max_workers = max_workers
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+            if max_queue is not None:
+                self.max_queue = max_queue
+            if timeout is not None:
+                self.timeout = timeout
+        self._prepare_dummy()
+
+    def _prepare_dummy(self) -> Future:
+        """Hash a random secret under the current policy, once per policy."""
+        executor = self._pool()
+        with self._lock:
+            if self._dummy is None:
+                self._dummy = executor.submit(
+                    self.policy.hash, secrets.token_urlsafe(16)
+                )
+            return self._dummy
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(1, self.max_workers),
+                        thread_name_prefix="password-kdf",
+                    )
+        return self._executor
+
+    def _run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._inflight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("password hashing queue is full")
+            self._inflight += 1
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the task finishes (or is cancelled), not when this
+        # caller stops waiting, so abandoned tasks still count to the bound.
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("password hashing timed out") from None
+
+    def _release(self, future: Future | None = None) -> None:
+        with self._lock:
+            self._inflight -= 1
+
+    def hash(self, password: str) -> str:
+        return self._run(self.policy.hash, password)
+
+    def verify(self, stored_hash: str, password: str) -> bool:
+        return self._run(self._timed_verify, stored_hash, password)
+
+    def _timed_verify(self, stored_hash: str, password: str) -> bool:
+        # Runs on a pool thread: measures the KDF itself, not the queue wait.
+        started = time.perf_counter()
+        result = self.policy.verify(stored_hash, password)
+        # Only hashes made under the current policy say what a verify costs.
+        if not self.policy.needs_rehash(stored_hash):
+            self._observe(time.perf_counter() - started)
+        return result
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        return self.policy.needs_rehash(stored_hash)
+
+    def reject_unknown(self) -> None:
+        """Take as long as a verify, queueing like one, without KDF work."""
+        seconds = self._verify_seconds
+        if seconds is None:
+            # One real, failing verify; its time calibrates the average.
+            try:
+                dummy = self._prepare_dummy().result(timeout=self.timeout)
+            except FutureTimeoutError:
+                raise PasswordHasherBusy("password hashing timed out") from None
+            self.verify(dummy, secrets.token_urlsafe(16))
+            return
+        self._run(self._dummy_verify, seconds)
+
+    @staticmethod
+    def _dummy_verify(seconds: float) -> None:
+        # Holds a worker for as long as a KDF would; small jitter so the two
+        # paths are not distinguishable by variance.
+        time.sleep(seconds * (0.95 + secrets.randbelow(100) / 1000))
+
+    def _observe(self, seconds: float) -> None:
+        with self._lock:
+            if self._verify_seconds is None:
+                self._verify_seconds = seconds
+            else:
+                self._verify_seconds += 0.1 * (seconds - self._verify_seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "algorithm": self.policy.algorithm,
+                "workers": self.max_workers,
+                "queue": self.max_queue,
+                "inflight": self._inflight,
+                "rejected": self.rejected,
+                "verify_ms": round((self._verify_seconds or 0.0) * 1000, 1),
+            }
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+password_hasher = PasswordHasher()
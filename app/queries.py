@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# app/queries.py - (./app/queries.py)
+# Reusable query helpers: keyset pagination and SQL-side aggregates.
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from flask import abort, current_app
+from sqlalchemy import Select, case, func, literal, select, tuple_
+from sqlalchemy.orm import joinedload, load_only
+
+from .extensions import db
+from .models import ApiIntegration, IntegrationCheck, User, hour_bucket
+from .search import get_search_backend
+
+# Integration statuses always shown on dashboards, even with a zero count.
+INTEGRATION_STATUSES = ("enabled", "disabled", "error")
+
+
+# ------------------------------------------------------------------------------
+@dataclass
+class KeysetPage:
+    """
+    One page of keyset-paginated results plus opaque cursors.
+
+    next_cursor / prev_cursor are None when there is nothing further in
+    that direction.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    items: list
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+# ------------------------------------------------------------------------------
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort-key values as a URL-safe opaque cursor token."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+# ------------------------------------------------------------------------------
+def decode_cursor(token: str | None, sort_columns: Sequence) -> list | None:
+    """
+    Decode a cursor token into bind values for sort_columns.
+
+    Returns None for missing or malformed input, including a token whose
+    values do not match the columns' types (each must be null, or an
+    int/float/str scalar of the column's type; datetimes as ISO strings),
+    so a tampered cursor never reaches the database.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(sort_columns):
+        return None
+    decoded = []
+    for value, column in zip(values, sort_columns):
+        try:
+            decoded.append(_from_json_value(value, column))
+        except ValueError:
+            return None
+    return decoded
+
+
+# ------------------------------------------------------------------------------
+def keyset_paginate(
+    stmt: Select,
+    sort_columns: Sequence,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = 50,
+    descending: bool = False,
+) -> KeysetPage:
+    """
+    Paginate an ORM select by seeking past a cursor instead of using OFFSET.
+
+    sort_columns must end with a unique column (normally the primary key)
+    so the ordering is total. The WHERE clause compares the whole sort key
+    as a row value, which lets the database seek straight into a matching
+    composite index: page 500 costs the same as page 1. A cursor that
+    does not decode for these columns aborts the request with 400.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    key = tuple_(*sort_columns)
+    after_values = decode_cursor(after, sort_columns)
+    before_values = decode_cursor(before, sort_columns)
+    if (after and after_values is None) or (before and before_values is None):
+        abort(400, description="Invalid pagination cursor.")
+    backwards = before_values is not None and after_values is None
+
+    # Walking backwards flips both the comparison and the ORDER BY, then
+    # the fetched rows are reversed back into display order.
+    forward_order = not descending
+    ascending = forward_order != backwards
+    if backwards:
+        cursor_values = before_values
+    else:
+        cursor_values = after_values
+    if cursor_values is not None:
+        bound = tuple_(
+            *(
+                literal(value, column.type)
+                for value, column in zip(cursor_values, sort_columns)
+            )
+        )
+        stmt = stmt.where(key > bound if ascending else key < bound)
+    order = [c.asc() if ascending else c.desc() for c in sort_columns]
+    rows = list(db.session.scalars(stmt.order_by(*order).limit(limit + 1)).unique())
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    def cursor_for(item) -> str:
+        return encode_cursor(
+            [_json_value(getattr(item, c.key)) for c in sort_columns]
+        )
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if backwards:
+            next_cursor = cursor_for(rows[-1])
+            prev_cursor = cursor_for(rows[0]) if has_more else None
+        else:
+            next_cursor = cursor_for(rows[-1]) if has_more else None
+            prev_cursor = cursor_for(rows[0]) if cursor_values is not None else None
+    return KeysetPage(items=rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+# ------------------------------------------------------------------------------
+def _json_value(value: Any) -> Any:
+    """Make sort-key values JSON-safe (datetimes become ISO strings)."""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+# ------------------------------------------------------------------------------
+def _from_json_value(value: Any, column) -> Any:
+    """
+    Reverse _json_value so cursor bounds bind with the column's type;
+    raises ValueError for a value the column cannot hold.
+    """
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError("expected an ISO datetime string")
+        return datetime.fromisoformat(value)
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("expected a scalar")
+    if python_type is int and not isinstance(value, int):
+        raise ValueError("expected an integer")
+    if python_type is float and isinstance(value, str):
+        raise ValueError("expected a number")
+    if python_type is str and not isinstance(value, str):
+        raise ValueError("expected a string")
+    return value
+
+
+# ------------------------------------------------------------------------------
+def integration_status_counts(**filters: Any) -> dict[str, int]:
+    """
+    Count integrations per status with a single GROUP BY query.
+
+    Keyword arguments are passed to filter_by so counts can be scoped, e.g.
+    integration_status_counts(owner_id=3).
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    stmt = (
+        select(ApiIntegration.status, func.count())
+        .filter_by(**filters)
+        .group_by(ApiIntegration.status)
+    )
+    counts = dict.fromkeys(INTEGRATION_STATUSES, 0)
+    counts.update({status: n for status, n in db.session.execute(stmt)})
+    return counts
+
+
+# ------------------------------------------------------------------------------
+@dataclass
+class IntegrationListFilters:
+    """
+    Validated filter, sort and cursor arguments for integration list views.
+
+    Built from request.args via from_args(); as_query_args() returns the
+    non-cursor values so templates can carry them across page links.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    status: str | None = None
+    system_name: str | None = None
+    search: str | None = None
+    sort: str = "name"
+    descending: bool = False
+    per_page: int | None = None
+    after: str | None = None
+    before: str | None = None
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, str]) -> "IntegrationListFilters":
+        status = args.get("status") or None
+        sort = args.get("sort") or "name"
+        try:
+            per_page = int(args.get("per_page") or 0) or None
+        except ValueError:
+            per_page = None
+        return cls(
+            status=status if status in INTEGRATION_STATUSES else None,
+            system_name=(args.get("system_name") or "").strip() or None,
+            search=(args.get("q") or "").strip() or None,
+            sort=sort if sort in INTEGRATION_SORTS else "name",
+            descending=args.get("dir") == "desc",
+            per_page=per_page,
+            after=args.get("after") or None,
+            before=args.get("before") or None,
+        )
+
+    def as_query_args(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "system_name": self.system_name,
+            "q": self.search,
+            "sort": None if self.sort == "name" else self.sort,
+            "dir": "desc" if self.descending else None,
+            "per_page": self.per_page,
+        }
+
+
+# Allowed list sorts. Every key ends with the primary key so the order is
+# total, and each tuple mirrors a composite index on api_integrations.
+INTEGRATION_SORTS = {
+    "name": (ApiIntegration.name, ApiIntegration.id),
+    "system_name": (
+        ApiIntegration.system_name,
+        ApiIntegration.name,
+        ApiIntegration.id,
+    ),
+    "status": (ApiIntegration.status, ApiIntegration.name, ApiIntegration.id),
+    "updated_at": (ApiIntegration.updated_at, ApiIntegration.id),
+}
+
+# Column projections for the list views; nothing else is read from the row.
+LIST_COLUMNS = (
+    ApiIntegration.name,
+    ApiIntegration.system_name,
+    ApiIntegration.status,
+    ApiIntegration.docusaurus_doc_path,
+)
+ADMIN_LIST_COLUMNS = LIST_COLUMNS + (
+    ApiIntegration.last_checked_at,
+    ApiIntegration.last_http_status,
+    ApiIntegration.last_latency_ms,
+    ApiIntegration.last_error,
+)
+STATUS_DASHBOARD_COLUMNS = LIST_COLUMNS + (ApiIntegration.cache_ttl,)
+
+
+# ------------------------------------------------------------------------------
+def integration_list_page(
+    filters: IntegrationListFilters,
+    limit: int,
+    owner_id: int | None = None,
+    columns: Sequence = LIST_COLUMNS,
+    with_owner: bool = True,
+) -> KeysetPage:
+    """
+    Shared keyset-paginated query behind every integration list view.
+
+    Filtering, searching and sorting all happen in SQL, and only the given
+    columns (plus the owner's name when with_owner is set) are loaded, so
+    memory is bounded by the page size. The search term is matched through
+    the configured full-text search backend (see search.py).
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    options = [load_only(*columns)]
+    if with_owner:
+        options.append(joinedload(ApiIntegration.owner).load_only(User.full_name))
+    stmt = select(ApiIntegration).options(*options)
+
+    if owner_id is not None:
+        stmt = stmt.where(ApiIntegration.owner_id == owner_id)
+    if filters.status:
+        stmt = stmt.where(ApiIntegration.status == filters.status)
+    if filters.system_name:
+        stmt = stmt.where(ApiIntegration.system_name == filters.system_name)
+    if filters.search:
+        stmt = stmt.where(get_search_backend().filter_clause(filters.search))
+    return keyset_paginate(
+        stmt,
+        INTEGRATION_SORTS[filters.sort],
+        after=filters.after,
+        before=filters.before,
+        limit=max(limit, 1),
+        descending=filters.descending,
+    )
+
+
+# ------------------------------------------------------------------------------
+def list_page_size(filters: IntegrationListFilters) -> int:
+    """Resolve the requested page size against the configured default and cap."""
+    config = current_app.config
+    requested = filters.per_page or config["DASHBOARD_PAGE_SIZE"]
+    return max(1, min(requested, config["DASHBOARD_MAX_PAGE_SIZE"]))
+
+
+# ------------------------------------------------------------------------------
+def history_summary(hours: int = 24) -> dict:
+    """
+    Aggregate probe history for the last N hours in a single query.
+
+    Filters on the indexed hour_bucket column, so the cost depends on the
+    size of the window rather than on the total history retained.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    since = hour_bucket(datetime.utcnow()) - hours + 1
+    row = db.session.execute(
+        select(
+            func.count(IntegrationCheck.id),
+            func.sum(case((IntegrationCheck.ok.is_(False), 1), else_=0)),
+            func.avg(IntegrationCheck.latency_ms),
+            func.max(IntegrationCheck.checked_at),
+        ).where(IntegrationCheck.hour_bucket >= since)
+    ).one()
+    return {
+        "hours": hours,
+        "checks": row[0] or 0,
+        "failures": row[1] or 0,
+        "avg_latency_ms": round(row[2], 1) if row[2] is not None else None,
+        "last_checked_at": row[3],
+    }
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# app/rate_limit.py - (./app/rate_limit.py)
+# Token-bucket rate limiting for the gateway, generated APIs and the UI.
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from flask import Flask, jsonify, request
+from flask_login import current_user
+from werkzeug.exceptions import TooManyRequests
+
+try:  # POSIX only; the shared backend falls back to per-process buckets.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+# Limit scopes and the config keys (overridable by a SiteSetting of the same
+# name) holding their default limit. An integration's own rate_limit column
+# replaces the "integration" default for that integration.
+RATE_LIMIT_SCOPES = {
+    "integration": "RATE_LIMIT_INTEGRATION",
+    "owner": "RATE_LIMIT_OWNER",
+    "client_ip": "RATE_LIMIT_CLIENT_IP",
+    "ui": "RATE_LIMIT_UI",
+}
+
+# Endpoints that apply integration rules themselves, or are never limited.
+_UI_EXEMPT_ENDPOINTS = frozenset({"static", "gateway", "generated_api"})
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_SPEC = re.compile(
+    r"^\s*(\d+(?:\.\d+)?)\s*/\s*(\d*)\s*"
+    r"(s|sec|second|m|min|minute|h|hr|hour|d|day)s?"
+    r"(?:\s+burst\s+(\d+))?\s*$",
+    re.IGNORECASE,
+)
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class RateLimit:
+    """A refill rate (tokens per second) and bucket capacity."""
+
+    rate: float
+    burst: float
+    spec: str
+
+
+# ------------------------------------------------------------------------------
+@lru_cache(maxsize=1024)
+def parse_rate_limit(spec: str | None) -> RateLimit | None:
+    """
+    Parse "120/m", "5/s", "1000/h burst 50" or "30/10s" into a RateLimit.
+
+    The burst defaults to the count, so "120/m" allows 120 back-to-back
+    requests and then two per second. Empty, "0", "off" and "none" mean
+    unlimited (None). Raises ValueError for anything else.
+    """
+    text = (spec or "").strip()
+    if text.lower() in ("", "0", "off", "none", "unlimited"):
+        return None
+    match = _SPEC.match(text)
+    if match is None:
+        raise ValueError(f"Invalid rate limit {spec!r}; expected e.g. 120/m")
+    count, multiple, unit, burst = match.groups()
+    period = int(multiple or 1) * _UNITS[unit[0].lower()]
+    count = float(count)
+    if count <= 0:
+        return None
+    return RateLimit(rate=count / period, burst=float(burst or count), spec=text)
+
+
+# ------------------------------------------------------------------------------
+def _safe_limit(spec: str | None, source: str) -> RateLimit | None:
+    try:
+        return parse_rate_limit(spec)
+    except ValueError:
+        log.warning("Ignoring invalid rate limit %r from %s", spec, source)
+        return None
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of a check: which key denied it and for how long."""
+
+    allowed: bool
+    retry_after: float = 0.0
+    key: str | None = None
+
+    @property
+    def scope(self) -> str | None:
+        """The denying bucket's scope ("integration", "ip", ...), not its key."""
+        return self.key.split(":", 1)[0] if self.key else None
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after))
+
+
+ALLOWED = Decision(True)
+
+
+# ------------------------------------------------------------------------------
+def _refill(tokens: float, elapsed: float, limit: RateLimit) -> float:
+    # A negative gap means the clock source restarted (e.g. a reboot with
+    # a persistent shared file); treat the bucket as full.
+    if elapsed < 0:
+        return limit.burst
+    return min(limit.burst, tokens + elapsed * limit.rate)
+
+
+# ------------------------------------------------------------------------------
+class MemoryBuckets:
+    """
+    Per-process buckets in a dict, shared by all threads under one lock.
+
+    A check is a few dict operations under an uncontended lock. Buckets
+    that have refilled completely are equivalent to absent ones, so they
+    are swept out once the table exceeds max_keys.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> (tokens, updated_at, full_at)
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, rules: Sequence[tuple[str, RateLimit]], cost: float = 1.0) -> Decision:
+        """Take `cost` tokens from every bucket, or from none of them."""
+        now = time.monotonic()
+        with self._lock:
+            taken = []
+            for key, limit in rules:
+                state = self._buckets.get(key)
+                tokens = limit.burst
+                if state is not None:
+                    tokens = _refill(state[0], now - state[1], limit)
+                if tokens < cost:
+                    return Decision(False, (cost - tokens) / limit.rate, key)
+                left = tokens - cost
+                taken.append((key, (left, now, now + (limit.burst - left) / limit.rate)))
+            self._buckets.update(taken)
+            if len(self._buckets) > self.max_keys:
+                self._sweep(now)
+        return ALLOWED
+
+    def _sweep(self, now: float) -> None:
+        self._buckets = {
+            key: state for key, state in self._buckets.items() if state[2] > now
+        }
+        while len(self._buckets) > self.max_keys:
+            del self._buckets[next(iter(self._buckets))]
+
+
+# ------------------------------------------------------------------------------
+class SharedMemoryBuckets:
+    """
+    Buckets in a memory-mapped file shared by every worker on the host.
+
+    The file (on /dev/shm by default, so it never touches disk) is a
+    set-associative table: a key's 64-bit fingerprint selects a group of
+    WAYS slots, and a slot holds (fingerprint, tokens, updated_at). A check
+    takes one POSIX byte-range lock over the groups it touches, reads and
+    writes the slots with struct, and unlocks. There is no syscall other
+    than the two fcntl calls, so a check costs a few microseconds. When a group is
+    full the least recently updated slot is reused; an idle bucket has
+    refilled anyway, so little is lost.
+
+    POSIX record locks do not exclude threads of one process, so a thread
+    lock is held around them. time.monotonic() is system-wide on Linux,
+    so timestamps compare across workers.
+    """
+
+    name = "shared"
+    WAYS = 8
+    _MAGIC = b"MCPRL001"
+    _HEADER = struct.Struct("<8sQ")
+    _SLOT = struct.Struct("<Qdd")
+
+    def __init__(self, path: str, slots: int = 65536) -> None:
+        self.path = path
+        groups = max(1, slots // self.WAYS)
+        self._group_bytes = self.WAYS * self._SLOT.size
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, self._HEADER.size, 0)
+            if len(header) == self._HEADER.size:
+                magic, existing = self._HEADER.unpack(header)
+                if magic == self._MAGIC:
+                    groups = existing  # the first worker's layout wins
+                else:
+                    header = b""
+            size = self._HEADER.size + groups * self._group_bytes
+            if len(header) != self._HEADER.size or os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, self._HEADER.pack(self._MAGIC, groups), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self.groups = groups
+        self._map = mmap.mmap(self._fd, size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def fingerprint(key: str) -> int:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def _slot(self, group: int, fingerprint: int) -> tuple[int, float, float]:
+        """Offset and state of the key's slot, claiming one if needed."""
+        base = self._HEADER.size + group * self._group_bytes
+        unpack = self._SLOT.unpack_from
+        victim, oldest = base, math.inf
+        for offset in range(base, base + self._group_bytes, self._SLOT.size):
+            owner, tokens, updated = unpack(self._map, offset)
+            if owner == fingerprint:
+                return offset, tokens, updated
+            if owner == 0:
+                return offset, math.nan, 0.0
+            if updated < oldest:
+                victim, oldest = offset, updated
+        return victim, math.nan, 0.0
+
+    def take(self, rules: Sequence[tuple[str, RateLimit]], cost: float = 1.0) -> Decision:
+        """Take `cost` tokens from every bucket, or from none of them."""
+        keyed = [(self.fingerprint(key), key, limit) for key, limit in rules]
+        groups = [fp % self.groups for fp, _, _ in keyed]
+        # One record lock over the span of groups touched: a single pair of
+        # syscalls, and no lock-ordering deadlock between workers.
+        start = self._HEADER.size + min(groups) * self._group_bytes
+        length = (max(groups) - min(groups) + 1) * self._group_bytes
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                now = time.monotonic()
+                taken = []
+                for (fp, key, limit), group in zip(keyed, groups):
+                    offset, tokens, updated = self._slot(group, fp)
+                    if math.isnan(tokens):
+                        tokens = limit.burst
+                    else:
+                        tokens = _refill(tokens, now - updated, limit)
+                    if tokens < cost:
+                        return Decision(False, (cost - tokens) / limit.rate, key)
+                    taken.append((offset, fp, tokens - cost))
+                for offset, fp, tokens in taken:
+                    self._SLOT.pack_into(self._map, offset, fp, tokens, now)
+                return ALLOWED
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+
+# ------------------------------------------------------------------------------
+class RateLimiter:
+    """
+    Token-bucket limits keyed by integration, owner, client IP and UI user.
+
+    Gateway and generated-API requests draw one token each from the
+    integration's bucket (its rate_limit, else RATE_LIMIT_INTEGRATION),
+    its owner's bucket shared by all their integrations (RATE_LIMIT_OWNER)
+    and the caller's IP bucket (RATE_LIMIT_CLIENT_IP). Other pages draw
+    from RATE_LIMIT_UI, per logged-in user or per IP for anonymous ones.
+    A request is admitted only if every bucket has a token, and then
+    takes from all of them together. Behind a reverse proxy, set
+    TRUSTED_PROXY_HOPS so the IP is the client's, not the proxy's.
+
+    Defaults come from config and can be changed at runtime with a
+    SiteSetting of the same key. Buckets live in SharedMemoryBuckets so
+    every gunicorn worker on the host sees the same counts, or in
+    MemoryBuckets (per process) where that is unavailable or configured.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.buckets: MemoryBuckets | SharedMemoryBuckets = MemoryBuckets()
+        self.checks = 0
+        self.limited = 0
+
+    def init_app(self, app: Flask) -> None:
+        self.enabled = app.config["RATE_LIMIT_ENABLED"]
+        backend = app.config["RATE_LIMIT_BACKEND"]
+        if backend not in ("auto", "shared", "memory"):
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND {backend!r}")
+        if backend == "shared" and fcntl is None:
+            log.warning("Shared rate-limit buckets need fcntl; using memory")
+        if backend != "memory" and fcntl is not None:
+            self.buckets = SharedMemoryBuckets(
+                shared_bucket_path(app), app.config["RATE_LIMIT_SHARED_SLOTS"]
+            )
+        else:
+            self.buckets = MemoryBuckets(app.config["RATE_LIMIT_MEMORY_KEYS"])
+        app.extensions["rate_limiter"] = self
+        if self.enabled:
+            app.before_request(self._limit_ui)
+
+    def default_limits(self) -> dict[str, RateLimit | None]:
+        """Current default limit per scope; needs an app context."""
+        from .settings_store import settings_store
+
+        return {
+            scope: _safe_limit(settings_store.config_value(key), key)
+            for scope, key in RATE_LIMIT_SCOPES.items()
+        }
+
+    def check(self, rules: Sequence[tuple[str, RateLimit | None]]) -> Decision:
+        """Admit a request against (key, limit) rules; None limits are skipped."""
+        limited = [(key, limit) for key, limit in rules if limit is not None]
+        if not self.enabled or not limited:
+            return ALLOWED
+        self.checks += 1
+        decision = self.buckets.take(limited)
+        if not decision.allowed:
+            self.limited += 1
+        return decision
+
+    def check_integration(
+        self,
+        integration_id: int,
+        owner_id: int | None,
+        rate_limit: str | None,
+        client_ip: str,
+        defaults: dict[str, RateLimit | None] | None = None,
+    ) -> Decision:
+        if not self.enabled:
+            return ALLOWED
+        defaults = self.default_limits() if defaults is None else defaults
+        limit = defaults["integration"]
+        if rate_limit:
+            limit = _safe_limit(rate_limit, f"integration {integration_id}")
+        return self.check(
+            [
+                (f"integration:{integration_id}", limit),
+                (f"owner:{owner_id}", defaults["owner"] if owner_id else None),
+                (f"ip:{client_ip}", defaults["client_ip"]),
+            ]
+        )
+
+    def _limit_ui(self) -> None:
+        if request.endpoint in _UI_EXEMPT_ENDPOINTS or request.endpoint is None:
+            return
+        limit = self.default_limits()["ui"]
+        if limit is None:
+            return
+        if current_user.is_authenticated:
+            key = f"ui:user:{current_user.get_id()}"
+        else:
+            key = f"ui:ip:{request.remote_addr}"
+        decision = self.check([(key, limit)])
+        if not decision.allowed:
+            raise TooManyRequests(retry_after=decision.retry_after_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.buckets.name,
+            "checks": self.checks,
+            "limited": self.limited,
+        }
+
+
+# ------------------------------------------------------------------------------
+def shared_bucket_path(app: Flask) -> str:
+    """RATE_LIMIT_SHARED_PATH, else a file per database under /dev/shm."""
+    if app.config["RATE_LIMIT_SHARED_PATH"]:
+        return app.config["RATE_LIMIT_SHARED_PATH"]
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    database = app.config["SQLALCHEMY_DATABASE_URI"].encode("utf-8")
+    return os.path.join(
+        root, f"mcpapp-ratelimit-{hashlib.sha1(database).hexdigest()[:12]}"
+    )
+
+
+# ------------------------------------------------------------------------------
+def rate_limited_response(decision: Decision):
+    """JSON 429 for API callers, with Retry-After."""
+    response = jsonify(error="Rate limit exceeded", limit=decision.scope)
+    response.status_code = 429
+    response.headers["Retry-After"] = str(decision.retry_after_seconds)
+    return response
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+rate_limiter = RateLimiter()
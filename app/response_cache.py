@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# app/response_cache.py - (./app/response_cache.py)
+# Gateway response cache: LRU memory tier, optional disk tier, single-flight.
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Mapping
+from urllib.parse import parse_qsl, urlencode
+
+from flask import Flask
+
+if TYPE_CHECKING:
+    from .gateway import GatewayRoute
+
+log = logging.getLogger(__name__)
+
+# Only safe methods: a POST is not idempotent, so identical POSTs must each
+# reach upstream and never share one caller's answer. HEAD is served from
+# GET entries but never populates the cache itself.
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+# Heuristically cacheable statuses (RFC 9111 section 4.2.2) minus the
+# error responses that an upstream blip should not pin for a whole TTL.
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 410})
+# Request headers that select a representation; part of every cache key.
+# Responses that Vary on anything else are not stored.
+VARY_HEADERS = ("accept", "accept-encoding", "accept-language")
+# Client conditionals are answered from the entry, never forwarded.
+CONDITIONAL_HEADERS = frozenset({"if-none-match", "if-modified-since"})
+# Headers a 304 is allowed to update on the stored response.
+_FRAMING_HEADERS = frozenset({"content-length", "content-encoding", "content-type"})
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class CachedResponse:
+    """One stored upstream response: status, relayed headers and raw body."""
+
+    status: int
+    headers: tuple[tuple[str, str], ...]
+    body: bytes
+    stored_at: float
+
+    def header(self, name: str) -> str | None:
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers) + 128
+
+    def age(self) -> float:
+        return max(0.0, time.time() - self.stored_at)
+
+    def fresh(self, ttl: float) -> bool:
+        return self.age() < ttl
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers that revalidate this entry upstream."""
+        headers = {}
+        if self.header("etag"):
+            headers["If-None-Match"] = self.header("etag")
+        if self.header("last-modified"):
+            headers["If-Modified-Since"] = self.header("last-modified")
+        return headers
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Weak If-None-Match comparison against the stored ETag."""
+        etag = self.header("etag")
+        if not if_none_match or not etag:
+            return False
+        wanted = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in wanted or etag.removeprefix("W/") in wanted
+
+    def not_modified_headers(self) -> list[tuple[str, str]]:
+        keep = {"etag", "last-modified", "cache-control", "expires", "vary", "date"}
+        return [(k, v) for k, v in self.headers if k.lower() in keep]
+
+    def revalidated(self, headers: Iterable[tuple[str, str]]) -> "CachedResponse":
+        """Copy refreshed by a 304, with its end-to-end headers applied."""
+        updates = [(k, v) for k, v in headers if k.lower() not in _FRAMING_HEADERS]
+        replaced = {k.lower() for k, _ in updates}
+        kept = [(k, v) for k, v in self.headers if k.lower() not in replaced]
+        return replace(self, headers=tuple(kept + updates), stored_at=time.time())
+
+
+# ------------------------------------------------------------------------------
+def request_directive(method: str, headers: Mapping[str, str]) -> str | None:
+    """
+    How the cache may answer a request: "use", "revalidate" or None (bypass).
+
+    `headers` must be keyed by lower-case name. Unsafe methods, and requests
+    carrying their own Authorization (per-caller upstream answers), always
+    bypass, so they are neither cached nor coalesced.
+    """
+    if method not in CACHEABLE_METHODS or "authorization" in headers:
+        return None
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if (
+        "no-cache" in cache_control
+        or "max-age=0" in cache_control
+        or headers.get("pragma", "").lower() == "no-cache"
+    ):
+        return "revalidate"
+    return "use"
+
+
+# ------------------------------------------------------------------------------
+def cache_key(
+    route: "GatewayRoute",
+    method: str,
+    path: str,
+    query_string: str,
+    headers: Mapping[str, str],
+    body: bytes | None,
+) -> str:
+    """
+    Key for (integration, method, path, normalized query, body hash).
+
+    Query parameters are sorted so ?a=1&b=2 and ?b=2&a=1 share an entry.
+    The upstream base_url and credentials are folded in, so editing an
+    integration orphans its old entries instead of serving them.
+    """
+    query = urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+    parts = [
+        route.base_url,
+        route.auth_type,
+        route.api_key or "",
+        "GET" if method == "HEAD" else method,
+        path,
+        query,
+        *(headers.get(name, "") for name in VARY_HEADERS),
+    ]
+    digest = hashlib.sha256("\0".join(parts).encode("utf-8", "surrogateescape"))
+    if body:
+        digest.update(b"\0" + hashlib.sha256(body).digest())
+    return f"{route.integration_id}-{digest.hexdigest()}"
+
+
+# ------------------------------------------------------------------------------
+def storable(status: int, headers: Mapping[str, str], max_bytes: int) -> bool:
+    """True if an upstream response (lower-case headers) may be cached."""
+    if status not in CACHEABLE_STATUSES:
+        return False
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return False
+    if headers.get("content-type", "").startswith("text/event-stream"):
+        return False
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+    if not vary <= set(VARY_HEADERS):
+        return False
+    length = headers.get("content-length")
+    return not (length and length.isdigit() and int(length) > max_bytes)
+
+
+# ------------------------------------------------------------------------------
+def tee(
+    chunks: Iterable[bytes],
+    limit: int,
+    on_done: Callable[[bytes | None], None],
+) -> Iterator[bytes]:
+    """
+    Relay chunks unchanged while keeping a copy of up to `limit` bytes.
+
+    on_done() always runs once, with the full body if it was relayed to the
+    end within the limit, or None if it was too large or the client left.
+    """
+    kept: list[bytes] | None = []
+    size = 0
+    complete = False
+    try:
+        for chunk in chunks:
+            if kept is not None:
+                size += len(chunk)
+                if size > limit:
+                    kept = None
+                else:
+                    kept.append(chunk)
+            yield chunk
+        complete = True
+    finally:
+        on_done(b"".join(kept) if complete and kept is not None else None)
+
+
+# ------------------------------------------------------------------------------
+class _MemoryTier:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.evictions += 1
+
+
+# ------------------------------------------------------------------------------
+class _DiskTier:
+    """
+    One file per entry: a JSON header line followed by the raw body.
+
+    Files are written to a temporary name and renamed into place, so other
+    workers sharing the directory never read a partial entry. The size
+    index is per process and rebuilt from the directory at start-up; a file
+    another worker evicted is simply a miss.
+    """
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.errors = 0
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        files = sorted(
+            (p for p in self.root.glob("*/*") if not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for path in files:
+            self._index[path.name] = path.stat().st_size
+            self.bytes += self._index[path.name]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[-2:] / key
+
+    def get(self, key: str) -> CachedResponse | None:
+        try:
+            with open(self._path(key), "rb") as handle:
+                meta = json.loads(handle.readline())
+                body = handle.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            self.errors += 1
+            log.warning("Unreadable response cache file %s: %s", key, exc)
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        return CachedResponse(
+            status=meta["status"],
+            headers=tuple(tuple(pair) for pair in meta["headers"]),
+            body=body,
+            stored_at=meta["stored_at"],
+        )
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        path = self._path(key)
+        meta = {
+            "status": entry.status,
+            "headers": entry.headers,
+            "stored_at": entry.stored_at,
+        }
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=path.parent, prefix=".")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(json.dumps(meta).encode() + b"\n")
+                handle.write(entry.body)
+            os.replace(temp, path)
+            size = path.stat().st_size
+        except OSError as exc:
+            self.errors += 1
+            log.warning("Could not write response cache file %s: %s", key, exc)
+            return
+        evicted = []
+        with self._lock:
+            self.bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            while self.bytes > self.max_bytes and len(self._index) > 1:
+                old, old_size = self._index.popitem(last=False)
+                self.bytes -= old_size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                self._path(old).unlink()
+            except OSError:
+                pass
+
+
+# ------------------------------------------------------------------------------
+class ResponseCache:
+    """
+    Shared cache of upstream gateway responses with per-integration TTLs.
+
+    Lookups check a byte-bounded in-process LRU first, then the optional
+    disk tier (GATEWAY_CACHE_DIR), promoting disk hits into memory. Entries
+    outlive their TTL so that stale ones carrying an ETag or Last-Modified
+    can be revalidated with a conditional request; a 304 refreshes the
+    entry without transferring the body again.
+
+    claim()/release() implement single-flight: the first request for a
+    missing or stale key fetches upstream, and concurrent requests for the
+    same key wait for that result instead of stampeding the upstream.
+
+    Hit, revalidation and miss counters are kept per process, overall and
+    per integration, for the operator dashboard. hit_rate counts
+    revalidated responses as served from cache, since no body was fetched.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 1024 * 1024,
+        disk_path: str | None = None,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        self.enabled = True
+        self.max_entry_bytes = max_entry_bytes
+        self._memory = _MemoryTier(max_bytes)
+        self._disk = _DiskTier(disk_path, disk_max_bytes) if disk_path else None
+        self._lock = threading.Lock()
+        self._flights: dict[str, threading.Event] = {}
+        self._counts: dict[int, list[int]] = {}
+        self.coalesced = 0
+
+    def init_app(self, app: Flask) -> None:
+        self.configure(
+            enabled=app.config["GATEWAY_CACHE_ENABLED"],
+            max_bytes=app.config["GATEWAY_CACHE_MAX_BYTES"],
+            max_entry_bytes=app.config["GATEWAY_CACHE_MAX_ENTRY_BYTES"],
+            disk_path=app.config["GATEWAY_CACHE_DIR"] or None,
+            disk_max_bytes=app.config["GATEWAY_CACHE_DISK_MAX_BYTES"],
+        )
+        app.extensions["response_cache"] = self
+
+    def configure(
+        self,
+        enabled: bool,
+        max_bytes: int,
+        max_entry_bytes: int,
+        disk_path: str | None,
+        disk_max_bytes: int,
+    ) -> None:
+        with self._lock:
+            self.enabled = enabled
+            self.max_entry_bytes = max_entry_bytes
+            self._memory = _MemoryTier(max_bytes)
+            self._disk = _DiskTier(disk_path, disk_max_bytes) if disk_path else None
+
+    # -- storage -------------------------------------------------------------
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None and self._disk is not None:
+            entry = self._disk.get(key)
+            if entry is not None:
+                with self._lock:
+                    self._memory.put(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._memory.put(key, entry)
+        if self._disk is not None:
+            self._disk.put(key, entry)
+
+    # -- single-flight -------------------------------------------------------
+
+    def claim(self, key: str) -> threading.Event | None:
+        """None if the caller now owns the fetch; else an Event to wait on."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                self._flights[key] = threading.Event()
+                return None
+        self.count_coalesced()
+        return flight
+
+    def count_coalesced(self) -> None:
+        with self._lock:
+            self.coalesced += 1
+
+    def release(self, key: str) -> None:
+        """Wake waiters for key; safe to call more than once."""
+        with self._lock:
+            flight = self._flights.pop(key, None)
+        if flight is not None:
+            flight.set()
+
+    # -- metrics -------------------------------------------------------------
+
+    def record(self, integration_id: int, outcome: str) -> None:
+        """Count a "hit", "revalidated" or "miss" for an integration."""
+        slot = ("hit", "revalidated", "miss").index(outcome)
+        with self._lock:
+            counts = self._counts.setdefault(integration_id, [0, 0, 0])
+            counts[slot] += 1
+
+    def counts(self) -> dict[int, tuple[int, int, int]]:
+        """(hits, revalidated, misses) for every integration seen."""
+        with self._lock:
+            return {key: tuple(value) for key, value in self._counts.items()}
+
+    def integration_stats(self, integration_ids: Iterable[int]) -> dict[int, dict]:
+        with self._lock:
+            return {
+                integration_id: _rates(*self._counts[integration_id])
+                for integration_id in integration_ids
+                if integration_id in self._counts
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            totals = [sum(column) for column in zip(*self._counts.values())]
+            stats = _rates(*(totals or (0, 0, 0)))
+            stats.update(
+                enabled=self.enabled,
+                coalesced=self.coalesced,
+                in_flight=len(self._flights),
+                entries=len(self._memory),
+                bytes=self._memory.bytes,
+                evictions=self._memory.evictions,
+            )
+        if self._disk is not None:
+            stats.update(disk_entries=len(self._disk), disk_bytes=self._disk.bytes)
+        return stats
+
+
+# ------------------------------------------------------------------------------
+def _rates(hits: int, revalidated: int, misses: int) -> dict:
+    lookups = hits + revalidated + misses
+    served = hits + revalidated
+    return {
+        "hits": hits,
+        "revalidated": revalidated,
+        "misses": misses,
+        "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+    }
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+response_cache = ResponseCache()
@@ -2,13 +2,31 @@
 # app/routes/admin.py - (./app/routes/admin.py)
 # Admin routes for managing users and simple site settings.
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+import hashlib
+
+from flask import (
+    Blueprint,
+    abort,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from flask_login import login_required
+from sqlalchemy.orm import joinedload
 
+from ..api_utils import get_api_root, is_pristine, module_name
+from ..audit_log import audit_daily_summaries, audit_events_page
 from ..extensions import db
 from ..forms import SiteSettingForm
-from ..models import User, Role, SiteSetting
+from ..models import ApiIntegration, User, Role, SiteSetting
 from ..security import role_required
+from ..database import replica_reads
+from ..sql_profiler import query_budget
+from ..user_cache import user_cache
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -17,19 +35,30 @@ admin_bp = Blueprint("admin", __name__)
 @admin_bp.route("/users")
 @login_required
 @role_required("admin")
+@query_budget(4)
+@replica_reads
 def users():
     """
     Display a list of all registered users for administration.
 
     Admins can see roles and activation state but are not provided
-    with direct CRUD over API integration records via this view.
+    with direct CRUD over API integration records via this view. Roles
+    are joined into the user query so rendering `user.role` does not
+    issue one lookup per row.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
-    users = User.query.order_by(User.full_name).all()
+    users = (
+        User.query.options(joinedload(User.role)).order_by(User.full_name).all()
+    )
     roles = {r.id: r.name for r in Role.query.all()}
-    return render_template("admin/users.html", users=users, roles=roles)
+    return render_template(
+        "admin/users.html",
+        users=users,
+        roles=roles,
+        cache_stats=user_cache.stats(),
+    )
 
 
 # ------------------------------------------------------------------------------
@@ -41,7 +70,8 @@ def set_user_role(user_id: int):
     Update a user's role based on form selection.
 
     This endpoint expects a 'role_name' field in the POST body. It
-    does not allow deletion of accounts to simplify demo behavior.
+    does not allow deletion of accounts to simplify demo behavior. The
+    user's cached identity is dropped by the user_cache mapper events.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
     Modified:  2025-11-23
@@ -90,3 +120,132 @@ def settings():
         return redirect(url_for("admin.settings", key=form.key.data))
 
     return render_template("admin/settings.html", form=form, setting=setting)
+
+
+# ------------------------------------------------------------------------------
+@admin_bp.route("/audit")
+@login_required
+@role_required("admin")
+@query_budget(4)
+@replica_reads
+def audit_events():
+    """
+    Return one page of the change-event audit log as JSON, newest first.
+
+    Filters: ?entity_type=integration|user|setting, ?entity_id=, ?actor_id=.
+    Pages are keyset-paginated: pass next_cursor back as ?after= (or
+    prev_cursor as ?before=), with ?limit= up to AUDIT_MAX_PAGE_SIZE.
+    When one entity is selected, its compacted daily summaries (events
+    older than AUDIT_RETENTION_DAYS) are included as "daily".
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    config = current_app.config
+    entity_type = request.args.get("entity_type") or None
+    entity_id = request.args.get("entity_id", type=int)
+    limit = request.args.get("limit", config["AUDIT_PAGE_SIZE"], type=int)
+    page = audit_events_page(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        actor_id=request.args.get("actor_id", type=int),
+        after=request.args.get("after"),
+        before=request.args.get("before"),
+        limit=max(1, min(limit, config["AUDIT_MAX_PAGE_SIZE"])),
+    )
+    body = {
+        "events": [
+            {
+                "id": e.id,
+                "occurred_at": e.occurred_at.isoformat(sep=" "),
+                "actor_id": e.actor_id,
+                "entity_type": e.entity_type,
+                "entity_id": e.entity_id,
+                "action": e.action,
+                "field": e.field,
+                "old_value": e.old_value,
+                "new_value": e.new_value,
+            }
+            for e in page.items
+        ],
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }
+    if entity_type and entity_id is not None:
+        body["daily"] = [
+            {
+                "day": s.day.isoformat(),
+                "action": s.action,
+                "field": s.field or None,
+                "events": s.event_count,
+                "first_at": s.first_at.isoformat(sep=" "),
+                "last_at": s.last_at.isoformat(sep=" "),
+                "last_actor_id": s.last_actor_id,
+                "first_old_value": s.first_old_value,
+                "last_new_value": s.last_new_value,
+            }
+            for s in audit_daily_summaries(entity_type, entity_id)
+        ]
+    return jsonify(body)
+
+
+# ------------------------------------------------------------------------------
+def _scaffold_source(integration_id: int) -> bytes:
+    path = get_api_root() / f"{module_name(integration_id)}.py"
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        abort(404)
+
+
+# ------------------------------------------------------------------------------
+@admin_bp.route("/scaffolds/<int:integration_id>")
+@login_required
+@role_required("admin")
+def scaffold(integration_id: int):
+    """
+    Return an integration's api/ module source and digest as JSON.
+
+    The generated-API loader only runs hand-edited modules an admin has
+    approved: review "source" here, then POST its "sha256" to the approve
+    endpoint below. Unedited scaffolds ("pristine") need no approval.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    integration = ApiIntegration.query.get_or_404(integration_id)
+    source = _scaffold_source(integration_id)
+    digest = hashlib.sha256(source).hexdigest()
+    return jsonify(
+        {
+            "integration_id": integration.id,
+            "sha256": digest,
+            "pristine": is_pristine(source.decode("utf-8", "replace")),
+            "approved": integration.scaffold_approved_sha256 == digest,
+            "source": source.decode("utf-8", "replace"),
+        }
+    )
+
+
+# ------------------------------------------------------------------------------
+@admin_bp.route("/scaffolds/<int:integration_id>/approve", methods=["POST"])
+@login_required
+@role_required("admin")
+def approve_scaffold(integration_id: int):
+    """
+    Approve the current api/ module of an integration for execution.
+
+    Expects the 'sha256' the admin reviewed in the POST body; if the file
+    changed since, nothing is approved (409). Editing the file again
+    revokes the approval, since its digest no longer matches.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    integration = ApiIntegration.query.get_or_404(integration_id)
+    digest = hashlib.sha256(_scaffold_source(integration_id)).hexdigest()
+    if request.form.get("sha256") != digest:
+        return jsonify({"error": "Module changed since it was reviewed."}), 409
+    integration.scaffold_approved_sha256 = digest
+    db.session.commit()
+    return jsonify({"integration_id": integration.id, "approved": digest})
@@ -2,15 +2,45 @@
 # app/routes/api_admin.py - (./app/routes/api_admin.py)
 # Routes for API administrators with full CRUD capabilities.
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request
-from flask_login import login_required
-
+import csv
+from datetime import date
+
+from flask import (
+    Blueprint,
+    Response,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
+from flask_login import current_user, login_required
+
+from ..bulk import (
+    ImportReport,
+    detect_format,
+    export_integrations,
+    import_integrations,
+    iter_records,
+)
 from ..extensions import db
 from ..forms import ApiIntegrationForm
 from ..models import ApiIntegration
 from ..mcp_integration import get_docusaurus_url
+from ..queries import (
+    ADMIN_LIST_COLUMNS,
+    INTEGRATION_STATUSES,
+    IntegrationListFilters,
+    integration_list_page,
+    list_page_size,
+)
+from ..search import search_response
 from ..security import role_required
-from ..api_utils import generate_api_module
+from ..database import replica_reads
+from ..sql_profiler import query_budget
+from ..scaffold_queue import scaffold_queue
 
 api_admin_bp = Blueprint("api_admin", __name__)
 
@@ -19,25 +49,51 @@ api_admin_bp = Blueprint("api_admin", __name__)
 @api_admin_bp.route("/integrations")
 @login_required
 @role_required("api_admin")
+@query_budget(6)
+@replica_reads
 def list_integrations():
     """
     Show all API integrations with full management controls.
 
     API admins can view, edit, delete, enable/disable, and retrigger
-    errored integrations from this interface.
+    errored integrations from this interface. The list is filtered,
+    sorted and keyset-paginated in SQL via the shared queries layer.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
-    integrations = ApiIntegration.query.order_by(ApiIntegration.name).all()
-    doc_links = {i.id: get_docusaurus_url(i) for i in integrations}
+    filters = IntegrationListFilters.from_args(request.args)
+    page = integration_list_page(
+        filters, limit=list_page_size(filters), columns=ADMIN_LIST_COLUMNS
+    )
+    doc_links = {i.id: get_docusaurus_url(i) for i in page.items}
     return render_template(
         "api_admin/integrations.html",
-        integrations=integrations,
+        integrations=page.items,
+        page=page,
+        filters=filters.as_query_args(),
+        statuses=INTEGRATION_STATUSES,
         doc_links=doc_links,
     )
 
 
+# ------------------------------------------------------------------------------
+@api_admin_bp.route("/integrations/search")
+@login_required
+@role_required("api_admin")
+def search_integrations():
+    """
+    Return all integrations matching ?q= as ranked JSON.
+
+    Backed by the configured full-text index (SQLite FTS5 by default), so
+    lookups stay fast regardless of how many integrations exist.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    return search_response("api_admin.edit_integration")
+
+
 # ------------------------------------------------------------------------------
 @api_admin_bp.route("/integrations/new", methods=["GET", "POST"])
 @login_required
@@ -50,7 +106,7 @@ def create_integration():
     admin or API admin roles as needed.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
     from flask_login import current_user
 
@@ -67,14 +123,15 @@ def create_integration():
             api_key=form.api_key.data,
             notes=form.notes.data,
             docusaurus_doc_path=form.docusaurus_doc_path.data,
+            cache_ttl=form.cache_ttl.data,
+            rate_limit=form.rate_limit.data or None,
             owner_id=current_user.id,
         )
         db.session.add(integration)
+        # The optional api/ module scaffold is written in the background
+        # after the commit (scaffold_queue.py); the gateway serves it either way.
         db.session.commit()
 
-        # Create on-disk module scaffold for this integration.
-        generate_api_module(integration)
-
         flash("API integration created.", "success")
         return redirect(url_for("api_admin.list_integrations"))
 
@@ -161,20 +218,146 @@ def toggle_integration_status(integration_id: int):
 @role_required("api_admin")
 def test_integration(integration_id: int):
     """
-    Simulate testing an integration and update its status.
+    Probe a single integration's endpoint and update its status.
 
-    In a real implementation, this would perform an outbound HTTP request
-    to the configured endpoint and update status based on the result.
-    Here, we simply mark previously errored integrations as enabled.
+    Sends the configured method (or HEAD for non-idempotent methods) to
+    base_url + endpoint_path with the integration's credentials, then
+    records latency and HTTP status. Errored integrations that respond are
+    re-enabled; enabled integrations that fail are marked as errored.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
+    from ..health_checks import ProbeTarget, apply_probe_results, get_health_checker
+
     integration = ApiIntegration.query.get_or_404(integration_id)
-    if integration.status == "error":
-        integration.status = "enabled"
-        db.session.commit()
-        flash("Integration test simulated and set to enabled.", "success")
+    target = ProbeTarget.from_integration(integration)
+    result = get_health_checker().probe(target)
+    apply_probe_results([result])
+
+    if result.ok:
+        flash(
+            f"Integration responded with HTTP {result.http_status} "
+            f"in {result.latency_ms:.0f} ms.",
+            "success",
+        )
     else:
-        flash("Integration appears healthy. No action taken.", "info")
+        flash(f"Integration test failed: {result.error}", "danger")
+    return redirect(url_for("api_admin.list_integrations"))
+
+
+# ------------------------------------------------------------------------------
+@api_admin_bp.route("/integrations/test-all", methods=["POST"])
+@login_required
+@role_required("api_admin")
+def test_all_integrations():
+    """
+    Probe every non-disabled integration concurrently in one request.
+
+    Probes run on the shared health-check pool and their outcomes are
+    written back with a single bulk update rather than one commit each.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    from ..health_checks import check_integrations
+
+    results = check_integrations()
+    failing = sum(1 for r in results if not r.ok)
+    flash(
+        f"Tested {len(results)} integrations: "
+        f"{len(results) - failing} healthy, {failing} failing.",
+        "warning" if failing else "success",
+    )
     return redirect(url_for("api_admin.list_integrations"))
+
+
+# ------------------------------------------------------------------------------
+@api_admin_bp.route("/integrations/import", methods=["POST"])
+@login_required
+@role_required("api_admin")
+def bulk_import():
+    """
+    Import integrations from an uploaded or posted JSONL/CSV stream.
+
+    Accepts a multipart "file" upload or the raw request body; the format
+    comes from ?format=, the file extension or the content type. Rows are
+    validated with ApiIntegrationForm's rules and inserted in batches,
+    owned by the current user; ?dry_run=1 only validates. API clients get
+    the import report as JSON, browsers a flash message. Module scaffolds
+    for the new rows are queued and written in the background.
+
+    Example:
+        curl -X POST -H "Content-Type: application/x-ndjson" \\
+            --data-binary @catalog.jsonl .../api-admin/integrations/import
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    wants_html = (
+        request.accept_mimetypes.best_match(["application/json", "text/html"])
+        == "text/html"
+    )
+    upload = request.files.get("file")
+    report = ImportReport()
+    try:
+        fmt = detect_format(
+            request.args.get("format"),
+            upload.filename if upload else None,
+            upload.mimetype if upload else request.mimetype,
+        )
+        stream = upload.stream if upload else request.stream
+        import_integrations(
+            iter_records(stream, fmt),
+            owner_id=current_user.id,
+            dry_run=request.args.get("dry_run", type=int, default=0) == 1,
+            report=report,
+        )
+    except (ValueError, csv.Error) as exc:
+        # Batches committed before the error stay imported; say so.
+        if wants_html:
+            flash(
+                f"Import failed after {report.inserted} integrations: {exc}",
+                "danger",
+            )
+            return redirect(url_for("api_admin.list_integrations"))
+        return jsonify({"error": str(exc), "inserted": report.inserted}), 400
+    finally:
+        # Core inserts bypass the mapper events that queue scaffolds on
+        # create; this also covers batches committed before an error.
+        scaffold_queue.enqueue(report.ids)
+
+    if wants_html:
+        flash(
+            f"Imported {report.inserted} integrations; "
+            f"{report.invalid} invalid rows skipped.",
+            "warning" if report.invalid else "success",
+        )
+        return redirect(url_for("api_admin.list_integrations"))
+    return jsonify(report.as_dict())
+
+
+# ------------------------------------------------------------------------------
+@api_admin_bp.route("/integrations/export")
+@login_required
+@role_required("api_admin")
+def bulk_export():
+    """
+    Stream every integration as JSONL (default) or CSV (?format=csv).
+
+    The body is generated in id-ordered batches while it is sent, so the
+    table is never loaded into memory as a whole.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    try:
+        fmt = detect_format(request.args.get("format", "jsonl"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    filename = f"integrations-{date.today():%Y%m%d}.{fmt}"
+    return Response(
+        stream_with_context(export_integrations(fmt)),
+        mimetype="text/csv" if fmt == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -8,6 +8,7 @@ from flask_login import login_user, logout_user, login_required, current_user
 from ..extensions import db
 from ..forms import LoginForm, RegisterForm
 from ..models import User, Role
+from ..passwords import PasswordHasherBusy, password_hasher
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -36,8 +37,14 @@ def login():
     On success, redirects to a role-appropriate dashboard. On failure,
     re-renders the login page with an error message.
 
+    Unknown emails take as long as a real password check without running
+    the KDF. Hashes from an older policy are upgraded after a successful
+    check, unless the hashing pool is busy. When the queue is full or the
+    check times out the login is refused with 503 rather than queued
+    behind other requests.
+
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-17
     """
     if current_user.is_authenticated:
         return redirect(url_for("developer.dashboard"))
@@ -45,7 +52,22 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data.lower()).first()
-        if user and user.check_password(form.password.data) and user.active:
+        try:
+            if user is None:
+                password_hasher.reject_unknown()
+                valid = False
+            else:
+                valid = user.check_password(form.password.data)
+        except PasswordHasherBusy:
+            flash("The server is busy; please try logging in again.", "warning")
+            return render_template("auth/login.html", form=form), 503
+        if valid and user.active and user.password_needs_rehash():
+            try:
+                user.set_password(form.password.data)
+                db.session.commit()
+            except PasswordHasherBusy:
+                pass  # The password was right; upgrade on a later login.
+        if valid and user.active:
             login_user(user)
             next_page = request.args.get("next") or url_for("developer.dashboard")
             return redirect(next_page)
@@ -79,7 +101,7 @@ def register():
     Admins can later update the role via the admin section.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
     if current_user.is_authenticated:
         return redirect(url_for("developer.dashboard"))
@@ -96,7 +118,11 @@ def register():
                 full_name=form.full_name.data,
                 role=dev_role,
             )
-            user.set_password(form.password.data)
+            try:
+                user.set_password(form.password.data)
+            except PasswordHasherBusy:
+                flash("The server is busy; please try again shortly.", "warning")
+                return render_template("auth/register.html", form=form), 503
             db.session.add(user)
             db.session.commit()
             flash("Registration successful. Please log in.", "success")
@@ -2,15 +2,30 @@
 # app/routes/developer.py - (./app/routes/developer.py)
 # Routes for developer role: CRUD on own integrations and dashboard.
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import (
+    Blueprint,
+    flash,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from flask_login import login_required, current_user
 
 from ..extensions import db
 from ..forms import ApiIntegrationForm
 from ..models import ApiIntegration
 from ..mcp_integration import get_docusaurus_url
+from ..queries import (
+    INTEGRATION_STATUSES,
+    IntegrationListFilters,
+    integration_list_page,
+    list_page_size,
+)
+from ..search import search_response
 from ..security import role_required
-from ..api_utils import generate_api_module
+from ..database import replica_reads
+from ..sql_profiler import query_budget
 
 developer_bp = Blueprint("developer", __name__)
 
@@ -35,30 +50,55 @@ def dashboard():
 @developer_bp.route("/integrations")
 @login_required
 @role_required("developer", "api_admin", "admin")
+@query_budget(6)
+@replica_reads
 def my_integrations():
     """
     List integrations created by the current user.
 
     Developers can create, update, and delete only records they own,
     while admins or API admins may have alternate interfaces for
-    broader management.
+    broader management. Uses the shared keyset-paginated list query
+    scoped to the owner, served by the (owner_id, name, id) index.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
-    integrations = (
-        ApiIntegration.query.filter_by(owner_id=current_user.id)
-        .order_by(ApiIntegration.name)
-        .all()
+    filters = IntegrationListFilters.from_args(request.args)
+    page = integration_list_page(
+        filters,
+        limit=list_page_size(filters),
+        owner_id=current_user.id,
+        with_owner=False,
     )
-    doc_links = {i.id: get_docusaurus_url(i) for i in integrations}
+    doc_links = {i.id: get_docusaurus_url(i) for i in page.items}
     return render_template(
         "developer/my_integrations.html",
-        integrations=integrations,
+        integrations=page.items,
+        page=page,
+        filters=filters.as_query_args(),
+        statuses=INTEGRATION_STATUSES,
         doc_links=doc_links,
     )
 
 
+# ------------------------------------------------------------------------------
+@developer_bp.route("/integrations/search")
+@login_required
+@role_required("developer", "api_admin", "admin")
+def search_integrations():
+    """
+    Return the current user's integrations matching ?q= as ranked JSON.
+
+    Backed by the configured full-text index (SQLite FTS5 by default), so
+    lookups stay fast regardless of how many integrations exist.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    return search_response("developer.edit_integration", owner_id=current_user.id)
+
+
 # ------------------------------------------------------------------------------
 @developer_bp.route("/integrations/new", methods=["GET", "POST"])
 @login_required
@@ -71,7 +111,7 @@ def create_integration():
     in the api/ directory to help jumpstart endpoint coding work.
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
     form = ApiIntegrationForm()
     if form.validate_on_submit():
@@ -86,13 +126,15 @@ def create_integration():
             api_key=form.api_key.data,
             notes=form.notes.data,
             docusaurus_doc_path=form.docusaurus_doc_path.data,
+            cache_ttl=form.cache_ttl.data,
+            rate_limit=form.rate_limit.data or None,
             owner_id=current_user.id,
         )
         db.session.add(integration)
+        # The optional api/ module scaffold is written in the background
+        # after the commit (scaffold_queue.py); the gateway serves it either way.
         db.session.commit()
 
-        generate_api_module(integration)
-
         flash("Integration created.", "success")
         return redirect(url_for("developer.my_integrations"))
 
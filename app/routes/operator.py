@@ -2,12 +2,25 @@
 # app/routes/operator.py - (./app/routes/operator.py)
 # Operator routes for read-only dashboards on integration status.
 
-from flask import Blueprint, render_template
+from flask import Blueprint, render_template, request
 from flask_login import login_required
 
-from ..models import ApiIntegration
+from ..queries import (
+    INTEGRATION_STATUSES,
+    STATUS_DASHBOARD_COLUMNS,
+    IntegrationListFilters,
+    history_summary,
+    integration_list_page,
+    integration_status_counts,
+    list_page_size,
+)
+from ..circuit_breaker import circuit_breakers
+from ..response_cache import response_cache
 from ..security import role_required
+from ..database import replica_reads
+from ..sql_profiler import query_budget
 from ..mcp_integration import get_docusaurus_url
+from ..metrics import metrics
 
 operator_bp = Blueprint("operator", __name__)
 
@@ -16,24 +29,43 @@ operator_bp = Blueprint("operator", __name__)
 @operator_bp.route("/status")
 @login_required
 @role_required("operator", "admin", "api_admin")
+@query_budget(6)
+@replica_reads
 def status_dashboard():
     """
     Display high-level status of all API integrations.
 
     Operators can view counts by status, drill into integration details,
     and navigate to documentation links without performing CRUD actions.
+    Counts come from one GROUP BY query and the table is keyset-paginated
+    and filterable by status and system name, so page cost stays flat as
+    the number of integrations grows.
+
+    Gateway response-cache hit rates come from this worker's in-memory
+    counters, overall and for the integrations on the current page, as
+    do the upstreams whose circuit breakers are currently open and the
+    request telemetry (per-blueprint and per-integration latency
+    percentiles, DB queries per request).
 
     Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
-    Modified:  2025-11-23
+    Modified:  2026-10-16
     """
-    integrations = ApiIntegration.query.all()
-    counts = {"enabled": 0, "disabled": 0, "error": 0}
-    for i in integrations:
-        counts[i.status] = counts.get(i.status, 0) + 1
-    doc_links = {i.id: get_docusaurus_url(i) for i in integrations}
+    filters = IntegrationListFilters.from_args(request.args)
+    page = integration_list_page(
+        filters, limit=list_page_size(filters), columns=STATUS_DASHBOARD_COLUMNS
+    )
+    doc_links = {i.id: get_docusaurus_url(i) for i in page.items}
     return render_template(
         "operator/status_dashboard.html",
-        integrations=integrations,
-        counts=counts,
+        integrations=page.items,
+        page=page,
+        filters=filters.as_query_args(),
+        statuses=INTEGRATION_STATUSES,
+        counts=integration_status_counts(),
         doc_links=doc_links,
+        history=history_summary(hours=24),
+        cache=response_cache.stats(),
+        cache_rates=response_cache.integration_stats(doc_links),
+        circuits=circuit_breakers.stats(),
+        telemetry=metrics.summary(doc_links),
     )
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# app/scaffold_queue.py - (./app/scaffold_queue.py)
+# Background writer keeping api/ scaffold modules in step with integrations.
+
+import atexit
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+from flask import Flask
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from .api_utils import remove_api_modules, write_api_modules
+from .extensions import db
+from .models import ApiIntegration
+
+log = logging.getLogger(__name__)
+
+WRITE = "write"
+DELETE = "delete"
+
+# Columns rendered into a scaffold; an edit touching one regenerates it.
+SCAFFOLD_COLUMNS = ("name", "endpoint_path", "http_method")
+
+# session.info key holding {integration id: action} until the commit.
+_CHANGES_KEY = "scaffold_queue_changes"
+
+_MODULE_FILE = re.compile(r"integration_(\d+)\.py")
+
+# Seconds between retries of a failed flush, doubling up to the maximum.
+RETRY_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+
+# ------------------------------------------------------------------------------
+class ScaffoldQueue:
+    """
+    Writes and removes api/integration_<id>.py scaffolds off the request path.
+
+    Mapper events record which integrations were created, had a scaffold
+    column edited, or were deleted; after the commit their ids are queued
+    here and the view returns straight away. A background thread waits
+    SCAFFOLD_FLUSH_DELAY seconds so a burst of changes shares one batch,
+    loads the rows it needs in one query per SCAFFOLD_BATCH_SIZE ids, and
+    hands them to write_api_modules() / remove_api_modules() (atomic
+    renames, one fsync pass per batch). The latest action per id wins, so
+    an integration created and deleted within one delay never touches disk.
+    A failed flush puts its work back and is retried with backoff.
+
+    Queued work is flushed at interpreter exit; `flask regenerate-all`
+    rebuilds every scaffold if a process died with work still queued.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(self) -> None:
+        self.generate = True
+        self.api_root: Path | None = None
+        self.flush_delay = 0.2
+        self.batch_size = 256
+        self.fsync = True
+        self.workers = 0
+        self.app: Flask | None = None
+        self.totals = {"written": 0, "unchanged": 0, "kept": 0, "removed": 0,
+                       "renamed": 0}
+        self._pending: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._atexit = False
+
+    def init_app(self, app: Flask) -> None:
+        self.app = app
+        self.generate = app.config["GENERATE_API_MODULES"]
+        self.api_root = Path(app.config["API_MODULES_DIR"])
+        self.flush_delay = app.config["SCAFFOLD_FLUSH_DELAY"]
+        self.batch_size = app.config["SCAFFOLD_BATCH_SIZE"]
+        self.fsync = app.config["SCAFFOLD_FSYNC"]
+        self.workers = app.config["SCAFFOLD_WORKERS"] or os.cpu_count() or 1
+        if not self._atexit:
+            atexit.register(self.stop)
+            self._atexit = True
+        app.extensions["scaffold_queue"] = self
+
+    # -- queueing ------------------------------------------------------------
+
+    def enqueue(self, integration_ids: Iterable[int], action: str = WRITE) -> None:
+        """Queue scaffold writes (or removals) for the given integrations."""
+        if self.app is None or (action == WRITE and not self.generate):
+            return
+        with self._lock:
+            for integration_id in integration_ids:
+                self._pending[integration_id] = action
+            if not self._pending:
+                return
+            if self._worker is None:
+                self._stop.clear()
+                self._worker = threading.Thread(
+                    target=self._run, name="scaffold-queue", daemon=True
+                )
+                self._worker.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        retry_delay = RETRY_DELAY
+        while True:
+            self._wake.wait()
+            stopping = self._stop.wait(self.flush_delay)
+            self._wake.clear()
+            try:
+                self.flush()
+                retry_delay = RETRY_DELAY
+            except Exception:  # Keep the thread alive; work is re-queued.
+                log.exception(
+                    "Scaffold flush failed; retrying in %gs", retry_delay
+                )
+                if not stopping:
+                    stopping = self._stop.wait(retry_delay)
+                    retry_delay = min(retry_delay * 2, RETRY_MAX_DELAY)
+                    # The re-queued work must not wait for an unrelated enqueue.
+                    self._wake.set()
+            if stopping:
+                return
+
+    # -- writing -------------------------------------------------------------
+
+    def flush(self) -> int:
+        """
+        Write everything queued so far on the calling thread; returns the
+        number of files written or removed. Waits for a flush already
+        running in the background, so on return all earlier work is done.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            writes = sorted(i for i, action in pending.items() if action == WRITE)
+            deletes = [i for i, action in pending.items() if action == DELETE]
+            changed = 0
+            try:
+                self.api_root.mkdir(parents=True, exist_ok=True)
+                with self.app.app_context():
+                    for start in range(0, len(writes), self.batch_size):
+                        chunk = writes[start : start + self.batch_size]
+                        rows = db.session.execute(
+                            _scaffold_rows().where(ApiIntegration.id.in_(chunk))
+                        ).all()
+                        # Rows gone by now were deleted after being queued.
+                        deletes.extend(set(chunk) - {row.id for row in rows})
+                        changed += self._count(
+                            write_api_modules(self.api_root, rows, self.fsync)
+                        )
+                    db.session.remove()
+                changed += self._count(
+                    remove_api_modules(self.api_root, deletes, self.fsync)
+                )
+            except Exception:
+                with self._lock:
+                    # Newer actions queued meanwhile win over the failed batch.
+                    self._pending = {**pending, **self._pending}
+                raise
+            return changed
+
+    def _count(self, counts: dict[str, int]) -> int:
+        """Add a batch's counts to the totals; returns files changed on disk."""
+        for key, value in counts.items():
+            self.totals[key] += value
+        return sum(counts[key] for key in ("written", "removed", "renamed") if key in counts)
+
+    def regenerate_all(self, force: bool = False, workers: int | None = None) -> dict:
+        """
+        Rewrite every integration's scaffold and clean up orphaned ones.
+
+        Ids are read in keyset batches of SCAFFOLD_BATCH_SIZE on the calling
+        thread (which needs an app context); each batch is rendered and
+        written by a pool of `workers` threads, so file I/O and fsyncs
+        overlap. force also overwrites scaffolds edited by hand. Modules
+        whose integration no longer exists are removed as on delete.
+        """
+        self.api_root.mkdir(parents=True, exist_ok=True)
+        totals = {"written": 0, "unchanged": 0, "kept": 0, "removed": 0,
+                  "renamed": 0}
+        live: set[int] = set()
+        with ThreadPoolExecutor(workers or self.workers) as pool:
+            futures = []
+            last_id = 0
+            while True:
+                rows = db.session.execute(
+                    _scaffold_rows()
+                    .where(ApiIntegration.id > last_id)
+                    .order_by(ApiIntegration.id)
+                    .limit(self.batch_size)
+                ).all()
+                if not rows:
+                    break
+                live.update(row.id for row in rows)
+                futures.append(
+                    pool.submit(write_api_modules, self.api_root, rows, self.fsync, force)
+                )
+                last_id = rows[-1].id
+            for future in futures:
+                for key, value in future.result().items():
+                    totals[key] += value
+        orphans = [
+            int(match.group(1))
+            for match in map(_MODULE_FILE.fullmatch, os.listdir(self.api_root))
+            if match and int(match.group(1)) not in live
+        ]
+        for key, value in remove_api_modules(self.api_root, orphans, self.fsync).items():
+            totals[key] += value
+        return totals
+
+    def stop(self) -> None:
+        """Flush queued work and stop the background thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=10)
+            self._worker = None
+
+    def stats(self) -> dict:
+        return {
+            "generate": self.generate,
+            "pending": len(self._pending),
+            **self.totals,
+        }
+
+
+# ------------------------------------------------------------------------------
+def _scaffold_rows():
+    return select(ApiIntegration.id, *(getattr(ApiIntegration, c) for c in SCAFFOLD_COLUMNS))
+
+
+# ------------------------------------------------------------------------------
+def _record(target, action: str) -> None:
+    session = Session.object_session(target)
+    if session is not None and scaffold_queue.app is not None:
+        session.info.setdefault(_CHANGES_KEY, {})[target.id] = action
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(ApiIntegration, "after_insert")
+def _integration_created(mapper, connection, target) -> None:
+    _record(target, WRITE)
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(ApiIntegration, "after_update")
+def _integration_updated(mapper, connection, target) -> None:
+    state = inspect(target)
+    if any(state.attrs[c].history.has_changes() for c in SCAFFOLD_COLUMNS):
+        _record(target, WRITE)
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(ApiIntegration, "after_delete")
+def _integration_deleted(mapper, connection, target) -> None:
+    _record(target, DELETE)
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session: Session) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes:
+        for action in (WRITE, DELETE):
+            scaffold_queue.enqueue(
+                [i for i, a in changes.items() if a == action], action
+            )
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_CHANGES_KEY, None)
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+scaffold_queue = ScaffoldQueue()
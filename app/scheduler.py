@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# app/scheduler.py - (./app/scheduler.py)
+# Background scheduler that periodically sweeps integration health.
+
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from flask import Flask
+
+from .extensions import db
+from .health_checks import apply_probe_results, get_health_checker, load_probe_targets
+
+try:  # POSIX only; on other platforms the leader lock is skipped.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class SweepSummary:
+    """Counts and timing for one completed sweep."""
+
+    checked: int
+    failing: int
+    transitions: int
+    elapsed: float
+
+
+# ------------------------------------------------------------------------------
+class HealthSweepScheduler:
+    """
+    Periodically probe every non-disabled integration in rate-limited batches.
+
+    Each sweep splits the targets into batches of HEALTH_SWEEP_BATCH_SIZE and
+    pauses HEALTH_SWEEP_BATCH_DELAY seconds between them. Both the pause and
+    the sweep interval are jittered by HEALTH_SWEEP_JITTER so that several
+    workers, or a restart of many workers, do not hit upstreams in lockstep.
+
+    The scheduler can run on a daemon thread inside the web process
+    (HEALTH_SWEEP_IN_PROCESS) or in the foreground via worker.py. Either way
+    it sweeps only while holding a non-blocking file lock on
+    HEALTH_SWEEP_LOCK_FILE, so one process per host sweeps: other gunicorn
+    workers and extra worker.py replicas stand by and take over if the
+    leader exits. Being that single process, it also compacts the audit log
+    every AUDIT_COMPACT_INTERVAL seconds (0 disables it).
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        interval: float = 300.0,
+        batch_size: int = 100,
+        batch_delay: float = 1.0,
+        jitter: float = 0.2,
+        audit_compact_interval: float = 0.0,
+    ) -> None:
+        self.app = app
+        self.interval = interval
+        self.batch_size = max(1, batch_size)
+        self.batch_delay = batch_delay
+        self.jitter = jitter
+        self.audit_compact_interval = audit_compact_interval
+        self._next_compaction = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock_handle = None
+
+    @classmethod
+    def from_app(cls, app: Flask) -> "HealthSweepScheduler":
+        config = app.config
+        return cls(
+            app,
+            interval=config["HEALTH_SWEEP_INTERVAL"],
+            batch_size=config["HEALTH_SWEEP_BATCH_SIZE"],
+            batch_delay=config["HEALTH_SWEEP_BATCH_DELAY"],
+            jitter=config["HEALTH_SWEEP_JITTER"],
+            audit_compact_interval=config["AUDIT_COMPACT_INTERVAL"],
+        )
+
+    def _jittered(self, seconds: float) -> float:
+        spread = seconds * self.jitter
+        return max(0.0, seconds + random.uniform(-spread, spread))
+
+    def sweep_once(self) -> SweepSummary:
+        """Probe all targets batch by batch, committing after each batch."""
+        started = time.perf_counter()
+        checked = failing = transitions = 0
+        with self.app.app_context():
+            targets = load_probe_targets()
+            db.session.rollback()
+            random.shuffle(targets)
+            checker = get_health_checker()
+            for start in range(0, len(targets), self.batch_size):
+                if self._stop.is_set():
+                    break
+                if start:
+                    self._stop.wait(self._jittered(self.batch_delay))
+                results = checker.probe_many(targets[start : start + self.batch_size])
+                transitions += apply_probe_results(results)
+                checked += len(results)
+                failing += sum(1 for r in results if not r.ok)
+            db.session.remove()
+        return SweepSummary(checked, failing, transitions, time.perf_counter() - started)
+
+    def run_forever(self) -> None:
+        """Sweep on the configured interval until stop() is called."""
+        if not self.lead():
+            log.info("Health sweep running in another process; pid %d standing by",
+                     os.getpid())
+            while not self.lead():
+                if self._stop.wait(self._jittered(self.interval)):
+                    return
+            log.info("Health sweep leader lock taken by pid %d", os.getpid())
+        # Random initial offset so restarted workers spread out immediately.
+        self._stop.wait(random.uniform(0, self.interval * self.jitter))
+        while not self._stop.is_set():
+            try:
+                summary = self.sweep_once()
+                log.info(
+                    "Health sweep: %d checked, %d failing, %d status changes in %.2fs",
+                    summary.checked,
+                    summary.failing,
+                    summary.transitions,
+                    summary.elapsed,
+                )
+            except Exception:  # Keep the loop alive across transient failures.
+                log.exception("Health sweep failed")
+            if self.audit_compact_interval > 0 and time.monotonic() >= self._next_compaction:
+                self._next_compaction = time.monotonic() + self.audit_compact_interval
+                self.compact_audit_log()
+            self._stop.wait(self._jittered(self.interval))
+
+    def compact_audit_log(self) -> None:
+        """Roll old audit events into daily summaries (see audit_log.py)."""
+        from .audit_log import audit_log
+
+        try:
+            with self.app.app_context():
+                totals = audit_log.compact()
+                db.session.remove()
+        except Exception:  # Retried at the next interval.
+            log.exception("Audit log compaction failed")
+            return
+        if totals["events"]:
+            log.info(
+                "Audit log: compacted %d events into %d daily summaries",
+                totals["events"],
+                totals["summaries"],
+            )
+
+    def lead(self) -> bool:
+        """Take (or keep) the leader lock; False if another process holds it."""
+        if self._lock_handle is not None:
+            return True
+        return self._acquire_leader_lock(self.app.config["HEALTH_SWEEP_LOCK_FILE"])
+
+    def _acquire_leader_lock(self, path: str) -> bool:
+        if fcntl is None:
+            return True
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        handle = open(path, "a+")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._lock_handle = handle
+        return True
+
+    def start(self) -> bool:
+        """Start on a daemon thread if this process wins the leader lock."""
+        if self._thread is not None:
+            return True
+        if not self.lead():
+            log.info("Health sweep already running in another process (pid %d idle)", os.getpid())
+            return False
+        self._thread = threading.Thread(
+            target=self.run_forever, name="health-sweep", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
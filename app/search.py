@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# app/search.py - (./app/search.py)
+# Full-text search over API integrations with pluggable index backends.
+
+import re
+import time
+from dataclasses import dataclass
+
+from flask import Response, current_app, jsonify, request, url_for
+from sqlalchemy import Connection, and_, case, column, false, func, or_, select, text
+from sqlalchemy.sql.elements import ColumnElement
+
+from .extensions import db
+from .models import ApiIntegration
+
+# Columns covered by the search index, in FTS column order.
+SEARCH_COLUMNS = ("name", "system_name", "notes", "endpoint_path", "base_url")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Escape character for LIKE patterns built from user input.
+_LIKE_ESCAPE = "\\"
+
+
+# ------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class SearchHit:
+    """A ranked search result; lower rank sorts first."""
+
+    id: int
+    name: str
+    system_name: str
+    status: str
+    owner_id: int
+    rank: float
+
+
+# ------------------------------------------------------------------------------
+class SearchBackend:
+    """
+    Interface for integration search backends.
+
+    filter_clause() returns a SQL expression that composes with the list
+    queries in queries.py; search() returns ranked hits for the search
+    endpoints. ensure_index() and rebuild() maintain any index structures
+    the backend needs.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    name = "base"
+
+    def ensure_index(self, connection: Connection) -> None:
+        """Create index structures if missing. Must be idempotent."""
+
+    def rebuild(self, connection: Connection) -> int:
+        """Rebuild the index from api_integrations; returns rows indexed."""
+        return connection.execute(
+            select(func.count()).select_from(ApiIntegration)
+        ).scalar_one()
+
+    def filter_clause(self, term: str) -> ColumnElement:
+        raise NotImplementedError
+
+    def search(self, term: str, limit: int, owner_id: int | None = None) -> list[SearchHit]:
+        raise NotImplementedError
+
+
+# ------------------------------------------------------------------------------
+class LikeSearchBackend(SearchBackend):
+    """
+    Portable fallback using case-insensitive substring matching.
+
+    Needs no index maintenance, which makes it suitable for any
+    DATABASE_URL, but it scans the table; ranks name matches first.
+    """
+
+    name = "like"
+
+    def filter_clause(self, term: str) -> ColumnElement:
+        clauses = []
+        for token in _tokens(term):
+            pattern = _contains_pattern(token)
+            clauses.append(
+                or_(
+                    *(
+                        getattr(ApiIntegration, c).ilike(pattern, escape=_LIKE_ESCAPE)
+                        for c in SEARCH_COLUMNS
+                    )
+                )
+            )
+        if not clauses:
+            return false()
+        return and_(*clauses)
+
+    def search(self, term: str, limit: int, owner_id: int | None = None) -> list[SearchHit]:
+        tokens = _tokens(term)
+        if not tokens:
+            return []
+        name_hit = case(
+            (
+                ApiIntegration.name.ilike(
+                    _contains_pattern(tokens[0]), escape=_LIKE_ESCAPE
+                ),
+                0,
+            ),
+            else_=1,
+        )
+        stmt = (
+            select(
+                ApiIntegration.id,
+                ApiIntegration.name,
+                ApiIntegration.system_name,
+                ApiIntegration.status,
+                ApiIntegration.owner_id,
+                name_hit,
+            )
+            .where(self.filter_clause(term))
+            .order_by(name_hit, ApiIntegration.name, ApiIntegration.id)
+            .limit(limit)
+        )
+        if owner_id is not None:
+            stmt = stmt.where(ApiIntegration.owner_id == owner_id)
+        return [SearchHit(*row) for row in db.session.execute(stmt)]
+
+
+# ------------------------------------------------------------------------------
+class Fts5SearchBackend(SearchBackend):
+    """
+    SQLite FTS5 index stored as an external-content table.
+
+    The virtual table references api_integrations by rowid, so indexed text
+    is not duplicated. Triggers on api_integrations keep it in sync within
+    the same transaction as every insert, delete and update of an indexed
+    column, whichever blueprint, CLI command or bulk statement issued it.
+    Results are ranked with bm25, weighting name matches highest.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    name = "fts5"
+    table = "api_integrations_fts"
+    # bm25 weights in SEARCH_COLUMNS order.
+    weights = (10.0, 5.0, 1.0, 3.0, 2.0)
+
+    def ensure_index(self, connection: Connection) -> None:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": self.table},
+        ).first()
+        cols = ", ".join(SEARCH_COLUMNS)
+        new_cols = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+        old_cols = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+        statements = [
+            f"""CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5(
+                {cols}, content='api_integrations', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table}_ai
+                AFTER INSERT ON api_integrations BEGIN
+                INSERT INTO {self.table}(rowid, {cols}) VALUES (new.id, {new_cols});
+                END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table}_ad
+                AFTER DELETE ON api_integrations BEGIN
+                INSERT INTO {self.table}({self.table}, rowid, {cols})
+                VALUES ('delete', old.id, {old_cols});
+                END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table}_au
+                AFTER UPDATE OF {cols} ON api_integrations BEGIN
+                INSERT INTO {self.table}({self.table}, rowid, {cols})
+                VALUES ('delete', old.id, {old_cols});
+                INSERT INTO {self.table}(rowid, {cols}) VALUES (new.id, {new_cols});
+                END""",
+        ]
+        for statement in statements:
+            connection.execute(text(statement))
+        if not exists:
+            # Index rows that were created before the index existed.
+            self.rebuild(connection)
+
+    def rebuild(self, connection: Connection) -> int:
+        connection.execute(text(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"))
+        return super().rebuild(connection)
+
+    def _match_query(self, term: str) -> str | None:
+        # Quote every token so user input cannot inject FTS5 operators, and
+        # prefix-match each one so partial words find results while typing.
+        tokens = _tokens(term)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def filter_clause(self, term: str) -> ColumnElement:
+        query = self._match_query(term)
+        if query is None:
+            return false()
+        matches = text(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH :fts_query")
+        return ApiIntegration.id.in_(
+            matches.bindparams(fts_query=query).columns(column("rowid"))
+        )
+
+    def search(self, term: str, limit: int, owner_id: int | None = None) -> list[SearchHit]:
+        query = self._match_query(term)
+        if query is None:
+            return []
+        weights = ", ".join(str(w) for w in self.weights)
+        sql = f"""
+            SELECT i.id, i.name, i.system_name, i.status, i.owner_id,
+                   bm25({self.table}, {weights}) AS rank
+            FROM {self.table}
+            JOIN api_integrations i ON i.id = {self.table}.rowid
+            WHERE {self.table} MATCH :fts_query
+            {"AND i.owner_id = :owner_id" if owner_id is not None else ""}
+            ORDER BY rank
+            LIMIT :limit
+        """
+        params = {"fts_query": query, "limit": limit, "owner_id": owner_id}
+        return [SearchHit(*row) for row in db.session.execute(text(sql), params)]
+
+
+# Registry of available backends; SEARCH_BACKEND selects one by name, and
+# "auto" picks FTS5 on SQLite and the LIKE fallback elsewhere.
+SEARCH_BACKENDS: dict[str, type[SearchBackend]] = {
+    LikeSearchBackend.name: LikeSearchBackend,
+    Fts5SearchBackend.name: Fts5SearchBackend,
+}
+
+
+# ------------------------------------------------------------------------------
+def _tokens(term: str) -> list[str]:
+    return _TOKEN_RE.findall(term or "")[:16]
+
+
+# ------------------------------------------------------------------------------
+def _contains_pattern(token: str) -> str:
+    """LIKE pattern matching token anywhere, with its wildcards escaped."""
+    for char in (_LIKE_ESCAPE, "%", "_"):
+        token = token.replace(char, _LIKE_ESCAPE + char)
+    return f"%{token}%"
+
+
+# ------------------------------------------------------------------------------
+def _sqlite_has_fts5(connection: Connection) -> bool:
+    rows = connection.execute(text("PRAGMA compile_options")).scalars()
+    return any(opt == "ENABLE_FTS5" for opt in rows)
+
+
+# ------------------------------------------------------------------------------
+def get_search_backend() -> SearchBackend:
+    """
+    Return the configured search backend, resolved once per application.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    backend = current_app.extensions.get("search_backend")
+    if backend is None:
+        choice = current_app.config["SEARCH_BACKEND"]
+        if choice == "auto":
+            choice = "like"
+            if db.engine.dialect.name == "sqlite":
+                with db.engine.connect() as connection:
+                    if _sqlite_has_fts5(connection):
+                        choice = "fts5"
+        backend = SEARCH_BACKENDS[choice]()
+        current_app.extensions["search_backend"] = backend
+    return backend
+
+
+# ------------------------------------------------------------------------------
+def ensure_search_index() -> None:
+    """Create the configured backend's index structures (idempotent)."""
+    backend = get_search_backend()
+    with db.engine.begin() as connection:
+        backend.ensure_index(connection)
+
+
+# ------------------------------------------------------------------------------
+def rebuild_search_index() -> int:
+    """Rebuild the search index from scratch; returns the row count."""
+    backend = get_search_backend()
+    with db.engine.begin() as connection:
+        backend.ensure_index(connection)
+        return backend.rebuild(connection)
+
+
+# ------------------------------------------------------------------------------
+def search_response(edit_endpoint: str, owner_id: int | None = None) -> Response:
+    """
+    JSON body shared by the integration search endpoints.
+
+    Runs ?q= through the configured backend with ?limit= capped at
+    SEARCH_RESULT_LIMIT; owner_id restricts hits to one user's
+    integrations, and each result links to edit_endpoint.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    term = request.args.get("q", "").strip()
+    limit = min(
+        request.args.get("limit", current_app.config["SEARCH_RESULT_LIMIT"], type=int),
+        current_app.config["SEARCH_RESULT_LIMIT"],
+    )
+    started = time.perf_counter()
+    hits = get_search_backend().search(term, limit=max(limit, 1), owner_id=owner_id)
+    return jsonify(
+        {
+            "query": term,
+            "took_ms": round((time.perf_counter() - started) * 1000.0, 2),
+            "results": [
+                {
+                    "id": hit.id,
+                    "name": hit.name,
+                    "system_name": hit.system_name,
+                    "status": hit.status,
+                    "url": url_for(edit_endpoint, integration_id=hit.id),
+                }
+                for hit in hits
+            ],
+        }
+    )
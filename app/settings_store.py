@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# app/settings_store.py - (./app/settings_store.py)
+# In-memory, versioned cache of admin-managed SiteSetting values.
+
+import threading
+import time
+from typing import Any
+
+from flask import Flask, current_app
+from sqlalchemy import Connection, event, select, update
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import SiteSetting, SiteSettingsVersion
+
+# Config keys that a SiteSetting row with the same key overrides at runtime.
+OVERRIDABLE_CONFIG_KEYS = (
+    "SITE_NAME",
+    "DOCUSAURUS_BASE_URL",
+    "RATE_LIMIT_INTEGRATION",
+    "RATE_LIMIT_OWNER",
+    "RATE_LIMIT_CLIENT_IP",
+    "RATE_LIMIT_UI",
+)
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+# session.info flag set when a transaction touched site_settings.
+_CHANGED_KEY = "site_settings_changed"
+
+# _version before the first load; distinct from None (no version row).
+_NEVER_LOADED: Any = object()
+
+
+# ------------------------------------------------------------------------------
+class SettingsStore:
+    """
+    Process-local map of all SiteSetting rows with typed getters.
+
+    All rows are loaded at once into a dict. At most once every
+    SITE_SETTINGS_CHECK_INTERVAL seconds a reader compares the cached
+    version against site_settings_version (one primary-key lookup) and
+    reloads only when another worker has changed something. Between
+    checks, reads are plain dict lookups with no database access.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+
+    def __init__(self, check_interval: float = 5.0) -> None:
+        self.check_interval = check_interval
+        self._values: dict[str, str] = {}
+        self._version: int | None = _NEVER_LOADED
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.check_interval = app.config["SITE_SETTINGS_CHECK_INTERVAL"]
+        app.extensions["settings_store"] = self
+
+        @app.context_processor
+        def inject_site_settings() -> dict[str, Any]:
+            return {
+                "site_name": self.config_value("SITE_NAME"),
+            }
+
+    @property
+    def version(self) -> int | None:
+        return None if self._version is _NEVER_LOADED else self._version
+
+    def mark_stale(self) -> None:
+        """Force the next read to re-check the version row."""
+        self._checked_at = float("-inf")
+
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and now - self._checked_at < self.check_interval:
+                return
+            version = db.session.execute(
+                select(SiteSettingsVersion.version).where(SiteSettingsVersion.id == 1)
+            ).scalar()
+            # Without a version row (e.g. migrated but never seeded) edits
+            # cannot be detected, so reload on every check instead.
+            if force or version is None or version != self._version:
+                rows = db.session.execute(select(SiteSetting.key, SiteSetting.value))
+                self._values = {key: value for key, value in rows}
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    def all(self) -> dict[str, str]:
+        self.refresh()
+        return dict(self._values)
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        self.refresh()
+        return self._values.get(key, default)
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        try:
+            return int(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        try:
+            return float(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        value = self.get(key)
+        if value is None:
+            return default
+        return value.strip().lower() in _TRUE_VALUES
+
+    def config_value(self, key: str) -> Any:
+        """Return a SiteSetting override for key, else app.config[key]."""
+        value = self.get(key)
+        if value is not None and key in OVERRIDABLE_CONFIG_KEYS:
+            return value
+        return current_app.config.get(key)
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+settings_store = SettingsStore()
+
+
+# ------------------------------------------------------------------------------
+def _bump_version(connection: Connection) -> None:
+    result = connection.execute(
+        update(SiteSettingsVersion)
+        .where(SiteSettingsVersion.id == 1)
+        .values(version=SiteSettingsVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            SiteSettingsVersion.__table__.insert().values(id=1, version=1)
+        )
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(SiteSetting, "after_insert")
+@event.listens_for(SiteSetting, "after_update")
+@event.listens_for(SiteSetting, "after_delete")
+def _site_setting_changed(mapper, connection: Connection, target: SiteSetting) -> None:
+    # Bump the version inside the writer's transaction so other workers
+    # see the new version exactly when the new values become visible.
+    _bump_version(connection)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_CHANGED_KEY] = True
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_commit")
+def _reload_after_commit(session: Session) -> None:
+    # The writing worker re-checks immediately instead of waiting out the
+    # interval, so admins see their own edits on the next page.
+    if session.info.pop(_CHANGED_KEY, False):
+        settings_store.mark_stale()
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_rollback")
+def _discard_change_flag(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# app/sql_profiler.py - (./app/sql_profiler.py)
+# Development-only SQL profiler with N+1 detection and per-route query budgets.
+
+import html
+import logging
+import re
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator
+
+from flask import Flask, Response, current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import ExecuteStyle
+
+log = logging.getLogger(__name__)
+
+_APP_DIR = str(Path(__file__).resolve().parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+# Expanded IN lists ("IN (?, ?, ?)") differ only in length; fold them so
+# a loop of varying-size lookups still shows up as one shape.
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_TOOLBAR = """
+<div id="sql-profiler" style="position:fixed;bottom:0;right:0;z-index:9999;
+max-width:60%;max-height:50%;overflow:auto;background:#212529;color:#f8f9fa;
+font:12px monospace;padding:4px 8px;opacity:.92">
+<details><summary>{summary}</summary>{body}</details></div>
+"""
+
+
+# ------------------------------------------------------------------------------
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request breaks its query budget."""
+
+
+# ------------------------------------------------------------------------------
+def statement_shape(statement: str) -> str:
+    """Statement text with whitespace collapsed and IN lists folded."""
+    return _IN_LIST.sub("(?...)", _WHITESPACE.sub(" ", statement.strip()))
+
+
+# ------------------------------------------------------------------------------
+@dataclass
+class QueryRecord:
+    statement: str
+    shape: str
+    duration: float
+    location: str
+    # executemany or multi-row INSERT batch: repeats are deliberate.
+    batched: bool = False
+
+
+# ------------------------------------------------------------------------------
+@dataclass
+class QueryLog:
+    """
+    Every statement run during one request or profile() block.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    threshold: int = 3
+    queries: list[QueryRecord] = field(default_factory=list)
+    started: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(q.duration for q in self.queries) * 1000, 2)
+
+    def repeated(self) -> list[tuple[str, int, str]]:
+        """(shape, count, first location) for shapes run `threshold`+ times."""
+        counts = Counter(q.shape for q in self.queries if not q.batched)
+        first: dict[str, str] = {}
+        for query in self.queries:
+            first.setdefault(query.shape, query.location)
+        return [
+            (shape, count, first[shape])
+            for shape, count in counts.most_common()
+            if count >= self.threshold
+        ]
+
+
+# ------------------------------------------------------------------------------
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declare the most SQL statements a view may run per request.
+
+    Example:
+        @admin_bp.route("/users")
+        @query_budget(3)
+        def users():
+            ...
+
+    The SQL profiler reports overruns, and raises QueryBudgetExceeded for
+    them in strict mode (SQL_PROFILER_STRICT). Outside development it is
+    a no-op attribute on the view.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def decorator(view: Callable) -> Callable:
+        view.query_budget = max_queries
+        return view
+
+    return decorator
+
+
+# ------------------------------------------------------------------------------
+class SqlProfiler:
+    """
+    Record every SQL statement per request in development.
+
+    Hooks SQLAlchemy's before/after_cursor_execute events and keeps a
+    QueryLog for the current thread while a request (or profile() block)
+    is active. Statements are grouped by shape; one shape run at least
+    SQL_PROFILER_N_PLUS_ONE_THRESHOLD times is reported as a likely N+1
+    with the app or template line that issued it first.
+
+    Each response carries X-SQL-Query-Count, X-SQL-Query-Time-Ms and
+    X-SQL-N-Plus-One headers plus a Server-Timing "db" entry, and HTML
+    pages get a collapsible toolbar listing the statements. Views can
+    declare a @query_budget; SQL_PROFILER_QUERY_BUDGET applies to the
+    rest. With SQL_PROFILER_STRICT on, an overrun or an N+1 raises
+    QueryBudgetExceeded, failing the request (and any test making it).
+
+    Only enabled by DevConfig; production pays nothing for it.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.threshold = 3
+        self.default_budget = 0
+        self.strict = False
+        self.toolbar = True
+        self._local = threading.local()
+        self._hooked = False
+
+    def init_app(self, app: Flask) -> None:
+        self.enabled = app.config["SQL_PROFILER_ENABLED"]
+        self.threshold = app.config["SQL_PROFILER_N_PLUS_ONE_THRESHOLD"]
+        self.default_budget = app.config["SQL_PROFILER_QUERY_BUDGET"]
+        self.strict = app.config["SQL_PROFILER_STRICT"]
+        self.toolbar = app.config["SQL_PROFILER_TOOLBAR"]
+        app.extensions["sql_profiler"] = self
+        if not self.enabled:
+            return
+        app.before_request(self._request_started)
+        app.after_request(self._request_finished)
+        app.teardown_request(self._request_torn_down)
+        self._hook()
+
+    def _hook(self) -> None:
+        if not self._hooked:
+            event.listen(Engine, "before_cursor_execute", self._before_execute)
+            event.listen(Engine, "after_cursor_execute", self._after_execute)
+            self._hooked = True
+
+    # -- recording -----------------------------------------------------------
+
+    @contextmanager
+    def profile(self) -> Iterator[QueryLog]:
+        """
+        Record the statements run on this thread inside the block.
+
+        Works with the profiler disabled (the benchmarks use it that way);
+        the cursor hooks are installed on first use and cost one
+        thread-local lookup per statement outside a block.
+        """
+        self._hook()
+        previous = getattr(self._local, "log", None)
+        query_log = self._local.log = QueryLog(self.threshold)
+        try:
+            yield query_log
+        finally:
+            self._local.log = previous
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        query_log = getattr(self._local, "log", None)
+        if query_log is not None:
+            query_log.started = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        query_log = getattr(self._local, "log", None)
+        if query_log is None:
+            return
+        query_log.queries.append(
+            QueryRecord(
+                statement=statement,
+                shape=statement_shape(statement),
+                duration=time.perf_counter() - query_log.started,
+                location=_caller(),
+                batched=context is not None
+                and context.execute_style is not ExecuteStyle.EXECUTE,
+            )
+        )
+
+    # -- request hooks -------------------------------------------------------
+
+    def _request_started(self) -> None:
+        self._local.log = QueryLog(self.threshold)
+
+    def _request_torn_down(self, exc: BaseException | None) -> None:
+        self._local.log = None
+
+    def budget_for(self, endpoint: str | None) -> int:
+        view = current_app.view_functions.get(endpoint) if endpoint else None
+        return getattr(view, "query_budget", None) or self.default_budget
+
+    def _request_finished(self, response: Response) -> Response:
+        query_log = getattr(self._local, "log", None)
+        if query_log is None:
+            return response
+        repeated = query_log.repeated()
+        budget = self.budget_for(request.endpoint)
+        response.headers["X-SQL-Query-Count"] = str(query_log.count)
+        response.headers["X-SQL-Query-Time-Ms"] = str(query_log.total_ms)
+        response.headers["X-SQL-N-Plus-One"] = str(len(repeated))
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={query_log.total_ms};desc="{query_log.count} queries"',
+        )
+
+        problems = []
+        if budget and query_log.count > budget:
+            problems.append(
+                f"{request.endpoint} ran {query_log.count} queries "
+                f"(budget {budget})"
+            )
+        for shape, count, location in repeated:
+            problems.append(
+                f"N+1 in {request.endpoint}: {count}x at {location}: {shape[:200]}"
+            )
+        for problem in problems:
+            log.warning("SQL profiler: %s", problem)
+
+        if (
+            self.toolbar
+            and response.mimetype == "text/html"
+            and not response.direct_passthrough
+            and not response.is_streamed
+        ):
+            _inject_toolbar(response, query_log, repeated, budget)
+        if self.strict and problems:
+            raise QueryBudgetExceeded("; ".join(problems))
+        return response
+
+
+# ------------------------------------------------------------------------------
+def _caller() -> str:
+    """First app or template frame outside this module, as "file:line"."""
+    for frame in reversed(traceback.extract_stack(limit=40)):
+        filename = frame.filename
+        if filename == _THIS_FILE:
+            continue
+        if filename.startswith(_APP_DIR) or filename.endswith(".html"):
+            return f"{Path(filename).name}:{frame.lineno}"
+    return "?"
+
+
+# ------------------------------------------------------------------------------
+def _inject_toolbar(
+    response: Response,
+    query_log: QueryLog,
+    repeated: list[tuple[str, int, str]],
+    budget: int,
+) -> None:
+    page = response.get_data(as_text=True)
+    marker = page.rfind("</body>")
+    if marker < 0:
+        return
+    summary = f"SQL: {query_log.count} queries, {query_log.total_ms} ms"
+    if budget:
+        summary += f" (budget {budget})"
+    if repeated:
+        summary += f", {len(repeated)} possible N+1"
+    rows = [
+        f"<div style='color:#ffc107'>N+1 x{count} at {html.escape(location)}: "
+        f"{html.escape(shape)}</div>"
+        for shape, count, location in repeated
+    ]
+    rows += [
+        f"<div>{q.duration * 1000:.2f} ms {html.escape(q.location)}: "
+        f"{html.escape(q.shape)}</div>"
+        for q in query_log.queries
+    ]
+    toolbar = _TOOLBAR.format(summary=html.escape(summary), body="".join(rows))
+    response.set_data(page[:marker] + toolbar + page[marker:])
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+sql_profiler = SqlProfiler()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# app/user_cache.py - (./app/user_cache.py)
+# Process-local LRU/TTL identity cache used by the Flask-Login user loader.
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Flask
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, joinedload
+
+from .extensions import db
+from .models import Role, User
+
+# session.info key collecting user ids changed in the current transaction.
+_PENDING_KEY = "user_cache_invalidate"
+
+
+# ------------------------------------------------------------------------------
+class UserCache:
+    """
+    Bounded, thread-safe cache of detached User objects with roles loaded.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted once `max_size` is reached. A generation counter guards against
+    a slow loader re-inserting a user that was invalidated while it was
+    reading the database.
+
+    The cache is per process: other workers pick up changes when their own
+    entry expires, so keep the TTL short.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, User]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: int) -> User | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user: User, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation or self.max_size <= 0:
+                return
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def init_app(self, app: Flask) -> None:
+        self.max_size = app.config["USER_CACHE_SIZE"]
+        self.ttl = app.config["USER_CACHE_TTL"]
+        app.extensions["user_cache"] = self
+
+
+# ------------------------------------------------------------------------------
+# Shared process-wide instance, configured by init_app() in create_app.
+user_cache = UserCache()
+
+
+# ------------------------------------------------------------------------------
+def load_cached_user(user_id: int) -> User | None:
+    """
+    Return the user for the current request, hitting the database at most once.
+
+    Cache hits are merged into the request session with load=False, which
+    copies the cached state without emitting SQL. Misses load the user with
+    its role eagerly joined through a short-lived private session so the
+    cached copy is never expired by commits made during a request.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-16
+    """
+    cached = user_cache.get(user_id)
+    if cached is None:
+        generation = user_cache.generation
+        with Session(db.engine, expire_on_commit=False) as session:
+            cached = session.scalar(
+                select(User).options(joinedload(User.role)).where(User.id == user_id)
+            )
+        if cached is None:
+            return None
+        user_cache.put(cached, generation)
+    return db.session.merge(cached, load=False)
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:
+    # Covers role changes, deactivation and password changes alike. Drop the
+    # entry at flush time and again after commit so a concurrent reader
+    # cannot re-cache the pre-commit row.
+    user_cache.invalidate(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Role, "after_update")
+@event.listens_for(Role, "after_delete")
+def _role_changed(mapper, connection, target: Role) -> None:
+    user_cache.clear()
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.invalidate(user_id)
+
+
+# ------------------------------------------------------------------------------
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_users(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# asgi.py - Root of project (./asgi.py)
+# ASGI entry point: async integration gateway alongside the Flask UI.
+
+"""
+Serve with any ASGI server, for example:
+
+    pip install httpx uvicorn
+    uvicorn asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
+Integration traffic under GATEWAY_PREFIX runs on the event loop with an
+async HTTP client, so thousands of slow upstream calls can be in flight
+per process. The admin/developer/operator UI is the same Flask app as
+app.py, using the same models and configuration.
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+from app import create_app
+from app.async_gateway import create_asgi_app
+
+flask_app = create_app()
+application = create_asgi_app(flask_app)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# benchmarks/asgi_load.py - (./benchmarks/asgi_load.py)
+# Load-test the ASGI gateway with thousands of concurrent slow upstream calls.
+
+"""
+Starts an asyncio "slow upstream" that answers /delay/<ms> after sleeping,
+registers one integration pointing at it, and fires --concurrency requests
+at once through the ASGI gateway. With a fully asynchronous path the whole
+batch finishes in roughly one upstream delay, however large it is.
+
+By default the ASGI app is called in-process with synthetic scopes, so no
+server is needed and no client-side HTTP stack is measured. Pass --url to
+load-test a running deployment instead (e.g. `uvicorn asgi:application`
+with GATEWAY_REQUIRE_LOGIN=false, RATE_LIMIT_ENABLED=false and an
+integration whose endpoint_path is /delay/<int:ms>); requests are then
+spread over several httpx clients, because a single httpx pool slows
+down sharply past a few hundred connections.
+
+    python benchmarks/asgi_load.py --concurrency 2000 --delay-ms 500
+
+Requires httpx (pip install httpx).
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+# ------------------------------------------------------------------------------
+async def _slow_upstream(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Keep-alive HTTP/1.1 handler: sleep for /delay/<ms>, then reply 200."""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            length = 0
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value.strip())
+            if length:
+                await reader.readexactly(length)
+            path = request_line.split(" ")[1]
+            parts = [p for p in path.split("?")[0].split("/") if p]
+            if len(parts) >= 2 and parts[0] == "delay":
+                await asyncio.sleep(int(parts[1]) / 1000.0)
+            body = b'{"ok": true}'
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+# ------------------------------------------------------------------------------
+def asgi_caller(application, path: str):
+    """Return a coroutine function that GETs path from the ASGI app."""
+
+    async def call() -> int:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+        status = 0
+
+        async def receive() -> dict:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await application(scope, receive, send)
+        return status
+
+    return call
+
+
+# ------------------------------------------------------------------------------
+def http_caller(clients: list, url: str):
+    """Return a coroutine function that GETs url, round-robin over clients."""
+    rotation = itertools.cycle(clients)
+
+    async def call() -> int:
+        return (await next(rotation).get(url)).status_code
+
+    return call
+
+
+# ------------------------------------------------------------------------------
+async def _fire(call, count: int) -> tuple[list, int]:
+    latencies: list[float] = []
+    failures = 0
+
+    async def one() -> None:
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            if await call() != 200:
+                failures += 1
+        except httpx.HTTPError:
+            failures += 1
+        latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies, failures
+
+
+# ------------------------------------------------------------------------------
+async def run(args: argparse.Namespace) -> None:
+    upstream = await asyncio.start_server(_slow_upstream, "127.0.0.1", 0)
+    port = upstream.sockets[0].getsockname()[1]
+    clients: list[httpx.AsyncClient] = []
+
+    if args.url:
+        timeout = httpx.Timeout(args.delay_ms / 1000.0 + 60)
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        clients = [
+            httpx.AsyncClient(timeout=timeout, limits=limits)
+            for _ in range(max(1, args.concurrency // 32))
+        ]
+        call = http_caller(clients, f"{args.url.rstrip('/')}/delay/{args.delay_ms}")
+        gateway = None
+    else:
+        workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+        os.environ["DB_INIT_LOCK_FILE"] = str(Path(workdir) / "db_init.lock")
+        os.environ["API_MODULES_DIR"] = str(Path(workdir) / "api")
+        os.environ["SQL_PROFILER_ENABLED"] = "false"
+        os.environ["GATEWAY_REQUIRE_LOGIN"] = "false"
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+        os.environ["ASYNC_GATEWAY_MAX_CONNECTIONS"] = str(args.concurrency)
+        os.environ["ASYNC_GATEWAY_MAX_KEEPALIVE"] = str(args.concurrency)
+
+        from app import create_app
+        from app.async_gateway import create_asgi_app
+        from app.extensions import db
+        from app.models import ApiIntegration, User
+
+        flask_app = create_app()
+        with flask_app.app_context():
+            owner = User.query.filter_by(email="admin@example.com").first()
+            db.session.add(
+                ApiIntegration(
+                    name="slow upstream",
+                    system_name="bench",
+                    base_url=f"http://127.0.0.1:{port}",
+                    endpoint_path="/delay/<int:ms>",
+                    http_method="GET",
+                    auth_type="none",
+                    owner_id=owner.id,
+                )
+            )
+            db.session.commit()
+        application = create_asgi_app(flask_app)
+        gateway = flask_app.extensions["async_gateway"]
+        await gateway.startup()
+        call = asgi_caller(application, f"/gateway/delay/{args.delay_ms}")
+
+    # Warm the route table and open the upstream keep-alive connections.
+    await _fire(call, args.concurrency)
+
+    started = time.perf_counter()
+    latencies, failures = await _fire(call, args.concurrency)
+    elapsed = time.perf_counter() - started
+
+    for client in clients:
+        await client.aclose()
+    if gateway is not None:
+        await gateway.shutdown()
+    upstream.close()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{args.concurrency} concurrent requests, upstream delay {args.delay_ms} ms\n"
+        f"  wall time   {elapsed * 1000:8.0f} ms "
+        f"(ideal ~{args.delay_ms} ms; {elapsed * 1000 / args.delay_ms:.2f}x)\n"
+        f"  throughput  {args.concurrency / elapsed:8.0f} req/s\n"
+        f"  latency     p50 {statistics.median(latencies) * 1000:.0f} ms, "
+        f"p99 {p99 * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms\n"
+        f"  failures    {failures}"
+    )
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ASGI gateway concurrency")
+    parser.add_argument("--concurrency", type=int, default=2000)
+    parser.add_argument("--delay-ms", type=int, default=500)
+    parser.add_argument("--url", default=None,
+                        help="Gateway base URL of a running server, e.g. "
+                             "http://127.0.0.1:8000/gateway")
+    asyncio.run(run(parser.parse_args()))
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
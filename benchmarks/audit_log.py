@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# benchmarks/audit_log.py - (./benchmarks/audit_log.py)
+# Measure what the audit log adds to integration edits, and compaction speed.
+
+"""
+Edits --edits integrations (two audited fields per commit, as an edit
+form would) and reports commit latency in three modes, each in a fresh
+process and database:
+
+  * off: AUDIT_LOG_ENABLED=false
+  * batched: the default, events buffered and inserted in the background
+  * inline: AUDIT_FLUSH_INTERVAL=0, one INSERT per commit on the request
+    thread (what writing the events synchronously would cost)
+
+then times compact() rolling the batched run's events into daily
+summaries.
+
+    python benchmarks/audit_log.py --edits 2000
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-17
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MODES = {
+    "off": {"AUDIT_LOG_ENABLED": "false"},
+    "batched": {},
+    "inline": {"AUDIT_FLUSH_INTERVAL": "0"},
+}
+
+
+# ------------------------------------------------------------------------------
+def run(mode: str, edits: int, integrations: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="mcpapp-bench-"))
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite:///{workdir / 'bench.db'}",
+            "DB_INIT_LOCK_FILE": str(workdir / "db_init.lock"),
+            "API_MODULES_DIR": str(workdir / "api"),
+            "SQL_PROFILER_ENABLED": "false",
+            "GENERATE_API_MODULES": "false",
+            **MODES[mode],
+        }
+    )
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import func, insert, select
+
+    from app import create_app
+    from app.audit_log import audit_log
+    from app.extensions import db
+    from app.models import ApiIntegration, AuditEvent, User
+
+    app = create_app()
+    with app.app_context():
+        owner = User.query.filter_by(email="admin@example.com").first()
+        db.session.execute(
+            insert(ApiIntegration),
+            [
+                {
+                    "name": f"integration-{n:06d}",
+                    "system_name": "bench",
+                    "base_url": "https://example.com",
+                    "endpoint_path": f"/items/{n}",
+                    "status": "enabled",
+                    "owner_id": owner.id,
+                }
+                for n in range(integrations)
+            ],
+        )
+        db.session.commit()
+
+        latencies = []
+        for n in range(edits):
+            started = time.perf_counter()
+            integration = db.session.get(ApiIntegration, n % integrations + 1)
+            integration.notes = f"edit {n}"
+            integration.status = "disabled" if n % 2 else "enabled"
+            db.session.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+        audit_log.flush()
+        events = db.session.scalar(select(func.count(AuditEvent.id)))
+
+        started = time.perf_counter()
+        totals = audit_log.compact(now=datetime.utcnow() + timedelta(days=365))
+        compact_s = time.perf_counter() - started
+        db.session.remove()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": statistics.quantiles(latencies, n=100)[98],
+        "total_s": sum(latencies) / 1000,
+        "events": events,
+        "compacted": totals["events"],
+        "compact_s": compact_s,
+    }
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Audit log write overhead")
+    parser.add_argument("--edits", type=int, default=2000)
+    parser.add_argument("--integrations", type=int, default=500)
+    args = parser.parse_args()
+
+    spawn = multiprocessing.get_context("spawn")
+    print(f"{args.edits} edit commits over {args.integrations} integrations")
+    print(f"{'mode':<8} {'p50 ms':>8} {'p99 ms':>8} {'total s':>8} {'events':>7} "
+          f"{'compact s':>10}")
+    for mode in MODES:
+        with spawn.Pool(1) as pool:
+            result = pool.apply(run, (mode, args.edits, args.integrations))
+        print(f"{mode:<8} {result['p50']:>8.2f} {result['p99']:>8.2f} "
+              f"{result['total_s']:>8.2f} {result['events']:>7} "
+              f"{result['compact_s']:>10.2f}")
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
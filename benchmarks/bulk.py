@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# benchmarks/bulk.py - (./benchmarks/bulk.py)
+# Measure bulk JSONL/CSV import and streaming export throughput.
+
+"""
+Writes a --rows catalog as JSONL and as CSV into a temp directory, with
+a handful of systems, base URLs and rate limits repeated across rows and
+--invalid-rate rows that fail validation. Each file is then imported
+into an emptied SQLite database. Reports, per format:
+
+  * import rows/s (parse, ApiIntegrationForm validation, batched INSERT)
+  * export rows/s and the peak Python memory held while streaming the
+    whole table, which should not grow with --rows
+  * with --modules, scaffold files/s for the imported rows through the
+    background queue (flushed on the calling thread), then for
+    `flask regenerate-all` on --workers threads into an emptied api/ dir
+
+    python benchmarks/bulk.py --rows 100000 --batch-size 1000 --modules
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-17
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+COLUMNS = (
+    "name", "system_name", "base_url", "endpoint_path", "http_method", "status",
+    "auth_type", "api_key", "notes", "docusaurus_doc_path", "cache_ttl", "rate_limit",
+)
+
+
+# ------------------------------------------------------------------------------
+def catalog(rows: int, invalid_rate: float, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    systems = [f"system{n:02d}" for n in range(40)]
+    records = []
+    for n in range(rows):
+        system = rng.choice(systems)
+        record = {
+            "name": f"{system}-endpoint-{n:07d}",
+            "system_name": system,
+            "base_url": f"https://{system}.example.com",
+            "endpoint_path": f"/v1/{system}/items/{n}",
+            "http_method": rng.choice(("GET", "GET", "POST")),
+            "status": "enabled",
+            "auth_type": rng.choice(("api_key", "none")),
+            "api_key": f"key-{n}",
+            "notes": "",
+            "docusaurus_doc_path": f"/integrations/{system}",
+            "cache_ttl": rng.choice(("", "30", "300")),
+            "rate_limit": rng.choice(("", "120/m", "10/s burst 20")),
+        }
+        if rng.random() < invalid_rate:
+            record["base_url"] = "not a url"
+        records.append(record)
+    return records
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import/export throughput")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--invalid-rate", type=float, default=0.01)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--modules", action="store_true",
+                        help="Also time scaffold generation (into a temp dir).")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="regenerate-all threads (default CPU count).")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="mcpapp-bench-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.db'}"
+    os.environ["DB_INIT_LOCK_FILE"] = str(workdir / "db_init.lock")
+    os.environ["SQL_PROFILER_ENABLED"] = "false"
+    os.environ["API_MODULES_DIR"] = str(workdir / "api")
+    os.environ["SCAFFOLD_WORKERS"] = str(args.workers)
+
+    records = catalog(args.rows, args.invalid_rate, args.seed)
+    files = {"csv": workdir / "catalog.csv", "jsonl": workdir / "catalog.jsonl"}
+    with files["jsonl"].open("w") as out:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+    with files["csv"].open("w", newline="") as out:
+        writer = csv.DictWriter(out, COLUMNS)
+        writer.writeheader()
+        writer.writerows(records)
+
+    from app import create_app
+    from app.bulk import export_integrations, import_integrations, iter_records
+    from app.extensions import db
+    from app.models import ApiIntegration, User
+    from app.scaffold_queue import scaffold_queue
+    from app.search import rebuild_search_index
+
+    app = create_app()
+    print(f"{args.rows} rows, {args.invalid_rate:.0%} invalid, batch {args.batch_size}")
+    for fmt, path in files.items():
+        with app.app_context():
+            # Start each format from a compact table and search index.
+            db.session.execute(db.delete(ApiIntegration))
+            db.session.commit()
+            rebuild_search_index()
+            db.session.execute(db.text("VACUUM"))
+            owner = User.query.filter_by(email="admin@example.com").first()
+            with path.open("rb") as source:
+                report = import_integrations(
+                    iter_records(source, fmt),
+                    owner_id=owner.id,
+                    batch_size=args.batch_size,
+                )
+            print(
+                f"{fmt:<5} import  {report.rows_per_second:>9.0f} rows/s "
+                f"({report.inserted} inserted, {report.invalid} invalid, "
+                f"{report.elapsed:.2f} s)"
+            )
+
+            started = time.perf_counter()
+            size = sum(len(chunk) for chunk in export_integrations(fmt))
+            elapsed = time.perf_counter() - started
+            tracemalloc.start()
+            for _ in export_integrations(fmt):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{fmt:<5} export  {report.inserted / elapsed:>9.0f} rows/s "
+                f"({size / 2**20:.1f} MiB, peak {peak / 1024:.0f} KiB traced)"
+            )
+
+            if args.modules:
+                api_root = scaffold_queue.api_root
+                started = time.perf_counter()
+                scaffold_queue.enqueue(report.ids)
+                written = scaffold_queue.flush()
+                print(
+                    f"{fmt:<5} queue   {written / (time.perf_counter() - started):>9.0f}"
+                    f" files/s ({written} written)"
+                )
+                for module in api_root.iterdir():
+                    module.unlink()
+                started = time.perf_counter()
+                written = scaffold_queue.regenerate_all()["written"]
+                print(
+                    f"{fmt:<5} regen   {written / (time.perf_counter() - started):>9.0f}"
+                    f" files/s ({written} written, {scaffold_queue.workers} workers)"
+                )
+                for module in api_root.iterdir():
+                    module.unlink()
+            db.session.remove()
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
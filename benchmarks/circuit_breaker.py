@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# benchmarks/circuit_breaker.py - (./benchmarks/circuit_breaker.py)
+# Exercise gateway circuit breakers and AIMD limits against injected faults.
+
+"""
+Runs the app on a local threaded WSGI server in front of the stub upstream
+and drives its /flaky/<name> faults through three phases:
+
+  * failing: every call returns 503; reports how many calls reached the
+    upstream before the breaker opened, the latency of fail-fast 503s,
+    and the integration status written back by the batched flush
+  * recovery: the fault is cleared; reports how long until half-open
+    probes close the breaker and the status written back
+  * degraded: a second upstream answers slowly to --threads concurrent
+    clients; reports how far the AIMD limit cut upstream concurrency.
+    Slow-call tripping is switched off (CIRCUIT_SLOW_CALL_RATE > 1) so
+    the limit alone is measured.
+
+    python benchmarks/circuit_breaker.py --threads 32 --slow-ms 400
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_upstream import Fault, StubHandler, start_stub_server  # noqa: E402
+
+
+# ------------------------------------------------------------------------------
+def integration_status(app, integration_id: int) -> str:
+    from app.extensions import db
+    from app.models import ApiIntegration
+
+    with app.app_context():
+        status = db.session.get(ApiIntegration, integration_id).status
+        db.session.remove()
+    return status
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gateway circuit breakers")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--slow-ms", type=int, default=400)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    os.environ["DB_INIT_LOCK_FILE"] = str(Path(workdir) / "db_init.lock")
+    os.environ["API_MODULES_DIR"] = str(Path(workdir) / "api")
+    os.environ["SQL_PROFILER_ENABLED"] = "false"
+    os.environ["GATEWAY_REQUIRE_LOGIN"] = "false"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["CIRCUIT_WINDOW_SECONDS"] = "5"
+    os.environ["CIRCUIT_MIN_REQUESTS"] = "10"
+    os.environ["CIRCUIT_OPEN_SECONDS"] = "2"
+    os.environ["CIRCUIT_SLOW_CALL_SECONDS"] = str(args.slow_ms / 2000.0)
+    os.environ["CIRCUIT_SLOW_CALL_RATE"] = "1.1"
+    os.environ["CIRCUIT_STATUS_FLUSH_INTERVAL"] = "0.5"
+
+    from werkzeug.serving import make_server
+
+    from app import create_app
+    from app.circuit_breaker import circuit_breakers
+    from app.extensions import db
+    from app.models import ApiIntegration, User
+
+    stub = start_stub_server()
+    port = stub.server_address[1]
+
+    app = create_app()
+    with app.app_context():
+        owner = User.query.filter_by(email="admin@example.com").first()
+        failing = ApiIntegration(
+            name="flaky",
+            system_name="bench",
+            base_url=f"http://127.0.0.1:{port}",
+            endpoint_path="/flaky/down",
+            http_method="GET",
+            auth_type="none",
+            status="enabled",
+            owner_id=owner.id,
+        )
+        degraded = ApiIntegration(
+            name="slow",
+            system_name="bench",
+            base_url=f"http://localhost:{port}",
+            endpoint_path="/flaky/slow",
+            http_method="GET",
+            auth_type="none",
+            status="enabled",
+            owner_id=owner.id,
+        )
+        db.session.add_all([failing, degraded])
+        db.session.commit()
+        failing_id = failing.id
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gateway = f"http://127.0.0.1:{server.server_port}/gateway"
+    session = requests.Session()
+
+    # -- failing upstream ----------------------------------------------------
+    StubHandler.faults["down"] = Fault(error_rate=1.0, status=503)
+    fast_fail = []
+    for _ in range(100):
+        started = time.perf_counter()
+        response = session.get(f"{gateway}/flaky/down", timeout=30)
+        if "circuit" in response.text:
+            fast_fail.append((time.perf_counter() - started) * 1000)
+    time.sleep(1.0)
+    print("failing upstream (100 requests, all 503)")
+    print(f"  upstream calls before open  {StubHandler.hits['flaky']}")
+    print(f"  fail-fast 503s              {len(fast_fail)}, "
+          f"median {statistics.median(fast_fail):.2f} ms")
+    print(f"  status after flush          {integration_status(app, failing_id)}")
+
+    # -- recovery ------------------------------------------------------------
+    StubHandler.faults["down"] = Fault()
+    started = time.perf_counter()
+    while session.get(f"{gateway}/flaky/down", timeout=30).status_code != 200:
+        time.sleep(0.05)
+    for _ in range(5):
+        session.get(f"{gateway}/flaky/down", timeout=30)
+    recovered = time.perf_counter() - started
+    time.sleep(1.0)
+    print("recovery (fault cleared)")
+    print(f"  first 200 after             {recovered:.2f} s")
+    print(f"  status after flush          {integration_status(app, failing_id)}")
+
+    # -- degraded upstream ---------------------------------------------------
+    StubHandler.faults["slow"] = Fault(delay_ms=args.slow_ms)
+    deadline = time.monotonic() + args.seconds
+    outcomes = {"ok": 0, "shed": 0}
+    lock = threading.Lock()
+
+    def client(_):
+        with requests.Session() as own:
+            while time.monotonic() < deadline:
+                response = own.get(f"{gateway}/flaky/slow", timeout=30)
+                key = "ok" if response.status_code == 200 else "shed"
+                with lock:
+                    outcomes[key] += 1
+                if key == "shed":
+                    time.sleep(0.05)
+
+    with ThreadPoolExecutor(args.threads) as pool:
+        futures = [pool.submit(client, n) for n in range(args.threads)]
+        time.sleep(args.seconds / 2)
+        first_peak = StubHandler.peak["slow"]
+        StubHandler.peak["slow"] = 0
+        for future in futures:
+            future.result()
+    breaker = circuit_breakers.get(f"http://localhost:{port}").snapshot()
+    print(f"degraded upstream ({args.slow_ms} ms, {args.threads} clients, "
+          f"{args.seconds:g} s)")
+    print(f"  upstream concurrency        peak {first_peak} at first, "
+          f"{StubHandler.peak['slow']} later")
+    print(f"  served / shed               {outcomes['ok']} / {outcomes['shed']}")
+    print(f"  AIMD limit                  {breaker['limit']}")
+
+    server.shutdown()
+    stub.shutdown()
+    circuit_breakers.stop()
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# benchmarks/db_concurrency.py - (./benchmarks/db_concurrency.py)
+# Measure SQLite write throughput with N worker processes, before and after tuning.
+
+"""
+Runs N worker processes (as gunicorn would) against one SQLite file, each
+looping for --seconds over a mix of read transactions (one dashboard
+page of integrations) and write transactions (update an integration and
+record a health check, as a probe does). Runs twice on fresh databases:
+
+  * legacy: no pragmas, i.e. rollback journal, synchronous=FULL and the
+    driver's default lock timeout (the configuration before app/database.py)
+  * tuned: the defaults, WAL + synchronous=NORMAL + busy_timeout
+
+and reports commits/s, reads/s, "database is locked" failures and write
+latency for each worker count.
+
+    python benchmarks/db_concurrency.py --workers 1,2,4,8 --seconds 5
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-17
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+PROFILES = {
+    "legacy": {"SQLITE_JOURNAL_MODE": "", "SQLITE_SYNCHRONOUS": "",
+               "SQLITE_BUSY_TIMEOUT_MS": ""},
+    "tuned": {},
+}
+
+
+# ------------------------------------------------------------------------------
+def environment(workdir: Path, profile: str) -> dict[str, str]:
+    return {
+        "DATABASE_URL": f"sqlite:///{workdir / 'bench.db'}",
+        "DB_INIT_LOCK_FILE": str(workdir / "db_init.lock"),
+        "API_MODULES_DIR": str(workdir / "api"),
+        "SQL_PROFILER_ENABLED": "false",
+        "GENERATE_API_MODULES": "false",
+        **PROFILES[profile],
+    }
+
+
+# ------------------------------------------------------------------------------
+def seed(env: dict[str, str], integrations: int) -> None:
+    os.environ.update(env)
+    from sqlalchemy import insert
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import ApiIntegration, User
+
+    app = create_app()
+    with app.app_context():
+        owner = User.query.filter_by(email="admin@example.com").first()
+        db.session.execute(
+            insert(ApiIntegration),
+            [
+                {
+                    "name": f"integration-{n:06d}",
+                    "system_name": f"system{n % 20}",
+                    "base_url": "https://example.com",
+                    "endpoint_path": f"/items/{n}",
+                    "status": "enabled",
+                    "owner_id": owner.id,
+                }
+                for n in range(integrations)
+            ],
+        )
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+
+
+# ------------------------------------------------------------------------------
+def worker(
+    env: dict[str, str], start_at: float, seconds: float, write_ratio: float, seed_: int
+) -> dict:
+    os.environ.update(env)
+    os.environ["AUTO_INIT_DB"] = "false"
+    from datetime import datetime
+
+    from sqlalchemy import func, select
+    from sqlalchemy.exc import OperationalError
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import ApiIntegration, IntegrationCheck
+
+    rng = random.Random(seed_)
+    app = create_app()
+    stats = {"writes": 0, "reads": 0, "locked": 0, "write_ms": []}
+    with app.app_context():
+        count = db.session.scalar(select(func.count(ApiIntegration.id)))
+        db.session.remove()
+        # Workers import the app at different speeds; start them together.
+        time.sleep(max(start_at - time.time(), 0))
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                if rng.random() < write_ratio:
+                    integration = db.session.get(ApiIntegration, rng.randint(1, count))
+                    now = datetime.utcnow()
+                    integration.last_checked_at = now
+                    integration.last_latency_ms = rng.random() * 100
+                    db.session.add(
+                        IntegrationCheck(
+                            integration_id=integration.id,
+                            checked_at=now,
+                            hour_bucket=int(now.timestamp()) // 3600,
+                            ok=True,
+                            http_status=200,
+                            latency_ms=integration.last_latency_ms,
+                        )
+                    )
+                    db.session.commit()
+                    stats["writes"] += 1
+                    stats["write_ms"].append((time.perf_counter() - started) * 1000)
+                else:
+                    db.session.execute(
+                        select(ApiIntegration.id, ApiIntegration.name, ApiIntegration.status)
+                        .order_by(ApiIntegration.name)
+                        .offset(rng.randrange(max(count - 50, 1)))
+                        .limit(50)
+                    ).all()
+                    db.session.commit()
+                    stats["reads"] += 1
+            except OperationalError as exc:
+                db.session.rollback()
+                if "locked" not in str(exc) and "busy" not in str(exc):
+                    raise
+                stats["locked"] += 1
+        db.session.remove()
+    return stats
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite multi-worker throughput")
+    parser.add_argument("--workers", default="1,2,4,8",
+                        help="Comma-separated worker process counts.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--integrations", type=int, default=5000)
+    args = parser.parse_args()
+
+    spawn = multiprocessing.get_context("spawn")
+    print(f"{args.seconds:g} s per run, {args.write_ratio:.0%} writes, "
+          f"{args.integrations} integrations")
+    print(f"{'profile':<8} {'workers':>7} {'writes/s':>9} {'reads/s':>9} "
+          f"{'locked':>7} {'w p50 ms':>9} {'w p99 ms':>9}")
+    for profile in PROFILES:
+        for workers in [int(n) for n in args.workers.split(",")]:
+            env = environment(Path(tempfile.mkdtemp(prefix="mcpapp-bench-")), profile)
+            with spawn.Pool(1) as pool:
+                pool.apply(seed, (env, args.integrations))
+            start_at = time.time() + 3 + 0.5 * workers
+            with spawn.Pool(workers) as pool:
+                results = pool.starmap(
+                    worker,
+                    [
+                        (env, start_at, args.seconds, args.write_ratio, n)
+                        for n in range(workers)
+                    ],
+                )
+            writes = sum(r["writes"] for r in results)
+            reads = sum(r["reads"] for r in results)
+            locked = sum(r["locked"] for r in results)
+            latencies = [ms for r in results for ms in r["write_ms"]]
+            p50 = statistics.median(latencies) if latencies else 0.0
+            p99 = (
+                statistics.quantiles(latencies, n=100)[98]
+                if len(latencies) > 1 else p50
+            )
+            print(f"{profile:<8} {workers:>7} {writes / args.seconds:>9.0f} "
+                  f"{reads / args.seconds:>9.0f} {locked:>7} {p50:>9.2f} {p99:>9.1f}")
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# benchmarks/gateway.py - (./benchmarks/gateway.py)
+# Measure gateway routing-table cost and proxied throughput at scale.
+
+"""
+Creates N integrations in a throwaway SQLite database, half with literal
+endpoint paths and half with an <int:...> parameter, all pointing at the
+local stub upstream. Reports the time and memory to build the routing
+trie, the per-lookup match cost, and end-to-end proxied requests/sec
+through the Flask test client.
+
+    python benchmarks/gateway.py --count 10000 --requests 2000
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_upstream import start_stub_server  # noqa: E402
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gateway routing and proxy cost")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    os.environ["DB_INIT_LOCK_FILE"] = str(Path(workdir) / "db_init.lock")
+    os.environ["SQL_PROFILER_ENABLED"] = "false"
+    os.environ["GATEWAY_REQUIRE_LOGIN"] = "false"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    from app import create_app
+    from app.extensions import db
+    from app.gateway import gateway
+    from app.models import ApiIntegration, User
+
+    stub = start_stub_server()
+    base_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    app = create_app()
+    with app.app_context():
+        owner = User.query.filter_by(email="admin@example.com").first()
+        rows = []
+        for n in range(args.count):
+            path = f"/echo/svc{n}" if n % 2 else f"/echo/svc{n}/<int:item_id>"
+            rows.append(
+                {
+                    "name": f"bench-{n:06d}",
+                    "system_name": "bench",
+                    "base_url": base_url,
+                    "endpoint_path": path,
+                    "http_method": "GET",
+                    "status": "enabled",
+                    "auth_type": "api_key",
+                    "api_key": f"key-{n}",
+                    "owner_id": owner.id,
+                }
+            )
+        db.session.execute(db.insert(ApiIntegration), rows)
+        db.session.commit()
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        gateway.refresh(0)
+        build_s = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    paths = [
+        f"/echo/svc{n}" if n % 2 else f"/echo/svc{n}/{n}"
+        for n in random.sample(range(args.count), min(args.count, 1000))
+    ]
+    started = time.perf_counter()
+    for i in range(args.lookups):
+        gateway.trie.match(paths[i % len(paths)])
+    lookup_us = (time.perf_counter() - started) / args.lookups * 1e6
+
+    client = app.test_client()
+    started = time.perf_counter()
+    for i in range(args.requests):
+        response = client.get(f"/gateway{paths[i % len(paths)]}")
+        assert response.status_code == 200, response.status_code
+    proxy_s = time.perf_counter() - started
+    stub.shutdown()
+
+    print(f"{gateway.trie.size} routes built in {build_s * 1000:.0f} ms "
+          f"(peak {peak / 1e6:.1f} MB while building)")
+    print(f"trie match: {lookup_us:.2f} us/lookup")
+    print(f"proxied: {args.requests / proxy_s:.0f} req/s "
+          f"({proxy_s / args.requests * 1000:.2f} ms/request, single client)")
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
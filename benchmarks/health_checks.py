@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# benchmarks/health_checks.py - (./benchmarks/health_checks.py)
+# Measure "test all" probe throughput against the local stub upstream.
+
+"""
+Creates N integrations in a throwaway SQLite database, all pointing at the
+local stub server with a configurable simulated upstream latency, then runs
+the same check_integrations() path used by the API admin "Test All" button.
+
+    python benchmarks/health_checks.py --count 1000 --delay-ms 50
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_upstream import start_stub_server  # noqa: E402
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Health-check throughput")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--delay-ms", type=int, default=50)
+    parser.add_argument("--error-every", type=int, default=10,
+                        help="Make every Nth integration return HTTP 500.")
+    parser.add_argument("--per-host-limit", type=int, default=None,
+                        help="Override HEALTH_CHECK_PER_HOST_LIMIT; every "
+                             "integration shares the single stub host.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    if args.per_host_limit:
+        os.environ["HEALTH_CHECK_PER_HOST_LIMIT"] = str(args.per_host_limit)
+
+    from app import create_app
+    from app.extensions import db
+    from app.health_checks import check_integrations
+    from app.models import ApiIntegration, User
+
+    stub = start_stub_server()
+    base_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    app = create_app()
+    with app.app_context():
+        owner = User.query.filter_by(email="admin@example.com").first()
+        rows = []
+        for n in range(args.count):
+            code = 500 if args.error_every and n % args.error_every == 0 else 200
+            rows.append(
+                {
+                    "name": f"bench-{n:06d}",
+                    "system_name": "bench",
+                    "base_url": base_url,
+                    "endpoint_path": f"/delay/{args.delay_ms}/{code}",
+                    "http_method": "GET",
+                    "status": "enabled",
+                    "auth_type": "none",
+                    "owner_id": owner.id,
+                }
+            )
+        db.session.execute(db.insert(ApiIntegration), rows)
+        db.session.commit()
+
+        started = time.perf_counter()
+        results = check_integrations()
+        elapsed = time.perf_counter() - started
+
+    stub.shutdown()
+    failing = sum(1 for r in results if not r.ok)
+    print(
+        f"{len(results)} probes in {elapsed:.2f}s "
+        f"({len(results) / elapsed:.0f}/s), {failing} failing, "
+        f"upstream delay {args.delay_ms} ms"
+    )
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# benchmarks/metrics.py - (./benchmarks/metrics.py)
+# Measure the per-request and per-query overhead of request telemetry.
+
+"""
+Reports, in microseconds:
+
+  * the before_request/after_request hook pair that times and records
+    one request (inside a pushed request context, so Flask routing and
+    the test client are not measured)
+  * the SQLAlchemy cursor-event pair added to every query, as the
+    difference between `SELECT 1` with and without the listeners
+  * rendering /metrics after --integrations integrations have been hit
+    from --threads threads
+
+    python benchmarks/metrics.py --requests 200000 --integrations 1000
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Request telemetry overhead")
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--integrations", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    os.environ["DB_INIT_LOCK_FILE"] = str(Path(workdir) / "db_init.lock")
+    os.environ["SQL_PROFILER_ENABLED"] = "false"
+
+    from flask import Response
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from app import create_app
+    from app.extensions import db
+    from app.metrics import metrics
+
+    app = create_app()
+    response = Response()
+    with app.test_request_context("/operator/status"):
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            metrics._request_started()
+            metrics._request_finished(response)
+        hooks = (time.perf_counter() - started) * 1e6 / args.requests
+    print(f"request hooks        {hooks:6.2f} us/request")
+
+    with app.app_context():
+        connection = db.engine.connect()
+
+        def run_queries() -> float:
+            started = time.perf_counter()
+            for _ in range(args.queries):
+                connection.exec_driver_sql("SELECT 1").close()
+            return (time.perf_counter() - started) * 1e6 / args.queries
+
+        run_queries()
+        with_hooks = run_queries()
+        event.remove(Engine, "before_cursor_execute", metrics._query_started)
+        event.remove(Engine, "after_cursor_execute", metrics._query_finished)
+        without_hooks = run_queries()
+        connection.close()
+    print(f"query events         {with_hooks - without_hooks:6.2f} us/query "
+          f"({without_hooks:.2f} us bare SELECT 1)")
+
+    def traffic() -> None:
+        for _ in range(args.integrations * 5):
+            metrics.observe(
+                "gateway",
+                random.choice((200, 200, 200, 404, 502)),
+                random.expovariate(20),
+                random.randrange(args.integrations),
+            )
+
+    workers = [threading.Thread(target=traffic) for _ in range(args.threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    started = time.perf_counter()
+    text = metrics.render(app)
+    rendered = (time.perf_counter() - started) * 1000
+    print(f"/metrics render      {rendered:6.1f} ms for {args.integrations} "
+          f"integrations, {len(text.splitlines())} lines, {len(text) // 1024} KiB")
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
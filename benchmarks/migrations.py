@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# benchmarks/migrations.py - (./benchmarks/migrations.py)
+# Time the startup schema check and an online SQLite table rebuild.
+
+"""
+Two measurements against a temporary SQLite database seeded with
+--integrations rows:
+
+  * startup check: the old readiness check (catalog inspection of every
+    table plus a sentinel lookup) against the new single schema_version
+    query in bootstrap.database_ready(), per call
+  * table rebuild: Operations.rebuild_table() on api_integrations while a
+    writer thread keeps updating and inserting rows, once copying in
+    --batch-size chunks (online) and once in a single chunk (the same as
+    a plain CREATE/INSERT SELECT/DROP/RENAME). Reports the rebuild time
+    and the writer's worst stall, and checks that no row or write was lost
+    and the search triggers survived.
+
+    python benchmarks/migrations.py --integrations 200000 --batch-size 5000
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-17
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+WORKDIR = Path(tempfile.mkdtemp(prefix="mcpapp-bench-"))
+DATABASE = WORKDIR / "bench.db"
+os.environ.update(
+    {
+        "DATABASE_URL": f"sqlite:///{DATABASE}",
+        "DB_INIT_LOCK_FILE": str(WORKDIR / "db_init.lock"),
+        "API_MODULES_DIR": str(WORKDIR / "api"),
+        "SQL_PROFILER_ENABLED": "false",
+        "GENERATE_API_MODULES": "false",
+    }
+)
+
+from sqlalchemy import func, insert, inspect, select, text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.bootstrap import database_ready  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.migrations import Operations  # noqa: E402
+from app.models import ApiIntegration, SiteSettingsVersion, User  # noqa: E402
+
+
+# ------------------------------------------------------------------------------
+def legacy_ready() -> bool:
+    existing = set(inspect(db.engine).get_table_names())
+    if not set(db.metadata.tables) <= existing:
+        return False
+    return db.session.get(SiteSettingsVersion, 1) is not None
+
+
+# ------------------------------------------------------------------------------
+def per_call_us(check, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        check()
+        db.session.remove()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+# ------------------------------------------------------------------------------
+def seed(count: int, start: int = 0) -> None:
+    owner = User.query.filter_by(email="admin@example.com").first()
+    db.session.execute(
+        insert(ApiIntegration),
+        [
+            {
+                "name": f"integration-{n:07d}",
+                "system_name": f"system{n % 20}",
+                "base_url": "https://example.com",
+                "endpoint_path": f"/items/{n}",
+                "status": "enabled",
+                "owner_id": owner.id,
+            }
+            for n in range(start, start + count)
+        ],
+    )
+    db.session.commit()
+
+
+# ------------------------------------------------------------------------------
+def table_triggers() -> set[str]:
+    names = db.session.execute(
+        text(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'api_integrations'"
+        )
+    ).scalars()
+    triggers = set(names)
+    db.session.remove()
+    return triggers
+
+
+# ------------------------------------------------------------------------------
+def writer(stop: threading.Event, rows: int, stats: dict) -> None:
+    # Like a web worker: short write transactions, waiting on the lock.
+    connection = sqlite3.connect(DATABASE, timeout=60, isolation_level=None)
+    n = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute(
+            "UPDATE api_integrations SET notes = ? WHERE id = ?",
+            (f"edit {n}", n % rows + 1),
+        )
+        connection.execute(
+            "INSERT INTO api_integrations (name, system_name, base_url, "
+            "endpoint_path, owner_id) VALUES (?, 'bench', 'https://x', '/', 1)",
+            (f"written-during-rebuild-{n}",),
+        )
+        connection.execute("COMMIT")
+        stats["max_ms"] = max(stats["max_ms"], (time.perf_counter() - started) * 1000)
+        stats["writes"] += 1
+        n += 1
+        time.sleep(0.002)
+    connection.close()
+
+
+# ------------------------------------------------------------------------------
+def rebuild(rows: int, batch_size: int) -> tuple[float, dict, int]:
+    stats = {"writes": 0, "max_ms": 0.0}
+    stop = threading.Event()
+    thread = threading.Thread(target=writer, args=(stop, rows, stats))
+    thread.start()
+    time.sleep(0.2)
+    started = time.perf_counter()
+    with db.engine.connect() as connection:
+        Operations(db.engine, connection).rebuild_table(
+            ApiIntegration.__table__, batch_size=batch_size
+        )
+    elapsed = time.perf_counter() - started
+    time.sleep(0.2)
+    stop.set()
+    thread.join()
+    total = db.session.scalar(select(func.count(ApiIntegration.id)))
+    db.session.remove()
+    return elapsed, stats, total
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migration benchmarks")
+    parser.add_argument("--integrations", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        for start in range(0, args.integrations, 50_000):
+            seed(min(50_000, args.integrations - start), start)
+
+        print(f"startup check, {args.calls} calls:")
+        print(f"  legacy (inspect + sentinel) {per_call_us(legacy_ready, args.calls):8.0f} us")
+        print(f"  schema_version query        {per_call_us(database_ready, args.calls):8.0f} us")
+
+        triggers = table_triggers()
+        print(f"rebuild api_integrations ({args.integrations} rows) with a writer:")
+        for label, batch_size in (
+            ("online", args.batch_size),
+            ("single batch", args.integrations * 10),
+        ):
+            before = db.session.scalar(select(func.count(ApiIntegration.id)))
+            db.session.remove()
+            elapsed, stats, total = rebuild(args.integrations, batch_size)
+            kept = table_triggers()
+            lost = before + stats["writes"] - total
+            print(
+                f"  {label:<13} {elapsed:6.2f} s, {stats['writes']:>5} writes, "
+                f"worst write {stats['max_ms']:8.1f} ms, rows lost {lost}, "
+                f"triggers kept {kept == triggers}"
+            )
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
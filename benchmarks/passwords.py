@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# benchmarks/passwords.py - (./benchmarks/passwords.py)
+# Measure password verifications (logins) per second per core for each policy.
+
+"""
+For every hashing policy, hashes one password and then verifies it from
+several client threads through the bounded KDF pool, exactly as the login
+view does. Reports single-verify latency, total logins/sec and logins/sec
+per core (pool workers are capped at the core count).
+
+    python benchmarks/passwords.py --seconds 3 --clients 8
+    python benchmarks/passwords.py --policy scrypt:16384:8:1 --policy pbkdf2:300000
+
+Policies are "scrypt:N:R:P", "pbkdf2:ITERATIONS" or "argon2:TIME:MEMORY_KIB:LANES";
+argon2 rows are skipped when argon2-cffi is not installed.
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.passwords import PasswordHasher, HashPolicy, argon2  # noqa: E402
+
+DEFAULT_POLICIES = (
+    "scrypt:32768:8:1",
+    "scrypt:16384:8:1",
+    "pbkdf2:600000",
+    "pbkdf2:210000",
+    "argon2:3:65536:4",
+    "argon2:2:19456:1",
+)
+
+
+# ------------------------------------------------------------------------------
+def parse_policy(spec: str) -> HashPolicy:
+    name, *params = spec.split(":")
+    values = [int(p) for p in params]
+    if name == "scrypt":
+        return HashPolicy("scrypt", scrypt_n=values[0], scrypt_r=values[1],
+                          scrypt_p=values[2])
+    if name == "pbkdf2":
+        return HashPolicy("pbkdf2", pbkdf2_iterations=values[0])
+    if name == "argon2":
+        return HashPolicy("argon2", argon2_time_cost=values[0],
+                          argon2_memory_cost=values[1],
+                          argon2_parallelism=values[2])
+    raise ValueError(f"unknown policy {spec!r}")
+
+
+# ------------------------------------------------------------------------------
+def run_policy(policy: HashPolicy, cores: int, clients: int, seconds: float) -> dict:
+    hasher = PasswordHasher(policy, max_workers=cores, max_queue=clients)
+    stored = hasher.hash("correct horse battery staple")
+
+    latencies = []
+    for _ in range(3):
+        started = time.perf_counter()
+        hasher.verify(stored, "correct horse battery staple")
+        latencies.append(time.perf_counter() - started)
+
+    deadline = time.perf_counter() + seconds
+    counts = [0] * clients
+
+    def client(slot: int) -> None:
+        while time.perf_counter() < deadline:
+            hasher.verify(stored, "correct horse battery staple")
+            counts[slot] += 1
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    per_second = sum(counts) / elapsed
+    return {
+        "latency_ms": statistics.median(latencies) * 1000,
+        "per_second": per_second,
+        "per_core": per_second / cores,
+    }
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Password hashing throughput")
+    parser.add_argument("--policy", action="append", default=None,
+                        help="Policy spec; repeat for several (default: a set "
+                             "of common scrypt/pbkdf2/argon2 costs).")
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1,
+                        help="KDF pool size; results are divided by this.")
+    parser.add_argument("--clients", type=int, default=8,
+                        help="Concurrent login threads.")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{args.cores} core(s), {args.clients} client threads, "
+          f"{args.seconds:.0f}s per policy")
+    print(f"{'policy':<22} {'verify ms':>10} {'logins/s':>10} {'per core':>10}")
+    for spec in args.policy or DEFAULT_POLICIES:
+        if spec.startswith("argon2") and argon2 is None:
+            print(f"{spec:<22} {'skipped (argon2-cffi not installed)':>32}")
+            continue
+        result = run_policy(parse_policy(spec), args.cores, args.clients, args.seconds)
+        print(
+            f"{spec:<22} {result['latency_ms']:>10.1f} "
+            f"{result['per_second']:>10.1f} {result['per_core']:>10.1f}"
+        )
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# benchmarks/rate_limit.py - (./benchmarks/rate_limit.py)
+# Measure rate-limit check cost and cross-process accuracy of the shared buckets.
+
+"""
+Reports the cost of one check (integration + owner + IP buckets, as the
+gateway does) for the in-process and shared-memory backends, single
+threaded and with --threads threads, then starts --workers processes that
+hammer one shared bucket for --seconds and compares the number admitted
+with what the limit allows (burst + rate * elapsed).
+
+    python benchmarks/rate_limit.py --workers 4 --seconds 2
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.rate_limit import (  # noqa: E402
+    MemoryBuckets,
+    SharedMemoryBuckets,
+    parse_rate_limit,
+)
+
+
+# ------------------------------------------------------------------------------
+def check_cost(buckets, checks: int, threads: int) -> float:
+    """Microseconds per three-bucket check, across `threads` threads."""
+    limit = parse_rate_limit("1000000/s")
+
+    def run(slot: int) -> None:
+        for n in range(checks):
+            buckets.take(
+                [
+                    (f"integration:{n % 500}", limit),
+                    (f"owner:{n % 50}", limit),
+                    (f"ip:10.0.{slot}.{n % 200}", limit),
+                ]
+            )
+
+    workers = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - started) * 1e6 / (checks * threads)
+
+
+# ------------------------------------------------------------------------------
+def hammer(path: str, spec: str, start_at: float, seconds: float, admitted) -> None:
+    buckets = SharedMemoryBuckets(path)
+    rule = [("integration:1", parse_rate_limit(spec))]
+    while time.time() < start_at:
+        time.sleep(0.001)
+    count = 0
+    while time.time() < start_at + seconds:
+        if buckets.take(rule).allowed:
+            count += 1
+    with admitted.get_lock():
+        admitted.value += count
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rate-limit buckets")
+    parser.add_argument("--checks", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--limit", default="500/s burst 100")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+    backends = [
+        ("memory", MemoryBuckets()),
+        ("shared", SharedMemoryBuckets(os.path.join(workdir, "cost"))),
+    ]
+    print(f"three-bucket check, {args.checks} checks per thread")
+    for name, buckets in backends:
+        single = check_cost(buckets, args.checks, 1)
+        threaded = check_cost(buckets, args.checks // args.threads, args.threads)
+        print(
+            f"  {name:<7} {single:6.2f} us/check, "
+            f"{threaded:6.2f} us/check with {args.threads} threads"
+        )
+
+    limit = parse_rate_limit(args.limit)
+    admitted = multiprocessing.Value("q", 0)
+    start_at = time.time() + 0.5
+    path = os.path.join(workdir, "shared")
+    SharedMemoryBuckets(path)
+    processes = [
+        multiprocessing.Process(
+            target=hammer, args=(path, args.limit, start_at, args.seconds, admitted)
+        )
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    allowed = limit.burst + limit.rate * args.seconds
+    print(
+        f"{args.workers} processes on one shared bucket ({args.limit}) "
+        f"for {args.seconds:g} s\n"
+        f"  admitted {admitted.value}, limit allows {allowed:.0f} "
+        f"({admitted.value / allowed:.1%})"
+    )
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# benchmarks/response_cache.py - (./benchmarks/response_cache.py)
+# Measure gateway response-cache latency, stampede coalescing and revalidation.
+
+"""
+Runs the app on a local threaded WSGI server in front of the stub upstream
+with one cached integration on the slow /etag/<v>/<ms> endpoint. Reports:
+
+  * median latency uncached (Cache-Control: no-store) vs cache hit
+  * upstream calls made when --concurrency clients miss the same key at
+    once (cold), and again once the entry has gone stale (revalidation
+    with If-None-Match answered by 304)
+  * the response cache's own counters
+
+    python benchmarks/response_cache.py --delay-ms 100 --concurrency 50
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_upstream import StubHandler, start_stub_server  # noqa: E402
+
+
+# ------------------------------------------------------------------------------
+def timed_gets(
+    session: requests.Session, url: str, count: int, headers: dict | None = None
+) -> list[float]:
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        session.get(url, headers=headers, timeout=30).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+# ------------------------------------------------------------------------------
+def burst(url: str, concurrency: int) -> tuple[int, dict[str, int]]:
+    """Fire concurrent GETs; return (upstream calls made, X-Cache counts)."""
+    before = StubHandler.hits["etag"]
+    barrier = threading.Barrier(concurrency)
+
+    def one(_):
+        barrier.wait()
+        response = requests.get(url, timeout=60)
+        response.raise_for_status()
+        return response.headers.get("X-Cache", "none")
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        states = list(pool.map(one, range(concurrency)))
+    counts: dict[str, int] = {}
+    for state in states:
+        counts[state] = counts.get(state, 0) + 1
+    return StubHandler.hits["etag"] - before, counts
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gateway response cache")
+    parser.add_argument("--delay-ms", type=int, default=100)
+    parser.add_argument("--ttl", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    os.environ["DB_INIT_LOCK_FILE"] = str(Path(workdir) / "db_init.lock")
+    os.environ["API_MODULES_DIR"] = str(Path(workdir) / "api")
+    os.environ["SQL_PROFILER_ENABLED"] = "false"
+    os.environ["GATEWAY_REQUIRE_LOGIN"] = "false"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    from werkzeug.serving import make_server
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import ApiIntegration, User
+    from app.response_cache import response_cache
+
+    stub = start_stub_server()
+    upstream = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    app = create_app()
+    with app.app_context():
+        owner = User.query.filter_by(email="admin@example.com").first()
+        db.session.add(
+            ApiIntegration(
+                name="etag cached",
+                system_name="bench",
+                base_url=upstream,
+                endpoint_path="/etag/<int:v>/<int:ms>",
+                http_method="GET",
+                auth_type="none",
+                cache_ttl=args.ttl,
+                owner_id=owner.id,
+            )
+        )
+        db.session.commit()
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gateway = f"http://127.0.0.1:{server.server_port}/gateway"
+
+    print(f"upstream delay {args.delay_ms} ms, cache_ttl {args.ttl} s")
+    session = requests.Session()
+    url = f"{gateway}/etag/1/{args.delay_ms}"
+    uncached = timed_gets(
+        session, url, args.requests, headers={"Cache-Control": "no-store"}
+    )
+    timed_gets(session, url, 1)
+    cached = timed_gets(session, url, args.requests)
+    print(f"  median uncached  {statistics.median(uncached):8.2f} ms")
+    print(f"  median cache hit {statistics.median(cached):8.2f} ms")
+
+    calls, states = burst(f"{gateway}/etag/2/{args.delay_ms}", args.concurrency)
+    print(f"  cold burst of {args.concurrency}: {calls} upstream call(s), {states}")
+    time.sleep(args.ttl + 0.2)
+    calls, states = burst(f"{gateway}/etag/2/{args.delay_ms}", args.concurrency)
+    print(f"  stale burst of {args.concurrency}: {calls} upstream call(s), {states}")
+
+    stats = response_cache.stats()
+    print(
+        f"  cache: hit rate {stats['hit_rate']:.1%}, {stats['hits']} hits, "
+        f"{stats['revalidated']} revalidated, {stats['misses']} misses, "
+        f"{stats['coalesced']} coalesced, {stats['entries']} entries"
+    )
+    server.shutdown()
+    stub.shutdown()
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+# benchmarks/routes.py - (./benchmarks/routes.py)
+# Benchmark every auth, admin, api_admin, developer and operator route.
+
+"""
+Seeds a throwaway SQLite database with --users users, --integrations
+integrations and --checks health-probe rows. Then drives every
+GET/POST route of the five UI blueprints through the Flask test client
+as a user with the right role. For each route it reports:
+
+  * latency percentiles (p50/p90/p99) over --requests timed requests,
+    after --warmup untimed ones
+  * SQL statements per request, and shapes repeated often enough to
+    look like an N+1 (via sql_profiler.profile())
+  * peak Python memory allocated while serving one request (tracemalloc)
+
+Routes added to a blueprint without a case here are listed as not
+covered, so the suite keeps up with the app; the few left out on
+purpose are listed in SKIPPED with the reason. Results can be saved as a
+JSON baseline and later runs compared against it; a compare exits
+non-zero when a route slows down, allocates more, or runs more queries
+than the baseline allows.
+
+    python benchmarks/routes.py --users 10000 --integrations 100000 \\
+        --save benchmarks/baseline.json
+    python benchmarks/routes.py --compare benchmarks/baseline.json
+    python benchmarks/routes.py --only admin. --requests 50
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import count
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_upstream import start_stub_server  # noqa: E402
+
+BLUEPRINTS = ("auth", "admin", "api_admin", "developer", "operator")
+PASSWORD = "benchmark-password"
+SYSTEMS = [f"system{n:02d}" for n in range(50)]
+CHUNK = 5000
+IMPORT_ROWS = 100
+
+# Routes deliberately left out, with the reason printed on every run.
+SKIPPED = {
+    "POST api_admin.test_all_integrations": "probes every integration; "
+    "see benchmarks/health_checks.py",
+}
+
+
+# ------------------------------------------------------------------------------
+@dataclass
+class RouteCase:
+    """
+    One route request: who makes it, where, and with what form data.
+
+    `path` and `data` are called before every request so cases that
+    consume rows (deletes) or need unique values (creates) get fresh ones.
+    """
+
+    endpoint: str
+    method: str
+    user: str | None
+    path: Callable[[], str]
+    data: Callable[[], dict] | None = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.method} {self.endpoint}"
+
+
+# ------------------------------------------------------------------------------
+def seed(args: argparse.Namespace, stub_url: str) -> dict:
+    """Bulk-insert the benchmark data set; return ids the cases need."""
+    from sqlalchemy import select
+
+    from app.api_utils import generate_api_module
+    from app.extensions import db
+    from app.models import ApiIntegration, IntegrationCheck, Role, User, hour_bucket
+    from app.passwords import password_hasher
+
+    rng = random.Random(args.seed)
+    roles = {role.name: role.id for role in Role.query.all()}
+    password_hash = password_hasher.hash(PASSWORD)
+
+    def insert(model, rows: list[dict]) -> None:
+        for start in range(0, len(rows), CHUNK):
+            db.session.execute(db.insert(model), rows[start:start + CHUNK])
+
+    named = {
+        role: f"bench-{role.replace('_', '-')}@example.com"
+        for role in ("api_admin", "developer", "operator")
+    }
+    user_rows = [
+        {
+            "email": email,
+            "full_name": f"Bench {role}",
+            "password_hash": password_hash,
+            "active": True,
+            "role_id": roles[role],
+        }
+        for role, email in named.items()
+    ]
+    weights = {"developer": 85, "operator": 10, "api_admin": 4, "admin": 1}
+    for n in range(args.users):
+        role = rng.choices(list(weights), list(weights.values()))[0]
+        user_rows.append(
+            {
+                "email": f"user{n:06d}@example.com",
+                "full_name": f"User {n:06d}",
+                "password_hash": password_hash,
+                "active": rng.random() > 0.05,
+                "role_id": roles[role],
+            }
+        )
+    insert(User, user_rows)
+
+    ids = dict(db.session.execute(select(User.email, User.id)).all())
+    users = {role: ids[email] for role, email in named.items()}
+    users["admin"] = ids["admin@example.com"]
+    owners = list(ids.values())
+
+    def integration(n: int, owner_id: int, **extra) -> dict:
+        system = SYSTEMS[n % len(SYSTEMS)]
+        row = {
+            "name": f"{system}-api-{n:06d}",
+            "system_name": system,
+            "base_url": "https://api.example.com",
+            "endpoint_path": f"/v1/{system}/{n}",
+            "http_method": "GET",
+            "status": rng.choices(("enabled", "disabled", "error"), (80, 15, 5))[0],
+            "auth_type": "api_key",
+            "api_key": f"key-{n}",
+            "docusaurus_doc_path": f"/integrations/{system}-{n}" if n % 2 else None,
+            "owner_id": owner_id,
+        }
+        row.update(extra)
+        return row
+
+    rows = []
+    for n in range(args.integrations):
+        owned = n < args.owned
+        rows.append(integration(n, users["developer"] if owned else rng.choice(owners)))
+    insert(ApiIntegration, rows)
+
+    # Rows the delete cases consume, one per request (plus the profiled
+    # and traced extra requests).
+    spares = args.warmup + args.requests + 2
+    marker = args.integrations
+    insert(
+        ApiIntegration,
+        [
+            integration(marker + n, users[role], name=f"spare-{role}-{n:04d}")
+            for role in ("developer", "api_admin")
+            for n in range(spares)
+        ],
+    )
+    spare_ids = {
+        role: db.session.scalars(
+            select(ApiIntegration.id)
+            .where(ApiIntegration.name.like(f"spare-{role}-%"))
+            .order_by(ApiIntegration.id)
+        ).all()
+        for role in ("developer", "api_admin")
+    }
+
+    probed = ApiIntegration(
+        **integration(
+            marker + 2 * spares,
+            users["api_admin"],
+            name="bench-probe",
+            base_url=stub_url,
+            endpoint_path="/echo/probe",
+            status="enabled",
+            auth_type="none",
+        )
+    )
+    db.session.add(probed)
+
+    now = datetime.utcnow()
+    integration_ids = db.session.scalars(select(ApiIntegration.id)).all()
+    check_rows = []
+    for _ in range(args.checks):
+        checked_at = now - timedelta(seconds=rng.randrange(24 * 3600))
+        ok = rng.random() > 0.05
+        check_rows.append(
+            {
+                "integration_id": rng.choice(integration_ids),
+                "checked_at": checked_at,
+                "hour_bucket": hour_bucket(checked_at),
+                "ok": ok,
+                "http_status": 200 if ok else 503,
+                "latency_ms": rng.expovariate(1 / 80),
+                "error": None if ok else "HTTP 503",
+            }
+        )
+    insert(IntegrationCheck, check_rows)
+    db.session.commit()
+
+    owned = db.session.scalar(
+        select(ApiIntegration.id)
+        .where(ApiIntegration.owner_id == users["developer"])
+        .order_by(ApiIntegration.id)
+    )
+    # One scaffold on disk for the review/approve routes.
+    scaffold = generate_api_module(db.session.get(ApiIntegration, owned))
+
+    return {
+        "users": users,
+        "spares": {role: iter(spare) for role, spare in spare_ids.items()},
+        "owned": owned,
+        "scaffold_sha256": hashlib.sha256(scaffold.read_bytes()).hexdigest(),
+        "probed": probed.id,
+        "role_target": ids["user000000@example.com"],
+    }
+
+
+# ------------------------------------------------------------------------------
+def integration_form(name: str) -> dict:
+    return {
+        "name": name,
+        "system_name": "bench",
+        "base_url": "https://api.example.com",
+        "endpoint_path": f"/v1/bench/{name}",
+        "http_method": "GET",
+        "status": "enabled",
+        "auth_type": "none",
+        "api_key": "",
+        "notes": "",
+        "docusaurus_doc_path": "",
+        "cache_ttl": "",
+        "rate_limit": "",
+    }
+
+
+# ------------------------------------------------------------------------------
+def build_cases(ctx: dict) -> list[RouteCase]:
+    """Every benchmarked request; paths are built with url_for at run time."""
+    from flask import url_for
+
+    serial = count()
+    owned = ctx["owned"]
+
+    def at(endpoint: str, **values) -> Callable[[], str]:
+        return lambda: url_for(endpoint, **values)
+
+    def spare(endpoint: str, role: str) -> Callable[[], str]:
+        return lambda: url_for(endpoint, integration_id=next(ctx["spares"][role]))
+
+    def created(prefix: str) -> Callable[[], dict]:
+        return lambda: integration_form(f"{prefix}-{next(serial):06d}")
+
+    def upload() -> dict:
+        batch = next(serial)
+        lines = (
+            json.dumps(integration_form(f"imported-{batch:06d}-{n:03d}")) + "\n"
+            for n in range(IMPORT_ROWS)
+        )
+        return {"file": (io.BytesIO("".join(lines).encode()), "bench.jsonl")}
+
+    return [
+        RouteCase("auth.index", "GET", "developer", at("auth.index")),
+        RouteCase("auth.login", "GET", None, at("auth.login")),
+        RouteCase(
+            "auth.login", "POST", None, at("auth.login"),
+            lambda: {"email": "bench-developer@example.com", "password": PASSWORD},
+        ),
+        RouteCase("auth.logout", "GET", "developer", at("auth.logout")),
+        RouteCase("auth.register", "GET", None, at("auth.register")),
+        RouteCase(
+            "auth.register", "POST", None, at("auth.register"),
+            lambda: {
+                "full_name": "Bench Registrant",
+                "email": f"register{next(serial):06d}@example.com",
+                "password": PASSWORD,
+            },
+        ),
+        RouteCase("admin.users", "GET", "admin", at("admin.users")),
+        RouteCase(
+            "admin.set_user_role", "POST", "admin",
+            at("admin.set_user_role", user_id=ctx["role_target"]),
+            lambda: {"role_name": ("developer", "operator")[next(serial) % 2]},
+        ),
+        RouteCase("admin.settings", "GET", "admin", at("admin.settings")),
+        RouteCase(
+            "admin.audit_events", "GET", "admin",
+            at("admin.audit_events", entity_type="integration", limit=50),
+        ),
+        RouteCase(
+            "admin.settings", "POST", "admin", at("admin.settings"),
+            lambda: {"key": "SITE_NAME", "value": f"Bench {next(serial)}"},
+        ),
+        RouteCase(
+            "admin.scaffold", "GET", "admin",
+            at("admin.scaffold", integration_id=owned),
+        ),
+        RouteCase(
+            "admin.approve_scaffold", "POST", "admin",
+            at("admin.approve_scaffold", integration_id=owned),
+            lambda: {"sha256": ctx["scaffold_sha256"]},
+        ),
+        RouteCase(
+            "api_admin.list_integrations", "GET", "api_admin",
+            at("api_admin.list_integrations"),
+        ),
+        RouteCase(
+            "api_admin.search_integrations", "GET", "api_admin",
+            at("api_admin.search_integrations", q="system07 api"),
+        ),
+        RouteCase(
+            "api_admin.create_integration", "GET", "api_admin",
+            at("api_admin.create_integration"),
+        ),
+        RouteCase(
+            "api_admin.create_integration", "POST", "api_admin",
+            at("api_admin.create_integration"), created("admin-created"),
+        ),
+        RouteCase(
+            "api_admin.edit_integration", "GET", "api_admin",
+            at("api_admin.edit_integration", integration_id=owned),
+        ),
+        RouteCase(
+            "api_admin.edit_integration", "POST", "api_admin",
+            at("api_admin.edit_integration", integration_id=owned),
+            lambda: integration_form("admin-edited"),
+        ),
+        RouteCase(
+            "api_admin.delete_integration", "POST", "api_admin",
+            spare("api_admin.delete_integration", "api_admin"),
+        ),
+        RouteCase(
+            "api_admin.toggle_integration_status", "POST", "api_admin",
+            at("api_admin.toggle_integration_status", integration_id=owned),
+        ),
+        RouteCase(
+            "api_admin.test_integration", "POST", "api_admin",
+            at("api_admin.test_integration", integration_id=ctx["probed"]),
+        ),
+        RouteCase(
+            "api_admin.bulk_import", "POST", "api_admin",
+            at("api_admin.bulk_import"), upload,
+        ),
+        RouteCase(
+            "api_admin.bulk_export", "GET", "api_admin",
+            at("api_admin.bulk_export", format="csv"),
+        ),
+        RouteCase("developer.dashboard", "GET", "developer", at("developer.dashboard")),
+        RouteCase(
+            "developer.my_integrations", "GET", "developer",
+            at("developer.my_integrations"),
+        ),
+        RouteCase(
+            "developer.search_integrations", "GET", "developer",
+            at("developer.search_integrations", q="system00"),
+        ),
+        RouteCase(
+            "developer.create_integration", "GET", "developer",
+            at("developer.create_integration"),
+        ),
+        RouteCase(
+            "developer.create_integration", "POST", "developer",
+            at("developer.create_integration"), created("dev-created"),
+        ),
+        RouteCase(
+            "developer.edit_integration", "GET", "developer",
+            at("developer.edit_integration", integration_id=owned),
+        ),
+        RouteCase(
+            "developer.edit_integration", "POST", "developer",
+            at("developer.edit_integration", integration_id=owned),
+            lambda: integration_form("dev-edited"),
+        ),
+        RouteCase(
+            "developer.delete_integration", "POST", "developer",
+            spare("developer.delete_integration", "developer"),
+        ),
+        RouteCase(
+            "operator.status_dashboard", "GET", "operator",
+            at("operator.status_dashboard"),
+        ),
+    ]
+
+
+# ------------------------------------------------------------------------------
+def uncovered(app, cases: list[RouteCase]) -> list[str]:
+    """Blueprint routes (method + endpoint) that no case exercises."""
+    covered = {case.label for case in cases} | set(SKIPPED)
+    missing = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint.partition(".")[0] not in BLUEPRINTS:
+            continue
+        for method in sorted(rule.methods - {"HEAD", "OPTIONS"}):
+            if f"{method} {rule.endpoint}" not in covered:
+                missing.append(f"{method} {rule.endpoint}")
+    return missing
+
+
+# ------------------------------------------------------------------------------
+def run_case(app, case: RouteCase, ctx: dict, args: argparse.Namespace) -> dict:
+    """Time one case, then profile its queries and trace its memory."""
+    from app.sql_profiler import sql_profiler
+
+    client = app.test_client()
+    user_id = ctx["users"].get(case.user)
+
+    def request():
+        # Reset the session each time: login/logout/register change it
+        # and flashed messages would otherwise pile up in the cookie.
+        with client.session_transaction() as session:
+            session.clear()
+            if user_id:
+                session["_user_id"] = str(user_id)
+                session["_fresh"] = True
+        with app.test_request_context():
+            path = case.path()
+        data = case.data() if case.data else None
+        started = time.perf_counter()
+        response = client.open(path, method=case.method, data=data)
+        response.get_data()  # drain streamed bodies such as the export
+        elapsed = (time.perf_counter() - started) * 1000
+        response.close()
+        return response.status_code, elapsed
+
+    statuses = set()
+    timings = []
+    for n in range(args.warmup + args.requests):
+        status, elapsed = request()
+        statuses.add(status)
+        if n >= args.warmup:
+            timings.append(elapsed)
+
+    with sql_profiler.profile() as query_log:
+        request()
+
+    tracemalloc.start()
+    request()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "status": max(statuses),
+        "p50_ms": round(cuts[49], 3),
+        "p90_ms": round(cuts[89], 3),
+        "p99_ms": round(cuts[98], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries": query_log.count,
+        "repeated_shapes": len(query_log.repeated()),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+# ------------------------------------------------------------------------------
+def compare(
+    baseline: dict, current: dict, args: argparse.Namespace
+) -> list[str]:
+    """Describe every route that regressed against the baseline."""
+    for key in ("users", "integrations", "checks"):
+        if baseline["meta"].get(key) != current["meta"][key]:
+            print(
+                f"warning: baseline {key}={baseline['meta'].get(key)}, "
+                f"this run {current['meta'][key]}",
+                file=sys.stderr,
+            )
+
+    regressions = []
+    limit = 1 + args.threshold
+    for label, now in current["routes"].items():
+        before = baseline["routes"].get(label)
+        if before is None:
+            continue
+        if now["status"] >= 400 > before["status"]:
+            regressions.append(f"{label}: HTTP {before['status']} -> {now['status']}")
+        for key in ("p50_ms", "p90_ms"):
+            grew = now[key] - before[key]
+            if now[key] > before[key] * limit and grew > args.min_delta_ms:
+                regressions.append(
+                    f"{label}: {key} {before[key]:.2f} -> {now[key]:.2f} "
+                    f"(+{grew / before[key]:.0%})"
+                )
+        if now["queries"] > before["queries"]:
+            regressions.append(
+                f"{label}: queries {before['queries']} -> {now['queries']}"
+            )
+        grew = now["peak_kib"] - before["peak_kib"]
+        if now["peak_kib"] > before["peak_kib"] * limit and grew > args.min_delta_kib:
+            regressions.append(
+                f"{label}: peak {before['peak_kib']:.0f} -> {now['peak_kib']:.0f} KiB"
+            )
+    return regressions
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-route latency, queries, memory")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--integrations", type=int, default=100_000)
+    parser.add_argument("--checks", type=int, default=50_000,
+                        help="Health-probe history rows in the last 24 hours.")
+    parser.add_argument("--owned", type=int, default=200,
+                        help="Integrations owned by the benchmark developer.")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", default="",
+                        help="Only run cases whose label contains this text.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", type=Path, help="Write results as a JSON baseline.")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative growth before a regression.")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="Ignore latency growth smaller than this.")
+    parser.add_argument("--min-delta-kib", type=float, default=64.0,
+                        help="Ignore memory growth smaller than this.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    os.environ["DB_INIT_LOCK_FILE"] = str(Path(workdir) / "db_init.lock")
+    os.environ["API_MODULES_DIR"] = str(Path(workdir) / "api")
+    os.environ["SQL_PROFILER_ENABLED"] = "false"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    # Scaffolds would be written into the repository's api/ directory.
+    os.environ["GENERATE_API_MODULES"] = "false"
+
+    from app import create_app
+
+    stub = start_stub_server()
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    app = create_app()
+    app.config["WTF_CSRF_ENABLED"] = False
+    logging.getLogger("app").setLevel(logging.WARNING)
+    started = time.perf_counter()
+    with app.app_context():
+        ctx = seed(args, stub_url)
+    print(
+        f"seeded {args.users} users, {args.integrations} integrations, "
+        f"{args.checks} checks in {time.perf_counter() - started:.1f} s"
+    )
+
+    cases = build_cases(ctx)
+    for label, reason in SKIPPED.items():
+        print(f"skipped: {label} ({reason})")
+    for label in uncovered(app, cases):
+        print(f"not covered: {label}", file=sys.stderr)
+
+    routes = {}
+    print(
+        f"{'route':<44} {'http':>4} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+        f"{'queries':>7} {'peak KiB':>9}"
+    )
+    for case in cases:
+        if args.only not in case.label:
+            continue
+        result = routes[case.label] = run_case(app, case, ctx, args)
+        flag = f"  {result['repeated_shapes']} repeated" if result["repeated_shapes"] else ""
+        print(
+            f"{case.label:<44} {result['status']:>4} {result['p50_ms']:>8.2f} "
+            f"{result['p90_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+            f"{result['queries']:>7} {result['peak_kib']:>9.0f}{flag}"
+        )
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"process peak RSS {max_rss / 1024:.0f} MiB")
+    stub.shutdown()
+
+    current = {
+        "meta": {
+            "users": args.users,
+            "integrations": args.integrations,
+            "checks": args.checks,
+            "requests": args.requests,
+            "python": platform.python_version(),
+            "created": datetime.utcnow().isoformat(timespec="seconds"),
+        },
+        "routes": routes,
+    }
+    if args.save:
+        args.save.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"baseline written to {args.save}")
+
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), current, args)
+        if regressions:
+            print("\nREGRESSION:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print(f"no regressions against {args.compare}")
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# benchmarks/startup.py - (./benchmarks/startup.py)
+# Measure package import and create_app() timings in fresh interpreters.
+
+"""
+Each sample runs in a new Python process so module caches do not hide
+import cost. Reports the median of several runs for:
+
+  * `import app`
+  * `create_app()` with AUTO_INIT_DB off (the production worker path)
+  * `create_app()` with AUTO_INIT_DB on against an already-initialized
+    database (the development path after the first boot)
+  * `create_app()` with AUTO_INIT_DB on against an empty database
+    (first boot: DDL, seed and the admin password hash)
+
+    python benchmarks/startup.py --runs 5 --top-imports 15
+    python benchmarks/startup.py --max-factory-ms 150   # fail on regression
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs inside the child interpreter; prints one JSON line of timings.
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+flask_app = app.create_app()
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "factory_ms": (t2 - t1) * 1000}))
+"""
+
+
+# ------------------------------------------------------------------------------
+def _child_env(database_url: str, auto_init: bool) -> dict[str, str]:
+    db_path = Path(database_url.removeprefix("sqlite:///"))
+    env = dict(os.environ)
+    env.update(
+        DATABASE_URL=database_url,
+        AUTO_INIT_DB="true" if auto_init else "false",
+        DB_INIT_LOCK_FILE=str(db_path.with_suffix(".lock")),
+        HEALTH_SWEEP_IN_PROCESS="false",
+    )
+    return env
+
+
+# ------------------------------------------------------------------------------
+def _sample(env: dict[str, str]) -> dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# ------------------------------------------------------------------------------
+def _top_imports(env: dict[str, str], limit: int) -> list[tuple[int, str]]:
+    """Return the slowest modules (cumulative µs) from `-X importtime`."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[12:].split("|"))
+        rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Application start-up timings")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top-imports", type=int, default=0,
+                        help="Also list the N slowest modules on import.")
+    parser.add_argument("--max-import-ms", type=float, default=None,
+                        help="Exit non-zero if median `import app` exceeds this.")
+    parser.add_argument("--max-factory-ms", type=float, default=None,
+                        help="Exit non-zero if median create_app() with "
+                             "AUTO_INIT_DB off exceeds this.")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="mcpapp-startup-"))
+    ready_url = f"sqlite:///{workdir / 'ready.db'}"
+
+    # Initialize once so the "warm" scenarios measure the skip path.
+    _sample(_child_env(ready_url, auto_init=True))
+
+    scenarios = {
+        "no auto-init": lambda n: _child_env(ready_url, auto_init=False),
+        "auto-init, ready db": lambda n: _child_env(ready_url, auto_init=True),
+        "auto-init, empty db": lambda n: _child_env(
+            f"sqlite:///{workdir / f'empty-{n}.db'}", auto_init=True
+        ),
+    }
+
+    medians: dict[str, dict[str, float]] = {}
+    for label, make_env in scenarios.items():
+        samples = [_sample(make_env(n)) for n in range(args.runs)]
+        medians[label] = {
+            key: statistics.median(s[key] for s in samples)
+            for key in ("import_ms", "factory_ms")
+        }
+
+    print(f"{'scenario':<22} {'import ms':>10} {'create_app ms':>14}")
+    for label, m in medians.items():
+        print(f"{label:<22} {m['import_ms']:>10.1f} {m['factory_ms']:>14.1f}")
+
+    if args.top_imports:
+        print("\nSlowest imports (cumulative ms) for `import app`:")
+        for micros, name in _top_imports(
+            _child_env(ready_url, auto_init=False), args.top_imports
+        ):
+            print(f"{micros / 1000:>10.1f}  {name}")
+
+    failures = []
+    baseline = medians["no auto-init"]
+    if args.max_import_ms is not None and baseline["import_ms"] > args.max_import_ms:
+        failures.append(f"import {baseline['import_ms']:.1f} ms > {args.max_import_ms} ms")
+    if args.max_factory_ms is not None and baseline["factory_ms"] > args.max_factory_ms:
+        failures.append(
+            f"create_app {baseline['factory_ms']:.1f} ms > {args.max_factory_ms} ms"
+        )
+    if failures:
+        print("\nREGRESSION: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# benchmarks/streaming.py - (./benchmarks/streaming.py)
+# Check that the gateway streams: TTFB, SSE pacing and bounded memory.
+
+"""
+Runs the app on a local threaded WSGI server in front of the stub
+upstream and compares direct-to-upstream against through-the-gateway:
+
+  * time to first Server-Sent Event and mean gap between events
+  * peak Python memory while downloading a large body
+  * peak Python memory while uploading a large body (sized and chunked)
+
+tracemalloc covers the whole process (client, gateway and stub), so the
+memory figures are an upper bound on what the gateway itself holds.
+
+    python benchmarks/streaming.py --events 20 --event-ms 50 --size-mb 200
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_upstream import start_stub_server  # noqa: E402
+
+CHUNK = 64 * 1024
+
+
+# ------------------------------------------------------------------------------
+def time_events(url: str) -> tuple[float, float, int]:
+    """Return (ms to first event, mean ms between events, event count)."""
+    started = time.perf_counter()
+    stamps = []
+    with requests.get(url, stream=True, timeout=30) as response:
+        for line in response.iter_lines(chunk_size=None):
+            if line.startswith(b"data:"):
+                stamps.append(time.perf_counter())
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    first = (stamps[0] - started) * 1000 if stamps else float("nan")
+    mean_gap = sum(gaps) / len(gaps) * 1000 if gaps else float("nan")
+    return first, mean_gap, len(stamps)
+
+
+# ------------------------------------------------------------------------------
+def measure_peak(fn) -> tuple[object, float]:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1e6
+
+
+# ------------------------------------------------------------------------------
+def download(url: str) -> int:
+    total = 0
+    with requests.get(url, stream=True, timeout=60) as response:
+        for chunk in response.iter_content(CHUNK):
+            total += len(chunk)
+    return total
+
+
+# ------------------------------------------------------------------------------
+def upload(url: str, size: int, chunked: bool) -> int:
+    def pieces():
+        piece = b"y" * CHUNK
+        remaining = size
+        while remaining > 0:
+            yield piece[:remaining]
+            remaining -= CHUNK
+
+    class Sized:
+        # requests sends Content-Length for objects with __len__.
+        def __len__(self):
+            return size
+
+        def __iter__(self):
+            return pieces()
+
+    body = pieces() if chunked else Sized()
+    response = requests.post(url, data=body, timeout=60)
+    response.raise_for_status()
+    return response.json()["bytes"]
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gateway streaming behaviour")
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--event-ms", type=int, default=50)
+    parser.add_argument("--size-mb", type=int, default=100)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcpapp-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    os.environ["DB_INIT_LOCK_FILE"] = str(Path(workdir) / "db_init.lock")
+    os.environ["API_MODULES_DIR"] = str(Path(workdir) / "api")
+    os.environ["SQL_PROFILER_ENABLED"] = "false"
+    os.environ["GATEWAY_REQUIRE_LOGIN"] = "false"
+
+    from werkzeug.serving import make_server
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import ApiIntegration, User
+
+    stub = start_stub_server()
+    upstream = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    app = create_app()
+    with app.app_context():
+        owner = User.query.filter_by(email="admin@example.com").first()
+        for path, method in (
+            ("/sse/<int:n>/<int:ms>", "GET"),
+            ("/bytes/<int:n>", "GET"),
+            ("/count", "POST"),
+        ):
+            db.session.add(
+                ApiIntegration(
+                    name=f"stream {path}",
+                    system_name="bench",
+                    base_url=upstream,
+                    endpoint_path=path,
+                    http_method=method,
+                    auth_type="none",
+                    owner_id=owner.id,
+                )
+            )
+        db.session.commit()
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gateway = f"http://127.0.0.1:{server.server_port}/gateway"
+
+    sse = f"/sse/{args.events}/{args.event_ms}"
+    print(f"{'SSE':<10} {'first event ms':>15} {'mean gap ms':>12} {'events':>7}")
+    for label, base in (("direct", upstream), ("gateway", gateway)):
+        first, gap, count = time_events(base + sse)
+        print(f"{label:<10} {first:>15.1f} {gap:>12.1f} {count:>7}")
+
+    size = args.size_mb * 1024 * 1024
+    print(f"\n{'transfer':<24} {'bytes':>12} {'peak MB':>9} {'seconds':>8}")
+    cases = (
+        ("download", lambda: download(f"{gateway}/bytes/{size}")),
+        ("upload (sized)", lambda: upload(f"{gateway}/count", size, False)),
+        ("upload (chunked)", lambda: upload(f"{gateway}/count", size, True)),
+    )
+    for label, fn in cases:
+        started = time.perf_counter()
+        moved, peak = measure_peak(fn)
+        elapsed = time.perf_counter() - started
+        status = "ok" if moved == size else f"MISMATCH ({moved})"
+        print(f"{label:<24} {moved:>12} {peak:>9.1f} {elapsed:>8.2f}  {status}")
+
+    server.shutdown()
+    stub.shutdown()
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# benchmarks/stub_upstream.py - (./benchmarks/stub_upstream.py)
+# Local stub HTTP server that stands in for integration upstreams.
+
+"""
+Stub upstream used by the benchmark scripts and for manual testing of the
+health-check engine without contacting real services.
+
+Behaviour is driven by the request path so every integration can point at
+the same server with a different endpoint_path:
+
+    /ok                  -> 200 with a small JSON body
+    /status/<code>       -> respond with the given HTTP status
+    /delay/<ms>          -> sleep <ms> milliseconds, then 200
+    /delay/<ms>/<code>   -> sleep, then respond with <code>
+    /echo[/...]          -> 200 echoing method, path, headers and body
+    /count               -> 200 with the number of request body bytes read
+    /bytes/<n>           -> 200 with an n-byte body, written in 64 KiB pieces
+    /sse/<n>/<ms>        -> chunked text/event-stream of n events, <ms> apart
+    /etag/<v>[/<ms>]     -> after <ms>, 200 with ETag "v<v>", or 304 when the
+                            request's If-None-Match already names it
+    /flaky/<name>        -> behave as the Fault registered under <name>:
+                            sleep delay_ms, then fail with `status` for an
+                            error_rate share of requests, else 200
+    /faults/<name>?...   -> set that Fault from error_rate, status and
+                            delay_ms query parameters (for standalone use)
+
+StubHandler.hits counts requests per first path segment, so benchmarks
+can tell how many calls actually reached the upstream. In-process callers
+can also set StubHandler.faults[name] directly; StubHandler.peak records
+the most /flaky/<name> requests seen in flight at once.
+
+Run standalone with `python benchmarks/stub_upstream.py --port 8099`.
+
+Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+Modified:  2026-10-16
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+# ------------------------------------------------------------------------------
+@dataclass
+class Fault:
+    """Injected behaviour for /flaky/<name>."""
+
+    error_rate: float = 0.0
+    status: int = 503
+    delay_ms: int = 0
+
+
+# ------------------------------------------------------------------------------
+class StubHandler(BaseHTTPRequestHandler):
+    """Path-driven handler; see the module docstring for the routes."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; avoid Nagle stalls.
+    disable_nagle_algorithm = True
+    hits: Counter = Counter()
+    hits_lock = threading.Lock()
+    faults: dict[str, Fault] = {}
+    active: Counter = Counter()
+    peak: Counter = Counter()
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+    def _body_pieces(self):
+        """Yield the request body in pieces, for sized or chunked uploads."""
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return
+                yield self.rfile.read(size)
+                self.rfile.readline()
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining > 0:
+            piece = self.rfile.read(min(remaining, 65536))
+            if not piece:
+                return
+            remaining -= len(piece)
+            yield piece
+
+    def _send_bytes(self, size: int) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        piece = b"x" * 65536
+        while size > 0 and self.command != "HEAD":
+            self.wfile.write(piece[:size])
+            size -= len(piece)
+
+    def _send_events(self, count: int, delay_ms: int) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for n in range(count):
+            time.sleep(delay_ms / 1000.0)
+            event = f"id: {n}\ndata: {json.dumps({'n': n, 't': time.time()})}\n\n"
+            data = event.encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_versioned(self, version: str, delay_ms: int) -> None:
+        time.sleep(delay_ms / 1000.0)
+        etag = f'"v{version}"'
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = json.dumps({"version": version, "t": time.time()}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _flaky(self, name: str) -> int:
+        fault = self.faults.get(name) or Fault()
+        with self.hits_lock:
+            self.active[name] += 1
+            self.peak[name] = max(self.peak[name], self.active[name])
+        try:
+            time.sleep(fault.delay_ms / 1000.0)
+        finally:
+            with self.hits_lock:
+                self.active[name] -= 1
+        return fault.status if random.random() < fault.error_rate else 200
+
+    def _set_fault(self, name: str) -> None:
+        query = parse_qs(self.path.partition("?")[2])
+        self.faults[name] = Fault(
+            error_rate=float(query.get("error_rate", ["0"])[0]),
+            status=int(query.get("status", ["503"])[0]),
+            delay_ms=int(query.get("delay_ms", ["0"])[0]),
+        )
+
+    def _respond(self) -> None:
+        parts = [p for p in self.path.split("?", 1)[0].split("/") if p]
+        with self.hits_lock:
+            self.hits[parts[0] if parts else ""] += 1
+        if parts and parts[0] == "count":
+            received = sum(len(piece) for piece in self._body_pieces())
+            payload = b""
+        else:
+            received = None
+            payload = b"".join(self._body_pieces())
+        if len(parts) >= 2 and parts[0] == "bytes":
+            return self._send_bytes(int(parts[1]))
+        if len(parts) >= 3 and parts[0] == "sse":
+            return self._send_events(int(parts[1]), int(parts[2]))
+        if len(parts) >= 2 and parts[0] == "etag":
+            delay = int(parts[2]) if len(parts) >= 3 else 0
+            return self._send_versioned(parts[1], delay)
+
+        status = 200
+        extra: dict = {}
+        if received is not None:
+            extra = {"bytes": received}
+        elif parts and parts[0] == "echo":
+            extra = {
+                "headers": dict(self.headers.items()),
+                "body": payload.decode("utf-8", "replace"),
+            }
+        elif len(parts) >= 2 and parts[0] == "status":
+            status = int(parts[1])
+        elif len(parts) >= 2 and parts[0] == "flaky":
+            status = self._flaky(parts[1])
+        elif len(parts) >= 2 and parts[0] == "faults":
+            self._set_fault(parts[1])
+        elif len(parts) >= 2 and parts[0] == "delay":
+            time.sleep(int(parts[1]) / 1000.0)
+            if len(parts) >= 3:
+                status = int(parts[2])
+
+        body = b"" if self.command == "HEAD" else json.dumps(
+            {"path": self.path, "method": self.command, "status": status, **extra}
+        ).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _respond
+
+
+# ------------------------------------------------------------------------------
+def start_stub_server(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the stub server on a daemon thread and return it.
+
+    Pass port=0 to bind an ephemeral port; the chosen port is available
+    as server.server_address[1]. Call server.shutdown() when finished.
+    """
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    stub = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Stub upstream listening on http://{args.host}:{args.port}")
+    stub.serve_forever()
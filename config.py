@@ -31,12 +31,83 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pool per worker process (see app/database.py). Size the pool
+    # to the worker's threads; pre-ping and recycle apply to server databases
+    # like PostgreSQL, where idle connections get dropped by proxies.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # Pragmas set on every SQLite connection; an empty value skips one.
+    # WAL plus a busy timeout lets several workers share the database file;
+    # foreign_keys makes SQLite enforce FKs and ON DELETE CASCADE.
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")
+    SQLITE_FOREIGN_KEYS = os.getenv("SQLITE_FOREIGN_KEYS", "ON")
+
+    # Optional read replica for read-only list views (@replica_reads). After
+    # a write, that browser session reads from the primary for
+    # DB_REPLICA_STICKY_SECONDS so it sees its own changes despite lag.
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+    DB_REPLICA_STICKY_SECONDS = float(
+        os.getenv("DB_REPLICA_STICKY_SECONDS", "5")
+    )
+
+    # Apply schema migrations (app/migrations.py) and seed data from
+    # create_app(). Production disables this and runs `flask init-db` once
+    # per deploy instead; workers then only check the schema version.
+    # Lock files live in instance/, which is kept out of version control.
+    AUTO_INIT_DB = os.getenv("AUTO_INIT_DB", "true").lower() == "true"
+    DB_INIT_LOCK_FILE = os.getenv(
+        "DB_INIT_LOCK_FILE", str(BASE_DIR / "instance" / "db_init.lock")
+    )
+
     # Session and security-related configuration
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SECURE = False  # Set True when serving via HTTPS in prod
     REMEMBER_COOKIE_HTTPONLY = True
+    # Reverse proxies (nginx, a load balancer) in front of the app. With N>0
+    # the client address, used for rate limits and X-Forwarded-For, is the
+    # Nth value from the right of X-Forwarded-For (werkzeug's ProxyFix). Keep
+    # 0 when clients connect directly, or they could spoof their address.
+    TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
 
-    # Flask-Scss configuration: compile SCSS at runtime in development
+    # Password hashing policy (see app/passwords.py). Algorithm is one of
+    # scrypt, pbkdf2 or argon2 (needs argon2-cffi). Existing hashes are
+    # upgraded on login when the algorithm or cost changes.
+    PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "scrypt")
+    PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", "32768"))
+    PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+    PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+    PASSWORD_PBKDF2_ITERATIONS = int(
+        os.getenv("PASSWORD_PBKDF2_ITERATIONS", "600000")
+    )
+    PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", "3"))
+    PASSWORD_ARGON2_MEMORY_COST = int(
+        os.getenv("PASSWORD_ARGON2_MEMORY_COST", "65536")
+    )
+    PASSWORD_ARGON2_PARALLELISM = int(
+        os.getenv("PASSWORD_ARGON2_PARALLELISM", "4")
+    )
+    # KDF worker pool: concurrent hashes, extra queued requests beyond that
+    # (then logins get 503), and the per-hash wait timeout in seconds.
+    PASSWORD_HASH_WORKERS = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2))
+    )
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+    # Process-local cache for Flask-Login user loading (see user_cache.py).
+    # The TTL bounds how long other workers may serve a stale role.
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+    # Flask-Scss configuration: compile SCSS at runtime in development.
+    # Production uses precompiled, hashed bundles (flask assets-build).
+    ASSETS_RUNTIME_SCSS = True
     ASSETS_DEBUG = True
     FLASK_SCSS = {
         "static_dir": "app/static",
@@ -45,10 +116,209 @@ class Config:
     }
 
     # Simple configuration section for site settings editable by admin.
+    # SiteSetting rows with the same key override these at runtime.
     SITE_NAME = os.getenv("SITE_NAME", "MCP API Integration Hub")
     DOCUSAURUS_BASE_URL = os.getenv(
         "DOCUSAURUS_BASE_URL", "http://localhost:3000/docs"
     )
+    # How often (seconds) each worker checks the settings version row.
+    SITE_SETTINGS_CHECK_INTERVAL = float(
+        os.getenv("SITE_SETTINGS_CHECK_INTERVAL", "5")
+    )
+
+    # Keyset-paginated list and dashboard views.
+    DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "50"))
+    DASHBOARD_MAX_PAGE_SIZE = int(os.getenv("DASHBOARD_MAX_PAGE_SIZE", "200"))
+
+    # Integration search: "auto" uses SQLite FTS5 when available and falls
+    # back to portable LIKE matching; see app/search.py for backends.
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+    SEARCH_RESULT_LIMIT = int(os.getenv("SEARCH_RESULT_LIMIT", "50"))
+
+    # Data-driven proxy (see app/gateway.py): GATEWAY_PREFIX/<endpoint_path>
+    # is forwarded to the integration's base_url with its credentials.
+    GATEWAY_ENABLED = os.getenv("GATEWAY_ENABLED", "true").lower() == "true"
+    GATEWAY_PREFIX = os.getenv("GATEWAY_PREFIX", "/gateway")
+    GATEWAY_CHECK_INTERVAL = float(os.getenv("GATEWAY_CHECK_INTERVAL", "2"))
+    GATEWAY_TIMEOUT = float(os.getenv("GATEWAY_TIMEOUT", "30"))
+    GATEWAY_POOL_SIZE = int(os.getenv("GATEWAY_POOL_SIZE", "64"))
+    GATEWAY_API_KEY_HEADER = os.getenv("GATEWAY_API_KEY_HEADER", "X-API-Key")
+    # Upper bound (bytes) on each relayed body piece; bounds per-request memory.
+    GATEWAY_STREAM_CHUNK_SIZE = int(
+        os.getenv("GATEWAY_STREAM_CHUNK_SIZE", "65536")
+    )
+    # Callers must hold a logged-in session; the gateway adds stored secrets.
+    GATEWAY_REQUIRE_LOGIN = (
+        os.getenv("GATEWAY_REQUIRE_LOGIN", "true").lower() == "true"
+    )
+    # Besides an integration's owner, only these roles may call it through
+    # the gateway (and so use its stored credentials). Comma-separated.
+    GATEWAY_TRUSTED_ROLES = os.getenv("GATEWAY_TRUSTED_ROLES", "admin,api_admin")
+
+    # Gateway response cache for integrations with a cache_ttl: a bounded
+    # in-process LRU, plus an on-disk tier shared by workers when
+    # GATEWAY_CACHE_DIR is set. Larger responses are relayed uncached.
+    GATEWAY_CACHE_ENABLED = (
+        os.getenv("GATEWAY_CACHE_ENABLED", "true").lower() == "true"
+    )
+    GATEWAY_CACHE_MAX_BYTES = int(
+        os.getenv("GATEWAY_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+    )
+    GATEWAY_CACHE_MAX_ENTRY_BYTES = int(
+        os.getenv("GATEWAY_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024))
+    )
+    GATEWAY_CACHE_DIR = os.getenv("GATEWAY_CACHE_DIR", "")
+    GATEWAY_CACHE_DISK_MAX_BYTES = int(
+        os.getenv("GATEWAY_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024))
+    )
+
+    # Token-bucket rate limits (see app/rate_limit.py) written as "120/m",
+    # "5/s" or "1000/h burst 50"; empty means unlimited. A SiteSetting with
+    # the same key overrides each default at runtime, and an integration's
+    # own rate_limit replaces RATE_LIMIT_INTEGRATION. "auto" keeps buckets
+    # in shared memory for all workers on the host where fcntl exists.
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "auto")
+    RATE_LIMIT_SHARED_PATH = os.getenv("RATE_LIMIT_SHARED_PATH", "")
+    RATE_LIMIT_SHARED_SLOTS = int(os.getenv("RATE_LIMIT_SHARED_SLOTS", "65536"))
+    RATE_LIMIT_MEMORY_KEYS = int(os.getenv("RATE_LIMIT_MEMORY_KEYS", "100000"))
+    RATE_LIMIT_INTEGRATION = os.getenv("RATE_LIMIT_INTEGRATION", "600/m")
+    RATE_LIMIT_OWNER = os.getenv("RATE_LIMIT_OWNER", "3000/m")
+    RATE_LIMIT_CLIENT_IP = os.getenv("RATE_LIMIT_CLIENT_IP", "1200/m")
+    RATE_LIMIT_UI = os.getenv("RATE_LIMIT_UI", "300/m")
+
+    # Per-base_url circuit breakers and AIMD concurrency limits in front of
+    # the gateways (see app/circuit_breaker.py). A breaker opens when, over
+    # CIRCUIT_WINDOW_SECONDS with at least CIRCUIT_MIN_REQUESTS calls, the
+    # error or slow-call share reaches its rate; it half-opens after
+    # CIRCUIT_OPEN_SECONDS. Status changes are written back in batches.
+    CIRCUIT_BREAKER_ENABLED = (
+        os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+    )
+    CIRCUIT_WINDOW_SECONDS = float(os.getenv("CIRCUIT_WINDOW_SECONDS", "10"))
+    CIRCUIT_MIN_REQUESTS = int(os.getenv("CIRCUIT_MIN_REQUESTS", "20"))
+    CIRCUIT_ERROR_RATE = float(os.getenv("CIRCUIT_ERROR_RATE", "0.5"))
+    CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "5"))
+    CIRCUIT_SLOW_CALL_RATE = float(os.getenv("CIRCUIT_SLOW_CALL_RATE", "0.8"))
+    CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+    CIRCUIT_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "3"))
+    CIRCUIT_MAX_CONCURRENCY = int(os.getenv("CIRCUIT_MAX_CONCURRENCY", "64"))
+    CIRCUIT_MIN_CONCURRENCY = int(os.getenv("CIRCUIT_MIN_CONCURRENCY", "1"))
+    CIRCUIT_BACKOFF = float(os.getenv("CIRCUIT_BACKOFF", "0.5"))
+    CIRCUIT_STATUS_FLUSH_INTERVAL = float(
+        os.getenv("CIRCUIT_STATUS_FLUSH_INTERVAL", "5")
+    )
+
+    # Request telemetry (see app/metrics.py), served in Prometheus text
+    # format at /metrics. Scrapers authenticate with
+    # "Authorization: Bearer <METRICS_TOKEN>"; operators can also open it
+    # with their browser session.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # Development SQL profiler (see app/sql_profiler.py); DevConfig turns it
+    # on. A statement shape repeated SQL_PROFILER_N_PLUS_ONE_THRESHOLD times
+    # in one request is reported as an N+1. SQL_PROFILER_QUERY_BUDGET caps
+    # queries for views without their own @query_budget (0 = no cap), and
+    # strict mode raises on any overrun or N+1 so tests fail.
+    SQL_PROFILER_ENABLED = False
+    SQL_PROFILER_N_PLUS_ONE_THRESHOLD = int(
+        os.getenv("SQL_PROFILER_N_PLUS_ONE_THRESHOLD", "3")
+    )
+    SQL_PROFILER_QUERY_BUDGET = int(os.getenv("SQL_PROFILER_QUERY_BUDGET", "0"))
+    SQL_PROFILER_STRICT = (
+        os.getenv("SQL_PROFILER_STRICT", "false").lower() == "true"
+    )
+    SQL_PROFILER_TOOLBAR = (
+        os.getenv("SQL_PROFILER_TOOLBAR", "true").lower() == "true"
+    )
+
+    # ASGI mode (asgi.py): connection limits for the async client pool, and
+    # threads running the Flask UI behind the WSGI adapter.
+    ASYNC_GATEWAY_MAX_CONNECTIONS = int(
+        os.getenv("ASYNC_GATEWAY_MAX_CONNECTIONS", "2000")
+    )
+    ASYNC_GATEWAY_MAX_KEEPALIVE = int(
+        os.getenv("ASYNC_GATEWAY_MAX_KEEPALIVE", "200")
+    )
+    # Split the async connection budget over this many clients (0 = auto).
+    ASYNC_GATEWAY_POOL_SHARDS = int(os.getenv("ASYNC_GATEWAY_POOL_SHARDS", "0"))
+    ASGI_UI_THREADS = int(os.getenv("ASGI_UI_THREADS", "10"))
+
+    # Write an api/integration_<id>.py scaffold when integrations are
+    # created. Optional now that the gateway serves integrations directly.
+    GENERATE_API_MODULES = (
+        os.getenv("GENERATE_API_MODULES", "true").lower() == "true"
+    )
+    API_MODULES_DIR = os.getenv("API_MODULES_DIR", str(BASE_DIR / "api"))
+
+    # Scaffolds are written off the request path (see app/scaffold_queue.py):
+    # changes are collected for SCAFFOLD_FLUSH_DELAY seconds, then written
+    # SCAFFOLD_BATCH_SIZE at a time with one fsync pass per batch.
+    # SCAFFOLD_WORKERS threads run `flask regenerate-all` (0 = CPU count).
+    SCAFFOLD_FLUSH_DELAY = float(os.getenv("SCAFFOLD_FLUSH_DELAY", "0.2"))
+    SCAFFOLD_BATCH_SIZE = int(os.getenv("SCAFFOLD_BATCH_SIZE", "256"))
+    SCAFFOLD_FSYNC = os.getenv("SCAFFOLD_FSYNC", "true").lower() == "true"
+    SCAFFOLD_WORKERS = int(os.getenv("SCAFFOLD_WORKERS", "0"))
+
+    # Bulk JSONL/CSV import and export of integrations (see app/bulk.py):
+    # rows per INSERT batch / export chunk, and how many invalid rows an
+    # import reports in detail (all of them are counted).
+    BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+    BULK_IMPORT_MAX_ERRORS = int(os.getenv("BULK_IMPORT_MAX_ERRORS", "100"))
+
+    # Change-event audit log (see app/audit_log.py). Events are buffered and
+    # inserted at most AUDIT_FLUSH_INTERVAL seconds after the commit, or
+    # once AUDIT_BATCH_SIZE are waiting (0 writes them right after each
+    # commit). Events older than AUDIT_RETENTION_DAYS are rolled up into
+    # daily summaries every AUDIT_COMPACT_INTERVAL seconds by the sweep
+    # scheduler, or by `flask audit-compact`.
+    AUDIT_LOG_ENABLED = os.getenv("AUDIT_LOG_ENABLED", "true").lower() == "true"
+    AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+    AUDIT_COMPACT_INTERVAL = float(os.getenv("AUDIT_COMPACT_INTERVAL", "21600"))
+    AUDIT_PAGE_SIZE = int(os.getenv("AUDIT_PAGE_SIZE", "50"))
+    AUDIT_MAX_PAGE_SIZE = int(os.getenv("AUDIT_MAX_PAGE_SIZE", "500"))
+
+    # Generated api/integration_<id>.py modules are served under this prefix
+    # (see app/api_loader.py). The route index is re-checked against the
+    # database at most every GENERATED_API_CHECK_INTERVAL seconds. Callers
+    # must hold a logged-in session, as for the gateway.
+    GENERATED_API_ENABLED = (
+        os.getenv("GENERATED_API_ENABLED", "true").lower() == "true"
+    )
+    GENERATED_API_PREFIX = os.getenv("GENERATED_API_PREFIX", "/api")
+    GENERATED_API_CHECK_INTERVAL = float(
+        os.getenv("GENERATED_API_CHECK_INTERVAL", "2")
+    )
+    GENERATED_API_REQUIRE_LOGIN = (
+        os.getenv("GENERATED_API_REQUIRE_LOGIN", "true").lower() == "true"
+    )
+
+    # Outbound integration health checks: timeouts are in seconds, the worker
+    # pool bounds total concurrency and the per-host limit protects upstreams.
+    HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+    HEALTH_CHECK_MAX_WORKERS = int(os.getenv("HEALTH_CHECK_MAX_WORKERS", "64"))
+    HEALTH_CHECK_PER_HOST_LIMIT = int(os.getenv("HEALTH_CHECK_PER_HOST_LIMIT", "8"))
+    HEALTH_CHECK_API_KEY_HEADER = os.getenv("HEALTH_CHECK_API_KEY_HEADER", "X-API-Key")
+    # Probe POST/PUT/PATCH/DELETE endpoints with HEAD to avoid side effects.
+    HEALTH_CHECK_SAFE_METHODS_ONLY = (
+        os.getenv("HEALTH_CHECK_SAFE_METHODS_ONLY", "true").lower() == "true"
+    )
+
+    # Periodic health sweeps (see app/scheduler.py and worker.py). Intervals
+    # and delays are in seconds; jitter is a fraction applied to both.
+    HEALTH_SWEEP_IN_PROCESS = (
+        os.getenv("HEALTH_SWEEP_IN_PROCESS", "false").lower() == "true"
+    )
+    HEALTH_SWEEP_INTERVAL = float(os.getenv("HEALTH_SWEEP_INTERVAL", "300"))
+    HEALTH_SWEEP_BATCH_SIZE = int(os.getenv("HEALTH_SWEEP_BATCH_SIZE", "100"))
+    HEALTH_SWEEP_BATCH_DELAY = float(os.getenv("HEALTH_SWEEP_BATCH_DELAY", "1.0"))
+    HEALTH_SWEEP_JITTER = float(os.getenv("HEALTH_SWEEP_JITTER", "0.2"))
+    HEALTH_SWEEP_LOCK_FILE = os.getenv(
+        "HEALTH_SWEEP_LOCK_FILE", str(BASE_DIR / "instance" / "health_sweep.lock")
+    )
 
 
 # ------------------------------------------------------------------------------
@@ -56,6 +326,9 @@ class DevConfig(Config):
     """Development configuration."""
 
     DEBUG = True
+    SQL_PROFILER_ENABLED = (
+        os.getenv("SQL_PROFILER_ENABLED", "true").lower() == "true"
+    )
 
 
 # ------------------------------------------------------------------------------
@@ -64,6 +337,9 @@ class ProdConfig(Config):
 
     DEBUG = False
     SESSION_COOKIE_SECURE = True
+    ASSETS_RUNTIME_SCSS = False
+    ASSETS_DEBUG = False
+    AUTO_INIT_DB = os.getenv("AUTO_INIT_DB", "false").lower() == "true"
 
 
 # ------------------------------------------------------------------------------
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# tests/test_api_utils.py - (./tests/test_api_utils.py)
+# Generated api/ scaffolds must keep user-supplied values as plain data.
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.api_loader import _RuleRecorder
+from app.api_utils import is_pristine, render_api_module
+
+HOSTILE_VALUES = [
+    'x"+str(__import__("os").system("echo owned"))+"',
+    "line one\nline two\r\n# not a comment",
+    "{braces} {{doubled}} {0} {name!r}",
+    "'''\"\"\" \\ trailing backslash \\",
+    " unicode separators\x00\x0c",
+]
+
+
+# ------------------------------------------------------------------------------
+def _load(source: str) -> dict:
+    namespace: dict = {"__name__": "api.integration_test"}
+    exec(compile(source, "integration_test.py", "exec"), namespace)
+    return namespace
+
+
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize("value", HOSTILE_VALUES)
+def test_render_keeps_name_literal(value):
+    integration = SimpleNamespace(
+        id=7, name=value, endpoint_path="/items", http_method="GET"
+    )
+    source = render_api_module(integration)
+
+    namespace = _load(source)
+
+    assert namespace["INTEGRATION_NAME"] == value
+    assert is_pristine(source)
+
+
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize("value", HOSTILE_VALUES)
+def test_render_keeps_path_and_method_literal(value):
+    path = "/" + value
+    integration = SimpleNamespace(
+        id=8, name="demo", endpoint_path=path, http_method=value
+    )
+    namespace = _load(render_api_module(integration))
+
+    recorder = _RuleRecorder()
+    for deferred in namespace["blueprint"].deferred_functions:
+        deferred(recorder)
+
+    [rule] = recorder.rules
+    assert rule.rule == path
+    assert value.upper() in rule.methods
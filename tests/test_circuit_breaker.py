@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# tests/test_circuit_breaker.py - (./tests/test_circuit_breaker.py)
+# Upstream circuit breaker states, AIMD limits and permits held by streams.
+
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from urllib3.exceptions import HTTPError
+
+from app import circuit_breaker
+from app.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerPolicy,
+    CircuitBreakers,
+    UpstreamBreaker,
+    UpstreamUnavailable,
+)
+from app.gateway import GatewayRoute, IntegrationGateway
+from app.response_cache import ResponseCache
+from benchmarks.stub_upstream import start_stub_server
+
+POLICY = BreakerPolicy(
+    min_requests=4,
+    open_seconds=5.0,
+    half_open_probes=2,
+    max_concurrency=8,
+)
+
+
+# ------------------------------------------------------------------------------
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(
+        circuit_breaker, "time", SimpleNamespace(monotonic=lambda: now.value)
+    )
+    return now
+
+
+# ------------------------------------------------------------------------------
+def _breaker(policy=POLICY):
+    transitions = []
+    breaker = UpstreamBreaker(
+        "http://upstream.test",
+        policy,
+        lambda url, previous, state: transitions.append((previous, state)),
+    )
+    return breaker, transitions
+
+
+# ------------------------------------------------------------------------------
+def _calls(breaker, clock, statuses, latency=0.01):
+    """Acquire one permit per status, then release them all `latency` later."""
+    permits = [breaker.acquire() for _ in statuses]
+    clock.value += latency
+    for permit, status in zip(permits, statuses):
+        permit.release(status)
+
+
+# ------------------------------------------------------------------------------
+def test_breaker_opens_probes_and_closes(clock):
+    breaker, transitions = _breaker()
+
+    _calls(breaker, clock, [200, 503, 503])
+    assert breaker.state == CLOSED  # below min_requests
+    _calls(breaker, clock, [None])
+    assert breaker.state == OPEN
+
+    with pytest.raises(UpstreamUnavailable) as denied:
+        breaker.acquire()
+    assert denied.value.retry_after == pytest.approx(5.0)
+
+    clock.value += 5.0
+    probes = [breaker.acquire(), breaker.acquire()]
+    assert breaker.state == HALF_OPEN
+    assert all(permit.probe for permit in probes)
+    with pytest.raises(UpstreamUnavailable):
+        breaker.acquire()  # only half_open_probes at a time
+
+    for permit in probes:
+        permit.release(200)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["calls"] == 0
+    assert breaker.limit >= POLICY.half_open_probes
+    assert transitions == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
+
+
+# ------------------------------------------------------------------------------
+def test_failed_probe_reopens(clock):
+    breaker, transitions = _breaker()
+    _calls(breaker, clock, [503] * 4)
+    clock.value += 5.0
+
+    probe = breaker.acquire()
+    clock.value += 0.01
+    probe.release(502)
+
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+    with pytest.raises(UpstreamUnavailable):
+        breaker.acquire()
+    assert transitions[-1] == (HALF_OPEN, OPEN)
+
+
+# ------------------------------------------------------------------------------
+def test_slow_calls_open_the_breaker(clock):
+    breaker, _ = _breaker()
+
+    _calls(breaker, clock, [200] * 4, latency=POLICY.slow_call_seconds + 1)
+
+    assert breaker.state == OPEN
+
+
+# ------------------------------------------------------------------------------
+def test_slowness_is_judged_at_response_headers(clock):
+    breaker, _ = _breaker()
+
+    for _ in range(4):
+        permit = breaker.acquire()
+        clock.value += 0.1
+        permit.responded()
+        clock.value += POLICY.slow_call_seconds * 10  # a long, healthy stream
+        permit.release(200)
+
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["slow_rate"] == 0.0
+
+
+# ------------------------------------------------------------------------------
+def test_aimd_cuts_once_per_round(clock):
+    breaker, _ = _breaker(BreakerPolicy(min_requests=100, max_concurrency=8))
+
+    _calls(breaker, clock, [503, 429, None, 503])
+    assert breaker.limit == 4.0
+
+    # Calls started after the cut may cut again, once.
+    _calls(breaker, clock, [503, 503])
+    assert breaker.limit == 2.0
+
+    _calls(breaker, clock, [503])
+    _calls(breaker, clock, [503])
+    assert breaker.limit == 1.0  # min_concurrency
+
+
+# ------------------------------------------------------------------------------
+def test_aimd_grows_additively_while_in_use(clock):
+    breaker, _ = _breaker(BreakerPolicy(min_requests=100, max_concurrency=8))
+    _calls(breaker, clock, [503])
+    assert breaker.limit == 4.0
+
+    permits = [breaker.acquire() for _ in range(4)]
+    with pytest.raises(UpstreamUnavailable):
+        breaker.acquire()
+    clock.value += 0.01
+    for permit in permits:
+        permit.release(200)
+
+    # In use (in_flight * 2 >= limit) for the first three releases.
+    assert 4.0 < breaker.limit < 5.0
+
+    grown = breaker.limit
+    for _ in range(20):
+        _calls(breaker, clock, [200])
+    assert breaker.limit == grown  # one call at a time leaves it idle
+
+
+# ------------------------------------------------------------------------------
+def test_permit_release_is_idempotent(clock):
+    breaker, _ = _breaker()
+
+    permit = breaker.acquire()
+    permit.release(None)
+    permit.release(200)
+
+    snapshot = breaker.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["calls"] == 1
+    assert snapshot["error_rate"] == 1.0
+
+
+# ------------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def upstream():
+    server = start_stub_server()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+# ------------------------------------------------------------------------------
+def _stream(upstream, path):
+    """Forward GET path through a fresh gateway; returns (response, breaker)."""
+    breakers = CircuitBreakers()
+    gateway = IntegrationGateway(
+        timeout=0.5, require_login=False, cache=ResponseCache(), breakers=breakers
+    )
+    route = GatewayRoute(1, "GET", upstream, "none", None)
+    return gateway.forward(route, path), breakers.get(upstream)
+
+
+# ------------------------------------------------------------------------------
+def test_stream_holds_permit_until_body_is_done(upstream):
+    with Flask(__name__).test_request_context("/sse/3/50"):
+        response, breaker = _stream(upstream, "/sse/3/50")
+        chunks = iter(response.response)
+        next(chunks)
+        assert breaker.snapshot()["in_flight"] == 1
+
+        b"".join(chunks)
+        response.close()
+
+    snapshot = breaker.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["calls"] == 1
+    assert snapshot["error_rate"] == 0.0
+
+
+# ------------------------------------------------------------------------------
+def test_stream_closed_early_is_not_an_error(upstream):
+    with Flask(__name__).test_request_context("/sse/3/50"):
+        response, breaker = _stream(upstream, "/sse/3/50")
+        next(iter(response.response))
+        response.close()
+
+    snapshot = breaker.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["error_rate"] == 0.0
+
+
+# ------------------------------------------------------------------------------
+def test_stalled_stream_counts_as_error(upstream):
+    with Flask(__name__).test_request_context("/sse/2/2000"):
+        response, breaker = _stream(upstream, "/sse/2/2000")
+        assert response.status_code == 200
+        with pytest.raises(HTTPError):
+            b"".join(response.response)
+        response.close()
+
+    snapshot = breaker.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["calls"] == 1
+    assert snapshot["error_rate"] == 1.0
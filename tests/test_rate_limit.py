@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# tests/test_rate_limit.py - (./tests/test_rate_limit.py)
+# Token buckets: limit parsing, refill, all-or-nothing takes, client keys.
+
+from types import SimpleNamespace
+
+import pytest
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.test import EnvironBuilder
+
+from app import rate_limit
+from app.async_gateway import _client_ip
+from app.rate_limit import (
+    MemoryBuckets,
+    RateLimit,
+    SharedMemoryBuckets,
+    _refill,
+    parse_rate_limit,
+)
+
+
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "spec, rate, burst",
+    [
+        ("120/m", 2.0, 120.0),
+        ("5/s", 5.0, 5.0),
+        ("5 / sec", 5.0, 5.0),
+        ("1000/h burst 50", 1000 / 3600, 50.0),
+        ("30/10s", 3.0, 30.0),
+        ("2/Day", 2 / 86400, 2.0),
+        ("1.5/minutes", 1.5 / 60, 1.5),
+    ],
+)
+def test_parse_rate_limit(spec, rate, burst):
+    limit = parse_rate_limit(spec)
+
+    assert limit.rate == pytest.approx(rate)
+    assert limit.burst == burst
+
+
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize("spec", [None, "", " ", "0", "off", "None", "unlimited", "0/m"])
+def test_parse_rate_limit_unlimited(spec):
+    assert parse_rate_limit(spec) is None
+
+
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize("spec", ["120", "fast", "10/w", "-1/s", "5/s burst"])
+def test_parse_rate_limit_rejects_garbage(spec):
+    with pytest.raises(ValueError):
+        parse_rate_limit(spec)
+
+
+# ------------------------------------------------------------------------------
+def test_refill_caps_at_burst():
+    limit = RateLimit(rate=2.0, burst=10.0, spec="2/s burst 10")
+
+    assert _refill(3.0, 1.5, limit) == 6.0
+    assert _refill(3.0, 60.0, limit) == 10.0
+    assert _refill(3.0, -5.0, limit) == 10.0
+
+
+# ------------------------------------------------------------------------------
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+# ------------------------------------------------------------------------------
+@pytest.fixture(params=["memory", "shared"])
+def buckets(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBuckets()
+    if rate_limit.fcntl is None:
+        pytest.skip("shared buckets need POSIX record locks")
+    return SharedMemoryBuckets(str(tmp_path / "buckets"), slots=64)
+
+
+# ------------------------------------------------------------------------------
+def test_take_spends_burst_then_refills(buckets, clock):
+    limit = parse_rate_limit("2/s burst 3")
+    rules = [("ip:1", limit)]
+
+    assert [buckets.take(rules).allowed for _ in range(4)] == [True] * 3 + [False]
+    denied = buckets.take(rules)
+    assert denied.key == "ip:1"
+    assert denied.retry_after == pytest.approx(0.5)
+    assert denied.retry_after_seconds == 1
+
+    clock.value += 1.0
+    assert [buckets.take(rules).allowed for _ in range(3)] == [True, True, False]
+
+
+# ------------------------------------------------------------------------------
+def test_take_is_all_or_nothing(buckets, clock):
+    roomy = parse_rate_limit("100/s")
+    tight = parse_rate_limit("1/m")
+
+    assert buckets.take([("integration:1", roomy), ("owner:1", tight)]).allowed
+    for _ in range(5):
+        denied = buckets.take([("integration:1", roomy), ("owner:1", tight)])
+        assert not denied.allowed
+        assert denied.scope == "owner"
+
+    # The denied takes left the integration bucket untouched: 99 remain.
+    results = [buckets.take([("integration:1", roomy)]).allowed for _ in range(100)]
+    assert results == [True] * 99 + [False]
+
+
+# ------------------------------------------------------------------------------
+def test_shared_buckets_are_shared_across_instances(tmp_path, clock):
+    if rate_limit.fcntl is None:
+        pytest.skip("shared buckets need POSIX record locks")
+    path = str(tmp_path / "buckets")
+    first = SharedMemoryBuckets(path, slots=64)
+    second = SharedMemoryBuckets(path, slots=1024)
+    rules = [("ip:1", parse_rate_limit("2/m"))]
+
+    assert second.groups == first.groups
+    assert first.take(rules).allowed
+    assert second.take(rules).allowed
+    assert not first.take(rules).allowed
+
+
+# ------------------------------------------------------------------------------
+def _proxied_addr(forwarded_for: str | None, hops: int) -> str:
+    headers = {"X-Forwarded-For": forwarded_for} if forwarded_for is not None else {}
+    environ = EnvironBuilder(
+        headers=headers, environ_base={"REMOTE_ADDR": "10.0.0.1"}
+    ).get_environ()
+    seen = {}
+
+    def wsgi_app(environ, start_response):
+        seen["addr"] = environ["REMOTE_ADDR"]
+        return []
+
+    ProxyFix(wsgi_app, x_for=hops)(environ, lambda *args: None)
+    return seen["addr"]
+
+
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "forwarded_for, hops",
+    [
+        (None, 0),
+        ("203.0.113.9", 0),
+        (None, 1),
+        ("203.0.113.9", 1),
+        ("198.51.100.7, 203.0.113.9", 1),
+        ("198.51.100.7, 203.0.113.9", 2),
+        ("203.0.113.9", 2),
+    ],
+)
+def test_client_ip_matches_proxy_fix(forwarded_for, hops):
+    headers = [] if forwarded_for is None else [(b"x-forwarded-for", forwarded_for.encode())]
+    scope = {"headers": headers, "client": ("10.0.0.1", 5000)}
+
+    assert _client_ip(scope, hops) == _proxied_addr(forwarded_for, hops)
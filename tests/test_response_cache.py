@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# tests/test_response_cache.py - (./tests/test_response_cache.py)
+# Gateway response cache: keys, storability, the body tee and GET-only use.
+
+import pytest
+from flask import Flask
+
+from app.circuit_breaker import CircuitBreakers
+from app.gateway import GatewayRoute, IntegrationGateway
+from app.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+    request_directive,
+    storable,
+    tee,
+)
+from benchmarks.stub_upstream import StubHandler, start_stub_server
+
+ROUTE = GatewayRoute(
+    integration_id=3,
+    method="GET",
+    base_url="http://upstream.test",
+    auth_type="api_key",
+    api_key="secret",
+    cache_ttl=60,
+)
+
+
+# ------------------------------------------------------------------------------
+def _key(route=ROUTE, method="GET", path="/items", query="", headers=None, body=None):
+    return cache_key(route, method, path, query, headers or {}, body)
+
+
+# ------------------------------------------------------------------------------
+def _tee(chunks, limit):
+    results = []
+    relayed = tee(iter(chunks), limit, results.append)
+    return relayed, results
+
+
+# ------------------------------------------------------------------------------
+def test_tee_keeps_full_body():
+    relayed, results = _tee([b"ab", b"cd", b"e"], limit=5)
+
+    assert b"".join(relayed) == b"abcde"
+    assert results == [b"abcde"]
+
+
+# ------------------------------------------------------------------------------
+def test_tee_relays_but_drops_body_over_limit():
+    relayed, results = _tee([b"ab", b"cd", b"e"], limit=4)
+
+    assert b"".join(relayed) == b"abcde"
+    assert results == [None]
+
+
+# ------------------------------------------------------------------------------
+def test_tee_drops_body_when_client_leaves():
+    relayed, results = _tee([b"ab", b"cd"], limit=100)
+
+    assert next(relayed) == b"ab"
+    relayed.close()
+    relayed.close()
+
+    assert results == [None]
+
+
+# ------------------------------------------------------------------------------
+def test_tee_drops_body_on_upstream_error():
+    def chunks():
+        yield b"ab"
+        raise OSError("connection reset")
+
+    results = []
+    relayed = tee(chunks(), 100, results.append)
+
+    with pytest.raises(OSError):
+        b"".join(relayed)
+    assert results == [None]
+
+
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "status, headers, expected",
+    [
+        (200, {}, True),
+        (404, {}, True),
+        (500, {}, False),
+        (206, {}, False),
+        (200, {"cache-control": "no-store"}, False),
+        (200, {"cache-control": "private, max-age=60"}, False),
+        (200, {"content-type": "text/event-stream"}, False),
+        (200, {"vary": "Accept-Encoding, accept"}, True),
+        (200, {"vary": "Cookie"}, False),
+        (200, {"content-length": "10"}, True),
+        (200, {"content-length": "11"}, False),
+    ],
+)
+def test_storable(status, headers, expected):
+    assert storable(status, headers, max_bytes=10) is expected
+
+
+# ------------------------------------------------------------------------------
+def test_cache_key_sorts_query_parameters():
+    assert _key(query="a=1&b=2") == _key(query="b=2&a=1")
+    assert _key(query="a=1&b=2") != _key(query="a=1&b=3")
+
+
+# ------------------------------------------------------------------------------
+def test_cache_key_shares_head_with_get():
+    assert _key(method="HEAD") == _key(method="GET")
+
+
+# ------------------------------------------------------------------------------
+def test_cache_key_varies_on_body_credentials_and_headers():
+    base = _key()
+
+    assert _key(body=b'{"a": 1}') != base
+    assert _key(body=b'{"a": 1}') != _key(body=b'{"a": 2}')
+    assert _key(route=GatewayRoute(3, "GET", ROUTE.base_url, "api_key", "other")) != base
+    assert _key(headers={"accept": "text/csv"}) != base
+    assert _key(headers={"cookie": "session=1"}) == base
+    assert base.startswith("3-")
+
+
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "method, headers, expected",
+    [
+        ("GET", {}, "use"),
+        ("HEAD", {}, "use"),
+        ("POST", {}, None),
+        ("PUT", {}, None),
+        ("GET", {"authorization": "Bearer x"}, None),
+        ("GET", {"cache-control": "no-store"}, None),
+        ("GET", {"cache-control": "no-cache"}, "revalidate"),
+        ("GET", {"cache-control": "max-age=0"}, "revalidate"),
+        ("GET", {"pragma": "no-cache"}, "revalidate"),
+    ],
+)
+def test_request_directive(method, headers, expected):
+    assert request_directive(method, headers) == expected
+
+
+# ------------------------------------------------------------------------------
+def test_revalidated_keeps_body_and_framing():
+    entry = CachedResponse(
+        status=200,
+        headers=(
+            ("Content-Type", "application/json"),
+            ("Content-Length", "2"),
+            ("ETag", '"v1"'),
+            ("Cache-Control", "max-age=10"),
+        ),
+        body=b"{}",
+        stored_at=0.0,
+    )
+
+    refreshed = entry.revalidated(
+        [("etag", '"v2"'), ("Content-Length", "0"), ("Date", "Sat, 17 Oct 2026")]
+    )
+
+    assert refreshed.body == b"{}"
+    assert refreshed.status == 200
+    assert refreshed.header("ETag") == '"v2"'
+    assert refreshed.header("Content-Length") == "2"
+    assert refreshed.header("Content-Type") == "application/json"
+    assert refreshed.header("Date") == "Sat, 17 Oct 2026"
+    assert refreshed.header("Cache-Control") == "max-age=10"
+    assert refreshed.fresh(60)
+    assert not entry.fresh(60)
+
+
+# ------------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def upstream():
+    server = start_stub_server()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+# ------------------------------------------------------------------------------
+def _forward(cache, upstream, method, path, data=None):
+    route = GatewayRoute(
+        integration_id=1,
+        method=method,
+        base_url=upstream,
+        auth_type="none",
+        api_key=None,
+        cache_ttl=60,
+    )
+    gateway = IntegrationGateway(
+        require_login=False, cache=cache, breakers=CircuitBreakers()
+    )
+    with Flask(__name__).test_request_context(path, method=method, data=data):
+        response = gateway.forward(route, path)
+        body = b"".join(response.response)
+        response.close()
+    return response, body
+
+
+# ------------------------------------------------------------------------------
+def test_gateway_caches_get(upstream):
+    cache = ResponseCache()
+    StubHandler.hits.clear()
+
+    served = [_forward(cache, upstream, "GET", "/echo/get") for _ in range(3)]
+
+    assert [r.headers.get("X-Cache") for r, _ in served] == ["MISS", "HIT", "HIT"]
+    assert len({body for _, body in served}) == 1
+    assert StubHandler.hits["echo"] == 1
+
+
+# ------------------------------------------------------------------------------
+def test_gateway_never_caches_post(upstream):
+    cache = ResponseCache()
+    StubHandler.hits.clear()
+
+    served = [_forward(cache, upstream, "POST", "/echo/post", data=b"{}") for _ in range(3)]
+
+    assert all(r.status_code == 200 for r, _ in served)
+    assert all(r.headers.get("X-Cache") is None for r, _ in served)
+    assert StubHandler.hits["echo"] == 3
+    assert cache.coalesced == 0
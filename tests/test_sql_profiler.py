@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# tests/test_sql_profiler.py - (./tests/test_sql_profiler.py)
+# The SQL profiler must fail requests that break their query budget.
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from app.sql_profiler import (
+    QueryBudgetExceeded,
+    SqlProfiler,
+    query_budget,
+    statement_shape,
+)
+
+
+# ------------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, owner INTEGER)"))
+        conn.execute(
+            text("INSERT INTO item (owner) VALUES (:owner)"),
+            [{"owner": n % 3} for n in range(9)],
+        )
+    return engine
+
+
+# ------------------------------------------------------------------------------
+def _app(engine, strict: bool) -> Flask:
+    app = Flask(__name__)
+    app.testing = True
+    app.config.update(
+        SQL_PROFILER_ENABLED=True,
+        SQL_PROFILER_N_PLUS_ONE_THRESHOLD=3,
+        SQL_PROFILER_QUERY_BUDGET=0,
+        SQL_PROFILER_STRICT=strict,
+        SQL_PROFILER_TOOLBAR=False,
+    )
+    SqlProfiler().init_app(app)
+
+    @app.route("/within")
+    @query_budget(2)
+    def within():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT count(*) FROM item")).scalar()
+            conn.execute(text("SELECT max(id) FROM item")).scalar()
+        return "ok"
+
+    @app.route("/over")
+    @query_budget(2)
+    def over():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT count(*) FROM item")).scalar()
+            conn.execute(text("SELECT max(id) FROM item")).scalar()
+            conn.execute(text("SELECT min(id) FROM item")).scalar()
+        return "ok"
+
+    @app.route("/n-plus-one")
+    def n_plus_one():
+        with engine.connect() as conn:
+            for owner in range(3):
+                conn.execute(
+                    text("SELECT id FROM item WHERE owner = :owner"), {"owner": owner}
+                ).all()
+        return "ok"
+
+    @app.route("/batched")
+    def batched():
+        with engine.begin() as conn:
+            conn.execute(
+                text("UPDATE item SET owner = :owner WHERE id = :id"),
+                [{"owner": 1, "id": n} for n in range(1, 4)],
+            )
+        return "ok"
+
+    return app
+
+
+# ------------------------------------------------------------------------------
+def test_strict_mode_passes_within_budget(engine):
+    response = _app(engine, strict=True).test_client().get("/within")
+
+    assert response.status_code == 200
+    assert response.headers["X-SQL-Query-Count"] == "2"
+    assert response.headers["X-SQL-N-Plus-One"] == "0"
+
+
+# ------------------------------------------------------------------------------
+def test_strict_mode_fails_over_budget(engine):
+    client = _app(engine, strict=True).test_client()
+
+    with pytest.raises(QueryBudgetExceeded, match=r"over ran 3 queries \(budget 2\)"):
+        client.get("/over")
+
+
+# ------------------------------------------------------------------------------
+def test_strict_mode_fails_n_plus_one(engine):
+    client = _app(engine, strict=True).test_client()
+
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1 in n_plus_one: 3x"):
+        client.get("/n-plus-one")
+
+
+# ------------------------------------------------------------------------------
+def test_executemany_is_not_an_n_plus_one(engine):
+    response = _app(engine, strict=True).test_client().get("/batched")
+
+    assert response.status_code == 200
+    assert response.headers["X-SQL-N-Plus-One"] == "0"
+
+
+# ------------------------------------------------------------------------------
+def test_lenient_mode_only_reports(engine):
+    client = _app(engine, strict=False).test_client()
+
+    over = client.get("/over")
+    repeated = client.get("/n-plus-one")
+
+    assert over.status_code == 200
+    assert over.headers["X-SQL-Query-Count"] == "3"
+    assert repeated.status_code == 200
+    assert repeated.headers["X-SQL-N-Plus-One"] == "1"
+
+
+# ------------------------------------------------------------------------------
+def test_statement_shape_folds_in_lists_and_whitespace():
+    first = statement_shape("SELECT *\n  FROM item\tWHERE id IN (?, ?, ?)")
+    second = statement_shape("SELECT * FROM item WHERE id IN (?)")
+
+    assert first == second
+    assert "\n" not in first
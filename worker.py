@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# worker.py - Root of project (./worker.py)
+# Standalone entry point for periodic integration health sweeps.
+
+import argparse
+import logging
+
+from app import create_app
+from app.scheduler import HealthSweepScheduler
+
+
+# ------------------------------------------------------------------------------
+def main() -> None:
+    """
+    Run the health sweep scheduler in the foreground.
+
+    Deploy this as its own process next to the web workers so sweeps do not
+    compete with request handling. Interval, batch size and jitter come from
+    the HEALTH_SWEEP_* settings in config.py; pass --once to run a single
+    sweep and exit (useful from cron). Only the process holding
+    HEALTH_SWEEP_LOCK_FILE sweeps: replicas stand by, and --once skips its
+    sweep while another process holds the lock.
+
+    Author:  Glenn Boynton vibe coded using Perplexity AI Workspace
+    Modified:  2026-10-17
+    """
+    parser = argparse.ArgumentParser(description="Integration health sweeps")
+    parser.add_argument("--once", action="store_true", help="Run one sweep and exit.")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    app = create_app()
+    scheduler = HealthSweepScheduler.from_app(app)
+    if args.once:
+        if not scheduler.lead():
+            logging.info("Health sweep running in another process; skipped")
+            return
+        summary = scheduler.sweep_once()
+        logging.info(
+            "Checked %d integrations (%d failing) in %.2fs",
+            summary.checked,
+            summary.failing,
+            summary.elapsed,
+        )
+        return
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()